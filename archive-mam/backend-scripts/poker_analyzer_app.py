@@ -13,7 +13,7 @@ from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 import logging
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, render_template, request, jsonify, send_file, session, Response, stream_with_context, make_response
 from werkzeug.utils import secure_filename
 import cv2
 
@@ -23,12 +23,24 @@ try:
     from src.fast_hand_detector import FastHandDetector
     from src.streaming_video_handler import StreamingVideoHandler
     from src.local_file_browser import LocalFileBrowser
+    from src.progress_store import ProgressStore
+    from src.job_scheduler import JobScheduler, QueueFullError
+    from src.live_stream_analyzer import LiveStreamAnalyzer
+    from src.scene_segmenter import get_skip_list
+    from src.signal_cache import get_signal_cache
+    from src.hand_results_db import HandResultsDB
 except ImportError:
     sys.path.append('.')
     from src.hand_boundary_detector import HandBoundaryDetector
     from src.fast_hand_detector import FastHandDetector
     from src.streaming_video_handler import StreamingVideoHandler
     from src.local_file_browser import LocalFileBrowser
+    from src.progress_store import ProgressStore
+    from src.job_scheduler import JobScheduler, QueueFullError
+    from src.live_stream_analyzer import LiveStreamAnalyzer
+    from src.scene_segmenter import get_skip_list
+    from src.signal_cache import get_signal_cache
+    from src.hand_results_db import HandResultsDB
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -54,12 +66,46 @@ ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'flv', 'webm'}
 for folder in [UPLOAD_FOLDER, RESULTS_FOLDER, 'static/results']:
     Path(folder).mkdir(parents=True, exist_ok=True)
 
-# 진행 상황 추적용 전역 변수
-analysis_progress = {}
+# 진행 상황 저장소 (SQLite - 여러 워커 프로세스가 공유하고 재시작 후에도 유지)
+analysis_progress = ProgressStore(os.path.join(RESULTS_FOLDER, 'progress.db'))
+
+# 완료된 결과의 핸드 테이블 (카테고리/길이 구간 미리 계산, 결과 조회는 SQL로)
+results_db = HandResultsDB(os.path.join(RESULTS_FOLDER, 'results.db'))
 
 # 파일 브라우저 인스턴스
 file_browser = LocalFileBrowser()
 
+# 분석 작업 스케줄러 설정
+# 슬롯은 프로세스 단위 예산이므로 워커 프로세스를 여러 개 띄우면 코어 수를 나눠서 지정
+ANALYSIS_CPU_SLOTS = os.cpu_count() or 4
+MAX_QUEUED_ANALYSES = 50
+FAST_MODE_CORES = 4  # 고속 모드(FastHandDetector)가 요청하는 최대 프로세스 수
+LIVE_LATENCY_BUDGET = 1.0  # 라이브 스트림 분석 지연 예산 (초)
+
+def _on_queue_change(task_id, position):
+    """대기 순번 변경 시 진행 상황에 반영"""
+    analysis_progress.update(
+        task_id,
+        status='queued',
+        queue_position=position,
+        message=f'대기 중... ({position}번째)'
+    )
+
+def _on_job_start(task_id, cores):
+    """작업 시작 시 할당 코어 기록"""
+    analysis_progress.update(task_id, queue_position=0, allocated_cores=cores)
+
+job_scheduler = JobScheduler(
+    total_slots=ANALYSIS_CPU_SLOTS,
+    max_queue=MAX_QUEUED_ANALYSES,
+    on_queue_change=_on_queue_change,
+    on_start=_on_job_start
+)
+
+# 실행 중인 라이브 분석 (task_id → LiveStreamAnalyzer), 취소 요청 시 stop() 호출용
+live_analyzers = {}
+live_analyzers_lock = threading.Lock()
+
 class HandLengthClassifier:
     """핸드 길이 분류 시스템"""
     
@@ -129,23 +175,36 @@ class StreamingAnalyzer:
     def __init__(self):
         self.streaming_handler = StreamingVideoHandler()
     
+    @staticmethod
+    def _video_info(info, url):
+        """스트림 정보(또는 캐시된 메타데이터) → 진행 상황에 표시할 영상 정보"""
+        return {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'width': info.get('width', 1280),
+            'height': info.get('height', 720),
+            'source_type': info.get('source_type', 'unknown'),
+            'url': url
+        }
+    
     def prepare_stream(self, url, task_id):
         """스트림 준비 및 정보 추출"""
         try:
-            analysis_progress[task_id]['status'] = 'preparing'
-            analysis_progress[task_id]['message'] = '스트림 정보 추출 중...'
+            analysis_progress.update(
+                task_id,
+                status='preparing',
+                message='스트림 정보 추출 중...'
+            )
+            
+            # 이전에 해석한 영상이면 URL 재해석(yt-dlp)을 기다리지 않고 영상 정보부터 표시
+            cached_metadata = self.streaming_handler.get_cached_metadata(url)
+            if cached_metadata:
+                analysis_progress.update(task_id, video_info=self._video_info(cached_metadata, url))
             
             # 스트림 URL 및 정보 추출
             stream_info = self.streaming_handler.get_stream_url(url)
             
-            analysis_progress[task_id]['video_info'] = {
-                'title': stream_info.get('title', 'Unknown'),
-                'duration': stream_info.get('duration', 0),
-                'width': stream_info.get('width', 1280),
-                'height': stream_info.get('height', 720),
-                'source_type': stream_info.get('source_type', 'unknown'),
-                'url': url
-            }
+            analysis_progress.update(task_id, video_info=self._video_info(stream_info, url))
             
             # VideoCapture 객체 생성
             cap = self.streaming_handler.create_video_capture(stream_info)
@@ -154,34 +213,40 @@ class StreamingAnalyzer:
             metadata = self.streaming_handler.validate_stream(cap)
             
             # 메타데이터 업데이트
-            analysis_progress[task_id]['video_info'].update(metadata)
+            analysis_progress.update(task_id, merge={'video_info': metadata})
             
             return cap, stream_info
                 
         except Exception as e:
-            analysis_progress[task_id]['status'] = 'error'
-            analysis_progress[task_id]['message'] = f'스트림 준비 실패: {str(e)}'
+            analysis_progress.update(
+                task_id,
+                status='error',
+                message=f'스트림 준비 실패: {str(e)}'
+            )
             raise
 
 def allowed_file(filename):
     """허용된 파일 확장자인지 확인"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def analyze_stream_task(url, task_id, use_fast_mode=False):
-    """스트리밍 비디오 분석 작업 (백그라운드 실행)"""
+def analyze_stream_task(url, task_id, use_fast_mode=False, cores=1):
+    """스트리밍 비디오 분석 작업 (백그라운드 실행, cores = 스케줄러가 할당한 코어 수)"""
     cap = None
     try:
         # 스트림 준비
         analyzer = StreamingAnalyzer()
         cap, stream_info = analyzer.prepare_stream(url, task_id)
         
-        analysis_progress[task_id]['status'] = 'analyzing'
-        analysis_progress[task_id]['message'] = '핸드 경계 감지 시작...'
-        analysis_progress[task_id]['progress'] = 5
+        analysis_progress.update(
+            task_id,
+            status='analyzing',
+            message='핸드 경계 감지 시작...',
+            progress=5
+        )
         
         # 진행률 업데이트 콜백 함수
         def progress_callback(progress_info):
-            current_progress = analysis_progress[task_id]['progress']
+            current_progress = analysis_progress.get(task_id)['progress']
             
             # 분석 진행률은 5%~80% 범위에서 업데이트
             if progress_info.get('progress_percent', 0) > 0:
@@ -196,19 +261,22 @@ def analyze_stream_task(url, task_id, use_fast_mode=False):
                 else:
                     new_progress = current_progress + 1  # 점진적 증가
             
-            analysis_progress[task_id]['progress'] = min(new_progress, 80)
-            analysis_progress[task_id]['message'] = f'분석 중... ({progress_info.get("detected_hands", 0)}개 핸드 감지됨)'
-            
             # 소스 정보 업데이트
+            merge = {}
             if 'source_info' in progress_info:
-                analysis_progress[task_id]['video_info'].update(progress_info['source_info'])
-        
-        # 핸드 감지 수행 (스트리밍 방식)
-        if use_fast_mode:
-            detector = FastHandDetector(sampling_rate=60, num_workers=4)
-            analysis_progress[task_id]['message'] = '고속 분석 모드로 실행 중...'
-        else:
-            detector = HandBoundaryDetector()
+                merge['video_info'] = progress_info['source_info']
+            
+            fields = {}
+            if 'instrumentation' in progress_info:
+                fields['instrumentation'] = progress_info['instrumentation']
+            
+            analysis_progress.update(
+                task_id,
+                merge=merge,
+                progress=min(new_progress, 80),
+                message=f'분석 중... ({progress_info.get("detected_hands", 0)}개 핸드 감지됨)',
+                **fields
+            )
         
         # 스트림 정보를 source_info로 전달
         source_info = {
@@ -218,15 +286,54 @@ def analyze_stream_task(url, task_id, use_fast_mode=False):
             'source_type': stream_info.get('source_type', 'unknown')
         }
         
-        result_file = detector.analyze_stream(
-            cap, 
-            source_info, 
-            progress_callback=progress_callback
+        if stream_info.get('is_live'):
+            # 라이브 방송: 최신 프레임만 분석하고 핸드 이벤트를 바로 반영
+            def event_callback(event):
+                fields = {'last_event': {
+                    'type': event.event_type,
+                    'hand_id': event.details.get('hand_id'),
+                    'timestamp': round(event.timestamp, 1)
+                }}
+                if event.event_type == 'hand_end':
+                    fields['message'] = f"라이브 분석 중... (핸드 {event.details['hand_id']} 종료 감지)"
+                analysis_progress.update(task_id, **fields)
+            
+            analysis_progress.update(task_id, message='라이브 스트림 실시간 분석 중...')
+            live_analyzer = LiveStreamAnalyzer(
+                latency_budget=LIVE_LATENCY_BUDGET,
+                event_callback=event_callback
+            )
+            with live_analyzers_lock:
+                live_analyzers[task_id] = live_analyzer
+            # 캡처 해제는 run()이 읽기 스레드 종료 후 처리 (막힌 read() 중에 release하지 않도록)
+            live_cap, cap = cap, None
+            try:
+                result_file = live_analyzer.run(live_cap, source_info, progress_callback=progress_callback)
+            finally:
+                with live_analyzers_lock:
+                    live_analyzers.pop(task_id, None)
+            run_stats = None
+        else:
+            # 핸드 감지 수행 (스트리밍 방식)
+            if use_fast_mode:
+                detector = FastHandDetector(sampling_rate=60, num_workers=cores)
+                analysis_progress.update(task_id, message='고속 분석 모드로 실행 중...')
+            else:
+                detector = HandBoundaryDetector()
+            
+            result_file = detector.analyze_stream(
+                cap, 
+                source_info, 
+                progress_callback=progress_callback
+            )
+            run_stats = getattr(detector, 'last_run_stats', None)
+        
+        analysis_progress.update(
+            task_id,
+            progress=85,
+            message='결과 분석 중...'
         )
         
-        analysis_progress[task_id]['progress'] = 85
-        analysis_progress[task_id]['message'] = '결과 분석 중...'
-        
         # 결과 로드
         with open(result_file, 'r', encoding='utf-8') as f:
             hands_data = json.load(f)
@@ -245,52 +352,79 @@ def analyze_stream_task(url, task_id, use_fast_mode=False):
             'classified_hands': classified_hands,
             'statistics': statistics,
             'summary': summary,
-            'categories': classifier.categories
+            'categories': classifier.categories,
+            'instrumentation': run_stats
         }
         
         result_path = f"{RESULTS_FOLDER}/stream_analysis_{task_id}.json"
         with open(result_path, 'w', encoding='utf-8') as f:
             json.dump(final_result, f, indent=2, ensure_ascii=False)
-        
-        analysis_progress[task_id]['status'] = 'completed'
-        analysis_progress[task_id]['message'] = '분석 완료!'
-        analysis_progress[task_id]['progress'] = 100
-        analysis_progress[task_id]['result_file'] = result_path
+        results_db.materialize(task_id, final_result)
+        
+        analysis_progress.update(
+            task_id,
+            status='completed',
+            message='분석 완료!',
+            progress=100,
+            result_file=result_path
+        )
         
         logger.info(f"스트림 분석 완료: {len(hands_data)}개 핸드 감지")
         
     except Exception as e:
-        analysis_progress[task_id]['status'] = 'error'
-        analysis_progress[task_id]['message'] = f'분석 실패: {str(e)}'
+        analysis_progress.update(
+            task_id,
+            status='error',
+            message=f'분석 실패: {str(e)}'
+        )
         logger.error(f"스트림 분석 오류: {e}")
     finally:
         # VideoCapture 리소스 정리
         if cap is not None:
             cap.release()
 
-def analyze_file_task(video_path, task_id, use_fast_mode=False):
-    """로컬 파일 분석 작업 (기존 방식 유지)"""
+def analyze_file_task(video_path, task_id, use_fast_mode=False, cores=1):
+    """로컬 파일 분석 작업 (cores = 스케줄러가 할당한 코어 수)"""
     try:
-        analysis_progress[task_id]['status'] = 'analyzing'
-        analysis_progress[task_id]['message'] = '핸드 경계 감지 중...'
-        analysis_progress[task_id]['progress'] = 0
+        analysis_progress.update(
+            task_id,
+            status='analyzing',
+            message='핸드 경계 감지 중...',
+            progress=0
+        )
         
         # 진행률 콜백
         def progress_callback(progress_info):
+            fields = {'message': f'분석 중... ({progress_info.get("detected_hands", 0)}개 핸드 감지됨)'}
             if progress_info.get('progress_percent', 0) > 0:
-                analysis_progress[task_id]['progress'] = progress_info['progress_percent'] * 0.8  # 80%까지
-            analysis_progress[task_id]['message'] = f'분석 중... ({progress_info.get("detected_hands", 0)}개 핸드 감지됨)'
+                fields['progress'] = progress_info['progress_percent'] * 0.8  # 80%까지
+            if 'instrumentation' in progress_info:
+                fields['instrumentation'] = progress_info['instrumentation']
+            analysis_progress.update(task_id, **fields)
         
         # 핸드 감지 수행
         if use_fast_mode:
-            detector = FastHandDetector(sampling_rate=60, num_workers=4)
-            analysis_progress[task_id]['message'] = '고속 분석 모드로 실행 중...'
+            # 로컬 파일은 ffmpeg로 저해상도 키프레임만 디코딩
+            # 샘플 신호는 캐시해 두어 임계값만 바꾼 재분석은 디코딩 없이 수행
+            detector = FastHandDetector(sampling_rate=60, num_workers=cores,
+                                        frame_source='ffmpeg', keyframes_only=True,
+                                        signal_cache=get_signal_cache())
+            analysis_progress.update(task_id, message='고속 분석 모드로 실행 중...')
+            result_file = detector.analyze_video(video_path, progress_callback=progress_callback)
         else:
+            # 정적 구간(리더보드, 휴식 화면)을 먼저 찾아 정밀 감지에서 제외 (펠트 색 판정은 끔)
+            analysis_progress.update(task_id, message='장면 분할 중...')
+            skip_list = get_skip_list(video_path)
             detector = HandBoundaryDetector()
-        result_file = detector.analyze_video(video_path, progress_callback=progress_callback)
-        
-        analysis_progress[task_id]['progress'] = 85
-        analysis_progress[task_id]['message'] = '결과 분석 중...'
+            result_file = detector.analyze_video(
+                video_path, progress_callback=progress_callback, skip_list=skip_list
+            )
+        
+        analysis_progress.update(
+            task_id,
+            progress=85,
+            message='결과 분석 중...'
+        )
         
         # 결과 로드 및 분류
         with open(result_file, 'r', encoding='utf-8') as f:
@@ -308,17 +442,23 @@ def analyze_file_task(video_path, task_id, use_fast_mode=False):
             'classified_hands': classified_hands,
             'statistics': statistics,
             'summary': summary,
-            'categories': classifier.categories
+            'categories': classifier.categories,
+            # 단계별 소요 시간 (고속 모드 감지기는 계측하지 않아 None)
+            'instrumentation': getattr(detector, 'last_run_stats', None)
         }
         
         result_path = f"{RESULTS_FOLDER}/file_analysis_{task_id}.json"
         with open(result_path, 'w', encoding='utf-8') as f:
             json.dump(final_result, f, indent=2, ensure_ascii=False)
-        
-        analysis_progress[task_id]['status'] = 'completed'
-        analysis_progress[task_id]['message'] = '분석 완료!'
-        analysis_progress[task_id]['progress'] = 100
-        analysis_progress[task_id]['result_file'] = result_path
+        results_db.materialize(task_id, final_result)
+        
+        analysis_progress.update(
+            task_id,
+            status='completed',
+            message='분석 완료!',
+            progress=100,
+            result_file=result_path
+        )
         
         # 임시 파일 정리
         if video_path.startswith(UPLOAD_FOLDER):
@@ -330,8 +470,11 @@ def analyze_file_task(video_path, task_id, use_fast_mode=False):
         logger.info(f"파일 분석 완료: {len(hands_data)}개 핸드 감지")
         
     except Exception as e:
-        analysis_progress[task_id]['status'] = 'error'
-        analysis_progress[task_id]['message'] = f'분석 실패: {str(e)}'
+        analysis_progress.update(
+            task_id,
+            status='error',
+            message=f'분석 실패: {str(e)}'
+        )
         logger.error(f"파일 분석 오류: {e}")
 
 @app.route('/')
@@ -351,12 +494,13 @@ def analyze():
         task_id = str(uuid.uuid4())
         
         # 진행 상황 초기화
-        analysis_progress[task_id] = {
-            'status': 'starting',
-            'message': '분석 준비 중...',
-            'progress': 0,
-            'start_time': datetime.now().isoformat()
-        }
+        analysis_progress.create(
+            task_id,
+            status='starting',
+            message='분석 준비 중...',
+            progress=0,
+            start_time=datetime.now().isoformat()
+        )
         
         # 분석 모드 확인 (고속 모드 여부)
         use_fast_mode = request.form.get('fast_mode', 'false').lower() == 'true'
@@ -371,10 +515,11 @@ def analyze():
             if not parsed_url.scheme or not parsed_url.netloc:
                 return jsonify({'error': '유효한 URL을 입력하세요'}), 400
             
-            # 백그라운드에서 스트리밍 분석 시작
-            thread = threading.Thread(target=analyze_stream_task, args=(url, task_id, use_fast_mode))
-            thread.daemon = True
-            thread.start()
+            # 스케줄러에 스트리밍 분석 작업 제출
+            queue_position = job_scheduler.submit(
+                task_id, analyze_stream_task, url, task_id, use_fast_mode,
+                cores=FAST_MODE_CORES if use_fast_mode else 1
+            )
                 
         elif 'video_file' in request.files:
             # 파일 업로드 분석
@@ -384,17 +529,25 @@ def analyze():
                 video_path = os.path.join(UPLOAD_FOLDER, f"{task_id}_{filename}")
                 file.save(video_path)
                 
-                # 백그라운드에서 파일 분석 시작
-                thread = threading.Thread(target=analyze_file_task, args=(video_path, task_id, use_fast_mode))
-                thread.daemon = True
-                thread.start()
+                # 스케줄러에 파일 분석 작업 제출
+                try:
+                    queue_position = job_scheduler.submit(
+                        task_id, analyze_file_task, video_path, task_id, use_fast_mode,
+                        cores=FAST_MODE_CORES if use_fast_mode else 1
+                    )
+                except QueueFullError:
+                    os.remove(video_path)
+                    raise
             else:
                 return jsonify({'error': '올바른 비디오 파일을 선택하세요'}), 400
         else:
             return jsonify({'error': 'URL 또는 파일을 입력하세요'}), 400
         
-        return jsonify({'task_id': task_id})
+        return jsonify({'task_id': task_id, 'queue_position': queue_position})
         
+    except QueueFullError as e:
+        analysis_progress.update(task_id, status='error', message=str(e))
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '60'}
     except Exception as e:
         logger.error(f"분석 시작 오류: {e}")
         return jsonify({'error': str(e)}), 500
@@ -402,59 +555,132 @@ def analyze():
 @app.route('/progress/<task_id>')
 def get_progress(task_id):
     """분석 진행 상황 조회"""
+    progress_info = analysis_progress.get(task_id)
+    if progress_info is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    
+    return jsonify(progress_info)
+
+@app.route('/progress/<task_id>/stream')
+def stream_progress(task_id):
+    """분석 진행 상황 스트림 (Server-Sent Events) - 변경될 때만 전송"""
     if task_id not in analysis_progress:
         return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
     
-    return jsonify(analysis_progress[task_id])
+    last_event_id = request.headers.get('Last-Event-ID', '0')
+    since_version = int(last_event_id) if last_event_id.isdigit() else 0
+    
+    return Response(
+        stream_with_context(analysis_progress.stream(task_id, since_version)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-@app.route('/results/<task_id>')
-def get_results(task_id):
-    """분석 결과 조회"""
+@app.route('/api/queue')
+def get_queue_status():
+    """분석 작업 스케줄러 현황 (슬롯 사용량, 실행/대기 작업)"""
+    return jsonify(job_scheduler.status())
+
+@app.route('/api/tasks/<task_id>/cancel', methods=['POST'])
+def cancel_task(task_id):
+    """
+    작업 취소
+    
+    대기 중인 작업은 큐에서 빼고, 실행 중인 라이브 분석은 중단 요청 후 지금까지의 결과를 저장
+    (작업이 끝나면 스케줄러 슬롯이 반환됨). 일반 영상 분석은 끝날 때까지 취소할 수 없음
+    """
     if task_id not in analysis_progress:
         return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
     
-    progress_info = analysis_progress[task_id]
+    cancelled_job = job_scheduler.cancel(task_id)
+    if cancelled_job is not None:
+        # 업로드 파일은 analyze_file_task가 지우므로 실행되지 않은 작업은 여기서 정리
+        if cancelled_job.func is analyze_file_task:
+            video_path = cancelled_job.args[0]
+            if video_path.startswith(UPLOAD_FOLDER) and os.path.exists(video_path):
+                os.remove(video_path)
+        analysis_progress.update(task_id, status='cancelled', message='분석이 취소되었습니다', queue_position=None)
+        return jsonify({'task_id': task_id, 'status': 'cancelled'})
+    
+    with live_analyzers_lock:
+        live_analyzer = live_analyzers.get(task_id)
+    if live_analyzer is not None:
+        live_analyzer.stop()
+        analysis_progress.update(task_id, message='라이브 분석 중단 중... (지금까지의 결과 저장)')
+        return jsonify({'task_id': task_id, 'status': 'stopping'})
+    
+    return jsonify({'error': '취소할 수 없는 작업입니다 (대기 중이거나 라이브 분석 중인 작업만 취소 가능)'}), 409
+
+def _completed_result(task_id):
+    """완료된 작업이면 (None, None), 아니면 (에러 응답, 상태 코드)"""
+    progress_info = analysis_progress.get(task_id)
+    if progress_info is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
     
     if progress_info['status'] != 'completed':
         return jsonify({'error': '분석이 아직 완료되지 않았습니다'}), 400
     
-    try:
+    # 결과 테이블이 생기기 전에 완료된 작업은 처음 조회할 때 JSON에서 한 번 옮김
+    if task_id not in results_db:
         with open(progress_info['result_file'], 'r', encoding='utf-8') as f:
-            results = json.load(f)
+            results_db.materialize(task_id, json.load(f))
+    return None, None
+
+def _conditional_response(task_id, variant, build):
+    """ETag가 같으면 조회 없이 304, 아니면 build()로 응답 생성"""
+    etag = results_db.etag(task_id, *variant)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    # 캐시해 두되 매번 ETag로 재검증
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/results/<task_id>')
+def get_results(task_id):
+    """분석 결과 조회"""
+    try:
+        error, status = _completed_result(task_id)
+        if error is not None:
+            return error, status
         
-        return render_template('results.html', 
-                             task_id=task_id, 
-                             results=results)
+        return _conditional_response(task_id, ('page',), lambda: make_response(
+            render_template('results.html', task_id=task_id, results=results_db.full_results(task_id))
+        ))
     except Exception as e:
         return jsonify({'error': f'결과 로드 실패: {str(e)}'}), 500
 
 @app.route('/api/results/<task_id>')
 def api_get_results(task_id):
-    """API로 결과 조회"""
-    if task_id not in analysis_progress:
-        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
-    
-    progress_info = analysis_progress[task_id]
-    
-    if progress_info['status'] != 'completed':
-        return jsonify({'error': '분석이 아직 완료되지 않았습니다'}), 400
+    """
+    API로 결과 조회 (핸드는 페이지 단위, 집계는 SQL)
     
+    쿼리: page (기본 1), per_page (기본 100), category (길이 카테고리 필터)
+    전체 결과 파일은 /download/<task_id>
+    """
     try:
-        with open(progress_info['result_file'], 'r', encoding='utf-8') as f:
-            results = json.load(f)
-        
-        return jsonify(results)
+        error, status = _completed_result(task_id)
+        if error is not None:
+            return error, status
+        
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 100, type=int)
+        category = request.args.get('category') or None
+        return _conditional_response(task_id, ('api', page, per_page, category), lambda: jsonify(
+            results_db.page(task_id, page=page, per_page=per_page, category=category)
+        ))
     except Exception as e:
         return jsonify({'error': f'결과 로드 실패: {str(e)}'}), 500
 
 @app.route('/download/<task_id>')
 def download_results(task_id):
     """결과 파일 다운로드"""
-    if task_id not in analysis_progress:
+    progress_info = analysis_progress.get(task_id)
+    if progress_info is None:
         return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
     
-    progress_info = analysis_progress[task_id]
-    
     if progress_info['status'] != 'completed':
         return jsonify({'error': '분석이 아직 완료되지 않았습니다'}), 400
     
@@ -482,8 +708,18 @@ def list_directory():
     try:
         path = request.args.get('path', os.getcwd())
         show_hidden = request.args.get('show_hidden', 'false').lower() == 'true'
-        
-        dir_info = file_browser.list_directory(path, show_hidden)
+        videos_only = request.args.get('videos_only', 'false').lower() == 'true'
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', None, type=int)
+        
+        dir_info = file_browser.list_directory(
+            path, show_hidden,
+            offset=offset,
+            limit=limit,
+            videos_only=videos_only,
+            use_cache=not refresh
+        )
         return jsonify(dir_info)
         
     except Exception as e:
@@ -548,21 +784,25 @@ def analyze_local_file():
         task_id = str(uuid.uuid4())
         
         # 진행 상황 초기화
-        analysis_progress[task_id] = {
-            'status': 'starting',
-            'message': '로컬 파일 분석 준비 중...',
-            'progress': 0,
-            'start_time': datetime.now().isoformat(),
-            'file_info': validation['file_info']
-        }
+        analysis_progress.create(
+            task_id,
+            status='starting',
+            message='로컬 파일 분석 준비 중...',
+            progress=0,
+            start_time=datetime.now().isoformat(),
+            file_info=validation['file_info']
+        )
         
-        # 백그라운드에서 파일 분석 시작
-        thread = threading.Thread(target=analyze_file_task, args=(file_path, task_id))
-        thread.daemon = True
-        thread.start()
+        # 스케줄러에 파일 분석 작업 제출
+        try:
+            queue_position = job_scheduler.submit(task_id, analyze_file_task, file_path, task_id)
+        except QueueFullError as e:
+            analysis_progress.update(task_id, status='error', message=str(e))
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '60'}
         
         return jsonify({
             'task_id': task_id,
+            'queue_position': queue_position,
             'file_info': validation['file_info']
         })
         
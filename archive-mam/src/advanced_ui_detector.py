@@ -15,11 +15,38 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import hashlib
 
+try:
+    from .scene_segmenter import SkipList
+    from .temporal_cache import TemporalCache, AdaptiveSampler
+    from .result_store import save_columnar
+    from .video_probe import capture_properties
+    from .signal_cache import SignalCache
+except ImportError:
+    from scene_segmenter import SkipList
+    from temporal_cache import TemporalCache, AdaptiveSampler
+    from result_store import save_columnar
+    from video_probe import capture_properties
+    from signal_cache import SignalCache
+
+# 프레임별 특징/UI 확률 추출 방식이 바뀌면 올려서 신호 캐시 무효화
+SIGNAL_EXTRACTOR = 'ui_probability'
+SIGNAL_VERSION = 1
+
 class AdvancedUIDetector:
     """고급 UI 감지 시스템 - 학습 기반"""
     
-    def __init__(self, fps: int = 30):
+    def __init__(self, fps: int = 30, backend=None, signal_cache: Optional[SignalCache] = None):
+        """
+        Args:
+            fps: 기본 프레임레이트
+            backend: 프레임 분류 백엔드 (cnn_classifier의 TinyCNNBackend/OnnxBackend 등,
+                     있으면 특징 추출 + 랜덤 포레스트 대신 축소 프레임 묶음 단위로 추론)
+            signal_cache: 프레임별 특징/UI 확률 캐시 (있으면 ui_threshold만 바꾼 재분석은 디코딩 생략)
+        """
         self.fps = fps
+        self.backend = backend
+        self.signal_cache = signal_cache
+        self.ui_threshold = 0.65  # 랜덤 포레스트 UI 판정 임계값 (백엔드는 backend.config.threshold)
         self.frame_interval = fps  # 1초에 1프레임 (30fps 기준 30프레임마다)
         
         # 특징 추출 설정
@@ -241,8 +268,35 @@ class AdvancedUIDetector:
         """균일도 계산"""
         return 1.0 / (1.0 + np.std(gray))
     
+    def analyze_frames(self, frames: List[np.ndarray], timestamps: List[float],
+                       frame_hashes: Optional[List[str]] = None) -> List[Dict]:
+        """
+        프레임 묶음 분석 (백엔드가 있으면 한 번의 배치 추론)
+        
+        frames는 원본 프레임 또는 backend.prepare()로 미리 축소한 입력
+        """
+        if self.backend is None:
+            return [self.analyze_frame(frame, timestamp) for frame, timestamp in zip(frames, timestamps)]
+        
+        threshold = self._threshold()
+        probabilities = self.backend.predict_proba(frames)
+        return [
+            {
+                'timestamp': timestamp,
+                'frame_hash': frame_hashes[i] if frame_hashes else self._calculate_frame_hash(frames[i]),
+                'features': {},
+                'ui_probability': float(probability),
+                'is_ui': bool(probability > threshold),
+                'confidence': float(max(probability, 1 - probability))
+            }
+            for i, (timestamp, probability) in enumerate(zip(timestamps, probabilities))
+        ]
+    
     def analyze_frame(self, frame: np.ndarray, timestamp: float) -> Dict:
         """프레임 분석 및 UI 확률 계산"""
+        if self.backend is not None:
+            return self.analyze_frames([frame], [timestamp])[0]
+        
         # 특징 추출
         features = self.extract_features(frame)
         
@@ -261,14 +315,69 @@ class AdvancedUIDetector:
         # 학습된 모델이 있으면 예측
         if self.is_trained:
             feature_vector = self._features_to_vector(features)
-            ui_probability = self.classifier.predict_proba([feature_vector])[0][1]
+            # 학습 때와 같이 정규화한 특징으로 예측
+            ui_probability = self.classifier.predict_proba(self.scaler.transform([feature_vector]))[0][1]
             
             result['ui_probability'] = ui_probability
-            result['is_ui'] = ui_probability > 0.65
+            result['is_ui'] = ui_probability > self.ui_threshold
             result['confidence'] = max(ui_probability, 1 - ui_probability)
         
         return result
     
+    def _threshold(self) -> float:
+        if self.backend is not None:
+            return getattr(getattr(self.backend, 'config', None), 'threshold', 0.5)
+        return self.ui_threshold
+    
+    def _model_fingerprint(self) -> str:
+        """UI 확률을 만드는 모델 식별자 (신호 캐시 키)"""
+        if self.backend is not None:
+            fingerprint = getattr(self.backend, 'fingerprint', None)
+            return fingerprint() if callable(fingerprint) else type(self.backend).__name__
+        if not self.is_trained:
+            return 'untrained'
+        return hashlib.sha1(pickle.dumps((self.classifier, self.scaler, self.feature_names))).hexdigest()
+    
+    def ui_segments(self, frame_results: List[Dict], end_time: float) -> List[Dict]:
+        """프레임별 is_ui로 UI 구간 계산 (마지막 구간은 end_time까지)"""
+        segments = []
+        current_ui_start = None
+        for analysis in frame_results:
+            timestamp = analysis['timestamp']
+            if analysis['is_ui'] and current_ui_start is None:
+                current_ui_start = timestamp
+            elif not analysis['is_ui'] and current_ui_start is not None:
+                segments.append({
+                    'start': current_ui_start,
+                    'end': timestamp,
+                    'duration': timestamp - current_ui_start
+                })
+                current_ui_start = None
+        
+        # 마지막 UI 세그먼트 처리
+        if current_ui_start is not None:
+            segments.append({
+                'start': current_ui_start,
+                'end': end_time,
+                'duration': end_time - current_ui_start
+            })
+        return segments
+    
+    def _results_from_signals(self, rows: List[Dict], extra: Dict, results: Dict) -> Dict:
+        """캐시된 프레임별 신호에 현재 임계값을 적용해 분석 결과 구성"""
+        threshold = self._threshold()
+        # 학습 전에는 analyze_frame과 같이 UI로 판정하지 않음
+        active = self.is_trained or self.backend is not None
+        for row in rows:
+            probability = row['ui_probability']
+            row['is_ui'] = active and probability > threshold
+            row['confidence'] = max(probability, 1 - probability) if active else 0.0
+        results['frame_results'] = rows
+        results['analyzed_frames'] = len(rows)
+        results['reused_frames'] = extra.get('reused_frames', 0)
+        results['ui_segments'] = self.ui_segments(rows, extra.get('end_time', 0.0))
+        return results
+    
     def _calculate_frame_hash(self, frame: np.ndarray) -> str:
         """프레임의 고유 해시 계산"""
         # 프레임을 작게 리사이즈하여 해시 계산
@@ -418,11 +527,21 @@ class AdvancedUIDetector:
         self.is_trained = True
         return metadata
     
-    def analyze_video(self, video_path: str, progress_callback=None) -> Dict:
-        """비디오 전체 분석 (1초에 1프레임)"""
+    def analyze_video(self, video_path: str, progress_callback=None,
+                      skip_list: Optional[SkipList] = None, adaptive: bool = False,
+                      cache_epsilon: float = 2.0) -> Dict:
+        """
+        비디오 전체 분석 (1초에 1프레임)
+        
+        skip_list 구간은 장면이 바뀌지 않으므로 첫 프레임만 분석하고
+        그 결과가 구간 끝까지 이어진다고 봄.
+        adaptive=True면 직전 분석 프레임과 거의 같은 프레임은 결과를 재사용하고,
+        안정 구간에서는 샘플링 간격을 늘리고 전환 지점 주변에서는 줄임.
+        signal_cache가 있으면 프레임별 UI 확률을 저장해 두고, 다음 실행에서는 임계값만 다시 적용
+        """
         cap = cv2.VideoCapture(video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps, total_frames = capture_properties(video_path, cap)
+        fps = int(fps)
         
         results = {
             'video_path': video_path,
@@ -430,51 +549,118 @@ class AdvancedUIDetector:
             'total_frames': total_frames,
             'analyzed_frames': 0,
             'ui_segments': [],
-            'frame_results': []
+            'frame_results': [],
+            'reused_frames': 0,
+            'skipped_intervals': skip_list.to_list() if skip_list is not None else []
         }
         
+        # 같은 영상/설정/모델의 프레임별 신호가 캐시에 있으면 디코딩 없이 임계값만 다시 적용
+        signal_params = None
+        if self.signal_cache is not None:
+            signal_params = {
+                'fps': fps,
+                'adaptive': adaptive,
+                'cache_epsilon': cache_epsilon if adaptive else None,
+                'skipped_intervals': results['skipped_intervals'],
+                'model': self._model_fingerprint()
+            }
+            cached = self.signal_cache.load(video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, signal_params)
+            if cached is not None:
+                cap.release()
+                return self._results_from_signals(cached[0], cached[1], results)
+        
         frame_count = 0
-        current_ui_start = None
+        cache = TemporalCache(epsilon=cache_epsilon) if adaptive else None
+        sampler = AdaptiveSampler(base_interval=1.0) if adaptive else None
+        next_sample = 0
+        
+        # 백엔드가 있고 적응형이 아니면 축소 프레임을 모아 묶음 단위로 추론
+        batch_size = getattr(getattr(self.backend, 'config', None), 'batch_size', 1)
+        batched = self.backend is not None and cache is None and batch_size > 1
+        pending = []  # (축소 프레임, 타임스탬프, 프레임 해시, 프레임 번호)
+        
+        def record(analysis: Dict, frame_number: int):
+            results['frame_results'].append(analysis)
+            results['analyzed_frames'] += 1
+            
+            # 진행률 콜백
+            if progress_callback:
+                progress = frame_number / total_frames
+                progress_callback(progress, analysis['timestamp'])
+        
+        def flush():
+            if not pending:
+                return
+            inputs, timestamps, hashes, numbers = zip(*pending)
+            for analysis, frame_number in zip(self.analyze_frames(list(inputs), list(timestamps), list(hashes)), numbers):
+                record(analysis, frame_number)
+            pending.clear()
         
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            resume = skip_list.resume_frame(frame_count, fps) if skip_list is not None else None
+            
+            # 1초에 1프레임만 분석 (스킵 구간은 첫 프레임만)
+            if sampler is not None:
+                is_sample = frame_count >= next_sample or resume is not None
+            else:
+                is_sample = frame_count % fps == 0 or resume is not None
+            
+            # 분석하지 않는 프레임은 grab만 (retrieve 비용 생략)
+            if not cap.grab():
                 break
             
-            # 1초에 1프레임만 분석
-            if frame_count % fps == 0:
+            if is_sample:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
                 timestamp = frame_count / fps
                 
-                # 프레임 분석
-                analysis = self.analyze_frame(frame, timestamp)
-                results['frame_results'].append(analysis)
-                results['analyzed_frames'] += 1
-                
-                # UI 세그먼트 추적
-                if analysis['is_ui'] and current_ui_start is None:
-                    current_ui_start = timestamp
-                elif not analysis['is_ui'] and current_ui_start is not None:
-                    results['ui_segments'].append({
-                        'start': current_ui_start,
-                        'end': timestamp,
-                        'duration': timestamp - current_ui_start
-                    })
-                    current_ui_start = None
-                
-                # 진행률 콜백
-                if progress_callback:
-                    progress = frame_count / total_frames
-                    progress_callback(progress, timestamp)
+                # 프레임 분석 (적응형이면 직전 결과 재사용 가능)
+                if batched:
+                    pending.append((self.backend.prepare(frame), timestamp,
+                                    self._calculate_frame_hash(frame), frame_count))
+                    if len(pending) >= batch_size:
+                        flush()
+                elif cache is not None:
+                    analysis, reused = cache.get_or_compute(
+                        frame, lambda f: self.analyze_frame(f, timestamp)
+                    )
+                    if reused:
+                        analysis = dict(analysis, timestamp=timestamp, reused=True)
+                        results['reused_frames'] += 1
+                    sampler.update(stable=reused)
+                    next_sample = frame_count + sampler.frames(fps)
+                    record(analysis, frame_count)
+                else:
+                    record(self.analyze_frame(frame, timestamp), frame_count)
+            
+            if resume is not None:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, resume)
+                frame_count = resume
+                continue
             
             frame_count += 1
         
-        # 마지막 UI 세그먼트 처리
-        if current_ui_start is not None:
-            results['ui_segments'].append({
-                'start': current_ui_start,
-                'end': frame_count / fps,
-                'duration': (frame_count / fps) - current_ui_start
-            })
-        
+        flush()
         cap.release()
-        return results
\ No newline at end of file
+        
+        # UI 세그먼트 (마지막 구간은 영상 끝까지)
+        results['ui_segments'] = self.ui_segments(results['frame_results'], frame_count / fps)
+        
+        if self.signal_cache is not None:
+            self.signal_cache.store(
+                video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, signal_params,
+                [{key: value for key, value in analysis.items() if key not in ('is_ui', 'confidence')}
+                 for analysis in results['frame_results']],
+                {'end_time': frame_count / fps, 'reused_frames': results['reused_frames']}
+            )
+        return results
+    
+    def save_results(self, results: Dict, output_path: str) -> str:
+        """
+        analyze_video 결과를 컬럼 파일(.npz)로 저장
+        
+        frame_results는 프레임별 컬럼(features.* 포함)으로, 나머지 항목은 요약 헤더로 저장
+        """
+        summary = {key: value for key, value in results.items() if key != 'frame_results'}
+        return save_columnar(output_path, results['frame_results'], summary)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+"""
+아카이브 폴더 일괄 분석
+폴더(NAS 등)의 영상을 찾아 길이 × 해상도로 비용을 추정하고, 비용이 큰 영상부터
+(LPT, longest-processing-time first) 프로세스 하나당 영상 하나씩 코어에 배분함.
+각 영상은 내부 병렬 처리 없이(num_workers=1) 분석하고, 내용 해시로 이미 분석한 영상은 건너뜀.
+진행 상황은 매니페스트에 영상마다 기록하므로 중단 후 다시 실행하면 남은 영상만 분석함
+
+사용 예시:
+  python -m src.batch_ingest /mnt/nas/wsop --output batch_results --workers 8
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .fast_hand_detector import FastHandDetector
+    from .local_file_browser import LocalFileBrowser
+    from .video_probe import get_probe
+    from .signal_cache import get_signal_cache
+except ImportError:
+    from fast_hand_detector import FastHandDetector
+    from local_file_browser import LocalFileBrowser
+    from video_probe import get_probe
+    from signal_cache import get_signal_cache
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'batch_manifest.json'
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 비용 기준 해상도 (1080p = 1.0)
+REFERENCE_PIXELS = 1920 * 1080
+
+
+@dataclass
+class VideoJob:
+    """분석 대상 영상"""
+    path: str
+    content_hash: str
+    file_size: int
+    duration: float
+    width: int
+    height: int
+
+    @property
+    def cost(self) -> float:
+        """예상 처리 비용 (1080p 기준 영상 초)"""
+        pixels = self.width * self.height or REFERENCE_PIXELS
+        return self.duration * pixels / REFERENCE_PIXELS
+
+
+def discover_videos(root: str, extensions=None, recursive: bool = True) -> List[str]:
+    """폴더에서 영상 파일 경로 수집 (숨김 파일/폴더 제외, 경로순)"""
+    extensions = {e.lower() for e in (extensions or LocalFileBrowser().video_extensions)}
+    found = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.')) if recursive else []
+        for name in filenames:
+            if not name.startswith('.') and Path(name).suffix.lower() in extensions:
+                found.append(os.path.join(directory, name))
+    return sorted(found)
+
+
+def file_sha256(path: str) -> str:
+    """파일 전체 SHA-256 (업로드 경로의 content_hash와 같은 방식)"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def probe_video(path: str) -> Dict:
+    """비용 추정용 메타데이터 (공용 메타데이터 캐시 사용)"""
+    probe = get_probe(path)
+    return {'duration': probe.duration, 'width': probe.width, 'height': probe.height}
+
+
+def lpt_order(jobs: List[VideoJob]) -> List[VideoJob]:
+    """
+    비용이 큰 순서 (LPT)
+
+    프로세스 풀은 제출 순서대로 빈 워커에 작업을 주므로, 이 순서로 제출하면
+    매번 가장 먼저 비는 코어에 남은 작업 중 가장 큰 작업이 배정됨
+    """
+    return sorted(jobs, key=lambda job: (-job.cost, job.path))
+
+
+def analyze_one(video_path: str, output_path: str, sampling_rate: int = 60,
+                keyframes_only: bool = False) -> Dict:
+    """워커 프로세스에서 영상 하나 분석 (내부 병렬 처리 없음)"""
+    started = time.time()
+    detector = FastHandDetector(sampling_rate=sampling_rate, num_workers=1,
+                                frame_source='ffmpeg', keyframes_only=keyframes_only,
+                                signal_cache=get_signal_cache())
+    result_file = detector.analyze_video(video_path, output_path)
+    elapsed = time.time() - started
+
+    with open(result_file, 'r', encoding='utf-8') as f:
+        hands = json.load(f)
+    return {'result_file': result_file, 'elapsed': elapsed, 'hands': len(hands)}
+
+
+class BatchManifest:
+    """
+    일괄 분석 매니페스트 (재시작 가능하도록 영상마다 즉시 저장)
+
+    videos: 내용 해시 → 상태/결과/처리량
+    hash_cache: 경로 → (크기, 수정시간, 해시) - 신호 캐시가 없을 때 재실행 시 다시 해시하지 않음
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {'videos': {}, 'hash_cache': {}}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data.update(json.load(f))
+
+    @property
+    def videos(self) -> Dict[str, Dict]:
+        return self.data['videos']
+
+    def cached_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        entry = self.data['hash_cache'].get(path)
+        if entry and entry['size'] == stat.st_size and abs(entry['mtime'] - stat.st_mtime) <= 1e-3:
+            return entry['hash']
+        return None
+
+    def remember_hash(self, path: str, stat: os.stat_result, content_hash: str):
+        self.data['hash_cache'][path] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': content_hash}
+
+    def is_done(self, content_hash: str) -> bool:
+        return self.videos.get(content_hash, {}).get('status') == 'done'
+
+    def record(self, content_hash: str, **fields):
+        self.videos.setdefault(content_hash, {}).update(fields)
+        self.save()
+
+    def save(self):
+        # 임시 파일에 쓰고 교체해 중단되어도 매니페스트가 깨지지 않게 함
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class BatchIngestor:
+    """폴더 단위 일괄 분석 스케줄러"""
+
+    def __init__(self, output_dir: str = 'batch_results', workers: Optional[int] = None,
+                 sampling_rate: int = 60, keyframes_only: bool = False,
+                 retry_failed: bool = False, hash_workers: int = 4):
+        self.output_dir = output_dir
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.sampling_rate = sampling_rate
+        self.keyframes_only = keyframes_only
+        self.retry_failed = retry_failed
+        self.hash_workers = hash_workers
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.manifest = BatchManifest(os.path.join(output_dir, MANIFEST_NAME))
+
+    def _hash(self, path: str) -> Optional[str]:
+        """
+        내용 해시
+
+        신호 캐시가 있으면 그 해시 기록(index.db)을 거쳐 계산해 워커의 신호 캐시 조회가
+        파일을 다시 읽지 않게 함. 신호 캐시가 없을 때만 매니페스트의 hash_cache로 재해시를 피함
+        """
+        try:
+            stat = os.stat(path)
+            signal_cache = get_signal_cache()
+            if signal_cache is not None:
+                content_hash = signal_cache.video_hash(path)
+            else:
+                content_hash = self.manifest.cached_hash(path, stat) or file_sha256(path)
+        except OSError as e:
+            logger.warning(f"파일을 읽을 수 없어 건너뜀: {path}: {e}")
+            return None
+        self.manifest.remember_hash(path, stat, content_hash)
+        return content_hash
+
+    def plan(self, paths: List[str]) -> List[VideoJob]:
+        """해시/메타데이터를 모아 분석할 작업 목록을 LPT 순서로 반환"""
+        # 해시는 I/O 위주이므로 스레드로 병렬 계산
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+            hashes = dict(zip(paths, pool.map(self._hash, paths)))
+        self.manifest.save()
+
+        jobs = []
+        planned = set()
+        for path in paths:
+            content_hash = hashes[path]
+            if content_hash is None:
+                continue
+            if content_hash in planned:
+                logger.info(f"중복 영상 건너뜀: {path}")
+                continue
+            entry = self.manifest.videos.get(content_hash, {})
+            if self.manifest.is_done(content_hash) or (entry.get('status') == 'failed' and not self.retry_failed):
+                logger.info(f"이미 처리한 영상 건너뜀 ({entry['status']}): {path}")
+                continue
+            try:
+                meta = probe_video(path)
+            except ValueError as e:
+                logger.warning(str(e))
+                self.manifest.record(content_hash, path=path, status='failed', error=str(e))
+                continue
+            planned.add(content_hash)
+            jobs.append(VideoJob(path=path, content_hash=content_hash,
+                                 file_size=os.path.getsize(path), **meta))
+        return lpt_order(jobs)
+
+    def _output_path(self, job: VideoJob) -> str:
+        return os.path.join(self.output_dir, f"{job.content_hash[:16]}_{Path(job.path).stem}.json")
+
+    def run(self, root: str, recursive: bool = True) -> Dict:
+        """폴더 전체 분석 후 요약 반환"""
+        started = time.time()
+        paths = discover_videos(root, recursive=recursive)
+        jobs = self.plan(paths)
+        logger.info(f"영상 {len(paths)}개 중 {len(jobs)}개 분석 예정 "
+                    f"(예상 비용 {sum(j.cost for j in jobs) / 3600:.1f}시간분, 워커 {self.workers}개)")
+
+        for job in jobs:
+            self.manifest.record(job.content_hash, path=job.path, status='pending', cost=job.cost,
+                                 duration=job.duration, width=job.width, height=job.height)
+
+        completed = failed = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(analyze_one, job.path, self._output_path(job),
+                            self.sampling_rate, self.keyframes_only): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"분석 실패: {job.path}: {e}")
+                    self.manifest.record(job.content_hash, status='failed', error=str(e))
+                    continue
+
+                completed += 1
+                elapsed = result['elapsed']
+                self.manifest.record(
+                    job.content_hash,
+                    status='done',
+                    error=None,
+                    result_file=result['result_file'],
+                    hands=result['hands'],
+                    elapsed=elapsed,
+                    # 처리량: 실시간 대비 배속, 1080p 환산 초/초
+                    realtime_factor=job.duration / elapsed if elapsed > 0 else None,
+                    cost_per_second=job.cost / elapsed if elapsed > 0 else None
+                )
+                logger.info(f"[{completed + failed}/{len(jobs)}] {Path(job.path).name}: "
+                            f"{result['hands']}개 핸드, {elapsed:.1f}초")
+
+        summary = {
+            'discovered': len(paths),
+            'scheduled': len(jobs),
+            'completed': completed,
+            'failed': failed,
+            'skipped': len(paths) - len(jobs),
+            'wall_time': time.time() - started,
+            'manifest': self.manifest.path
+        }
+        logger.info(f"일괄 분석 완료: {summary}")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='폴더 단위 포커 영상 일괄 분석')
+    parser.add_argument('root', help='영상이 있는 폴더 (NAS 경로 가능)')
+    parser.add_argument('--output', '-o', default='batch_results', help='결과/매니페스트 저장 폴더')
+    parser.add_argument('--workers', '-w', type=int, default=None, help='동시 분석 영상 수 (기본: CPU 코어 수)')
+    parser.add_argument('--sampling-rate', type=int, default=60, help='프레임 샘플링 비율')
+    parser.add_argument('--keyframes-only', action='store_true', help='ffmpeg로 키프레임만 디코딩')
+    parser.add_argument('--no-recursive', action='store_true', help='하위 폴더 제외')
+    parser.add_argument('--retry-failed', action='store_true', help='실패했던 영상도 다시 분석')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    ingestor = BatchIngestor(
+        output_dir=args.output,
+        workers=args.workers,
+        sampling_rate=args.sampling_rate,
+        keyframes_only=args.keyframes_only,
+        retry_failed=args.retry_failed
+    )
+    summary = ingestor.run(args.root, recursive=not args.no_recursive)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Hand clip extraction with keyframe-aware seeking and a content-addressed cache.
+
+Clips are cut with input-side seeking (-ss before -i), so ffmpeg jumps
+straight to the keyframe instead of decoding from the start of the file.
+The default mode snaps the start back to the previous keyframe (taken from
+the video's sidecar index) and stream copies; accurate mode re-encodes only
+the head GOP and stream copies the rest. Finished clips are cached by (video hash, start, end, format, mode)
+and evicted least-recently-used once the cache exceeds its disk budget.
+"""
+import bisect
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .video_index import get_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = 20 * 1024 ** 3  # 20 GiB
+
+# Cache entries are named <40 hex chars>.<format>
+_KEY_LENGTH = 40
+
+# Container formats a clip can be written as (the format is also the file extension).
+# Clips are stream copied or encoded as H.264/AAC, so only containers that hold those
+# codecs are listed (WebM does not)
+CLIP_FORMATS = ('mp4', 'mov', 'mkv')
+
+
+def validate_format(fmt: str) -> str:
+    """Return fmt if it is a supported clip container, raise ValueError otherwise"""
+    if fmt not in CLIP_FORMATS:
+        raise ValueError(f"Unsupported clip format: {fmt!r} (expected one of {', '.join(CLIP_FORMATS)})")
+    return fmt
+
+
+def keyframe_at_or_before(keyframes: Sequence[float], t: float) -> float:
+    """Latest keyframe not after t (0.0 when there is none)"""
+    i = bisect.bisect_right(keyframes, t + 1e-6)
+    return keyframes[i - 1] if i > 0 else 0.0
+
+
+def keyframe_after(keyframes: Sequence[float], t: float) -> Optional[float]:
+    """First keyframe strictly after t"""
+    i = bisect.bisect_right(keyframes, t + 1e-6)
+    return keyframes[i] if i < len(keyframes) else None
+
+
+def file_identity(video_path: str) -> str:
+    """Cheap identity for videos without a stored content hash"""
+    stat = os.stat(video_path)
+    return f"{os.path.abspath(video_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+class ClipService:
+    """Cuts and caches hand clips"""
+
+    def __init__(self, cache_dir, max_cache_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 runner: Callable = subprocess.run, popen: Callable = subprocess.Popen):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_cache_bytes = max_cache_bytes
+        self.runner = runner
+        self.popen = popen
+
+    # ----- cache -----
+
+    def cache_key(self, video_hash: str, start: float, end: float, fmt: str,
+                  accurate: bool = False) -> str:
+        mode = 'accurate' if accurate else 'keyframe'
+        raw = f"{video_hash}:{start:.3f}:{end:.3f}:{fmt}:{mode}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def cache_path(self, video_hash: str, start: float, end: float, fmt: str = 'mp4',
+                   accurate: bool = False) -> Path:
+        # fmt becomes part of the file name, so it must never carry a path
+        validate_format(fmt)
+        return self.cache_dir / f"{self.cache_key(video_hash, start, end, fmt, accurate)}.{fmt}"
+
+    def lookup(self, video_hash: str, start: float, end: float, fmt: str = 'mp4',
+               accurate: bool = False) -> Optional[Path]:
+        """Return the cached clip (marking it recently used) or None"""
+        path = self.cache_path(video_hash, start, end, fmt, accurate)
+        if path.exists():
+            self.touch(path)
+            return path
+        return None
+
+    @staticmethod
+    def touch(path: Path):
+        """Record a cache hit; eviction order follows mtime"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _cache_entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            stem = entry.name.split('.', 1)[0]
+            if entry.is_file() and len(stem) == _KEY_LENGTH:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    def evict(self, keep: Sequence[Path] = ()) -> int:
+        """Delete least recently used clips until the cache fits its budget"""
+        entries = sorted(self._cache_entries())
+        total = sum(size for _, size, _ in entries)
+        keep = {Path(p) for p in keep}
+        freed = 0
+
+        for _, size, path in entries:
+            if total <= self.max_cache_bytes:
+                break
+            if path in keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            freed += size
+
+        if freed:
+            logger.info(f"Evicted {freed / 1024 ** 2:.1f} MiB from clip cache")
+        return freed
+
+    # ----- keyframes -----
+
+    def keyframes(self, video_path: str) -> List[float]:
+        """Keyframe timestamps from the video's sidecar index"""
+        return get_index(video_path, self.runner, self.popen).keyframe_times
+
+    def snap(self, video_path: str, t: float) -> float:
+        """Start time snapped back to a keyframe
+
+        Without keyframe information the time is passed through; input-side
+        seeking with stream copy then starts at the preceding keyframe anyway.
+        """
+        keyframes = self.keyframes(video_path)
+        return keyframe_at_or_before(keyframes, t) if keyframes else t
+
+    # ----- extraction -----
+
+    def _run(self, cmd: List[str]):
+        result = self.runner(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"FFmpeg error: {result.stderr}")
+
+    def _copy_cmd(self, video_path: str, start: float, end: float, output: str) -> List[str]:
+        return [
+            'ffmpeg', '-y',
+            '-ss', f"{start:.3f}",
+            '-i', video_path,
+            '-t', f"{end - start:.3f}",
+            '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            output
+        ]
+
+    def _encode_cmd(self, video_path: str, start: float, end: float, output: str) -> List[str]:
+        return [
+            'ffmpeg', '-y',
+            '-ss', f"{start:.3f}",
+            '-i', video_path,
+            '-t', f"{end - start:.3f}",
+            '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18',
+            '-c:a', 'aac',
+            output
+        ]
+
+    def _extract_accurate(self, video_path: str, start: float, end: float, output: str):
+        """Re-encode [start, next keyframe) and stream copy the remainder"""
+        keyframes = self.keyframes(video_path)
+        if not keyframes:
+            self._run(self._encode_cmd(video_path, start, end, output))
+            return
+        if abs(keyframe_at_or_before(keyframes, start) - start) < 1e-3:
+            self._run(self._copy_cmd(video_path, start, end, output))
+            return
+
+        next_keyframe = keyframe_after(keyframes, start)
+        if next_keyframe is None or next_keyframe >= end:
+            self._run(self._encode_cmd(video_path, start, end, output))
+            return
+
+        ext = Path(output).suffix
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp:
+            head = os.path.join(tmp, f"head{ext}")
+            tail = os.path.join(tmp, f"tail{ext}")
+            concat_list = os.path.join(tmp, 'concat.txt')
+
+            self._run(self._encode_cmd(video_path, start, next_keyframe, head))
+            self._run(self._copy_cmd(video_path, next_keyframe, end, tail))
+            with open(concat_list, 'w') as f:
+                f.write(f"file '{head}'\nfile '{tail}'\n")
+            self._run([
+                'ffmpeg', '-y', '-f', 'concat', '-safe', '0',
+                '-i', concat_list, '-c', 'copy', output
+            ])
+
+    def get_clip(self, video_path: str, start: float, end: float, fmt: str = 'mp4',
+                 video_hash: Optional[str] = None, accurate: bool = False) -> Path:
+        """Return a cached clip, cutting it first if necessary"""
+        video_hash = video_hash or file_identity(video_path)
+        cached = self.lookup(video_hash, start, end, fmt, accurate)
+        if cached:
+            logger.info(f"Clip cache hit: {cached.name}")
+            return cached
+
+        path = self.cache_path(video_hash, start, end, fmt, accurate)
+        # Write to a temporary name so concurrent workers never serve a partial file
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{fmt}")
+        try:
+            if accurate:
+                self._extract_accurate(video_path, start, end, str(tmp_path))
+            else:
+                snapped = self.snap(video_path, start)
+                self._run(self._copy_cmd(video_path, snapped, end, str(tmp_path)))
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        self.evict(keep=[path])
+        return path
+
+    def export_all(self, video_path: str, ranges: Sequence[Tuple[float, float]],
+                   fmt: str = 'mp4', video_hash: Optional[str] = None) -> List[Path]:
+        """
+        Cut every (start, end) range of one video in a single ffmpeg run.
+
+        The input is read once and every missing clip is written as a
+        separate stream-copied output, each starting on a keyframe.
+        """
+        video_hash = video_hash or file_identity(video_path)
+        paths = [self.cache_path(video_hash, start, end, fmt) for start, end in ranges]
+
+        missing = [
+            (start, end, path) for (start, end), path in zip(ranges, paths)
+            if self.lookup(video_hash, start, end, fmt) is None
+        ]
+        if missing:
+            snapped = [self.snap(video_path, start) for start, _, _ in missing]
+            # Seek the input to the first clip so the leading footage is skipped
+            base = min(snapped)
+
+            cmd = ['ffmpeg', '-y', '-ss', f"{base:.3f}", '-i', video_path]
+            tmp_paths = []
+            for (_, end, path), clip_start in zip(missing, snapped):
+                tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.{fmt}")
+                tmp_paths.append((tmp_path, path))
+                cmd += [
+                    '-ss', f"{clip_start - base:.3f}",
+                    '-t', f"{end - clip_start:.3f}",
+                    '-map', '0', '-c', 'copy',
+                    '-avoid_negative_ts', 'make_zero',
+                    str(tmp_path)
+                ]
+
+            try:
+                self._run(cmd)
+                for tmp_path, path in tmp_paths:
+                    os.replace(tmp_path, path)
+            finally:
+                for tmp_path, _ in tmp_paths:
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+
+            logger.info(f"Exported {len(missing)} clips from {video_path} in one pass")
+
+        self.evict(keep=paths)
+        return paths
@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+"""
+경량 CNN 기반 GFX/UI 오버레이 분류 백엔드
+축소한 프레임(기본 64x36)을 작은 합성곱 신경망으로 분류해 프레임마다 OCR을 돌리지 않고
+오버레이 여부를 판정함. 프레임 묶음(batch) 단위로 추론하고 묶음을 스레드로 나눠 CPU에서 실행.
+
+백엔드 두 가지:
+  - TinyCNNBackend: numpy 합성곱(고정 시드 필터 뱅크) + 학습되는 로지스틱 출력층.
+    UIPatternManager에 저장된 레이블 샘플로 CNNTrainer가 학습
+  - OnnxBackend: 외부에서 학습한 .onnx 모델 (onnxruntime이 있으면 사용, 없으면 OpenCV DNN)
+
+두 백엔드 모두 predict_proba(frames) -> UI/GFX 확률 배열을 제공하므로
+AdvancedUIDetector, HybridGFXClassifier에 backend로 넘겨 사용
+
+사용 예시:
+  python -m src.cnn_classifier train --data-dir ui_detection_data --output models/ui_cnn.npz
+  python -m src.cnn_classifier predict --model models/ui_cnn.npz frame1.jpg frame2.jpg
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+try:
+    from .ui_pattern_manager import UIPatternManager
+except ImportError:
+    from ui_pattern_manager import UIPatternManager
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 1
+
+
+@dataclass
+class CNNConfig:
+    """CNN 입력/구조/추론 설정"""
+    input_size: Tuple[int, int] = (64, 36)  # (너비, 높이) - 16:9 방송 화면 축소
+    conv_filters: Tuple[int, ...] = (8, 16)  # 층별 필터 수 (3x3 합성곱 + 2x2 max pool)
+    pool_grid: Tuple[int, int] = (4, 4)  # 마지막 특징 맵 평균 풀링 격자 (오버레이 위치 정보 유지)
+    batch_size: int = 64
+    threads: int = 1  # 추론 스레드 수 (묶음을 나눠 병렬 실행)
+    threshold: float = 0.5
+    seed: int = 0
+
+
+def prepare_frame(frame: np.ndarray, input_size: Tuple[int, int]) -> np.ndarray:
+    """프레임 하나를 CNN 입력(H, W, 3, float32, -0.5~0.5)으로 축소"""
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    small = cv2.resize(frame, input_size, interpolation=cv2.INTER_AREA)
+    return small.astype(np.float32) / 255.0 - 0.5
+
+
+def prepare_batch(frames: Sequence[np.ndarray], input_size: Tuple[int, int]) -> np.ndarray:
+    """
+    프레임 묶음 → (N, H, W, 3) 입력
+
+    이미 prepare_frame으로 축소한 입력(float32, 크기 일치)은 그대로 사용
+    """
+    width, height = input_size
+    prepared = [
+        frame if frame.dtype == np.float32 and frame.shape[:2] == (height, width) else prepare_frame(frame, input_size)
+        for frame in frames
+    ]
+    if not prepared:
+        return np.zeros((0, height, width, 3), dtype=np.float32)
+    return np.stack(prepared)
+
+
+def _conv3x3_relu_pool(x: np.ndarray, weights: np.ndarray, bias: np.ndarray) -> np.ndarray:
+    """(N, H, W, C) → 3x3 valid 합성곱 + ReLU + 2x2 max pool → (N, H', W', F)"""
+    windows = np.lib.stride_tricks.sliding_window_view(x, (3, 3), axis=(1, 2))  # (N, H-2, W-2, C, 3, 3)
+    out = np.tensordot(windows, weights, axes=([3, 4, 5], [0, 1, 2])) + bias
+    np.maximum(out, 0, out=out)
+    n, h, w, f = out.shape
+    out = out[:, :h - h % 2, :w - w % 2]
+    return out.reshape(n, h // 2, 2, w // 2, 2, f).max(axis=(2, 4))
+
+
+def _grid_pool(x: np.ndarray, grid: Tuple[int, int]) -> np.ndarray:
+    """(N, H, W, F) → 격자 평균 풀링 후 (N, rows * cols * F)"""
+    rows, cols = grid
+    cells = [
+        cell.mean(axis=(1, 2))
+        for band in np.array_split(x, rows, axis=1)
+        for cell in np.array_split(band, cols, axis=2)
+    ]
+    return np.concatenate(cells, axis=1)
+
+
+class TinyCNNBackend:
+    """
+    numpy 경량 CNN
+
+    합성곱 층은 시드로 고정한 평균 0 필터 뱅크(엣지/대비 검출기 역할)이고
+    격자 풀링한 특징 위의 로지스틱 출력층만 학습함. 딥러닝 프레임워크 없이 CPU에서 동작
+    """
+
+    def __init__(self, config: Optional[CNNConfig] = None):
+        self.config = config or CNNConfig()
+        rng = np.random.default_rng(self.config.seed)
+        self.conv_layers: List[Tuple[np.ndarray, np.ndarray]] = []
+        channels = 3
+        for filters in self.config.conv_filters:
+            weights = rng.standard_normal((channels, 3, 3, filters)).astype(np.float32)
+            weights -= weights.mean(axis=(0, 1, 2), keepdims=True)
+            weights /= np.linalg.norm(weights.reshape(-1, filters), axis=0) + 1e-6
+            self.conv_layers.append((weights, np.zeros(filters, dtype=np.float32)))
+            channels = filters
+
+        # 출력층 (학습 전에는 None)
+        self.feature_mean: Optional[np.ndarray] = None
+        self.feature_std: Optional[np.ndarray] = None
+        self.head_weights: Optional[np.ndarray] = None
+        self.head_bias = 0.0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.head_weights is not None
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        return prepare_frame(frame, self.config.input_size)
+
+    def fingerprint(self) -> str:
+        """출력에 영향을 주는 구조/가중치의 해시 (스레드 수, 배치 크기 제외)"""
+        hasher = hashlib.sha1(json.dumps([
+            self.config.input_size, self.config.conv_filters, self.config.pool_grid, self.config.seed
+        ]).encode('utf-8'))
+        for weights, bias in self.conv_layers:
+            hasher.update(np.ascontiguousarray(weights).tobytes())
+            hasher.update(np.ascontiguousarray(bias).tobytes())
+        if self.is_trained:
+            for array in (self.feature_mean, self.feature_std, self.head_weights):
+                hasher.update(np.ascontiguousarray(array).tobytes())
+            hasher.update(repr(self.head_bias).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def embed(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """프레임 묶음의 합성곱 특징 (N, D)"""
+        x = prepare_batch(frames, self.config.input_size)
+        if len(x) == 0:
+            return np.zeros((0, 0), dtype=np.float32)
+        for weights, bias in self.conv_layers:
+            x = _conv3x3_relu_pool(x, weights, bias)
+        return _grid_pool(x, self.config.pool_grid)
+
+    def _predict_chunk(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        features = (self.embed(frames) - self.feature_mean) / self.feature_std
+        logits = features @ self.head_weights + self.head_bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def predict_proba(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """UI/GFX 확률 (N,) - batch_size 단위로 나눠 threads개 스레드에서 추론"""
+        if not self.is_trained:
+            raise ValueError("CNN 분류기가 학습되지 않았습니다")
+        if len(frames) == 0:
+            return np.zeros(0)
+        batch = self.config.batch_size
+        chunks = [frames[i:i + batch] for i in range(0, len(frames), batch)]
+        if self.config.threads > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.config.threads) as pool:
+                return np.concatenate(list(pool.map(self._predict_chunk, chunks)))
+        return np.concatenate([self._predict_chunk(chunk) for chunk in chunks])
+
+    def fit(self, frames: Sequence[np.ndarray], labels: Sequence[bool]) -> Dict:
+        """출력층 학습 (합성곱 특징 표준화 후 로지스틱 회귀)"""
+        labels = np.asarray(labels, dtype=int)
+        if len(set(labels.tolist())) < 2:
+            raise ValueError("UI/비UI 샘플이 모두 있어야 학습할 수 있습니다")
+        features = np.concatenate([
+            self.embed(frames[i:i + self.config.batch_size])
+            for i in range(0, len(frames), self.config.batch_size)
+        ])
+        self.feature_mean = features.mean(axis=0)
+        self.feature_std = features.std(axis=0) + 1e-6
+        scaled = (features - self.feature_mean) / self.feature_std
+
+        head = LogisticRegression(max_iter=2000, class_weight='balanced')
+        head.fit(scaled, labels)
+        self.head_weights = head.coef_[0].astype(np.float32)
+        self.head_bias = float(head.intercept_[0])
+
+        return {
+            'total_samples': int(len(labels)),
+            'ui_samples': int(labels.sum()),
+            'non_ui_samples': int(len(labels) - labels.sum()),
+            'accuracy': float(head.score(scaled, labels))
+        }
+
+    def save(self, path: str) -> str:
+        if not self.is_trained:
+            raise ValueError("CNN 분류기가 학습되지 않았습니다")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {f'conv{i}_weights': w for i, (w, _) in enumerate(self.conv_layers)}
+        arrays.update({f'conv{i}_bias': b for i, (_, b) in enumerate(self.conv_layers)})
+        metadata = {'model_type': 'tiny_cnn', 'version': MODEL_VERSION, 'config': asdict(self.config)}
+        np.savez_compressed(
+            path,
+            metadata=np.array(json.dumps(metadata)),
+            feature_mean=self.feature_mean,
+            feature_std=self.feature_std,
+            head_weights=self.head_weights,
+            head_bias=np.array(self.head_bias),
+            **arrays
+        )
+        logger.info(f"CNN 모델 저장: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str, threads: Optional[int] = None, batch_size: Optional[int] = None) -> 'TinyCNNBackend':
+        """저장된 모델 로드 (threads/batch_size는 실행 환경에 맞게 덮어쓸 수 있음)"""
+        with np.load(path) as data:
+            metadata = json.loads(str(data['metadata']))
+            if metadata.get('model_type') != 'tiny_cnn':
+                raise ValueError("잘못된 모델 타입입니다")
+            config = metadata['config']
+            config['input_size'] = tuple(config['input_size'])
+            config['conv_filters'] = tuple(config['conv_filters'])
+            config['pool_grid'] = tuple(config['pool_grid'])
+            if threads is not None:
+                config['threads'] = threads
+            if batch_size is not None:
+                config['batch_size'] = batch_size
+            backend = cls(CNNConfig(**config))
+            backend.conv_layers = [
+                (data[f'conv{i}_weights'], data[f'conv{i}_bias']) for i in range(len(backend.conv_layers))
+            ]
+            backend.feature_mean = data['feature_mean']
+            backend.feature_std = data['feature_std']
+            backend.head_weights = data['head_weights']
+            backend.head_bias = float(data['head_bias'])
+        return backend
+
+
+class OnnxBackend:
+    """
+    외부 학습 ONNX 모델 (입력 NCHW float32, 출력 (N, 2) 확률 또는 (N, 1) 로짓)
+
+    onnxruntime이 설치되어 있으면 intra-op 스레드 수를 지정해 사용하고,
+    없으면 OpenCV DNN으로 같은 모델을 실행
+    """
+
+    def __init__(self, model_path: str, config: Optional[CNNConfig] = None):
+        self.model_path = model_path
+        self.config = config or CNNConfig()
+        try:
+            import onnxruntime
+        except ImportError:
+            onnxruntime = None
+
+        if onnxruntime is not None:
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self.config.threads
+            self._session = onnxruntime.InferenceSession(
+                model_path, options, providers=['CPUExecutionProvider']
+            )
+            self._input_name = self._session.get_inputs()[0].name
+            self._net = None
+            self.runtime = 'onnxruntime'
+        else:
+            self._session = None
+            self._net = cv2.dnn.readNetFromONNX(model_path)
+            self._net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self._net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+            self.runtime = 'opencv_dnn'
+        logger.info(f"ONNX 모델 로드: {model_path} ({self.runtime})")
+
+    @property
+    def is_trained(self) -> bool:
+        return True
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        return prepare_frame(frame, self.config.input_size)
+
+    def fingerprint(self) -> str:
+        """모델 파일 내용과 입력 크기의 해시"""
+        hasher = hashlib.sha1(json.dumps(self.config.input_size).encode('utf-8'))
+        with open(self.model_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        if self._session is not None:
+            return self._session.run(None, {self._input_name: batch})[0]
+        # OpenCV DNN은 스레드 수를 전역 설정으로만 지정 가능
+        cv2.setNumThreads(self.config.threads)
+        self._net.setInput(batch)
+        return self._net.forward()
+
+    def predict_proba(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        if len(frames) == 0:
+            return np.zeros(0)
+        outputs = []
+        for i in range(0, len(frames), self.config.batch_size):
+            batch = prepare_batch(frames[i:i + self.config.batch_size], self.config.input_size)
+            output = np.asarray(self._run(np.ascontiguousarray(batch.transpose(0, 3, 1, 2))))
+            output = output.reshape(len(batch), -1)
+            if output.shape[1] >= 2:
+                outputs.append(output[:, 1])
+            else:
+                outputs.append(1.0 / (1.0 + np.exp(-output[:, 0])))
+        return np.concatenate(outputs)
+
+
+def load_backend(model_path: str, threads: Optional[int] = None, batch_size: Optional[int] = None):
+    """확장자로 백엔드 선택 (.onnx → OnnxBackend, 그 외 → TinyCNNBackend)"""
+    if model_path.lower().endswith('.onnx'):
+        config = CNNConfig()
+        if threads is not None:
+            config.threads = threads
+        if batch_size is not None:
+            config.batch_size = batch_size
+        return OnnxBackend(model_path, config)
+    return TinyCNNBackend.load(model_path, threads=threads, batch_size=batch_size)
+
+
+class CNNTrainer:
+    """
+    UIPatternManager의 레이블 샘플로 TinyCNNBackend 학습
+
+    샘플 프레임은 screenshots/<sample_id>.jpg에서 읽고, 스크린샷이 없으면
+    video_resolver(video_name) → 영상 경로에서 timestamp 위치 프레임을 읽음
+    """
+
+    def __init__(self, manager: UIPatternManager, video_resolver: Optional[Callable[[str], Optional[str]]] = None,
+                 config: Optional[CNNConfig] = None):
+        self.manager = manager
+        self.video_resolver = video_resolver
+        self.config = config or CNNConfig()
+
+    def _screenshot(self, sample_id: str) -> Optional[np.ndarray]:
+        path = os.path.join(self.manager.data_dir, 'screenshots', f"{sample_id}.jpg")
+        return cv2.imread(path) if os.path.exists(path) else None
+
+    def collect(self) -> Tuple[List[np.ndarray], List[bool]]:
+        """학습 입력(축소 프레임)과 레이블 수집 (프레임을 찾을 수 없는 샘플은 제외)"""
+        inputs, labels = [], []
+        pending: Dict[str, List] = {}
+        for sample in self.manager.load_feature_samples():
+            frame = self._screenshot(sample.sample_id)
+            if frame is not None:
+                inputs.append(prepare_frame(frame, self.config.input_size))
+                labels.append(sample.is_ui)
+            else:
+                pending.setdefault(sample.video_name, []).append(sample)
+
+        missing = 0
+        for video_name, samples in pending.items():
+            video_path = self.video_resolver(video_name) if self.video_resolver else None
+            if not video_path:
+                missing += len(samples)
+                continue
+            cap = cv2.VideoCapture(video_path)
+            try:
+                for sample in sorted(samples, key=lambda s: s.timestamp):
+                    cap.set(cv2.CAP_PROP_POS_MSEC, sample.timestamp * 1000)
+                    ret, frame = cap.read()
+                    if not ret:
+                        missing += 1
+                        continue
+                    inputs.append(prepare_frame(frame, self.config.input_size))
+                    labels.append(sample.is_ui)
+            finally:
+                cap.release()
+
+        if missing:
+            logger.warning(f"프레임을 찾을 수 없는 샘플 {missing}개 제외")
+        return inputs, labels
+
+    def train(self, min_samples: int = 20) -> Tuple[TinyCNNBackend, Dict]:
+        inputs, labels = self.collect()
+        if len(inputs) < min_samples:
+            raise ValueError(f"최소 {min_samples}개의 샘플이 필요합니다. 현재: {len(inputs)}개")
+        backend = TinyCNNBackend(self.config)
+        metrics = backend.fit(inputs, labels)
+        logger.info(f"CNN 학습 완료: {metrics}")
+        return backend, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='경량 CNN GFX/UI 분류기')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='UIPatternManager 샘플로 학습')
+    train_parser.add_argument('--data-dir', default='ui_detection_data', help='UI 패턴 데이터 폴더')
+    train_parser.add_argument('--video-dir', help='스크린샷이 없는 샘플의 원본 영상 폴더')
+    train_parser.add_argument('--output', '-o', default='ui_detection_data/models/ui_cnn.npz')
+    train_parser.add_argument('--min-samples', type=int, default=20)
+
+    predict_parser = subparsers.add_parser('predict', help='이미지 분류')
+    predict_parser.add_argument('--model', required=True, help='.npz 또는 .onnx 모델')
+    predict_parser.add_argument('--threads', type=int, default=None)
+    predict_parser.add_argument('images', nargs='+')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'train':
+        resolver = None
+        if args.video_dir:
+            resolver = lambda name: os.path.join(args.video_dir, name)
+        trainer = CNNTrainer(UIPatternManager(args.data_dir), video_resolver=resolver)
+        backend, metrics = trainer.train(min_samples=args.min_samples)
+        backend.save(args.output)
+        print(json.dumps(metrics, indent=2, ensure_ascii=False))
+    else:
+        backend = load_backend(args.model, threads=args.threads)
+        frames = [cv2.imread(path) for path in args.images]
+        for path, probability in zip(args.images, backend.predict_proba(frames)):
+            print(f"{path}: {probability:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,57 @@
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, Enum
+from sqlalchemy import create_engine, event, Column, Integer, String, Float, DateTime, JSON, Enum, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.sql.schema import ForeignKey
 import datetime
 import enum
 
-# SQLite database URL
+# SQLite database URL (the API uses the aiosqlite driver on the same file)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./sql_app.db"
 
-# Create the SQLAlchemy engine
+# Connection pool per engine; WAL lets these readers run while a writer commits
+POOL_SIZE = 10
+MAX_OVERFLOW = 10
+BUSY_TIMEOUT_MS = 30000
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """WAL journal so list/search reads are not blocked by an upload's write transaction"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+# Create the SQLAlchemy engine (Celery tasks and scripts)
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False},
+    pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_pre_ping=True
 )
+event.listen(engine, "connect", _set_sqlite_pragma)
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the API, created on first use so workers don't need aiosqlite
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW, pool_pre_ping=True
+        )
+        event.listen(_async_engine.sync_engine, "connect", _set_sqlite_pragma)
+        # Objects are serialized after commit, so keep their loaded attributes
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
 # Base class for declarative models
 Base = declarative_base()
 
@@ -38,6 +73,8 @@ class Video(Base):
     status = Column(Enum(VideoStatus), default=VideoStatus.PENDING)
     task_id = Column(String, nullable=True)  # Celery task ID
     error_message = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the file contents
+    file_size = Column(Integer, nullable=True)
     
     # Relationship to hands
     hands = relationship("Hand", back_populates="video")
@@ -61,6 +98,25 @@ class Hand(Base):
 # Function to create database tables
 def create_db_tables():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+
+# create_all() does not alter existing tables, so add columns introduced
+# after the first release to databases created by older versions
+def add_missing_columns(bind=None):
+    bind = bind or engine
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
 
 # Dependency to get DB session
 def get_db():
@@ -69,3 +125,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async DB session (API endpoints)
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
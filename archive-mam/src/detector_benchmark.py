@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+"""
+핸드 감지기 처리량/정확도 벤치마크
+시드로 재현 가능한 합성 토너먼트 영상(정답 핸드 경계 포함)을 만들고
+HandBoundaryDetector(전체 프레임/모션 영역 객체 감지), FastHandDetector, AdvancedHandDetector,
+UI 기반 HandSeparationAlgorithm을 각각 실행해
+처리 속도(초당 프레임, 실시간 배속), 최대 메모리(RSS), 경계 정밀도/재현율을 기록.
+결과 JSON은 키 순서와 반올림이 고정되어 커밋 간 diff/비교가 가능함
+
+사용 예시:
+  python -m src.detector_benchmark --duration 300 --resolution 640x360 --resolution 1280x720 \\
+      --output benchmark.json
+  python -m src.detector_benchmark --output new.json --compare benchmark.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+
+try:
+    from .generate_sample_video import create_sample_video, load_ground_truth
+    from .hand_boundary_detector import HandBoundaryDetector
+    from .fast_hand_detector import FastHandDetector
+    from .advanced_hand_detection import AdvancedHandDetector
+    from .advanced_ui_detector import AdvancedUIDetector
+    from .hand_separation_algorithm import HandSeparationAlgorithm, UISegment
+except ImportError:
+    from generate_sample_video import create_sample_video, load_ground_truth
+    from hand_boundary_detector import HandBoundaryDetector
+    from fast_hand_detector import FastHandDetector
+    from advanced_hand_detection import AdvancedHandDetector
+    from advanced_ui_detector import AdvancedUIDetector
+    from hand_separation_algorithm import HandSeparationAlgorithm, UISegment
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+DETECTORS = ('boundary', 'boundary_motion', 'fast', 'advanced', 'ui_separation')
+
+# UI 감지기 학습용 영상은 평가 영상과 겹치지 않는 시드 사용
+CALIBRATION_SEED_OFFSET = 1000
+
+
+@dataclass
+class BenchmarkConfig:
+    """벤치마크 영상/평가 설정"""
+    duration: int = 300
+    fps: int = 30
+    resolutions: List[Tuple[int, int]] = field(default_factory=lambda: [(640, 360)])
+    seed: int = 42
+    hand_duration: Tuple[int, int] = (30, 120)
+    gap_duration: Tuple[int, int] = (20, 40)
+    tolerance: float = 5.0  # 경계 일치로 보는 최대 오차 (초)
+    codec: str = 'MJPG'
+    extension: str = '.avi'
+
+
+def _video_name(config: BenchmarkConfig, width: int, height: int, seed: int) -> str:
+    return f"bench_s{seed}_{config.duration}s_{width}x{height}_{config.fps}fps{config.extension}"
+
+
+def prepare_video(config: BenchmarkConfig, width: int, height: int, work_dir: str,
+                  seed: Optional[int] = None) -> str:
+    """합성 영상 생성 (같은 설정의 영상과 정답 파일이 있으면 재사용)"""
+    seed = config.seed if seed is None else seed
+    path = os.path.join(work_dir, _video_name(config, width, height, seed))
+    expected = {
+        'duration': config.duration, 'fps': config.fps, 'width': width, 'height': height,
+        'seed': seed, 'ui_overlay': True
+    }
+    truth = load_ground_truth(path)
+    if truth is not None and truth['config'] == expected and os.path.exists(path):
+        return path
+
+    logger.info(f"합성 영상 생성: {path}")
+    create_sample_video(path, duration=config.duration, fps=config.fps, width=width, height=height,
+                        seed=seed, codec=config.codec, ui_overlay=True,
+                        hand_duration=config.hand_duration, gap_duration=config.gap_duration,
+                        verbose=False)
+    return path
+
+
+def truth_boundaries(video_path: str) -> List[Tuple[float, float]]:
+    """정답 핸드 (시작, 끝) 목록"""
+    truth = load_ground_truth(video_path)
+    if truth is None:
+        raise ValueError(f"정답 파일이 없습니다: {video_path}")
+    return [(float(h['start_time']), float(h['end_time'])) for h in truth['hands']]
+
+
+def _match_times(detected: Sequence[float], expected: Sequence[float], tolerance: float) -> List[float]:
+    """허용 오차 안에서 가까운 쌍부터 1:1로 짝지어 오차 목록 반환"""
+    pairs = sorted(
+        (abs(d - e), i, j)
+        for i, d in enumerate(detected)
+        for j, e in enumerate(expected)
+        if abs(d - e) <= tolerance
+    )
+    used_detected, used_expected, errors = set(), set(), []
+    for error, i, j in pairs:
+        if i in used_detected or j in used_expected:
+            continue
+        used_detected.add(i)
+        used_expected.add(j)
+        errors.append(error)
+    return errors
+
+
+def score_boundaries(detected: Sequence[Tuple[float, float]], truth: Sequence[Tuple[float, float]],
+                     tolerance: float = 5.0) -> Dict:
+    """
+    경계 정밀도/재현율
+
+    시작 경계는 시작끼리, 끝 경계는 끝끼리 tolerance 초 이내로 1:1 매칭
+    """
+    errors = (_match_times([d[0] for d in detected], [t[0] for t in truth], tolerance)
+              + _match_times([d[1] for d in detected], [t[1] for t in truth], tolerance))
+    matched = len(errors)
+    detected_count = 2 * len(detected)
+    truth_count = 2 * len(truth)
+    precision = matched / detected_count if detected_count else (1.0 if not truth_count else 0.0)
+    recall = matched / truth_count if truth_count else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'matched_boundaries': matched,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'mean_boundary_error': sum(errors) / matched if matched else None
+    }
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """현재 프로세스(와 종료된 자식 프로세스)의 최대 RSS"""
+    try:
+        import resource
+        peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        # macOS는 바이트, Linux는 KB 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss)
+    except ImportError:
+        return None
+
+
+def _hands_from_json(result_file: str) -> List[Tuple[float, float]]:
+    with open(result_file, 'r', encoding='utf-8') as f:
+        return [(float(h['start_time']), float(h['end_time'])) for h in json.load(f)]
+
+
+def _calibrated_ui_detector(calibration_video: str):
+    """정답 구간(핸드 사이 = UI)으로 UI 감지기를 학습 (디스크에 학습 샘플을 남기지 않음)"""
+    detector = AdvancedUIDetector()
+    hands = truth_boundaries(calibration_video)
+    cap = cv2.VideoCapture(calibration_video)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_number = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame_number % int(fps) == 0:
+                t = frame_number / fps
+                in_hand = any(start <= t <= end for start, end in hands)
+                detector.training_data.append({
+                    'features': detector.extract_features(frame),
+                    'is_ui': not in_hand,
+                    'timestamp': t,
+                    'video_name': Path(calibration_video).name
+                })
+            frame_number += 1
+    finally:
+        cap.release()
+    labels = {sample['is_ui'] for sample in detector.training_data}
+    if len(labels) < 2:
+        raise ValueError(f"학습 영상에 핸드/UI 구간이 모두 있어야 합니다: {calibration_video}")
+    detector.train_model(min_samples=10)
+    return detector
+
+
+def run_detector(name: str, video_path: str, output_dir: str, calibration_video: Optional[str] = None) -> Dict:
+    """
+    감지기 하나 실행 후 (감지 핸드, 소요 시간, 최대 RSS) 반환
+
+    ui_separation은 calibration_video로 UI 감지기를 학습하며, 학습 시간은 setup_seconds로 따로 기록
+    """
+    output_path = os.path.join(output_dir, f"{name}_{Path(video_path).stem}.json")
+    setup = 0.0
+    started = time.perf_counter()
+
+    if name == 'boundary':
+        hands = _hands_from_json(HandBoundaryDetector().analyze_video(video_path, output_path))
+    elif name == 'boundary_motion':
+        # 카드/칩 감지를 모션 영역 + 고정 ROI로 제한한 경로 (boundary와 비교)
+        detector = HandBoundaryDetector(object_detection='motion')
+        hands = _hands_from_json(detector.analyze_video(video_path, output_path))
+    elif name == 'fast':
+        hands = _hands_from_json(FastHandDetector().analyze_video(video_path, output_path))
+    elif name == 'advanced':
+        hands = _hands_from_json(AdvancedHandDetector().analyze_video(video_path, output_path))
+    elif name == 'ui_separation':
+        detector = _calibrated_ui_detector(calibration_video or video_path)
+        setup = time.perf_counter() - started
+        started = time.perf_counter()
+        results = detector.analyze_video(video_path)
+        duration = results['total_frames'] / results['fps'] if results['fps'] else 0.0
+        segments = [UISegment(s['start'], s['end'], 1.0, 'stats') for s in results['ui_segments']]
+        separated = HandSeparationAlgorithm().separate_hands(segments, duration)
+        hands = [(h.start_time, h.end_time) for h in separated]
+    else:
+        raise ValueError(f"알 수 없는 감지기: {name} (가능: {', '.join(DETECTORS)})")
+
+    return {
+        'hands': hands,
+        'elapsed': time.perf_counter() - started,
+        'setup_seconds': setup,
+        'peak_rss_bytes': _peak_rss_bytes()
+    }
+
+
+def _round(value, digits=3):
+    return round(value, digits) if isinstance(value, float) else value
+
+
+class DetectorBenchmark:
+    """합성 영상 생성 → 감지기 실행 → 점수 계산 → JSON 보고서"""
+
+    def __init__(self, config: Optional[BenchmarkConfig] = None, work_dir: str = 'benchmark_work',
+                 detectors: Sequence[str] = DETECTORS, isolate: bool = True):
+        self.config = config or BenchmarkConfig()
+        self.work_dir = work_dir
+        self.detectors = list(detectors)
+        # 감지기마다 새 프로세스에서 실행해야 최대 RSS가 서로 섞이지 않음
+        self.isolate = isolate
+        os.makedirs(work_dir, exist_ok=True)
+
+    def _run(self, name: str, video_path: str, calibration_video: Optional[str]) -> Dict:
+        if not self.isolate:
+            return run_detector(name, video_path, self.work_dir, calibration_video)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return pool.submit(run_detector, name, video_path, self.work_dir, calibration_video).result()
+
+    def run(self) -> Dict:
+        config = self.config
+        videos, results = [], []
+        for width, height in config.resolutions:
+            video_path = prepare_video(config, width, height, self.work_dir)
+            calibration_video = None
+            if 'ui_separation' in self.detectors:
+                calibration_video = prepare_video(config, width, height, self.work_dir,
+                                                  seed=config.seed + CALIBRATION_SEED_OFFSET)
+            truth = truth_boundaries(video_path)
+            frame_count = int(config.duration * config.fps)
+            video_name = Path(video_path).name
+            videos.append({
+                'name': video_name,
+                'duration': config.duration,
+                'fps': config.fps,
+                'resolution': f"{width}x{height}",
+                'frames': frame_count,
+                'truth_hands': len(truth)
+            })
+
+            for name in self.detectors:
+                logger.info(f"벤치마크 실행: {name} / {video_name}")
+                try:
+                    run = self._run(name, video_path, calibration_video)
+                except Exception as e:
+                    logger.error(f"{name} 실행 실패: {e}")
+                    results.append({'detector': name, 'video': video_name, 'error': str(e)})
+                    continue
+
+                elapsed = run['elapsed']
+                score = score_boundaries(run['hands'], truth, config.tolerance)
+                rss = run['peak_rss_bytes']
+                entry = {
+                    'detector': name,
+                    'video': video_name,
+                    'elapsed_seconds': elapsed,
+                    'setup_seconds': run['setup_seconds'],
+                    # 원본 영상 기준 초당 처리 프레임 (샘플링하는 감지기도 같은 기준)
+                    'frames_per_second': frame_count / elapsed if elapsed > 0 else None,
+                    'realtime_factor': config.duration / elapsed if elapsed > 0 else None,
+                    'peak_rss_mb': rss / (1024 * 1024) if rss is not None else None,
+                    'detected_hands': len(run['hands']),
+                    **score
+                }
+                results.append({key: _round(value) for key, value in entry.items()})
+
+        return {
+            'version': REPORT_VERSION,
+            'config': {
+                **asdict(config),
+                'resolutions': [f"{w}x{h}" for w, h in config.resolutions],
+                'detectors': self.detectors
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'opencv': cv2.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count()
+            },
+            'videos': videos,
+            'results': results
+        }
+
+
+def save_report(report: Dict, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+COMPARE_METRICS = ('frames_per_second', 'realtime_factor', 'peak_rss_mb', 'precision', 'recall', 'f1')
+
+
+def compare_reports(baseline: Dict, current: Dict) -> List[Dict]:
+    """두 보고서의 (감지기, 영상)별 지표 변화"""
+    old = {(r['detector'], r['video']): r for r in baseline.get('results', [])}
+    rows = []
+    for result in current.get('results', []):
+        key = (result['detector'], result['video'])
+        previous = old.get(key)
+        if previous is None or 'error' in result or 'error' in previous:
+            continue
+        row = {'detector': key[0], 'video': key[1]}
+        for metric in COMPARE_METRICS:
+            before, after = previous.get(metric), result.get(metric)
+            row[metric] = {
+                'before': before,
+                'after': after,
+                'change': _round(after - before) if before is not None and after is not None else None
+            }
+        rows.append(row)
+    return rows
+
+
+def _parse_resolution(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 영상 기반 핸드 감지기 벤치마크')
+    parser.add_argument('--duration', type=int, default=300, help='영상 길이 (초)')
+    parser.add_argument('--fps', type=int, default=30, help='영상 FPS')
+    parser.add_argument('--resolution', action='append', type=_parse_resolution,
+                        help='영상 해상도 (예: 1280x720, 여러 번 지정 가능)')
+    parser.add_argument('--seed', type=int, default=42, help='핸드 시나리오 시드')
+    parser.add_argument('--tolerance', type=float, default=5.0, help='경계 일치 허용 오차 (초)')
+    parser.add_argument('--detectors', nargs='+', choices=DETECTORS, default=list(DETECTORS))
+    parser.add_argument('--work-dir', default='benchmark_work', help='합성 영상/중간 결과 폴더')
+    parser.add_argument('--output', '-o', default='benchmark_results.json', help='보고서 경로')
+    parser.add_argument('--compare', help='비교할 이전 보고서')
+    parser.add_argument('--no-isolate', action='store_true', help='감지기를 같은 프로세스에서 실행')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    config = BenchmarkConfig(
+        duration=args.duration,
+        fps=args.fps,
+        resolutions=args.resolution or [(640, 360)],
+        seed=args.seed,
+        tolerance=args.tolerance
+    )
+    report = DetectorBenchmark(config, args.work_dir, args.detectors, isolate=not args.no_isolate).run()
+    save_report(report, args.output)
+
+    for result in report['results']:
+        if 'error' in result:
+            print(f"{result['detector']:>14} {result['video']}: 오류 {result['error']}")
+            continue
+        print(f"{result['detector']:>14} {result['video']}: {result['frames_per_second']} fps, "
+              f"x{result['realtime_factor']} 실시간, {result['peak_rss_mb']}MB, "
+              f"P={result['precision']} R={result['recall']}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for row in compare_reports(baseline, report):
+            changes = ', '.join(f"{m} {row[m]['change']:+}" for m in COMPARE_METRICS
+                                if row[m]['change'] is not None)
+            print(f"{row['detector']:>14} {row['video']}: {changes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,26 @@ import multiprocessing as mp
 from collections import deque
 import queue
 
+try:
+    from .ffmpeg_frame_reader import FFmpegFrameReader, ffmpeg_available
+    from .video_probe import capture_properties
+    from .signal_cache import SignalCache
+except ImportError:
+    from ffmpeg_frame_reader import FFmpegFrameReader, ffmpeg_available
+    from video_probe import capture_properties
+    from signal_cache import SignalCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 샘플 신호(모션 면적, 카드 수) 추출 방식이 바뀌면 올려서 캐시 무효화
+SIGNAL_EXTRACTOR = 'fast_hand'
+SIGNAL_VERSION = 2
+
+# 신호 추출 청크 크기 (샘플 수). 청크마다 배경 모델을 새로 만들므로 경계가 워커 수에 따라
+# 달라지지 않도록 고정 (워커는 고정 크기 청크를 나눠 처리)
+SIGNAL_CHUNK_SAMPLES = 64
+
 @dataclass
 class HandBoundary:
     """핸드 경계 정보"""
@@ -36,14 +53,25 @@ class HandBoundary:
 class FastHandDetector:
     """고속 핸드 감지기 - 프레임 샘플링 및 병렬 처리"""
     
-    def __init__(self, sampling_rate=60, num_workers=None):
+    # 분석용 프레임 크기
+    ANALYSIS_SIZE = (480, 270)
+    
+    def __init__(self, sampling_rate=60, num_workers=None, frame_source='opencv', keyframes_only=False,
+                 signal_cache: Optional[SignalCache] = None):
         """
         Args:
             sampling_rate: 프레임 샘플링 비율 (60 = 60프레임마다 1개 분석)
             num_workers: 병렬 처리 워커 수 (None = CPU 코어 수)
+            frame_source: 'opencv' (VideoCapture + resize) 또는 'ffmpeg' (디코더에서 스케일링)
+            keyframes_only: ffmpeg 사용 시 키프레임만 디코딩 (sampling_rate 대신 GOP 간격으로 샘플링)
+            signal_cache: 샘플별 모션 면적/카드 수 캐시 (있으면 임계값만 바꾼 재분석은 디코딩 생략)
         """
         self.sampling_rate = sampling_rate
         self.num_workers = num_workers or mp.cpu_count()
+        self.frame_source = frame_source
+        self.keyframes_only = keyframes_only
+        self.signal_cache = signal_cache
+        self.last_signals_cached = False
         
         # 핸드 감지 파라미터
         self.min_hand_duration = 30  # 최소 30초
@@ -62,17 +90,36 @@ class FastHandDetector:
         if not cap.isOpened():
             raise ValueError(f"비디오를 열 수 없습니다: {video_path}")
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps, total_frames = capture_properties(video_path, cap)
         
         logger.info(f"비디오 정보: {total_frames} 프레임, {fps} FPS, {total_frames/fps/60:.1f}분")
         logger.info(f"샘플링 비율: {self.sampling_rate}:1, 워커 수: {self.num_workers}")
         
-        # 1단계: 키 프레임 추출 (샘플링)
-        key_frames = self._extract_key_frames(cap, total_frames, fps, progress_callback)
+        use_ffmpeg = self.frame_source == 'ffmpeg' and ffmpeg_available()
+        params = self.signal_params(use_ffmpeg)
+        signals = None
+        if self.signal_cache is not None:
+            cached = self.signal_cache.load(video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, params)
+            if cached is not None:
+                signals = cached[0]
+        self.last_signals_cached = signals is not None
+        
+        if signals is None:
+            # 1단계: 키 프레임 추출 (샘플링)
+            if use_ffmpeg:
+                key_frames = self._extract_key_frames_ffmpeg(video_path, fps, progress_callback)
+            else:
+                if self.frame_source == 'ffmpeg':
+                    logger.warning("ffmpeg를 찾을 수 없어 OpenCV로 프레임 추출")
+                key_frames = self._extract_key_frames(cap, total_frames, fps, progress_callback)
+            
+            # 2단계: 병렬 처리로 샘플별 신호 추출
+            signals = self._extract_signals_parallel(key_frames)
+            if self.signal_cache is not None:
+                self.signal_cache.store(video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, params, signals)
         
-        # 2단계: 병렬 처리로 핸드 후보 감지
-        hand_candidates = self._detect_hand_candidates_parallel(key_frames, fps)
+        # 임계값/그룹화는 신호 위에서 계산 (캐시된 신호면 디코딩 없이 바로)
+        hand_candidates = self._group_events_to_hands(self._events_from_signals(signals), fps)
         
         # 3단계: 정밀 분석 (후보 구간만)
         validated_hands = self._validate_hands_precise(cap, hand_candidates, fps, progress_callback)
@@ -111,7 +158,7 @@ class FastHandDetector:
             
             # 작은 크기로 리사이즈 (분석 속도 향상)
             # 더 작은 크기로 리사이즈하여 속도 향상
-            small_frame = cv2.resize(frame, (480, 270))
+            small_frame = cv2.resize(frame, self.ANALYSIS_SIZE)
             
             key_frames.append({
                 'frame_idx': frame_idx,
@@ -130,31 +177,79 @@ class FastHandDetector:
         
         return key_frames
     
+    def _extract_key_frames_ffmpeg(self, video_path, fps, progress_callback):
+        """키 프레임 추출 (ffmpeg 파이프, 디코딩 단계에서 축소/샘플링)"""
+        width, height = self.ANALYSIS_SIZE
+        reader = FFmpegFrameReader(
+            video_path, width=width, height=height,
+            sample_every=self.sampling_rate, keyframes_only=self.keyframes_only, fps=fps
+        )
+        expected = reader.expected_frames
+        mode = '키프레임만' if reader.keyframes_only else f'{self.sampling_rate}프레임 간격'
+        logger.info(f"키 프레임 추출 중... (ffmpeg, {mode}, 약 {expected}개)")
+        
+        key_frames = []
+        for idx, (frame_idx, timestamp, frame) in enumerate(reader):
+            key_frames.append({
+                'frame_idx': frame_idx,
+                'timestamp': timestamp,
+                'frame': frame.copy()  # 리더 버퍼는 다음 프레임에 재사용됨
+            })
+            
+            if progress_callback and idx % 100 == 0:
+                progress_callback({
+                    'stage': 'extracting_keyframes',
+                    'progress': (idx / expected) * 100 if expected else 0,
+                    'current': idx,
+                    'total': expected
+                })
+        
+        return key_frames
+    
+    def signal_params(self, use_ffmpeg: bool) -> Dict:
+        """신호 캐시 키에 들어가는 추출 파라미터 (청크 경계는 고정이라 워커 수와 무관)"""
+        return {
+            'sampling_rate': self.sampling_rate,
+            'frame_source': 'ffmpeg' if use_ffmpeg else 'opencv',
+            'keyframes_only': bool(self.keyframes_only and use_ffmpeg),
+            'analysis_size': list(self.ANALYSIS_SIZE),
+            'chunk_samples': SIGNAL_CHUNK_SAMPLES
+        }
+    
     def _detect_hand_candidates_parallel(self, key_frames, fps):
         """병렬 처리로 핸드 후보 감지"""
-        logger.info(f"핸드 후보 감지 중... (병렬 처리)")
+        signals = self._extract_signals_parallel(key_frames)
+        return self._group_events_to_hands(self._events_from_signals(signals), fps)
+    
+    def _extract_signals_parallel(self, key_frames):
+        """병렬 처리로 샘플별 신호 추출"""
+        logger.info(f"샘플 신호 추출 중... (병렬 처리)")
+        
+        # 고정 크기 청크로 분할 (워커 수가 바뀌어도 같은 신호)
+        chunks = [key_frames[i:i + SIGNAL_CHUNK_SAMPLES]
+                  for i in range(0, len(key_frames), SIGNAL_CHUNK_SAMPLES)]
         
-        # 프레임을 청크로 분할
-        chunk_size = max(1, len(key_frames) // self.num_workers)
-        chunks = [key_frames[i:i+chunk_size] for i in range(0, len(key_frames), chunk_size)]
+        # 워커가 하나면 프로세스를 만들지 않고 바로 처리 (일괄 분석처럼 바깥에서 병렬화하는 경우)
+        if self.num_workers <= 1:
+            signals = []
+            for chunk_id, chunk in enumerate(chunks):
+                signals.extend(self._extract_chunk_signals(chunk, chunk_id))
+            return signals
         
         # 병렬 처리
         with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            futures = [executor.submit(self._analyze_chunk, chunk) for chunk in chunks]
+            futures = [executor.submit(self._extract_chunk_signals, chunk, chunk_id)
+                       for chunk_id, chunk in enumerate(chunks)]
             
-            all_events = []
+            signals = []
             for future in futures:
-                chunk_events = future.result()
-                all_events.extend(chunk_events)
+                signals.extend(future.result())
         
-        # 이벤트를 핸드로 그룹화
-        hand_candidates = self._group_events_to_hands(all_events, fps)
-        
-        return hand_candidates
+        return signals
     
-    def _analyze_chunk(self, frames_chunk):
-        """프레임 청크 분석 (워커 프로세스에서 실행)"""
-        events = []
+    def _extract_chunk_signals(self, frames_chunk, chunk_id=0):
+        """프레임 청크의 샘플별 모션 면적/카드 수 (워커 프로세스에서 실행, 임계값과 무관)"""
+        signals = []
         
         # 간소화된 분석기 초기화
         bg_subtractor = cv2.createBackgroundSubtractorMOG2(
@@ -162,31 +257,47 @@ class FastHandDetector:
             varThreshold=100,
             history=100
         )
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
         
-        # 이전 프레임 정보 저장
-        prev_motion_area = 0
-        motion_history = deque(maxlen=5)
-        
-        for frame_info in frames_chunk:
+        for position, frame_info in enumerate(frames_chunk):
             frame = frame_info['frame']
             
             # 빠른 모션 감지
             fg_mask = bg_subtractor.apply(frame)
             
             # 노이즈 제거를 위한 간단한 모폴로지 연산
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
             fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
             
-            motion_area = cv2.countNonZero(fg_mask)
+            signals.append({
+                'chunk': chunk_id,
+                'frame_idx': int(frame_info['frame_idx']),
+                'timestamp': float(frame_info['timestamp']),
+                'motion_area': int(cv2.countNonZero(fg_mask)),
+                # 청크 앞 두 샘플은 판정에 쓰이지 않으므로 카드 감지 생략 (-1)
+                'card_count': self._quick_card_detection(frame) if position >= 2 else -1
+            })
+        
+        return signals
+    
+    def _events_from_signals(self, signals):
+        """샘플 신호에 임계값을 적용해 핸드 시작/종료 후보 이벤트 생성 (청크 단위 상태)"""
+        events = []
+        chunk_id = None
+        
+        for signal in signals:
+            # 청크가 바뀌면 이전 상태 초기화 (추출 때와 같은 경계)
+            if signal['chunk'] != chunk_id:
+                chunk_id = signal['chunk']
+                prev_motion_area = 0
+                motion_history = deque(maxlen=5)
+            
+            motion_area = signal['motion_area']
             motion_history.append(motion_area)
             
             # 급격한 모션 변화 감지
             if len(motion_history) >= 3:
-                avg_motion = sum(motion_history) / len(motion_history)
                 motion_change = abs(motion_area - prev_motion_area)
-                
-                # 빠른 카드 감지 (색상 기반만)
-                card_count = self._quick_card_detection(frame)
+                card_count = signal['card_count']
                 
                 # 핸드 시작 감지: 급격한 모션 증가 + 카드 존재
                 if (motion_change > self.motion_threshold * 0.5 and 
@@ -194,8 +305,8 @@ class FastHandDetector:
                     card_count >= self.card_threshold):
                     events.append({
                         'type': 'potential_hand_start',
-                        'frame_idx': frame_info['frame_idx'],
-                        'timestamp': frame_info['timestamp'],
+                        'frame_idx': signal['frame_idx'],
+                        'timestamp': signal['timestamp'],
                         'motion_area': motion_area,
                         'card_count': card_count,
                         'confidence': min(motion_area / self.motion_threshold * 50 + card_count * 10, 100)
@@ -206,8 +317,8 @@ class FastHandDetector:
                       motion_area < self.motion_threshold * 0.5):
                     events.append({
                         'type': 'potential_hand_end',
-                        'frame_idx': frame_info['frame_idx'],
-                        'timestamp': frame_info['timestamp'],
+                        'frame_idx': signal['frame_idx'],
+                        'timestamp': signal['timestamp'],
                         'motion_area': motion_area,
                         'confidence': 80
                     })
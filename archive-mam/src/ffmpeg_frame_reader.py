@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+ffmpeg rawvideo 파이프 프레임 리더
+스케일링, 프레임 간격 샘플링, 키프레임만 디코딩(-skip_frame nokey)을 디코더 안에서 처리하고
+파이프에서 읽은 BGR 프레임을 재사용 버퍼에 담아 numpy 배열로 돌려줌
+(cv2.VideoCapture로 원본 해상도를 디코딩한 뒤 파이썬에서 resize하는 것보다 훨씬 저렴함)
+"""
+import logging
+import os
+import shutil
+import subprocess
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .video_index import VideoIndex, get_index
+except ImportError:
+    from video_index import VideoIndex, get_index
+
+logger = logging.getLogger(__name__)
+
+
+def ffmpeg_available(ffmpeg: str = 'ffmpeg') -> bool:
+    """ffmpeg 실행 파일이 있는지 확인"""
+    return shutil.which(ffmpeg) is not None
+
+
+class FFmpegFrameReader:
+    """
+    ffmpeg 디코딩 프레임 리더
+
+    - sample_every: N프레임마다 1개만 출력 (select 필터, 프레임 번호 기준이라 정확함)
+    - keyframes_only: 디코더가 키프레임 외에는 디코딩하지 않음 (타임스탬프는 VideoIndex 사용)
+    - 반복 시 (프레임 번호, 시간, 프레임)을 반환하며, 프레임은 재사용 버퍼의 뷰이므로
+      보관하려면 copy() 해야 함
+    """
+
+    def __init__(self, video_path: str, width: int = 480, height: int = 270,
+                 sample_every: int = 1, keyframes_only: bool = False,
+                 index: Optional[VideoIndex] = None, fps: Optional[float] = None,
+                 ffmpeg: str = 'ffmpeg', popen: Callable = subprocess.Popen):
+        self.video_path = video_path
+        self.width = width
+        self.height = height
+        self.sample_every = max(1, int(sample_every))
+        self.ffmpeg = ffmpeg
+        self.popen = popen
+
+        # 로컬 파일이면 인덱스로 fps와 키프레임 위치를 알 수 있음 (스트림 URL은 인덱스 없음)
+        if index is None and os.path.isfile(video_path):
+            index = get_index(video_path)
+        self.index = index
+        self.fps = fps or (index.fps if index else 0) or 30.0
+
+        # 키프레임 위치를 모르면 출력 프레임의 시간을 알 수 없으므로 샘플링 모드로 대체
+        self.keyframes_only = keyframes_only and index is not None and index.has_keyframes
+        if keyframes_only and not self.keyframes_only:
+            logger.info(f"키프레임 인덱스가 없어 {self.sample_every}프레임 간격 샘플링으로 대체: {video_path}")
+
+        self._frame_bytes = width * height * 3
+        self._buffer = bytearray(self._frame_bytes)
+        self._frame = np.frombuffer(self._buffer, dtype=np.uint8).reshape(height, width, 3)
+        self._process = None
+
+    @property
+    def expected_frames(self) -> int:
+        """출력될 프레임 수 추정 (진행률 계산용, 모르면 0)"""
+        if self.keyframes_only:
+            return len(self.index.keyframe_times)
+        if self.index and self.index.frame_count > 0:
+            return (self.index.frame_count + self.sample_every - 1) // self.sample_every
+        return 0
+
+    def command(self) -> List[str]:
+        """ffmpeg 명령 구성"""
+        cmd = [self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-nostdin']
+        if self.keyframes_only:
+            # 입력 옵션: 키프레임이 아닌 프레임은 디코딩 자체를 건너뜀
+            cmd += ['-skip_frame', 'nokey']
+        cmd += ['-i', self.video_path, '-map', '0:v:0', '-an', '-sn']
+
+        filters = []
+        if not self.keyframes_only and self.sample_every > 1:
+            filters.append(f"select='not(mod(n\\,{self.sample_every}))'")
+        filters.append(f"scale={self.width}:{self.height}")
+        cmd += ['-vf', ','.join(filters)]
+
+        # 선택된 프레임만 그대로 내보냄 (빈 자리를 복제 프레임으로 채우지 않음)
+        cmd += ['-vsync', '0', '-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+        return cmd
+
+    def _position(self, i: int) -> Tuple[int, float]:
+        """i번째 출력 프레임의 (원본 프레임 번호, 시간)"""
+        if self.keyframes_only:
+            return self.index.keyframe_frames[i], self.index.keyframe_times[i]
+        frame_idx = i * self.sample_every
+        return frame_idx, frame_idx / self.fps
+
+    def _read_into_buffer(self, stream) -> bool:
+        """파이프에서 프레임 하나를 버퍼에 채움 (EOF면 False)"""
+        view = memoryview(self._buffer)
+        filled = 0
+        while filled < self._frame_bytes:
+            n = stream.readinto(view[filled:])
+            if not n:
+                if filled:
+                    logger.warning(f"불완전한 마지막 프레임 무시 ({filled}/{self._frame_bytes} 바이트)")
+                return False
+            filled += n
+        return True
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        self._process = self.popen(
+            self.command(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            bufsize=self._frame_bytes
+        )
+        try:
+            i = 0
+            while self._read_into_buffer(self._process.stdout):
+                if self.keyframes_only and i >= len(self.index.keyframe_times):
+                    break
+                frame_idx, timestamp = self._position(i)
+                yield frame_idx, timestamp, self._frame
+                i += 1
+        finally:
+            self.close()
+
+    def close(self):
+        """ffmpeg 프로세스 종료"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.stdout:
+            process.stdout.close()
+        if process.poll() is None:
+            process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FFmpegFrameWriter:
+    """
+    ffmpeg rawvideo 파이프 인코더
+
+    BGR 프레임을 stdin으로 받아 하나의 영상 파일로 인코딩 (인코딩은 ffmpeg 프로세스에서 병렬로 진행)
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, fps: float,
+                 codec: str = 'libx264', preset: str = 'veryfast', crf: int = 23,
+                 ffmpeg: str = 'ffmpeg', popen: Callable = subprocess.Popen):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.codec = codec
+        self.preset = preset
+        self.crf = crf
+        self.ffmpeg = ffmpeg
+        self.frames_written = 0
+        self._process = popen(
+            self.command(), stdin=subprocess.PIPE, stderr=subprocess.PIPE,
+            bufsize=width * height * 3
+        )
+
+    def command(self) -> List[str]:
+        """ffmpeg 명령 구성"""
+        cmd = [self.ffmpeg, '-hide_banner', '-loglevel', 'error', '-y',
+               '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{self.width}x{self.height}',
+               '-r', f'{self.fps:g}', '-i', 'pipe:0', '-an', '-c:v', self.codec]
+        if self.codec == 'libx264':
+            cmd += ['-preset', self.preset, '-crf', str(self.crf)]
+        # 대부분의 플레이어가 재생할 수 있는 픽셀 포맷
+        cmd += ['-pix_fmt', 'yuv420p', self.output_path]
+        return cmd
+
+    def write(self, frame: np.ndarray):
+        """프레임 하나 전송 (크기가 다르면 ValueError)"""
+        if frame.shape != (self.height, self.width, 3):
+            raise ValueError(f"프레임 크기 불일치: {frame.shape} != {(self.height, self.width, 3)}")
+        try:
+            self._process.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg 인코더가 종료됨: {self._error_output(self._process)}")
+        self.frames_written += 1
+
+    @staticmethod
+    def _error_output(process) -> str:
+        if process.stderr is None:
+            return ''
+        try:
+            return process.stderr.read().decode('utf-8', errors='replace').strip()
+        except (OSError, ValueError):
+            return ''
+
+    def close(self):
+        """입력을 닫고 인코딩이 끝날 때까지 대기 (실패하면 RuntimeError)"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        error = self._error_output(process)
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg 인코딩 실패: {error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
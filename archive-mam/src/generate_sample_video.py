@@ -9,10 +9,15 @@ import numpy as np
 import random
 import math
 import os
+import json
 from pathlib import Path
 
+TRUTH_SUFFIX = '.truth.json'
+
 def create_sample_video(output_path="test_videos/sample_poker_video.mp4", 
-                       duration=300, fps=30, width=1280, height=720):
+                       duration=300, fps=30, width=1280, height=720,
+                       seed=None, codec='mp4v', ui_overlay=False, hand_duration=(30, 180),
+                       gap_duration=(10, 30), verbose=True):
     """
     포커 테이블 시뮬레이션 비디오 생성
     
@@ -21,18 +26,27 @@ def create_sample_video(output_path="test_videos/sample_poker_video.mp4",
         duration: 비디오 길이 (초)
         fps: 초당 프레임 수
         width, height: 비디오 해상도
+        seed: 핸드 시나리오 난수 시드 (같은 시드 = 같은 영상)
+        codec: VideoWriter FourCC
+        ui_overlay: 핸드 사이 간격에 통계 화면(GFX) 표시
+        hand_duration, gap_duration: 핸드 길이/핸드 간 간격 범위 (초)
+    
+    핸드 시나리오(정답 경계)는 <output_path>.truth.json에 함께 저장
     """
     
     # 출력 디렉토리 생성
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
     # 비디오 작성기 설정
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    fourcc = cv2.VideoWriter_fourcc(*codec)
     out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    if not out.isOpened():
+        raise ValueError(f"비디오 작성기를 열 수 없습니다 ({codec}): {output_path}")
     
-    total_frames = duration * fps
-    print(f"[VIDEO] 샘플 비디오 생성 시작: {output_path}")
-    print(f"[INFO] 설정: {width}x{height}, {fps}FPS, {duration}초 ({total_frames} 프레임)")
+    total_frames = int(duration * fps)
+    if verbose:
+        print(f"[VIDEO] 샘플 비디오 생성 시작: {output_path}")
+        print(f"[INFO] 설정: {width}x{height}, {fps}FPS, {duration}초 ({total_frames} 프레임)")
     
     # 포커 테이블 설정
     table_center = (width // 2, height // 2)
@@ -47,7 +61,11 @@ def create_sample_video(output_path="test_videos/sample_poker_video.mp4",
         player_positions.append((x, y))
     
     # 핸드 시나리오 생성
-    hands = generate_hand_scenarios(duration, fps)
+    rng = random.Random(seed)
+    hands = generate_hand_scenarios(duration, fps, rng=rng, hand_duration=hand_duration,
+                                    gap_duration=gap_duration, verbose=verbose)
+    write_ground_truth(output_path, hands, duration=duration, fps=fps, width=width,
+                       height=height, seed=seed, ui_overlay=ui_overlay)
     
     current_hand_index = 0
     current_hand = hands[0] if hands else None
@@ -83,6 +101,10 @@ def create_sample_video(output_path="test_videos/sample_poker_video.mp4",
                 draw_pot_collection(frame, table_center, player_positions, 
                                   collection_progress, current_hand['winner'])
         
+        # 핸드 사이 간격의 통계 화면
+        elif ui_overlay:
+            draw_stats_overlay(frame, len(hands))
+        
         # 게임 정보 표시
         draw_game_info(frame, current_time, current_hand, len(hands))
         
@@ -90,29 +112,47 @@ def create_sample_video(output_path="test_videos/sample_poker_video.mp4",
         out.write(frame)
         
         # 진행률 표시
-        if frame_num % (fps * 10) == 0:  # 10초마다
+        if verbose and frame_num % (fps * 10) == 0:  # 10초마다
             progress = (frame_num / total_frames) * 100
             print(f"진행률: {progress:.1f}%")
     
     out.release()
-    print(f"[DONE] 샘플 비디오 생성 완료: {output_path}")
+    if verbose:
+        print(f"[DONE] 샘플 비디오 생성 완료: {output_path}")
     return output_path
 
-def generate_hand_scenarios(duration, fps):
-    """핸드 시나리오 생성"""
+def write_ground_truth(output_path, hands, **config):
+    """정답 핸드 경계를 사이드카 JSON으로 저장"""
+    with open(output_path + TRUTH_SUFFIX, 'w', encoding='utf-8') as f:
+        json.dump({'config': config, 'hands': hands}, f, indent=2)
+
+def load_ground_truth(video_path):
+    """create_sample_video가 저장한 정답 경계 (없으면 None)"""
+    path = video_path + TRUTH_SUFFIX
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def generate_hand_scenarios(duration, fps, rng=None, hand_duration=(30, 180),
+                            gap_duration=(10, 30), verbose=True):
+    """핸드 시나리오 생성 (rng: random.Random, 없으면 전역 random)"""
+    rng = rng or random
     hands = []
     current_time = 0
     hand_id = 1
+    # 마지막 여유 (기본 1분, 짧은 핸드 설정이면 최대 핸드+간격만큼)
+    tail = min(60, hand_duration[1] + gap_duration[1])
     
-    while current_time < duration - 60:  # 마지막 1분 여유
-        # 핸드 길이 랜덤 생성 (30초 ~ 180초)
-        hand_duration = random.randint(30, 180)
+    while current_time < duration - tail:
+        # 핸드 길이 랜덤 생성 (기본 30초 ~ 180초)
+        length = rng.randint(*hand_duration)
         
-        # 핸드 간 간격 (10초 ~ 30초)
-        gap = random.randint(10, 30)
+        # 핸드 간 간격 (기본 10초 ~ 30초)
+        gap = rng.randint(*gap_duration)
         
         start_time = current_time + gap
-        end_time = start_time + hand_duration
+        end_time = start_time + length
         
         if end_time > duration:
             break
@@ -121,16 +161,17 @@ def generate_hand_scenarios(duration, fps):
             'hand_id': hand_id,
             'start_time': start_time,
             'end_time': end_time,
-            'duration': hand_duration,
-            'num_players': random.randint(2, 6),
-            'winner': random.randint(0, 5),
-            'pot_size': random.randint(100, 5000)
+            'duration': length,
+            'num_players': rng.randint(2, 6),
+            'winner': rng.randint(0, 5),
+            'pot_size': rng.randint(100, 5000)
         })
         
         current_time = end_time
         hand_id += 1
     
-    print(f"🎲 생성된 핸드 수: {len(hands)}개")
+    if verbose:
+        print(f"🎲 생성된 핸드 수: {len(hands)}개")
     return hands
 
 def create_poker_table_background(width, height, center, radius):
@@ -166,7 +207,7 @@ def draw_dealing_animation(frame, center, positions, progress, num_players):
         card_num = i // num_players
         
         pos = positions[player_idx]
-        card_x = pos[0] + (card_num - 0.5) * 20
+        card_x = int(pos[0] + (card_num - 0.5) * 20)
         card_y = pos[1]
         
         # 카드 그리기
@@ -190,7 +231,7 @@ def draw_game_state(frame, center, positions, hand, progress):
         
         # 2장의 카드
         for j in range(2):
-            card_x = pos[0] + (j - 0.5) * 20
+            card_x = int(pos[0] + (j - 0.5) * 20)
             card_y = pos[1]
             
             cv2.rectangle(frame, (card_x - 10, card_y - 15), 
@@ -247,6 +288,24 @@ def draw_pot_collection(frame, center, positions, progress, winner):
     cv2.putText(frame, "WIN", (winner_pos[0]-15, winner_pos[1]-30), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
+def draw_stats_overlay(frame, total_hands):
+    """핸드 사이 방송 통계 화면 (화면 하단 GFX 패널)"""
+    height, width = frame.shape[:2]
+    top = int(height * 0.6)
+    overlay = frame.copy()
+    cv2.rectangle(overlay, (0, top), (width, height), (40, 20, 10), -1)
+    cv2.addWeighted(overlay, 0.85, frame, 0.15, 0, frame)
+    cv2.rectangle(frame, (0, top), (width, top + 6), (0, 200, 255), -1)
+    
+    rows = 4
+    row_height = (height - top - 20) // rows
+    for i in range(rows):
+        y = top + 20 + i * row_height + row_height // 2
+        cv2.putText(frame, f"PLAYER {i + 1}", (int(width * 0.05), y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        cv2.putText(frame, f"{(i + 1) * 125000:,}", (int(width * 0.6), y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+
 def draw_game_info(frame, current_time, current_hand, total_hands):
     """게임 정보 표시"""
     # 시간 표시
@@ -13,6 +13,15 @@ from pathlib import Path
 import time
 from collections import deque
 
+try:
+    from .scene_segmenter import SkipList
+    from .video_probe import capture_properties
+    from .instrumentation import Instrumentation
+except ImportError:
+    from scene_segmenter import SkipList
+    from video_probe import capture_properties
+    from instrumentation import Instrumentation
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -47,7 +56,9 @@ class HandBoundary:
 class MotionTracker:
     """고급 모션 추적 시스템"""
     
-    def __init__(self):
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        self.instrumentation = instrumentation or Instrumentation()
+        
         # 배경 제거기 초기화
         self.bg_subtractor = cv2.createBackgroundSubtractorMOG2(
             detectShadows=False,
@@ -71,45 +82,50 @@ class MotionTracker:
     
     def update(self, frame):
         """프레임 업데이트 및 모션 분석"""
+        inst = self.instrumentation
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
         # 배경 제거로 전경 마스크 생성
-        fg_mask = self.bg_subtractor.apply(frame)
-        
-        # 노이즈 제거
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
+        with inst.stage('motion.mog2'):
+            fg_mask = self.bg_subtractor.apply(frame)
+            
+            # 노이즈 제거
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+            fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
         
         # 모션 영역 찾기
-        contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        motion_regions = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if area > 500:  # 최소 영역 필터
-                x, y, w, h = cv2.boundingRect(contour)
-                motion_regions.append({
-                    'bbox': (x, y, w, h),
-                    'center': (x + w//2, y + h//2),
-                    'area': area,
-                    'contour': contour
-                })
+        with inst.stage('motion.contours'):
+            contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            
+            motion_regions = []
+            for contour in contours:
+                area = cv2.contourArea(contour)
+                if area > 500:  # 최소 영역 필터
+                    x, y, w, h = cv2.boundingRect(contour)
+                    motion_regions.append({
+                        'bbox': (x, y, w, h),
+                        'center': (x + w//2, y + h//2),
+                        'area': area,
+                        'contour': contour
+                    })
+        inst.count('motion.regions', len(motion_regions))
         
         # 옵티컬 플로우 계산
         flow_vectors = None
         if self.previous_gray is not None:
-            # 전체 프레임에 대한 dense optical flow
-            flow = cv2.calcOpticalFlowPyrLK(
-                self.previous_gray, gray, 
-                np.array([[x, y] for x in range(0, gray.shape[1], 20) 
-                         for y in range(0, gray.shape[0], 20)], dtype=np.float32), 
-                None, **self.lk_params
-            )
+            with inst.stage('motion.optical_flow'):
+                # 전체 프레임에 대한 dense optical flow
+                flow = cv2.calcOpticalFlowPyrLK(
+                    self.previous_gray, gray, 
+                    np.array([[x, y] for x in range(0, gray.shape[1], 20) 
+                             for y in range(0, gray.shape[0], 20)], dtype=np.float32), 
+                    None, **self.lk_params
+                )
             
-            if flow[0] is not None:
-                good_points = flow[0][flow[1].ravel() == 1]
-                flow_vectors = flow[0] - np.array([[x, y] for x in range(0, gray.shape[1], 20) 
-                                                  for y in range(0, gray.shape[0], 20)], dtype=np.float32)
+                if flow[0] is not None:
+                    good_points = flow[0][flow[1].ravel() == 1]
+                    flow_vectors = flow[0] - np.array([[x, y] for x in range(0, gray.shape[1], 20) 
+                                                      for y in range(0, gray.shape[0], 20)], dtype=np.float32)
         
         # 모션 정보 업데이트
         motion_info = {
@@ -215,10 +231,70 @@ class MotionTracker:
         # 구현 세부사항은 실제 프레임 크기에 따라 조정
         return flow_vectors  # 단순화된 버전
 
+OBJECT_DETECTION_MODES = ('full', 'motion')
+
+
+def _rects_overlap(a, b):
+    """(x1, y1, x2, y2) 사각형 겹침 여부"""
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _merge_rects(rects):
+    """겹치는 사각형을 외접 사각형으로 합침 (같은 픽셀을 두 번 검사하지 않도록)"""
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if _rects_overlap(a, b):
+                    merged[i] = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def _offset_detection(detection, dx, dy):
+    """잘라낸 영역 기준 좌표를 프레임 좌표로 변환"""
+    if dx == 0 and dy == 0:
+        return detection
+    moved = dict(detection)
+    cx, cy = detection['center']
+    moved['center'] = (type(cx)(cx + dx), type(cy)(cy + dy))
+    if 'bbox' in detection:
+        x, y, w, h = detection['bbox']
+        moved['bbox'] = (x + dx, y + dy, w, h)
+    if 'contour' in detection:
+        moved['contour'] = detection['contour'] + np.array([dx, dy], dtype=detection['contour'].dtype)
+    return moved
+
+
 class ObjectDetector:
-    """포커 객체 감지 시스템 (카드, 칩)"""
+    """
+    포커 객체 감지 시스템 (카드, 칩)
     
-    def __init__(self):
+    region_mode='full'은 매 프레임 전체를 검사하고, 'motion'은 모션 영역(여백 포함)과
+    고정 테이블 ROI(팟, 플레이어 자리)만 검사함. 모션이 닿지 않은 ROI는 이전 결과를 재사용하고
+    static_refresh_interval번 호출마다 다시 검사함
+    """
+    
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, region_mode: str = 'full',
+                 motion_margin: int = 40, static_refresh_interval: int = 30):
+        if region_mode not in OBJECT_DETECTION_MODES:
+            raise ValueError(f"알 수 없는 객체 감지 모드: {region_mode} (가능: {', '.join(OBJECT_DETECTION_MODES)})")
+        self.instrumentation = instrumentation or Instrumentation()
+        self.region_mode = region_mode
+        self.motion_margin = motion_margin
+        self.static_refresh_interval = static_refresh_interval
+        
+        # 정적 ROI 결과 캐시: 종류('cards'/'chips') → ROI 이름 → (검사 시점 호출 번호, 결과)
+        self._region_cache: Dict[str, Dict[str, Tuple[int, List[Dict]]]] = {'cards': {}, 'chips': {}}
+        self._region_calls = {'cards': 0, 'chips': 0}
+        
         # 카드 감지 파라미터
         self.card_size_range = (800, 8000)  # 픽셀 영역
         self.card_aspect_ratio_range = (1.2, 1.8)
@@ -237,22 +313,27 @@ class ObjectDetector:
         self.pot_region = None
         self.dealer_region = None
     
-    def detect_cards(self, frame):
-        """카드 감지"""
-        cards = []
+    def detect_cards(self, frame, motion_regions=None):
+        """카드 감지 (motion 모드에서는 motion_regions와 고정 ROI만 검사)"""
+        with self.instrumentation.stage('objects.cards'):
+            if self._use_regions(motion_regions):
+                cards = self._detect_in_regions(frame, motion_regions, 'cards', self._find_cards)
+            else:
+                cards = self._find_cards(frame)
+            
+            # 중복 제거 및 검증
+            verified_cards = self._verify_and_merge_cards(cards)
         
+        self.instrumentation.count('objects.cards_found', len(verified_cards))
+        return verified_cards
+    
+    def _find_cards(self, frame):
         # 형태 기반 감지
-        shape_cards = self._detect_cards_by_shape(frame)
-        cards.extend(shape_cards)
+        cards = self._detect_cards_by_shape(frame)
         
         # 색상 기반 감지
-        color_cards = self._detect_cards_by_color(frame)
-        cards.extend(color_cards)
-        
-        # 중복 제거 및 검증
-        verified_cards = self._verify_and_merge_cards(cards)
-        
-        return verified_cards
+        cards.extend(self._detect_cards_by_color(frame))
+        return cards
     
     def _detect_cards_by_shape(self, frame):
         """형태 기반 카드 감지"""
@@ -356,8 +437,19 @@ class ObjectDetector:
         
         return merged_cards
     
-    def detect_chips(self, frame):
-        """칩 감지"""
+    def detect_chips(self, frame, motion_regions=None):
+        """칩 감지 (motion 모드에서는 motion_regions와 고정 ROI만 검사)"""
+        with self.instrumentation.stage('objects.chips'):
+            if self._use_regions(motion_regions):
+                all_chips = self._merge_chips(
+                    self._detect_in_regions(frame, motion_regions, 'chips', self._detect_chips)
+                )
+            else:
+                all_chips = self._detect_chips(frame)
+        self.instrumentation.count('objects.chips_found', len(all_chips))
+        return all_chips
+    
+    def _detect_chips(self, frame):
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         all_chips = []
         
@@ -386,8 +478,83 @@ class ObjectDetector:
         
         return all_chips
     
+    def _merge_chips(self, chips):
+        """영역 경계에서 두 번 잡힌 칩 제거 (같은 색, 반지름 이내)"""
+        merged = []
+        for chip in chips:
+            if not any(
+                chip['color'] == existing['color'] and
+                abs(int(chip['center'][0]) - int(existing['center'][0])) <= existing['radius'] and
+                abs(int(chip['center'][1]) - int(existing['center'][1])) <= existing['radius']
+                for existing in merged
+            ):
+                merged.append(chip)
+        return merged
+    
+    def _use_regions(self, motion_regions) -> bool:
+        return self.region_mode == 'motion' and motion_regions is not None and self.pot_region is not None
+    
+    def fixed_regions(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """고정 테이블 ROI (이름 → x1, y1, x2, y2)"""
+        regions = {}
+        if self.pot_region is not None:
+            regions['pot'] = self.pot_region
+        for seat, region in self.player_regions.items():
+            regions[f'player_{seat}'] = region
+        return {name: (r['x1'], r['y1'], r['x2'], r['y2']) for name, r in regions.items()}
+    
+    def _detect_in_regions(self, frame, motion_regions, kind: str, detect):
+        """
+        모션 영역과 고정 ROI에서만 감지
+        
+        모션이 닿은 ROI는 모션 영역과 합쳐 다시 검사하고, 나머지 ROI는 캐시를 사용
+        """
+        height, width = frame.shape[:2]
+        margin = self.motion_margin
+        inst = self.instrumentation
+        self._region_calls[kind] += 1
+        calls = self._region_calls[kind]
+        cache = self._region_cache[kind]
+        
+        motion_rects = [
+            (max(0, x - margin), max(0, y - margin), min(width, x + w + margin), min(height, y + h + margin))
+            for x, y, w, h in (region['bbox'] for region in motion_regions)
+        ]
+        
+        detections = []
+        scan_rects = list(motion_rects)
+        dirty = []
+        for name, rect in self.fixed_regions().items():
+            cached = cache.get(name)
+            if (cached is not None and calls - cached[0] < self.static_refresh_interval and
+                    not any(_rects_overlap(rect, m) for m in motion_rects)):
+                detections.extend(dict(d) for d in cached[1])
+                inst.count(f'objects.{kind}_cache_hits')
+                continue
+            dirty.append((name, rect))
+            scan_rects.append(rect)
+        
+        scanned = []
+        for x1, y1, x2, y2 in _merge_rects(scan_rects):
+            if x2 - x1 < 2 or y2 - y1 < 2:
+                continue
+            inst.count(f'objects.{kind}_scanned_pixels', (x2 - x1) * (y2 - y1))
+            found = [_offset_detection(d, x1, y1) for d in detect(frame[y1:y2, x1:x2])]
+            scanned.append(((x1, y1, x2, y2), found))
+            detections.extend(found)
+        
+        # 다시 검사한 ROI는 중심이 ROI 안에 있는 결과로 캐시 갱신
+        for name, (x1, y1, x2, y2) in dirty:
+            cache[name] = (calls, [
+                dict(d) for rect, found in scanned if _rects_overlap(rect, (x1, y1, x2, y2))
+                for d in found if x1 <= d['center'][0] < x2 and y1 <= d['center'][1] < y2
+            ])
+        return detections
+    
     def set_regions(self, frame_shape):
-        """ROI 영역 설정"""
+        """ROI 영역 설정 (영상이 바뀌므로 ROI 결과 캐시도 초기화)"""
+        for cache in self._region_cache.values():
+            cache.clear()
         height, width = frame_shape[:2]
         
         # 기본 영역 설정 (실제로는 더 정교하게 설정)
@@ -415,13 +582,21 @@ class ObjectDetector:
 class HandBoundaryDetector:
     """핸드 경계 감지 메인 클래스"""
     
-    def __init__(self):
-        self.motion_tracker = MotionTracker()
-        self.object_detector = ObjectDetector()
+    def __init__(self, instrumentation: Optional[Instrumentation] = None, object_detection: str = 'full'):
+        """
+        Args:
+            instrumentation: 단계별 계측 (모션/객체 감지기와 공유, 실행마다 초기화)
+            object_detection: 'full'(매 프레임 전체 검사) 또는 'motion'(모션 영역 + 고정 ROI만 검사)
+        """
+        self.instrumentation = instrumentation or Instrumentation()
+        self.last_run_stats: Optional[Dict] = None
+        self.motion_tracker = MotionTracker(self.instrumentation)
+        self.object_detector = ObjectDetector(self.instrumentation, region_mode=object_detection)
         
         # 상태 관리
         self.current_hand_start = None
         self.detected_hands = []
+        self.next_hand_id = 1
         self.frame_count = 0
         self.fps = 30
         
@@ -437,15 +612,19 @@ class HandBoundaryDetector:
         self.dealing_motion_count = 0
         self.collection_motion_count = 0
         
-    def analyze_video(self, video_path: str, output_path: str = None, progress_callback=None) -> str:
-        """비디오 분석 메인 함수 (파일 경로 기반)"""
+    def analyze_video(self, video_path: str, output_path: str = None, progress_callback=None,
+                      skip_list: Optional[SkipList] = None) -> str:
+        """비디오 분석 메인 함수 (파일 경로 기반, skip_list 구간은 건너뜀)"""
         logger.info(f"핸드 경계 감지 시작: {video_path}")
         
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise ValueError(f"비디오를 열 수 없습니다: {video_path}")
         
-        return self._analyze_video_capture(cap, output_path, progress_callback, source_info={'type': 'file', 'path': video_path})
+        return self._analyze_video_capture(cap, output_path, progress_callback,
+                                           source_info={'type': 'file', 'path': video_path},
+                                           skip_list=skip_list,
+                                           properties=capture_properties(video_path, cap))
     
     def analyze_stream(self, video_capture: cv2.VideoCapture, source_info: dict, output_path: str = None, progress_callback=None) -> str:
         """비디오 스트림 분석 메인 함수 (VideoCapture 객체 기반)"""
@@ -456,10 +635,18 @@ class HandBoundaryDetector:
         
         return self._analyze_video_capture(video_capture, output_path, progress_callback, source_info)
     
-    def _analyze_video_capture(self, cap: cv2.VideoCapture, output_path: str = None, progress_callback=None, source_info: dict = None) -> str:
-        """VideoCapture 객체를 이용한 실제 분석 로직"""
-        self.fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    def _analyze_video_capture(self, cap: cv2.VideoCapture, output_path: str = None, progress_callback=None,
+                               source_info: dict = None, skip_list: Optional[SkipList] = None,
+                               properties: Optional[Tuple[float, int]] = None) -> str:
+        """VideoCapture 객체를 이용한 실제 분석 로직 (properties: 미리 조사한 (fps, 총 프레임 수))"""
+        inst = self.instrumentation
+        inst.reset()
+        
+        if properties is not None:
+            self.fps, total_frames = properties
+        else:
+            self.fps = cap.get(cv2.CAP_PROP_FPS)
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         # 첫 번째 프레임으로 ROI 설정
         ret, first_frame = cap.read()
@@ -474,12 +661,22 @@ class HandBoundaryDetector:
         else:
             logger.info(f"총 {total_frames} 프레임, {self.fps} FPS")
         
-        hand_id = 1
-        
         while True:
-            ret, frame = cap.read()
+            # 정적/테이블 외 구간은 seek로 건너뜀
+            if skip_list is not None:
+                resume = skip_list.resume_frame(self.frame_count, self.fps)
+                if resume is not None:
+                    with inst.stage('seek'):
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, resume)
+                    inst.count('frames_skipped', resume - self.frame_count)
+                    self.frame_count = resume
+                    continue
+            
+            with inst.stage('decode'):
+                ret, frame = cap.read()
             if not ret:
                 break
+            inst.count('frames')
             
             current_time = self.frame_count / self.fps
             
@@ -497,77 +694,116 @@ class HandBoundaryDetector:
                     progress_info['progress_percent'] = (self.frame_count / total_frames) * 100
                 else:
                     progress_info['progress_percent'] = 0
+                if inst.enabled:
+                    progress_info['instrumentation'] = inst.snapshot()
                 
                 try:
                     progress_callback(progress_info)
                 except Exception as e:
                     logger.warning(f"진행률 콜백 오류: {e}")
             
-            # 모션 추적 업데이트
-            motion_info = self.motion_tracker.update(frame)
-            
-            # 핸드 시작 감지
-            if self.current_hand_start is None:
-                is_start, confidence, indicators = self._detect_hand_start(
-                    frame, motion_info, current_time
-                )
-                
-                if is_start:
-                    self.current_hand_start = DetectionEvent(
-                        event_type='hand_start',
-                        frame_number=self.frame_count,
-                        timestamp=current_time,
-                        confidence=confidence,
-                        indicators=indicators,
-                        details={'hand_id': hand_id}
-                    )
-                    logger.info(f"핸드 {hand_id} 시작 감지: {current_time:.2f}초 (신뢰도: {confidence:.1f})")
-            
-            # 핸드 종료 감지
-            else:
-                # 최소 30초 후부터 종료 감지
-                if current_time - self.current_hand_start.timestamp > 30:
-                    is_end, confidence, indicators = self._detect_hand_end(
-                        frame, motion_info, current_time
-                    )
-                    
-                    if is_end:
-                        # 핸드 완성
-                        duration = current_time - self.current_hand_start.timestamp
-                        overall_confidence = (self.current_hand_start.confidence + confidence) / 2
-                        
-                        hand_boundary = HandBoundary(
-                            hand_id=hand_id,
-                            start_frame=self.current_hand_start.frame_number,
-                            end_frame=self.frame_count,
-                            start_time=self.current_hand_start.timestamp,
-                            end_time=current_time,
-                            duration=duration,
-                            start_confidence=self.current_hand_start.confidence,
-                            end_confidence=confidence,
-                            overall_confidence=overall_confidence,
-                            start_indicators=self.current_hand_start.indicators,
-                            end_indicators=indicators
-                        )
-                        
-                        self.detected_hands.append(hand_boundary)
-                        logger.info(f"핸드 {hand_id} 종료 감지: {current_time:.2f}초 "
-                                  f"(지속시간: {duration:.1f}초, 신뢰도: {overall_confidence:.1f})")
-                        
-                        # 다음 핸드 준비
-                        self.current_hand_start = None
-                        hand_id += 1
+            with inst.stage('process_frame'):
+                self.process_frame(frame, current_time, self.frame_count)
             
             self.frame_count += 1
             
             # 진행률 표시
-            if self.frame_count % 900 == 0:  # 30초마다
+            if total_frames and self.frame_count % 900 == 0:  # 30초마다
                 progress = (self.frame_count / total_frames) * 100
                 logger.info(f"진행률: {progress:.1f}% ({self.frame_count}/{total_frames})")
         
         cap.release()
         
-        # 결과 후처리 및 저장
+        with inst.stage('save'):
+            result_path = self.save_results(output_path, source_info)
+        
+        self.last_run_stats = inst.snapshot()
+        if inst.enabled:
+            top = sorted(self.last_run_stats['stages'].items(), key=lambda kv: -kv[1]['total_ms'])[:5]
+            logger.info("단계별 소요 시간: " + ", ".join(
+                f"{name} {stats['total_ms'] / 1000:.1f}초 ({stats['share']:.0%})" for name, stats in top
+            ))
+        return result_path
+    
+    def process_frame(self, frame, current_time: float, frame_number: int) -> Optional[DetectionEvent]:
+        """
+        프레임 하나를 처리해 핸드 시작/종료 상태를 갱신
+        
+        Returns:
+            핸드 시작 또는 종료가 감지되면 해당 DetectionEvent (종료 이벤트의 details['hand']에 핸드 정보)
+        """
+        # 모션 추적 업데이트
+        motion_info = self.motion_tracker.update(frame)
+        
+        # 핸드 시작 감지
+        if self.current_hand_start is None:
+            is_start, confidence, indicators = self._detect_hand_start(
+                frame, motion_info, current_time
+            )
+            
+            if is_start:
+                self.current_hand_start = DetectionEvent(
+                    event_type='hand_start',
+                    frame_number=frame_number,
+                    timestamp=current_time,
+                    confidence=confidence,
+                    indicators=indicators,
+                    details={'hand_id': self.next_hand_id}
+                )
+                logger.info(f"핸드 {self.next_hand_id} 시작 감지: {current_time:.2f}초 (신뢰도: {confidence:.1f})")
+                return self.current_hand_start
+            
+            return None
+        
+        # 핸드 종료 감지 - 최소 30초 후부터
+        if current_time - self.current_hand_start.timestamp <= 30:
+            return None
+        
+        is_end, confidence, indicators = self._detect_hand_end(
+            frame, motion_info, current_time
+        )
+        
+        if not is_end:
+            return None
+        
+        # 핸드 완성
+        hand_id = self.next_hand_id
+        duration = current_time - self.current_hand_start.timestamp
+        overall_confidence = (self.current_hand_start.confidence + confidence) / 2
+        
+        hand_boundary = HandBoundary(
+            hand_id=hand_id,
+            start_frame=self.current_hand_start.frame_number,
+            end_frame=frame_number,
+            start_time=self.current_hand_start.timestamp,
+            end_time=current_time,
+            duration=duration,
+            start_confidence=self.current_hand_start.confidence,
+            end_confidence=confidence,
+            overall_confidence=overall_confidence,
+            start_indicators=self.current_hand_start.indicators,
+            end_indicators=indicators
+        )
+        
+        self.detected_hands.append(hand_boundary)
+        logger.info(f"핸드 {hand_id} 종료 감지: {current_time:.2f}초 "
+                  f"(지속시간: {duration:.1f}초, 신뢰도: {overall_confidence:.1f})")
+        
+        # 다음 핸드 준비
+        self.current_hand_start = None
+        self.next_hand_id += 1
+        
+        return DetectionEvent(
+            event_type='hand_end',
+            frame_number=frame_number,
+            timestamp=current_time,
+            confidence=confidence,
+            indicators=indicators,
+            details={'hand_id': hand_id, 'hand': hand_boundary.to_dict()}
+        )
+    
+    def save_results(self, output_path: str = None, source_info: dict = None) -> str:
+        """감지된 핸드를 검증 후 JSON으로 저장"""
         validated_hands = self._validate_hands(self.detected_hands)
         
         if output_path is None:
@@ -599,7 +835,7 @@ class HandBoundaryDetector:
         confidence_scores = {}
         
         # 1. 새로운 카드 출현 감지 (35점)
-        cards = self.object_detector.detect_cards(frame)
+        cards = self.object_detector.detect_cards(frame, motion_info['motion_regions'])
         current_card_count = len(cards)
         self.card_count_history.append(current_card_count)
         
@@ -674,7 +910,7 @@ class HandBoundaryDetector:
             confidence_scores['pot_collection'] = 0
         
         # 2. 칩 분포 변화 (30점)
-        chips = self.object_detector.detect_chips(frame)
+        chips = self.object_detector.detect_chips(frame, motion_info['motion_regions'])
         central_chips = self._count_central_chips(chips)
         
         if central_chips == 0:  # 중앙 팟에 칩이 없음
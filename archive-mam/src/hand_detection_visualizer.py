@@ -2,22 +2,195 @@
 """
 핸드 감지 시각화 도구
 실시간으로 감지 과정을 시각화하여 디버깅 및 튜닝에 활용
+
+감지 스레드는 프레임마다 가벼운 어노테이션 레코드만 만들고, 오버레이 그리기와 인코딩은
+렌더 파이프라인(스레드 풀 + 인코더 스레드)이 따로 처리함. 출력은 ffmpeg 파이프로 하나의 영상에 인코딩
 """
 import cv2
 import numpy as np
 import json
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 import argparse
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+try:
+    from .hand_boundary_detector import HandBoundaryDetector, MotionTracker, ObjectDetector
+    from .ffmpeg_frame_reader import FFmpegFrameWriter, ffmpeg_available
+except ImportError:
+    from hand_boundary_detector import HandBoundaryDetector, MotionTracker, ObjectDetector
+    from ffmpeg_frame_reader import FFmpegFrameWriter, ffmpeg_available
+
+
+@dataclass
+class FrameAnnotation:
+    """프레임 하나의 감지 결과 (원본 해상도 좌표, 렌더링에 필요한 값만)"""
+    frame_idx: int
+    timestamp: float
+    motion_regions: List[Dict] = field(default_factory=list)  # bbox, center, area
+    total_motion_area: int = 0
+    cards: List[Dict] = field(default_factory=list)  # bbox, confidence
+    chips: List[Dict] = field(default_factory=list)  # center, radius, color
+    hand_status: Optional[Dict] = None  # 감지 시점의 핸드 상태 사본
+    dealing_score: float = 0.0
+    collection_score: float = 0.0
+    boundary: Optional[str] = None  # 이 프레임에서 감지된 경계 ('start' / 'end')
+
+
+class OpenCVFrameWriter:
+    """ffmpeg가 없을 때의 대체 인코더 (cv2.VideoWriter, mp4v)"""
+
+    def __init__(self, output_path: str, width: int, height: int, fps: float):
+        self.frames_written = 0
+        self._writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+
+    def write(self, frame: np.ndarray):
+        self._writer.write(frame)
+        self.frames_written += 1
+
+    def close(self):
+        self._writer.release()
+
+
+def open_frame_writer(output_path: str, width: int, height: int, fps: float):
+    """ffmpeg 파이프 인코더 (없으면 OpenCV 인코더)"""
+    if ffmpeg_available():
+        return FFmpegFrameWriter(output_path, width, height, fps)
+    print("ffmpeg를 찾을 수 없어 OpenCV로 인코딩")
+    return OpenCVFrameWriter(output_path, width, height, fps)
+
+
+class RenderPipeline:
+    """
+    어노테이션 렌더링/인코딩 파이프라인
+
+    - submit()은 프레임과 어노테이션을 렌더 풀에 넘기기만 하고 바로 반환
+      (진행 중인 프레임이 max_pending개를 넘으면 대기 → 메모리 상한)
+    - 인코더 스레드가 렌더 결과를 순서대로 writer에 씀
+    - scale < 1이면 축소 해상도로 렌더링
+    - boundary_window(초)가 있으면 핸드 경계 전후 구간만 렌더링 (경계 이전 프레임은 축소해 링 버퍼에 보관)
+    """
+
+    def __init__(self, draw: Callable[[np.ndarray, FrameAnnotation, float], np.ndarray],
+                 writer=None, scale: float = 1.0, workers: int = 2, max_pending: Optional[int] = None,
+                 boundary_window: Optional[float] = None, fps: float = 30.0,
+                 frames_dir: Optional[Path] = None, frame_interval: int = 30,
+                 preview_interval: int = 0):
+        self.draw = draw
+        self.writer = writer
+        self.scale = scale
+        self.frames_dir = frames_dir
+        self.frame_interval = frame_interval
+        self.preview_interval = preview_interval
+        self.latest_frame = None  # 미리보기용 최근 렌더 프레임
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='render')
+        self._futures = queue.Queue(maxsize=max_pending or max(1, workers) * 4)
+        self._error = None
+        self._encoder = threading.Thread(target=self._encode_loop, name='render-encoder', daemon=True)
+        self._encoder.start()
+
+        self._window_frames = int(round(boundary_window * fps)) if boundary_window else None
+        self._ring = deque(maxlen=self._window_frames or 1)
+        self._render_until = -1
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        if self.scale == 1.0:
+            return frame
+        return cv2.resize(frame, scaled_size(frame.shape[1], frame.shape[0], self.scale),
+                          interpolation=cv2.INTER_AREA)
+
+    def _render(self, frame: np.ndarray, annotation: FrameAnnotation, prepared: bool) -> np.ndarray:
+        # 링 버퍼에서 온 프레임은 이미 축소되어 있음
+        rendered = self.draw(frame if prepared else self._prepare(frame), annotation, self.scale)
+        if self.frames_dir is not None and annotation.frame_idx % self.frame_interval == 0:
+            cv2.imwrite(str(self.frames_dir / f"frame_{annotation.frame_idx:06d}.jpg"), rendered)
+        return rendered
+
+    def _encode_loop(self):
+        while True:
+            future = self._futures.get()
+            if future is None:
+                return
+            if self._error is not None:
+                continue  # 실패 후에는 남은 작업만 비움
+            try:
+                rendered = future.result()
+                if self.writer is not None:
+                    self.writer.write(rendered)
+                self.rendered_frames += 1
+                if self.preview_interval and self.rendered_frames % self.preview_interval == 0:
+                    self.latest_frame = rendered
+            except Exception as e:
+                self._error = e
+
+    def _enqueue(self, frame: np.ndarray, annotation: FrameAnnotation, prepared: bool = False):
+        self._futures.put(self._pool.submit(self._render, frame, annotation, prepared))
+
+    def submit(self, frame: np.ndarray, annotation: FrameAnnotation):
+        """렌더링 예약 (프레임은 이후 수정하지 않아야 함)"""
+        if self._error is not None:
+            raise RuntimeError(f"렌더링 실패: {self._error}") from self._error
+
+        if self._window_frames is None:
+            self._enqueue(frame, annotation)
+            return
+
+        if annotation.boundary is not None:
+            # 경계 직전 구간부터 렌더링
+            while self._ring:
+                self._enqueue(*self._ring.popleft(), prepared=True)
+            self._render_until = annotation.frame_idx + self._window_frames
+
+        if annotation.frame_idx <= self._render_until:
+            self._enqueue(frame, annotation)
+        else:
+            if len(self._ring) == self._ring.maxlen:
+                self.skipped_frames += 1
+            self._ring.append((self._prepare(frame), annotation))
+
+    def close(self):
+        """남은 프레임을 모두 인코딩하고 writer를 닫음"""
+        self.skipped_frames += len(self._ring)
+        self._ring.clear()
+        self._futures.put(None)
+        self._encoder.join()
+        self._pool.shutdown(wait=True)
+        if self.writer is not None:
+            self.writer.close()
+        if self._error is not None:
+            raise RuntimeError(f"렌더링 실패: {self._error}") from self._error
+
+
+def scaled_size(width: int, height: int, scale: float) -> Tuple[int, int]:
+    """축소 해상도 (yuv420p 인코딩을 위해 짝수로 맞춤)"""
+    if scale == 1.0:
+        return width, height
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
 
-from hand_boundary_detector import HandBoundaryDetector, MotionTracker, ObjectDetector
 
 class HandDetectionVisualizer:
     """핸드 감지 과정 시각화"""
     
-    def __init__(self, show_debug=True):
+    def __init__(self, show_debug=True, render_scale: float = 1.0, render_workers: int = 2,
+                 boundary_window: Optional[float] = None):
+        """
+        Args:
+            render_scale: 출력 영상 해상도 배율 (예: 0.5)
+            render_workers: 오버레이 렌더링 스레드 수
+            boundary_window: 지정하면 핸드 경계 전후 이 시간(초)만 출력 영상에 포함
+        """
         self.detector = HandBoundaryDetector()
         self.show_debug = show_debug
+        self.render_scale = render_scale
+        self.render_workers = render_workers
+        self.boundary_window = boundary_window
         
         # 시각화 색상 정의
         self.colors = {
@@ -35,27 +208,30 @@ class HandDetectionVisualizer:
         self.current_hand_info = None
         self.detection_history = []
     
-    def visualize_video(self, video_path: str, output_path: str = None, save_frames: bool = False):
-        """비디오 분석과 동시에 시각화"""
+    def visualize_video(self, video_path: str, output_path: str = None, save_frames: bool = False) -> Dict[str, Any]:
+        """
+        비디오 분석과 동시에 시각화
+        
+        감지 결과는 어노테이션 레코드로 렌더 파이프라인에 넘기고, 렌더링/인코딩은 별도 스레드에서 진행.
+        감지된 핸드 경계 목록과 프레임 수를 반환
+        """
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise ValueError(f"비디오를 열 수 없습니다: {video_path}")
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
         print(f"비디오 정보: {width}x{height}, {fps} FPS, {total_frames} 프레임")
         
-        # 출력 비디오 설정
-        if output_path:
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_path, fourcc, fps, (width * 2, height))
-        else:
-            out = None
+        # 출력 비디오 설정 (원본/디버그 화면을 나란히)
+        out_width, out_height = scaled_size(width, height, self.render_scale)
+        writer = open_frame_writer(output_path, out_width * 2, out_height, fps) if output_path else None
         
         # 프레임 저장 디렉토리
+        frames_dir = None
         if save_frames:
             frames_dir = Path("debug_frames")
             frames_dir.mkdir(exist_ok=True)
@@ -66,115 +242,157 @@ class HandDetectionVisualizer:
             self.detector.object_detector.set_regions(first_frame.shape)
             cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
         
+        pipeline = None
+        if writer is not None or frames_dir is not None or self.show_debug:
+            pipeline = RenderPipeline(
+                self.render_annotation, writer=writer, scale=self.render_scale,
+                workers=self.render_workers, boundary_window=self.boundary_window, fps=fps,
+                frames_dir=frames_dir, preview_interval=5 if self.show_debug else 0
+            )
+        
         hand_id = 1
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            current_time = self.frame_count / fps
-            
-            # 원본 프레임 복사
-            display_frame = frame.copy()
-            debug_frame = np.zeros_like(frame)
-            
-            # 모션 추적 및 객체 감지
-            motion_info = self.detector.motion_tracker.update(frame)
-            cards = self.detector.object_detector.detect_cards(frame)
-            chips = self.detector.object_detector.detect_chips(frame)
-            
-            # 핸드 감지 로직
-            if self.detector.current_hand_start is None:
-                is_start, confidence, indicators = self.detector._detect_hand_start(
-                    frame, motion_info, current_time
-                )
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
                 
-                if is_start:
-                    self.detector.current_hand_start = {
-                        'hand_id': hand_id,
-                        'frame': self.frame_count,
-                        'time': current_time,
-                        'confidence': confidence,
-                        'indicators': indicators
-                    }
-                    self.current_hand_info = {
-                        'status': 'in_progress',
-                        'start_time': current_time,
-                        'hand_id': hand_id
-                    }
-                    print(f"핸드 {hand_id} 시작 감지: {current_time:.2f}초 (신뢰도: {confidence:.1f})")
-            else:
-                # 최소 30초 후부터 종료 감지
-                if current_time - self.detector.current_hand_start['time'] > 30:
-                    is_end, confidence, indicators = self.detector._detect_hand_end(
+                current_time = self.frame_count / fps
+                boundary = None
+                
+                # 모션 추적 및 객체 감지
+                motion_info = self.detector.motion_tracker.update(frame)
+                cards = self.detector.object_detector.detect_cards(frame)
+                chips = self.detector.object_detector.detect_chips(frame)
+                
+                # 핸드 감지 로직
+                if self.detector.current_hand_start is None:
+                    is_start, confidence, indicators = self.detector._detect_hand_start(
                         frame, motion_info, current_time
                     )
                     
-                    if is_end:
-                        duration = current_time - self.detector.current_hand_start['time']
-                        print(f"핸드 {hand_id} 종료 감지: {current_time:.2f}초 (길이: {duration:.1f}초)")
-                        
+                    if is_start:
+                        self.detector.current_hand_start = {
+                            'hand_id': hand_id,
+                            'frame': self.frame_count,
+                            'time': current_time,
+                            'confidence': confidence,
+                            'indicators': indicators
+                        }
                         self.current_hand_info = {
-                            'status': 'completed',
-                            'end_time': current_time,
-                            'duration': duration
+                            'status': 'in_progress',
+                            'start_time': current_time,
+                            'hand_id': hand_id
                         }
+                        boundary = 'start'
+                        self.detection_history.append({'type': 'start', 'hand_id': hand_id,
+                                                       'frame': self.frame_count, 'time': current_time})
+                        print(f"핸드 {hand_id} 시작 감지: {current_time:.2f}초 (신뢰도: {confidence:.1f})")
+                else:
+                    # 최소 30초 후부터 종료 감지
+                    if current_time - self.detector.current_hand_start['time'] > 30:
+                        is_end, confidence, indicators = self.detector._detect_hand_end(
+                            frame, motion_info, current_time
+                        )
                         
-                        self.detector.current_hand_start = None
-                        hand_id += 1
-            
-            # 시각화 수행
-            self._draw_motion_regions(display_frame, debug_frame, motion_info)
-            self._draw_detected_objects(display_frame, debug_frame, cards, chips)
-            self._draw_roi_regions(display_frame, debug_frame)
-            self._draw_hand_status(display_frame, current_time)
-            self._draw_detection_info(debug_frame, motion_info, cards, chips, current_time)
-            
-            # 두 프레임을 나란히 결합
-            combined_frame = np.hstack([display_frame, debug_frame])
-            
-            # 비디오 저장
-            if out:
-                out.write(combined_frame)
-            
-            # 프레임 저장
-            if save_frames and self.frame_count % 30 == 0:  # 1초마다
-                frame_path = frames_dir / f"frame_{self.frame_count:06d}.jpg"
-                cv2.imwrite(str(frame_path), combined_frame)
-            
-            # 실시간 표시 (선택사항)
-            if self.show_debug and self.frame_count % 5 == 0:  # 5프레임마다 표시
-                resized = cv2.resize(combined_frame, (1280, 360))
-                cv2.imshow('Hand Detection Debug', resized)
+                        if is_end:
+                            duration = current_time - self.detector.current_hand_start['time']
+                            print(f"핸드 {hand_id} 종료 감지: {current_time:.2f}초 (길이: {duration:.1f}초)")
+                            
+                            self.current_hand_info = {
+                                'status': 'completed',
+                                'end_time': current_time,
+                                'duration': duration
+                            }
+                            boundary = 'end'
+                            self.detection_history.append({'type': 'end', 'hand_id': hand_id,
+                                                           'frame': self.frame_count, 'time': current_time})
+                            
+                            self.detector.current_hand_start = None
+                            hand_id += 1
                 
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    break
-                elif key == ord(' '):  # 스페이스바로 일시정지
-                    cv2.waitKey(0)
-            
-            self.frame_count += 1
-            
-            # 진행률 표시
-            if self.frame_count % 300 == 0:
-                progress = (self.frame_count / total_frames) * 100
-                print(f"진행률: {progress:.1f}%")
-        
-        # 정리
-        cap.release()
-        if out:
-            out.release()
-        cv2.destroyAllWindows()
+                # 그리기는 렌더 풀에서 (감지 스레드는 어노테이션만 생성)
+                if pipeline is not None:
+                    pipeline.submit(frame, self._annotate(motion_info, cards, chips, current_time, boundary))
+                    
+                    # 실시간 표시 (선택사항, 렌더링이 끝난 최근 프레임)
+                    if self.show_debug and self.frame_count % 5 == 0 and pipeline.latest_frame is not None:
+                        resized = cv2.resize(pipeline.latest_frame, (1280, 360))
+                        cv2.imshow('Hand Detection Debug', resized)
+                        
+                        key = cv2.waitKey(1) & 0xFF
+                        if key == ord('q'):
+                            break
+                        elif key == ord(' '):  # 스페이스바로 일시정지
+                            cv2.waitKey(0)
+                
+                self.frame_count += 1
+                
+                # 진행률 표시
+                if self.frame_count % 300 == 0:
+                    progress = (self.frame_count / total_frames) * 100
+                    print(f"진행률: {progress:.1f}%")
+        finally:
+            # 정리
+            cap.release()
+            if pipeline is not None:
+                pipeline.close()
+            if self.show_debug:
+                cv2.destroyAllWindows()
         
         print(f"시각화 완료: {self.frame_count} 프레임 처리")
         if output_path:
-            print(f"결과 비디오 저장: {output_path}")
+            print(f"결과 비디오 저장: {output_path} ({pipeline.rendered_frames} 프레임)")
+        
+        return {
+            'frames': self.frame_count,
+            'rendered_frames': pipeline.rendered_frames if pipeline else 0,
+            'boundaries': list(self.detection_history)
+        }
+    
+    def _annotate(self, motion_info, cards, chips, current_time, boundary=None) -> FrameAnnotation:
+        """감지 결과에서 렌더링에 필요한 값만 복사 (감지기 상태는 렌더 스레드에서 읽지 않음)"""
+        return FrameAnnotation(
+            frame_idx=self.frame_count,
+            timestamp=current_time,
+            motion_regions=[
+                {'bbox': region['bbox'], 'center': region['center'], 'area': region['area']}
+                for region in motion_info['motion_regions']
+            ],
+            total_motion_area=motion_info['total_motion_area'],
+            cards=[
+                {'bbox': card['bbox'], 'confidence': card.get('confidence', 0)}
+                for card in cards if 'bbox' in card
+            ],
+            chips=[
+                {'center': chip['center'], 'radius': chip['radius'], 'color': chip['color']}
+                for chip in chips
+            ],
+            hand_status=dict(self.current_hand_info) if self.current_hand_info else None,
+            dealing_score=self.detector.motion_tracker.analyze_motion_pattern('dealing'),
+            collection_score=self.detector.motion_tracker.analyze_motion_pattern('collection'),
+            boundary=boundary
+        )
     
-    def _draw_motion_regions(self, display_frame, debug_frame, motion_info):
+    def render_annotation(self, frame: np.ndarray, annotation: FrameAnnotation, scale: float = 1.0) -> np.ndarray:
+        """어노테이션을 그린 원본/디버그 결합 프레임 (frame은 이미 scale 배율로 축소된 상태)"""
+        display_frame = frame.copy()
+        debug_frame = np.zeros_like(frame)
+        
+        self._draw_motion_regions(display_frame, debug_frame, annotation.motion_regions, scale)
+        self._draw_detected_objects(display_frame, debug_frame, annotation.cards, annotation.chips, scale)
+        self._draw_roi_regions(display_frame, debug_frame, scale)
+        self._draw_hand_status(display_frame, annotation)
+        self._draw_detection_info(debug_frame, annotation)
+        
+        # 두 프레임을 나란히 결합
+        return np.hstack([display_frame, debug_frame])
+    
+    def _draw_motion_regions(self, display_frame, debug_frame, motion_regions, scale=1.0):
         """모션 영역 시각화"""
-        for region in motion_info['motion_regions']:
-            x, y, w, h = region['bbox']
+        for region in motion_regions:
+            x, y, w, h = [int(v * scale) for v in region['bbox']]
             
             # 원본 프레임에 반투명 박스
             overlay = display_frame.copy()
@@ -185,31 +403,30 @@ class HandDetectionVisualizer:
             cv2.rectangle(debug_frame, (x, y), (x + w, y + h), self.colors['motion'], 2)
             
             # 중심점 표시
-            center = region['center']
+            center = tuple(int(v * scale) for v in region['center'])
             cv2.circle(debug_frame, center, 5, self.colors['motion'], -1)
             
             # 영역 정보 텍스트
             cv2.putText(debug_frame, f"A:{region['area']}", 
                        (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.colors['text'])
     
-    def _draw_detected_objects(self, display_frame, debug_frame, cards, chips):
+    def _draw_detected_objects(self, display_frame, debug_frame, cards, chips, scale=1.0):
         """감지된 객체 시각화"""
         # 카드 시각화
         for card in cards:
-            if 'bbox' in card:
-                x, y, w, h = card['bbox']
-                cv2.rectangle(display_frame, (x, y), (x + w, y + h), self.colors['cards'], 2)
-                cv2.rectangle(debug_frame, (x, y), (x + w, y + h), self.colors['cards'], 2)
-                
-                # 카드 정보
-                info_text = f"Card({card.get('confidence', 0):.1f})"
-                cv2.putText(debug_frame, info_text, (x, y - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.colors['cards'])
+            x, y, w, h = [int(v * scale) for v in card['bbox']]
+            cv2.rectangle(display_frame, (x, y), (x + w, y + h), self.colors['cards'], 2)
+            cv2.rectangle(debug_frame, (x, y), (x + w, y + h), self.colors['cards'], 2)
+            
+            # 카드 정보
+            info_text = f"Card({card['confidence']:.1f})"
+            cv2.putText(debug_frame, info_text, (x, y - 10), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.colors['cards'])
         
         # 칩 시각화
         for chip in chips:
-            center = chip['center']
-            radius = chip['radius']
+            center = tuple(int(v * scale) for v in chip['center'])
+            radius = max(1, int(chip['radius'] * scale))
             color = self.colors['chips']
             
             cv2.circle(display_frame, center, radius, color, 2)
@@ -220,43 +437,47 @@ class HandDetectionVisualizer:
             cv2.putText(debug_frame, chip_text, (center[0] - 20, center[1] - radius - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.3, color)
     
-    def _draw_roi_regions(self, display_frame, debug_frame):
-        """ROI 영역 시각화"""
+    def _draw_roi_regions(self, display_frame, debug_frame, scale=1.0):
+        """ROI 영역 시각화 (첫 프레임에서 정한 뒤 바뀌지 않음)"""
+        def corners(region):
+            return ((int(region['x1'] * scale), int(region['y1'] * scale)),
+                    (int(region['x2'] * scale), int(region['y2'] * scale)))
+        
         # 팟 영역
         if self.detector.object_detector.pot_region:
-            pot = self.detector.object_detector.pot_region
-            cv2.rectangle(debug_frame, (pot['x1'], pot['y1']), 
-                         (pot['x2'], pot['y2']), self.colors['roi'], 1)
-            cv2.putText(debug_frame, "POT", (pot['x1'], pot['y1'] - 5),
+            top_left, bottom_right = corners(self.detector.object_detector.pot_region)
+            cv2.rectangle(debug_frame, top_left, bottom_right, self.colors['roi'], 1)
+            cv2.putText(debug_frame, "POT", (top_left[0], top_left[1] - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, self.colors['roi'])
         
         # 플레이어 영역
         for player_id, region in self.detector.object_detector.player_regions.items():
-            cv2.rectangle(debug_frame, (region['x1'], region['y1']), 
-                         (region['x2'], region['y2']), self.colors['roi'], 1)
+            top_left, bottom_right = corners(region)
+            cv2.rectangle(debug_frame, top_left, bottom_right, self.colors['roi'], 1)
             cv2.putText(debug_frame, f"P{player_id}", 
-                       (region['x1'], region['y1'] - 5),
+                       (top_left[0], top_left[1] - 5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, self.colors['roi'])
     
-    def _draw_hand_status(self, display_frame, current_time):
+    def _draw_hand_status(self, display_frame, annotation: FrameAnnotation):
         """현재 핸드 상태 표시"""
         status_text = []
+        hand_status = annotation.hand_status
         
-        if self.current_hand_info:
-            if self.current_hand_info['status'] == 'in_progress':
-                duration = current_time - self.current_hand_info['start_time']
-                status_text.append(f"Hand {self.current_hand_info['hand_id']} - {duration:.1f}s")
+        if hand_status:
+            if hand_status['status'] == 'in_progress':
+                duration = annotation.timestamp - hand_status['start_time']
+                status_text.append(f"Hand {hand_status['hand_id']} - {duration:.1f}s")
                 color = self.colors['hand_start']
             else:
-                status_text.append(f"Hand Completed - {self.current_hand_info['duration']:.1f}s")
+                status_text.append(f"Hand Completed - {hand_status['duration']:.1f}s")
                 color = self.colors['hand_end']
         else:
             status_text.append("Waiting for Hand Start")
             color = self.colors['text']
         
         # 시간 정보
-        status_text.append(f"Time: {current_time:.1f}s")
-        status_text.append(f"Frame: {self.frame_count}")
+        status_text.append(f"Time: {annotation.timestamp:.1f}s")
+        status_text.append(f"Frame: {annotation.frame_idx}")
         
         # 화면 상단에 상태 표시
         for i, text in enumerate(status_text):
@@ -264,24 +485,18 @@ class HandDetectionVisualizer:
             cv2.putText(display_frame, text, (10, y_pos),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
     
-    def _draw_detection_info(self, debug_frame, motion_info, cards, chips, current_time):
+    def _draw_detection_info(self, debug_frame, annotation: FrameAnnotation):
         """감지 정보 표시"""
         info_lines = [
-            f"Motion Areas: {len(motion_info['motion_regions'])}",
-            f"Total Motion: {motion_info['total_motion_area']}",
-            f"Cards: {len(cards)}",
-            f"Chips: {len(chips)}",
+            f"Motion Areas: {len(annotation.motion_regions)}",
+            f"Total Motion: {annotation.total_motion_area}",
+            f"Cards: {len(annotation.cards)}",
+            f"Chips: {len(annotation.chips)}",
+            # 모션 패턴 분석 결과 (감지 시점에 계산)
+            f"Dealing Score: {annotation.dealing_score:.2f}",
+            f"Collection Score: {annotation.collection_score:.2f}",
         ]
         
-        # 모션 패턴 분석 결과
-        dealing_score = self.detector.motion_tracker.analyze_motion_pattern('dealing')
-        collection_score = self.detector.motion_tracker.analyze_motion_pattern('collection')
-        
-        info_lines.extend([
-            f"Dealing Score: {dealing_score:.2f}",
-            f"Collection Score: {collection_score:.2f}",
-        ])
-        
         # 화면 하단에 정보 표시
         frame_height = debug_frame.shape[0]
         for i, line in enumerate(info_lines):
@@ -296,6 +511,10 @@ def main():
     parser.add_argument('--output', '-o', help='출력 비디오 파일 경로')
     parser.add_argument('--save-frames', action='store_true', help='디버그 프레임 저장')
     parser.add_argument('--no-display', action='store_true', help='실시간 표시 비활성화')
+    parser.add_argument('--scale', type=float, default=1.0, help='출력 영상 해상도 배율 (예: 0.5)')
+    parser.add_argument('--render-workers', type=int, default=2, help='오버레이 렌더링 스레드 수')
+    parser.add_argument('--boundary-window', type=float, default=None,
+                        help='핸드 경계 전후 N초만 출력 영상에 포함')
     
     args = parser.parse_args()
     
@@ -305,7 +524,12 @@ def main():
     
     print(f"🎥 핸드 감지 시각화 시작: {args.video_path}")
     
-    visualizer = HandDetectionVisualizer(show_debug=not args.no_display)
+    visualizer = HandDetectionVisualizer(
+        show_debug=not args.no_display,
+        render_scale=args.scale,
+        render_workers=args.render_workers,
+        boundary_window=args.boundary_window
+    )
     
     try:
         visualizer.visualize_video(
@@ -0,0 +1,280 @@
+"""
+분석 결과 핸드 저장소
+완료된 분석 결과(JSON)를 SQLite 테이블로 한 번만 옮겨 두고, 핸드마다 길이 카테고리와
+길이 구간(히스토그램 버킷)을 미리 계산해 저장. 결과 조회는 인덱스를 탄 SQL 페이지/집계로 처리하고,
+버전 기반 ETag로 변경이 없으면 조회 자체를 생략(304)할 수 있게 함
+"""
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 길이 히스토그램 버킷 폭 (초)
+DURATION_BUCKET_SECONDS = 15
+
+# 핸드 목록 페이지 크기 상한
+MAX_PAGE_SIZE = 500
+
+# 핸드 목록/분류는 테이블에서 다시 만들므로 메타데이터로 저장하지 않는 키
+_DERIVED_KEYS = ('hands_data', 'classified_hands', 'statistics', 'summary')
+
+
+def classify_duration(duration: float, categories: Dict[str, Dict]) -> Optional[str]:
+    """길이가 속하는 카테고리 (min <= duration < max, 없으면 None)"""
+    for category, criteria in categories.items():
+        if criteria['min'] <= duration < criteria['max']:
+            return category
+    return None
+
+
+class HandResultsDB:
+    """SQLite 기반 분석 결과 핸드 저장소"""
+
+    def __init__(self, db_path: str = 'hand_results.db'):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS analyses (
+                task_id TEXT PRIMARY KEY,
+                meta TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS hands (
+                task_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                hand_id INTEGER,
+                start_time REAL,
+                end_time REAL,
+                duration REAL NOT NULL,
+                category TEXT,
+                duration_bucket INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (task_id, seq)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_hands_category ON hands (task_id, category, seq)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_hands_duration ON hands (task_id, duration)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_hands_bucket ON hands (task_id, duration_bucket)')
+
+    def materialize(self, task_id: str, result: Dict[str, Any]) -> int:
+        """
+        분석 결과 저장 (같은 task_id는 교체), 새 버전 번호 반환
+
+        result: 분석 작업이 만든 최종 결과 (hands_data, categories 필수)
+        """
+        categories = result.get('categories') or {}
+        meta = {key: value for key, value in result.items() if key not in _DERIVED_KEYS}
+        rows = []
+        for seq, hand in enumerate(result.get('hands_data') or []):
+            duration = float(hand['duration'])
+            rows.append((
+                task_id, seq, hand.get('hand_id'), hand.get('start_time'), hand.get('end_time'),
+                duration, classify_duration(duration, categories),
+                int(duration // DURATION_BUCKET_SECONDS),
+                json.dumps(hand, ensure_ascii=False)
+            ))
+
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT version FROM analyses WHERE task_id = ?', (task_id,)).fetchone()
+            version = (row[0] if row else 0) + 1
+            conn.execute(
+                'INSERT OR REPLACE INTO analyses (task_id, meta, version, updated_at) VALUES (?, ?, ?, ?)',
+                (task_id, json.dumps(meta, ensure_ascii=False), version, time.time())
+            )
+            conn.execute('DELETE FROM hands WHERE task_id = ?', (task_id,))
+            conn.executemany('INSERT INTO hands VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        logger.info(f"분석 결과 저장: {task_id} ({len(rows)}개 핸드, v{version})")
+        return version
+
+    def version(self, task_id: str) -> Optional[int]:
+        row = self._connect().execute(
+            'SELECT version FROM analyses WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.version(task_id) is not None
+
+    def etag(self, task_id: str, *variant: Any) -> Optional[str]:
+        """결과 버전과 조회 조건(페이지 등)으로 만든 ETag (결과가 없으면 None)"""
+        version = self.version(task_id)
+        if version is None:
+            return None
+        raw = json.dumps([task_id, version, *variant], default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+    def meta(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """핸드 목록을 제외한 결과 메타데이터 (분석 시각, 카테고리 정의, 계측 등)"""
+        row = self._connect().execute(
+            'SELECT meta FROM analyses WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def statistics(self, task_id: str, categories: Dict[str, Dict]) -> Dict[str, int]:
+        """카테고리별 핸드 수"""
+        statistics = {category: 0 for category in categories}
+        for category, count in self._connect().execute(
+            'SELECT category, COUNT(*) FROM hands WHERE task_id = ? AND category IS NOT NULL GROUP BY category',
+            (task_id,)
+        ):
+            statistics[category] = count
+        return statistics
+
+    def duration_histogram(self, task_id: str) -> List[Dict[str, Any]]:
+        """길이 구간별 핸드 수 (빈 구간 포함, DURATION_BUCKET_SECONDS 단위)"""
+        counts = dict(self._connect().execute(
+            'SELECT duration_bucket, COUNT(*) FROM hands WHERE task_id = ? GROUP BY duration_bucket',
+            (task_id,)
+        ).fetchall())
+        if not counts:
+            return []
+        return [
+            {
+                'start': bucket * DURATION_BUCKET_SECONDS,
+                'end': (bucket + 1) * DURATION_BUCKET_SECONDS,
+                'count': counts.get(bucket, 0)
+            }
+            for bucket in range(min(counts), max(counts) + 1)
+        ]
+
+    def _extreme_hand(self, task_id: str, order: str) -> Optional[Dict[str, Any]]:
+        # 같은 길이면 먼저 나온 핸드 (max()/min()과 같은 선택)
+        row = self._connect().execute(
+            f'SELECT hand_id, duration, start_time FROM hands WHERE task_id = ? '
+            f'ORDER BY duration {order}, seq LIMIT 1',
+            (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'duration': round(row[1], 1), 'start_time': round(row[2] or 0, 1)}
+
+    def summary(self, task_id: str, statistics: Dict[str, int]) -> Dict[str, Any]:
+        """결과 요약 (총 핸드 수, 길이 합/평균, 최장/최단 핸드)"""
+        total_hands, total_duration = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(duration), 0) FROM hands WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        if not total_hands:
+            return {
+                'total_hands': 0,
+                'total_duration': 0,
+                'average_duration': 0,
+                'longest_hand': None,
+                'shortest_hand': None
+            }
+
+        return {
+            'total_hands': total_hands,
+            'total_duration': round(total_duration, 1),
+            'average_duration': round(total_duration / total_hands, 1),
+            'longest_hand': self._extreme_hand(task_id, 'DESC'),
+            'shortest_hand': self._extreme_hand(task_id, 'ASC'),
+            'distribution': statistics
+        }
+
+    def hands(self, task_id: str, page: int = 1, per_page: int = 100,
+              category: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """핸드 목록 한 페이지 (원래 순서), (핸드 목록, 조건에 맞는 전체 수) 반환"""
+        page = max(page, 1)
+        per_page = min(max(per_page, 1), MAX_PAGE_SIZE)
+        where, params = 'task_id = ?', [task_id]
+        if category is not None:
+            where += ' AND category = ?'
+            params.append(category)
+
+        conn = self._connect()
+        total = conn.execute(f'SELECT COUNT(*) FROM hands WHERE {where}', params).fetchone()[0]
+        rows = conn.execute(
+            f'SELECT data FROM hands WHERE {where} ORDER BY seq LIMIT ? OFFSET ?',
+            params + [per_page, (page - 1) * per_page]
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def overview(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """메타데이터 + SQL 집계 (카테고리별 수, 요약, 길이 히스토그램)"""
+        meta = self.meta(task_id)
+        if meta is None:
+            return None
+        statistics = self.statistics(task_id, meta.get('categories') or {})
+        return dict(
+            meta,
+            statistics=statistics,
+            summary=self.summary(task_id, statistics),
+            duration_histogram=self.duration_histogram(task_id)
+        )
+
+    def page(self, task_id: str, page: int = 1, per_page: int = 100,
+             category: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """API 응답: 집계 + 핸드 한 페이지"""
+        result = self.overview(task_id)
+        if result is None:
+            return None
+        hands, total = self.hands(task_id, page, per_page, category)
+        per_page = min(max(per_page, 1), MAX_PAGE_SIZE)
+        result['hands'] = hands
+        result['pagination'] = {
+            'page': max(page, 1),
+            'per_page': per_page,
+            'total': total,
+            'pages': math.ceil(total / per_page),
+            'category': category
+        }
+        return result
+
+    def full_results(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """원래 결과 JSON과 같은 구조 (결과 페이지 렌더링용, 분류는 저장된 카테고리 사용)"""
+        result = self.overview(task_id)
+        if result is None:
+            return None
+        classified = {category: [] for category in result.get('categories') or {}}
+        hands_data = []
+        for category, data in self._connect().execute(
+            'SELECT category, data FROM hands WHERE task_id = ? ORDER BY seq', (task_id,)
+        ):
+            hand = json.loads(data)
+            hands_data.append(hand)
+            if category is not None:
+                classified[category].append(hand)
+        result['hands_data'] = hands_data
+        result['classified_hands'] = classified
+        return result
+
+    def delete(self, task_id: str):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM hands WHERE task_id = ?', (task_id,))
+            conn.execute('DELETE FROM analyses WHERE task_id = ?', (task_id,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
@@ -7,13 +7,15 @@ import cv2
 import numpy as np
 from typing import List, Dict, Tuple, Optional, Union
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 import logging
 import time
 from collections import defaultdict
 
 from gfx_text_analyzer import GFXTextAnalyzer, TextFeature
+from video_index import IndexedCapture
+from temporal_cache import TemporalCache, AdaptiveSampler
 
 @dataclass
 class VisualFeature:
@@ -47,9 +49,21 @@ class HybridClassification:
 class HybridGFXClassifier:
     """하이브리드 GFX 분류기 - 비전 + OCR 융합"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, gate_ocr: bool = False, cnn_backend=None):
+        """
+        Args:
+            config_path: 설정 파일 경로
+            gate_ocr: True면 시각적 점수가 불확실 구간에 있을 때만 OCR 수행
+            cnn_backend: CNN 분류 백엔드 (cnn_classifier, 있으면 classify_frames/구간 분석에서
+                         시각+OCR 대신 축소 프레임 묶음 추론 사용)
+        """
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
+        self.gate_ocr = gate_ocr
+        self.cnn_backend = cnn_backend
+        
+        # 분석 경로별 처리 횟수 (visual_only, hybrid, visual_gated 등)
+        self.path_stats = defaultdict(int)
         
         # OCR 텍스트 분석기
         self.text_analyzer = GFXTextAnalyzer(config_path)
@@ -90,7 +104,10 @@ class HybridGFXClassifier:
             'visual_threshold': 0.6,
             'text_threshold': 0.5,
             'hybrid_threshold': 0.65,
-            'confidence_weight': 0.7  # 시각적 vs 텍스트 가중치
+            'confidence_weight': 0.7,  # 시각적 vs 텍스트 가중치
+            # OCR 게이팅 불확실 구간 (None이면 가중치에서 계산한 무손실 구간)
+            'ocr_band_low': None,
+            'ocr_band_high': None
         }
         
         if config_path and Path(config_path).exists():
@@ -352,12 +369,53 @@ class HybridGFXClassifier:
         except Exception:
             return 0.0
     
+    def ocr_band(self) -> Tuple[float, float]:
+        """
+        OCR이 필요한 시각적 점수 구간 [low, high)
+        
+        텍스트 점수는 0~1이므로 시각적 점수가 이 구간 밖이면 텍스트 점수와 관계없이
+        하이브리드 판정이 정해짐. 설정값이 있으면 그 값을 사용
+        """
+        weight = self.thresholds['confidence_weight']
+        threshold = self.thresholds['hybrid_threshold']
+        low = self.thresholds.get('ocr_band_low')
+        high = self.thresholds.get('ocr_band_high')
+        if low is None:
+            low = (threshold - (1 - weight)) / weight if weight > 0 else 0.0
+        if high is None:
+            high = threshold / weight if weight > 0 else 1.0
+        return max(0.0, low), min(1.0, high)
+    
+    def get_path_stats(self) -> Dict:
+        """분석 경로별 처리 횟수와 OCR 수행 비율"""
+        stats = dict(self.path_stats)
+        total = sum(stats.values())
+        ocr_frames = stats.get('hybrid', 0) + stats.get('text_only', 0)
+        return {
+            'paths': stats,
+            'total_frames': total,
+            'ocr_frames': ocr_frames,
+            'ocr_rate': ocr_frames / total if total else 0.0,
+            'ocr_skipped': stats.get('visual_gated', 0)
+        }
+    
+    def reset_path_stats(self):
+        self.path_stats.clear()
+    
     def classify_frame(self, frame: np.ndarray, 
                       use_visual: bool = True, 
-                      use_text: bool = True) -> HybridClassification:
-        """하이브리드 프레임 분류"""
+                      use_text: bool = True,
+                      gate_ocr: Optional[bool] = None) -> HybridClassification:
+        """
+        하이브리드 프레임 분류
+        
+        gate_ocr (None이면 생성 시 설정값)가 켜져 있으면 시각적 점수가 ocr_band() 밖일 때
+        OCR을 생략하고 시각적 점수만으로 판정 (method='visual_gated')
+        """
         start_time = time.time()
         debug_info = {}
+        if gate_ocr is None:
+            gate_ocr = self.gate_ocr
         
         # 기본값
         visual_score = 0.0
@@ -373,8 +431,15 @@ class HybridGFXClassifier:
                 visual_score = self._calculate_visual_score(visual_features)
                 debug_info['visual_features'] = asdict(visual_features)
             
+            # 시각적 점수가 확실하면 OCR 생략
+            gated = False
+            if use_visual and use_text and gate_ocr:
+                band_low, band_high = self.ocr_band()
+                gated = not (band_low <= visual_score < band_high)
+                debug_info['ocr_band'] = [band_low, band_high]
+            
             # 2. 텍스트 특징 분석
-            if use_text:
+            if use_text and not gated:
                 text_result = self.text_analyzer.classify_frame_by_text(frame, visual_score)
                 text_score = text_result['text_score']
                 text_features_count = text_result['text_features_count']
@@ -383,7 +448,11 @@ class HybridGFXClassifier:
                 debug_info['density_features'] = text_result['density_features']
             
             # 3. 하이브리드 점수 계산
-            if use_visual and use_text:
+            if gated:
+                # 구간 위쪽이면 텍스트 점수가 0이어도 GFX, 아래쪽이면 1이어도 Game
+                confidence = visual_score
+                method = 'visual_gated'
+            elif use_visual and use_text:
                 # 두 점수 모두 사용
                 confidence = (visual_score * self.thresholds['confidence_weight'] + 
                             text_score * (1 - self.thresholds['confidence_weight']))
@@ -400,7 +469,10 @@ class HybridGFXClassifier:
                 raise ValueError("최소 하나의 분석 방법이 활성화되어야 합니다")
             
             # 4. 최종 분류 결정
-            is_gfx = confidence >= self.thresholds['hybrid_threshold']
+            if gated:
+                is_gfx = visual_score >= band_high
+            else:
+                is_gfx = confidence >= self.thresholds['hybrid_threshold']
             
             # 5. 신뢰도 보정 (특징 일관성 기반)
             confidence = self._adjust_confidence(confidence, visual_features, 
@@ -408,6 +480,7 @@ class HybridGFXClassifier:
             
             processing_time = time.time() - start_time
             debug_info['processing_time'] = processing_time
+            self.path_stats[method] += 1
             
             return HybridClassification(
                 is_gfx=is_gfx,
@@ -424,6 +497,7 @@ class HybridGFXClassifier:
             
         except Exception as e:
             self.logger.error(f"프레임 분류 실패: {e}")
+            self.path_stats['error'] += 1
             return HybridClassification(
                 is_gfx=False,
                 confidence=0.0,
@@ -437,6 +511,48 @@ class HybridGFXClassifier:
                 debug_info={'error': str(e)}
             )
     
+    def classify_frames(self, frames: List[np.ndarray],
+                        gate_ocr: Optional[bool] = None) -> List[HybridClassification]:
+        """
+        프레임 묶음 분류
+        
+        CNN 백엔드가 있으면 한 번의 배치 추론으로 판정 (method='cnn'),
+        없으면 프레임마다 classify_frame
+        """
+        if self.cnn_backend is None:
+            return [self.classify_frame(frame, gate_ocr=gate_ocr) for frame in frames]
+        
+        start_time = time.time()
+        threshold = getattr(getattr(self.cnn_backend, 'config', None), 'threshold', 0.5)
+        try:
+            probabilities = self.cnn_backend.predict_proba(frames)
+        except Exception as e:
+            self.logger.error(f"CNN 분류 실패: {e}")
+            self.path_stats['error'] += len(frames)
+            probabilities = None
+        per_frame = (time.time() - start_time) / max(len(frames), 1)
+        
+        results = []
+        for i in range(len(frames)):
+            if probabilities is None:
+                method, probability, debug_info = 'error', 0.0, {'error': 'cnn'}
+            else:
+                method, probability, debug_info = 'cnn', float(probabilities[i]), {'batch_size': len(frames)}
+                self.path_stats['cnn'] += 1
+            results.append(HybridClassification(
+                is_gfx=method == 'cnn' and probability >= threshold,
+                confidence=probability,
+                visual_score=probability,
+                text_score=0.0,
+                method=method,
+                visual_features=VisualFeature(0, 0, 0, 0, 0, 0, 0),
+                text_features_count=0,
+                poker_relevance=0.0,
+                processing_time=per_frame,
+                debug_info=debug_info
+            ))
+        return results
+    
     def _calculate_visual_score(self, features: VisualFeature) -> float:
         """시각적 특징을 점수로 변환"""
         try:
@@ -512,46 +628,89 @@ class HybridGFXClassifier:
             return base_confidence
     
     def analyze_video_segment(self, video_path: str, start_time: float, 
-                            end_time: float, frame_skip: int = 30) -> List[HybridClassification]:
-        """비디오 구간의 하이브리드 분석"""
-        self.logger.info(f"비디오 구간 분석: {start_time:.1f}s - {end_time:.1f}s")
+                            end_time: float, frame_skip: int = 30,
+                            gate_ocr: Optional[bool] = None, adaptive: bool = False,
+                            cache_epsilon: float = 2.0) -> List[HybridClassification]:
+        """
+        비디오 구간의 하이브리드 분석
         
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
+        adaptive=True면 직전 분류 프레임과 거의 같은 프레임은 결과를 재사용
+        (debug_info['reused']=True)하고 샘플링 간격을 장면 안정도에 맞춰 조절
+        """
+        self.logger.info(f"비디오 구간 분석: {start_time:.1f}s - {end_time:.1f}s")
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        # 키프레임 인덱스 기반 읽기 (fps도 인덱스에서 조회)
+        cap = IndexedCapture(video_path)
+        fps = cap.fps
         results = []
         
+        # CNN 백엔드는 축소 프레임을 모아 묶음 단위로 추론 (적응형은 직전 결과가 필요하므로 제외)
+        batch_size = getattr(getattr(self.cnn_backend, 'config', None), 'batch_size', 1)
+        batched = self.cnn_backend is not None and not adaptive
+        pending = []  # (축소 프레임, 타임스탬프)
+        
+        def flush():
+            if pending:
+                inputs, timestamps = zip(*pending)
+                for classification, timestamp in zip(self.classify_frames(list(inputs)), timestamps):
+                    classification.debug_info['timestamp'] = timestamp
+                    results.append(classification)
+                pending.clear()
+        cache = TemporalCache(epsilon=cache_epsilon) if adaptive else None
+        sampler = AdaptiveSampler(base_interval=frame_skip / fps) if adaptive else None
+        
         try:
             current_time = start_time
             frame_count = 0
             
             while current_time < end_time:
                 # 특정 시간으로 이동
-                cap.set(cv2.CAP_PROP_POS_MSEC, current_time * 1000)
-                ret, frame = cap.read()
+                ret, frame = cap.read_at(current_time)
                 
                 if not ret:
                     break
                 
                 # 하이브리드 분류 수행
-                classification = self.classify_frame(frame)
+                if batched:
+                    pending.append((self.cnn_backend.prepare(frame), current_time))
+                    if len(pending) >= batch_size:
+                        flush()
+                    current_time += frame_skip / fps
+                    frame_count += 1
+                    continue
+                if cache is not None:
+                    classification, reused = cache.get_or_compute(
+                        frame, lambda f: self.classify_frame(f, gate_ocr=gate_ocr)
+                    )
+                    if reused:
+                        classification = replace(
+                            classification, debug_info=dict(classification.debug_info, reused=True)
+                        )
+                        self.path_stats['reused'] += 1
+                    elif classification.method == 'error':
+                        cache.reset()  # 실패 결과는 재사용하지 않음
+                    step = sampler.update(stable=reused)
+                else:
+                    classification = self.classify_frame(frame, gate_ocr=gate_ocr)
+                    step = frame_skip / fps
                 classification.debug_info['timestamp'] = current_time
                 
                 results.append(classification)
                 
-                current_time += frame_skip / fps
+                current_time += step
                 frame_count += 1
                 
                 if frame_count % 10 == 0:
                     progress = (current_time - start_time) / (end_time - start_time) * 100
                     self.logger.debug(f"분석 진행률: {progress:.1f}%")
         
+            flush()
         finally:
             cap.release()
         
-        self.logger.info(f"구간 분석 완료: {len(results)}개 프레임 분석")
+        ocr_count = sum(1 for r in results
+                        if r.method in ('hybrid', 'text_only') and not r.debug_info.get('reused'))
+        self.logger.info(f"구간 분석 완료: {len(results)}개 프레임 분석 (OCR {ocr_count}회)")
         return results
     
     def save_model(self, output_path: str, samples: List[Dict]):
@@ -608,6 +767,7 @@ def main():
     parser.add_argument('image_path', help='분석할 이미지 파일 경로')
     parser.add_argument('--visual-only', action='store_true', help='시각적 분석만 사용')
     parser.add_argument('--text-only', action='store_true', help='텍스트 분석만 사용')
+    parser.add_argument('--gate-ocr', action='store_true', help='시각적 점수가 불확실할 때만 OCR 수행')
     parser.add_argument('--output', '-o', help='결과 저장 경로')
     parser.add_argument('--model', '-m', help='모델 파일 경로')
     parser.add_argument('--debug', '-d', action='store_true', help='디버그 모드')
@@ -619,7 +779,7 @@ def main():
     
     try:
         # 하이브리드 분류기 생성
-        classifier = HybridGFXClassifier()
+        classifier = HybridGFXClassifier(gate_ocr=args.gate_ocr)
         
         # 모델 로드 (있는 경우)
         if args.model and Path(args.model).exists():
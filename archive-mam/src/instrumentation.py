@@ -0,0 +1,110 @@
+"""
+파이프라인 단계별 시간/카운터 계측
+디코딩, MOG2, 옵티컬 플로우, 윤곽선, OCR 등 단계마다 호출 수와 누적 시간을 모아
+실행 단위 요약(snapshot)으로 결과 JSON과 진행 상황에 포함.
+꺼져 있으면 stage()는 공용 빈 컨텍스트를, count()는 즉시 반환하므로 비용이 거의 없음
+
+사용 예시:
+    inst = Instrumentation()
+    with inst.stage('decode'):
+        ret, frame = cap.read()
+    inst.count('frames')
+    inst.snapshot()
+"""
+
+import contextlib
+import os
+import time
+from typing import Dict, Optional
+
+# 전역 기본값 (PIPELINE_INSTRUMENTATION=0 이면 기본으로 꺼짐)
+ENV_VAR = 'PIPELINE_INSTRUMENTATION'
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def default_enabled() -> bool:
+    return os.environ.get(ENV_VAR, '1').lower() not in ('0', 'false', 'off', 'no')
+
+
+class _StageTimer:
+    """단계 하나의 누적 시간 (재사용되는 컨텍스트 매니저)"""
+
+    __slots__ = ('calls', 'total', 'max', '_started')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._started = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        return False
+
+
+class Instrumentation:
+    """
+    단계별 타이머와 카운터 모음
+
+    같은 이름의 단계는 중첩하지 않는다고 가정 (타이머 객체를 재사용해 할당 비용을 없앰).
+    단계 이름은 'motion.mog2'처럼 점으로 구분해 묶음
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = default_enabled() if enabled is None else enabled
+        self._stages: Dict[str, _StageTimer] = {}
+        self._counters: Dict[str, int] = {}
+        self._started = time.perf_counter()
+
+    def stage(self, name: str):
+        """단계 시간 측정 컨텍스트"""
+        if not self.enabled:
+            return _NULL_STAGE
+        timer = self._stages.get(name)
+        if timer is None:
+            timer = self._stages[name] = _StageTimer()
+        return timer
+
+    def count(self, name: str, value: int = 1):
+        """카운터 증가"""
+        if self.enabled:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        """새 실행 시작"""
+        self._stages.clear()
+        self._counters.clear()
+        self._started = time.perf_counter()
+
+    def snapshot(self) -> Dict:
+        """
+        실행 단위 요약 (JSON 직렬화 가능)
+
+        share는 실행 시작 이후 경과 시간 대비 비율 (중첩 단계는 합이 1을 넘을 수 있음)
+        """
+        wall_time = time.perf_counter() - self._started
+        stages = {}
+        for name in sorted(self._stages):
+            timer = self._stages[name]
+            stages[name] = {
+                'calls': timer.calls,
+                'total_ms': round(timer.total * 1000, 3),
+                'mean_ms': round(timer.total * 1000 / timer.calls, 3) if timer.calls else 0.0,
+                'max_ms': round(timer.max * 1000, 3),
+                'share': round(timer.total / wall_time, 4) if wall_time > 0 else 0.0
+            }
+        return {
+            'enabled': self.enabled,
+            'wall_time_ms': round(wall_time * 1000, 3),
+            'stages': stages,
+            'counters': dict(sorted(self._counters.items()))
+        }
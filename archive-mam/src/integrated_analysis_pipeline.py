@@ -14,6 +14,7 @@ import time
 
 # 모듈 import
 from pot_size_ocr import PotSizeOCR, PotSizeReading
+from pot_timeline import PotTimeline
 from player_detection import PlayerDetector, HandParticipation
 
 @dataclass
@@ -171,7 +172,8 @@ class IntegratedAnalysisPipeline:
             
             # 팟 사이즈 통계
             valid_pot_readings = [r for r in pot_readings if r.pot_value and r.confidence >= self.settings['pot_confidence_threshold']]
-            max_pot_size = max([r.pot_value for r in valid_pot_readings]) if valid_pot_readings else None
+            pot_timeline = PotTimeline.from_readings(valid_pot_readings, min_confidence=0).clean()
+            max_pot_size = float(pot_timeline.values.max()) if len(pot_timeline) else None
             
             # 팟 변화 감지
             pot_changes = self.detect_pot_changes_in_readings(valid_pot_readings)
@@ -258,30 +260,8 @@ class IntegratedAnalysisPipeline:
     
     def detect_pot_changes_in_readings(self, readings: List[PotSizeReading], 
                                      threshold_percent: float = 15.0) -> List[Dict]:
-        """팟 사이즈 변화 감지"""
-        if len(readings) < 2:
-            return []
-        
-        changes = []
-        prev_pot = readings[0].pot_value
-        
-        for reading in readings[1:]:
-            if not reading.pot_value:
-                continue
-                
-            change_percent = abs(reading.pot_value - prev_pot) / prev_pot * 100
-            
-            if change_percent >= threshold_percent:
-                changes.append({
-                    'timestamp': reading.timestamp,
-                    'previous_pot': prev_pot,
-                    'current_pot': reading.pot_value,
-                    'change_amount': reading.pot_value - prev_pot,
-                    'change_percent': change_percent
-                })
-                prev_pot = reading.pot_value
-        
-        return changes
+        """팟 사이즈 변화 감지 (중복/오인식 제거 후 평활화한 값 기준)"""
+        return PotTimeline.from_readings(readings, min_confidence=0).clean().changes(threshold_percent)
     
     def analyze_video_complete(self, video_path: str, gfx_data_path: str, 
                               output_path: Optional[str] = None) -> VideoAnalysisResult:
@@ -0,0 +1,165 @@
+"""
+분석 작업 스케줄러
+CPU 슬롯(코어) 예산 안에서만 작업을 실행하고, 나머지는 우선순위/FIFO 큐에서 대기.
+작업마다 요청 코어 수를 받아 남은 슬롯만큼 할당하고, 대기 순번을 콜백으로 알림
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+    pass
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """대기/실행 중인 작업"""
+    priority: int
+    sequence: int
+    job_id: str = field(compare=False)
+    func: Callable = field(compare=False, repr=False)
+    args: Tuple = field(compare=False, default=(), repr=False)
+    kwargs: Dict[str, Any] = field(compare=False, default_factory=dict, repr=False)
+    requested_cores: int = field(compare=False, default=1)
+    allocated_cores: int = field(compare=False, default=0)
+
+
+class JobScheduler:
+    """
+    CPU 슬롯 예산 기반 작업 스케줄러
+
+    - priority 값이 작을수록 먼저 실행되고, 같은 우선순위는 제출 순서(FIFO)
+    - 큐의 맨 앞 작업은 남은 슬롯이 요청보다 적으면 남은 만큼만 받아 바로 시작
+      (슬롯이 놀지 않고, 큰 작업이 작은 작업에 밀려 굶지도 않음)
+    - 작업 함수는 할당된 코어 수를 cores 키워드 인자로 받음
+    """
+
+    def __init__(self, total_slots: Optional[int] = None, max_queue: int = 50,
+                 on_queue_change: Optional[Callable[[str, int], None]] = None,
+                 on_start: Optional[Callable[[str, int], None]] = None):
+        self.total_slots = max(1, total_slots or os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.on_queue_change = on_queue_change
+        self.on_start = on_start
+
+        self._queue: List[ScheduledJob] = []
+        self._running: Dict[str, ScheduledJob] = {}
+        self._free_slots = self.total_slots
+        self._sequence = itertools.count()
+        # 콜백이 스케줄러 메서드를 다시 호출해도 되도록 RLock 사용
+        self._lock = threading.RLock()
+
+    def submit(self, job_id: str, func: Callable, *args, cores: int = 1,
+               priority: int = 0, **kwargs) -> int:
+        """
+        작업 제출
+
+        Returns:
+            대기 순번 (0 = 즉시 실행)
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        job = ScheduledJob(
+            priority=priority,
+            sequence=next(self._sequence),
+            job_id=job_id,
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            requested_cores=min(max(1, cores), self.total_slots)
+        )
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                raise QueueFullError(f"대기 중인 작업이 너무 많습니다 ({len(self._queue)}개)")
+            heapq.heappush(self._queue, job)
+            self._dispatch_locked()
+            return self.queue_position(job_id) or 0
+
+    def cancel(self, job_id: str) -> Optional[ScheduledJob]:
+        """
+        대기 중인 작업을 큐에서 뺌
+
+        Returns:
+            취소된 작업 (호출자가 인자로 넘긴 자원을 정리할 수 있도록), 실행 중이거나 모르는 작업이면 None
+        """
+        with self._lock:
+            for index, job in enumerate(self._queue):
+                if job.job_id == job_id:
+                    self._queue.pop(index)
+                    heapq.heapify(self._queue)
+                    logger.info(f"대기 작업 취소: {job_id}")
+                    self._dispatch_locked()
+                    return job
+        return None
+
+    def is_running(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._running
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """대기 순번 (1부터 시작, 실행 중이면 0, 모르는 작업이면 None)"""
+        with self._lock:
+            if job_id in self._running:
+                return 0
+            for position, job in enumerate(sorted(self._queue), start=1):
+                if job.job_id == job_id:
+                    return position
+        return None
+
+    def status(self) -> Dict[str, Any]:
+        """스케줄러 현황"""
+        with self._lock:
+            return {
+                'total_slots': self.total_slots,
+                'free_slots': self._free_slots,
+                'running': [
+                    {'job_id': job.job_id, 'cores': job.allocated_cores}
+                    for job in self._running.values()
+                ],
+                'queued': [job.job_id for job in sorted(self._queue)]
+            }
+
+    def _dispatch_locked(self):
+        """
+        남은 슬롯으로 시작할 수 있는 작업을 모두 시작 (lock 보유 상태에서 호출)
+
+        콜백도 lock 안에서 호출해 순번 알림이 작업 시작보다 늦게 도착하지 않게 함
+        """
+        while self._queue and self._free_slots > 0:
+            job = heapq.heappop(self._queue)
+            job.allocated_cores = min(job.requested_cores, self._free_slots)
+            self._free_slots -= job.allocated_cores
+            self._running[job.job_id] = job
+
+            logger.info(f"작업 시작: {job.job_id} ({job.allocated_cores}/{job.requested_cores} 코어)")
+            if self.on_start:
+                self.on_start(job.job_id, job.allocated_cores)
+
+            thread = threading.Thread(target=self._run, args=(job,), name=f"job-{job.job_id}")
+            thread.daemon = True
+            thread.start()
+
+        if self.on_queue_change:
+            for position, job in enumerate(sorted(self._queue), start=1):
+                self.on_queue_change(job.job_id, position)
+
+    def _run(self, job: ScheduledJob):
+        try:
+            job.func(*job.args, cores=job.allocated_cores, **job.kwargs)
+        except Exception as e:
+            logger.error(f"작업 실행 오류 ({job.job_id}): {e}")
+        finally:
+            with self._lock:
+                self._running.pop(job.job_id, None)
+                self._free_slots += job.allocated_cores
+                self._dispatch_locked()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+"""
+실시간 라이브 스트림 분석
+캡처 스레드는 항상 최신 프레임 하나만 유지하고(밀린 프레임은 버림),
+분석 스레드는 지연 예산(latency budget)을 지키도록 샘플링 간격을 조절하며
+핸드 시작/종료 이벤트를 스트림이 진행되는 동안 바로 내보냄
+"""
+import cv2
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+
+from .hand_boundary_detector import HandBoundaryDetector, DetectionEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CapturedFrame:
+    """캡처 스레드가 읽은 프레임"""
+    frame: object
+    frame_number: int
+    stream_time: float   # 스트림 기준 시간 (초)
+    captured_at: float   # time.monotonic() 기준 캡처 시각
+
+
+@dataclass
+class LiveStats:
+    """라이브 분석 통계"""
+    captured_frames: int = 0
+    processed_frames: int = 0
+    dropped_frames: int = 0
+    sample_interval: float = 0.0
+    average_latency: float = 0.0
+    max_latency: float = 0.0
+    average_processing_time: float = 0.0
+
+
+class LatestFrameReader:
+    """별도 스레드에서 계속 읽으면서 가장 최근 프레임만 보관"""
+
+    def __init__(self, cap: cv2.VideoCapture):
+        self.cap = cap
+        self._latest: Optional[CapturedFrame] = None
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-capture", daemon=True)
+        self.captured = 0
+        self.finished = False
+        # close()가 기다리다 포기하면 읽기 스레드가 read()에서 돌아온 뒤 직접 release
+        self._release_on_exit = False
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """읽기 중단 요청 후 스레드 종료를 기다림 (timeout 안에 끝났으면 True)"""
+        self._stopped.set()
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
+
+    def close(self, timeout: float = 5.0):
+        """
+        읽기 스레드를 멈추고 캡처를 해제
+
+        read()가 막혀 있는 동안 release하면 같은 캡처를 두 스레드가 동시에 건드리게 되므로,
+        timeout 안에 스레드가 끝나지 않으면 해제를 읽기 스레드에 넘기고 바로 반환
+        (분석 작업과 스케줄러 슬롯은 막힌 스트림을 기다리지 않음)
+        """
+        self.stop(timeout)
+        with self._condition:
+            if not self.finished:
+                self._release_on_exit = True
+                logger.warning("캡처 스레드가 응답하지 않아 읽기가 끝난 뒤 해제")
+                return
+        self.cap.release()
+
+    def _run(self):
+        start = time.monotonic()
+        frame_number = 0
+        while not self._stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+
+            pos_msec = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+            captured_at = time.monotonic()
+            stream_time = pos_msec / 1000 if pos_msec > 0 else captured_at - start
+
+            with self._condition:
+                # 분석이 아직 가져가지 않은 이전 프레임은 덮어써서 버림
+                self._latest = CapturedFrame(frame, frame_number, stream_time, captured_at)
+                self.captured += 1
+                self._condition.notify_all()
+            frame_number += 1
+
+        with self._condition:
+            self.finished = True
+            release = self._release_on_exit
+            self._condition.notify_all()
+        if release:
+            self.cap.release()
+
+    def take(self, timeout: float = 1.0) -> Optional[CapturedFrame]:
+        """최신 프레임을 가져감 (새 프레임이 없으면 기다림, 스트림 종료 시 None)"""
+        with self._condition:
+            if self._latest is None and not self.finished:
+                self._condition.wait(timeout)
+            captured, self._latest = self._latest, None
+            return captured
+
+
+class LiveStreamAnalyzer:
+    """
+    지연 예산 기반 라이브 핸드 감지
+
+    프레임 캡처부터 분석 완료까지의 지연이 latency_budget을 넘으면 샘플링 간격을 늘리고,
+    여유가 있으면 다시 줄여 라이브 시점을 따라감
+    """
+
+    def __init__(self, detector: Optional[HandBoundaryDetector] = None,
+                 latency_budget: float = 1.0, min_interval: float = 1 / 30,
+                 max_interval: float = 2.0,
+                 event_callback: Optional[Callable[[DetectionEvent], None]] = None):
+        self.detector = detector or HandBoundaryDetector()
+        self.latency_budget = latency_budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.event_callback = event_callback
+
+        # 이벤트 소비자가 콜백 대신 큐를 쓸 수도 있음
+        self.events: "queue.Queue[DetectionEvent]" = queue.Queue()
+        self.stats = LiveStats(sample_interval=min_interval)
+        self._stop = threading.Event()
+        self._regions_set = False
+
+    def stop(self):
+        """분석 중단 요청 (run은 현재 프레임 처리 후 결과를 저장하고 반환)"""
+        self._stop.set()
+
+    def _adapt_interval(self, latency: float):
+        """지연에 맞춰 샘플링 간격 조절"""
+        interval = self.stats.sample_interval
+        if latency > self.latency_budget:
+            interval = min(self.max_interval, interval * 1.5)
+        elif latency < self.latency_budget * 0.5:
+            interval = max(self.min_interval, interval * 0.9)
+        self.stats.sample_interval = interval
+
+    def _record(self, latency: float, processing_time: float):
+        # 최근 값 위주의 이동 평균
+        alpha = 0.1
+        stats = self.stats
+        if stats.processed_frames == 1:
+            stats.average_latency = latency
+            stats.average_processing_time = processing_time
+        else:
+            stats.average_latency += alpha * (latency - stats.average_latency)
+            stats.average_processing_time += alpha * (processing_time - stats.average_processing_time)
+        stats.max_latency = max(stats.max_latency, latency)
+
+    def _emit(self, event: DetectionEvent):
+        self.events.put(event)
+        if self.event_callback:
+            try:
+                self.event_callback(event)
+            except Exception as e:
+                logger.warning(f"이벤트 콜백 오류: {e}")
+
+    def run(self, cap: cv2.VideoCapture, source_info: Optional[Dict] = None,
+            output_path: Optional[str] = None, progress_callback=None,
+            max_duration: Optional[float] = None) -> str:
+        """
+        스트림이 끝나거나 stop() / max_duration까지 분석하고 결과 파일 경로 반환
+
+        cap은 이 메서드가 해제함 (읽기 스레드가 끝난 뒤)
+        """
+        if not cap.isOpened():
+            # 호출자가 이미 cap을 넘겼으므로 실패해도 여기서 해제
+            cap.release()
+            raise ValueError("비디오 스트림이 열려있지 않습니다")
+
+        source_info = dict(source_info or {}, type='stream', live=True)
+        reader = LatestFrameReader(cap).start()
+        started = time.monotonic()
+        next_sample = started
+        last_progress = started
+
+        logger.info(f"라이브 분석 시작 (지연 예산 {self.latency_budget:.2f}초)")
+
+        try:
+            while not self._stop.is_set():
+                if max_duration is not None and time.monotonic() - started >= max_duration:
+                    break
+
+                # 샘플링 간격만큼 대기 (그 사이 캡처 스레드는 최신 프레임만 유지)
+                wait = next_sample - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(wait)
+
+                captured = reader.take()
+                if captured is None:
+                    if reader.finished:
+                        break
+                    continue
+                next_sample = time.monotonic() + self.stats.sample_interval
+
+                if not self._regions_set:
+                    self.detector.object_detector.set_regions(captured.frame.shape)
+                    self._regions_set = True
+
+                process_start = time.monotonic()
+                event = self.detector.process_frame(
+                    captured.frame, captured.stream_time, captured.frame_number
+                )
+                done = time.monotonic()
+
+                self.stats.processed_frames += 1
+                latency = done - captured.captured_at
+                self._record(latency, done - process_start)
+                self._adapt_interval(latency)
+
+                if event is not None:
+                    self._emit(event)
+
+                if progress_callback and done - last_progress >= 1.0:
+                    last_progress = done
+                    try:
+                        progress_callback({
+                            'current_time': captured.stream_time,
+                            'current_frame': captured.frame_number,
+                            'detected_hands': len(self.detector.detected_hands),
+                            'progress_percent': 0,
+                            'live_stats': self.get_stats(reader),
+                            'source_info': source_info
+                        })
+                    except Exception as e:
+                        logger.warning(f"진행률 콜백 오류: {e}")
+        finally:
+            reader.close()
+
+        stats = self.get_stats(reader)
+        logger.info(f"라이브 분석 종료: {stats['processed_frames']}프레임 처리, "
+                    f"{stats['dropped_frames']}프레임 버림, 평균 지연 {stats['average_latency']:.3f}초")
+
+        return self.detector.save_results(output_path, source_info)
+
+    def get_stats(self, reader: Optional[LatestFrameReader] = None) -> Dict:
+        if reader is not None:
+            self.stats.captured_frames = reader.captured
+            self.stats.dropped_frames = reader.captured - self.stats.processed_frames
+        return asdict(self.stats)
@@ -4,13 +4,20 @@
 로컬 및 네트워크 경로에서 비디오 파일을 탐색하고 선택할 수 있는 기능
 """
 import os
+import stat
 import sys
 from pathlib import Path
 import logging
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
 import mimetypes
 import platform
 
+try:
+    from .video_probe import get_probe
+except ImportError:
+    from video_probe import get_probe
+
 logger = logging.getLogger(__name__)
 
 class LocalFileBrowser:
@@ -20,6 +27,10 @@ class LocalFileBrowser:
         self.video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.webm', '.wmv', '.m4v', '.3gp'}
         self.max_file_size = 10 * 1024 * 1024 * 1024  # 10GB 제한
         
+        # 디렉토리 목록 캐시: 경로 → (디렉토리 수정시간, 항목 목록), 최근 사용 순
+        self._listing_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self.listing_cache_size = 64
+        
         # 보안: 제한된 경로 패턴들
         self.restricted_paths = {
             # Windows 시스템 경로
@@ -147,8 +158,75 @@ class LocalFileBrowser:
         
         return filename
     
-    def list_directory(self, path: str, show_hidden: bool = False) -> Dict[str, Any]:
-        """디렉토리 내용 나열"""
+    def _scan_directory(self, path: str) -> List[Dict[str, Any]]:
+        """
+        os.scandir로 디렉토리 항목 수집 (디렉토리 먼저, 이름순)
+        
+        DirEntry의 타입 정보와 stat을 그대로 써서 항목마다 네트워크 왕복이
+        여러 번 생기지 않게 함 (SMB 공유에서 특히 중요)
+        """
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    # 파일명 보안 검증
+                    if self._sanitize_filename(entry.name) is None:
+                        continue  # 위험한 파일명은 건너뛰기
+                    
+                    try:
+                        is_dir = entry.is_dir()
+                        stat_info = entry.stat()
+                    except (OSError, PermissionError) as e:
+                        # 접근 권한이 없는 파일/디렉토리
+                        logger.warning(f"접근 권한 없음: {entry.path} - {e}")
+                        continue
+                    
+                    extension = None if is_dir else Path(entry.name).suffix.lower()
+                    entries.append({
+                        'name': entry.name,
+                        'path': entry.path,
+                        'type': 'directory' if is_dir else 'file',
+                        'size': stat_info.st_size,
+                        'modified': stat_info.st_mtime,
+                        'is_video': extension in self.video_extensions if extension else False,
+                        'extension': extension
+                    })
+        except PermissionError:
+            raise PermissionError(f"디렉토리 접근 권한이 없습니다: {path}")
+        
+        entries.sort(key=lambda item: (item['type'] != 'directory', item['name'].lower()))
+        return entries
+    
+    def _get_entries(self, path: str, dir_mtime: float, use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        캐시된 목록 반환 (디렉토리 수정시간이 그대로일 때만)
+        
+        항목 추가/삭제/이름 변경은 디렉토리 수정시간을 바꾸므로 다시 스캔하게 됨.
+        이미 있는 파일의 크기 변화(복사 중인 파일 등)는 새로고침(use_cache=False)으로 반영
+        """
+        cached = self._listing_cache.get(path)
+        if use_cache and cached is not None and cached[0] == dir_mtime:
+            self._listing_cache.move_to_end(path)
+            return cached[1]
+        
+        entries = self._scan_directory(path)
+        self._listing_cache[path] = (dir_mtime, entries)
+        self._listing_cache.move_to_end(path)
+        while len(self._listing_cache) > self.listing_cache_size:
+            self._listing_cache.popitem(last=False)
+        return entries
+    
+    def list_directory(self, path: str, show_hidden: bool = False, offset: int = 0,
+                       limit: Optional[int] = None, videos_only: bool = False,
+                       use_cache: bool = True) -> Dict[str, Any]:
+        """
+        디렉토리 내용 나열
+        
+        Args:
+            offset, limit: 페이지 범위 (limit=None이면 전체)
+            videos_only: 디렉토리와 비디오 파일만 포함
+            use_cache: False면 캐시를 무시하고 다시 스캔
+        """
         try:
             # 보안 검증: 경로 정규화 및 제한
             path = os.path.abspath(path)
@@ -157,17 +235,29 @@ class LocalFileBrowser:
             if self._is_dangerous_path(path):
                 raise PermissionError(f"접근이 제한된 경로입니다: {path}")
             
-            if not os.path.exists(path):
+            try:
+                dir_stat = os.stat(path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"경로를 찾을 수 없습니다: {path}")
             
-            if not os.path.isdir(path):
+            if not stat.S_ISDIR(dir_stat.st_mode):
                 raise NotADirectoryError(f"디렉토리가 아닙니다: {path}")
             
-            items = []
             parent_path = os.path.dirname(path) if path != os.path.dirname(path) else None
             
-            # 상위 디렉토리
-            if parent_path:
+            # 디렉토리 내용 (필터링)
+            entries = [
+                item for item in self._get_entries(path, dir_stat.st_mtime, use_cache)
+                if (show_hidden or not item['name'].startswith('.'))
+                and (not videos_only or item['type'] == 'directory' or item['is_video'])
+            ]
+            
+            offset = max(0, offset)
+            page = entries[offset:offset + limit] if limit is not None else entries[offset:]
+            
+            items = []
+            # 상위 디렉토리 (첫 페이지에만)
+            if parent_path and offset == 0:
                 items.append({
                     'name': '..',
                     'path': parent_path,
@@ -176,65 +266,31 @@ class LocalFileBrowser:
                     'modified': None,
                     'is_video': False
                 })
-            
-            # 디렉토리 내용
-            try:
-                entries = os.listdir(path)
-                entries.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-                
-                for entry in entries:
-                    if not show_hidden and entry.startswith('.'):
-                        continue
-                    
-                    # 파일명 보안 검증
-                    sanitized_name = self._sanitize_filename(entry)
-                    if sanitized_name is None:
-                        continue  # 위험한 파일명은 건너뛰기
-                    
-                    entry_path = os.path.join(path, entry)
-                    
-                    try:
-                        stat_info = os.stat(entry_path)
-                        is_dir = os.path.isdir(entry_path)
-                        
-                        # 파일인 경우 비디오 확장자 확인
-                        is_video = False
-                        if not is_dir:
-                            ext = Path(entry).suffix.lower()
-                            is_video = ext in self.video_extensions
-                        
-                        items.append({
-                            'name': entry,
-                            'path': entry_path,
-                            'type': 'directory' if is_dir else 'file',
-                            'size': stat_info.st_size,
-                            'modified': stat_info.st_mtime,
-                            'is_video': is_video,
-                            'extension': Path(entry).suffix.lower() if not is_dir else None
-                        })
-                        
-                    except (OSError, PermissionError) as e:
-                        # 접근 권한이 없는 파일/디렉토리
-                        logger.warning(f"접근 권한 없음: {entry_path} - {e}")
-                        continue
-                
-            except PermissionError:
-                raise PermissionError(f"디렉토리 접근 권한이 없습니다: {path}")
+            # 호출자가 항목을 수정해도 캐시가 바뀌지 않도록 복사
+            items.extend(dict(item) for item in page)
             
             return {
                 'current_path': path,
                 'parent_path': parent_path,
                 'items': items,
-                'total_items': len(items),
-                'video_count': sum(1 for item in items if item.get('is_video', False))
+                'total_items': len(entries) + (1 if parent_path else 0),
+                'video_count': sum(1 for item in entries if item['is_video']),
+                'offset': offset,
+                'limit': limit,
+                'has_more': offset + len(page) < len(entries)
             }
             
         except Exception as e:
             logger.error(f"디렉토리 탐색 오류: {e}")
             raise
     
-    def get_file_info(self, file_path: str) -> Dict[str, Any]:
-        """파일 상세 정보 반환"""
+    def get_file_info(self, file_path: str, probe: bool = True) -> Dict[str, Any]:
+        """
+        파일 상세 정보 반환
+        
+        probe=True면 비디오 파일의 메타데이터(길이, fps, 코덱, 해상도 등)를
+        공용 메타데이터 캐시에서 읽어 video_info로 포함 (없으면 한 번만 조사)
+        """
         try:
             file_path = os.path.abspath(file_path)
             
@@ -260,6 +316,15 @@ class LocalFileBrowser:
             # 파일 크기 제한 확인
             size_ok = stat_info.st_size <= self.max_file_size
             
+            video_info = None
+            probe_error = None
+            if probe and is_video:
+                try:
+                    video_info = get_probe(file_path).to_dict()
+                except (OSError, ValueError) as e:
+                    probe_error = str(e)
+                    logger.warning(f"비디오 메타데이터 조사 실패: {file_path} - {e}")
+            
             return {
                 'path': file_path,
                 'name': path_obj.name,
@@ -270,7 +335,9 @@ class LocalFileBrowser:
                 'mime_type': mime_type,
                 'is_video': is_video,
                 'size_ok': size_ok,
-                'readable': os.access(file_path, os.R_OK)
+                'readable': os.access(file_path, os.R_OK),
+                'video_info': video_info,
+                'probe_error': probe_error
             }
             
         except Exception as e:
@@ -304,6 +371,18 @@ class LocalFileBrowser:
                 validation_result['valid'] = False
                 validation_result['errors'].append('파일 읽기 권한 없음')
             
+            # 실제로 디코딩 가능한 영상인지 확인
+            video_info = file_info['video_info']
+            if file_info['is_video'] and file_info['readable']:
+                if video_info is None:
+                    validation_result['valid'] = False
+                    validation_result['errors'].append(f"비디오를 열 수 없음: {file_info['probe_error']}")
+                elif video_info['fps'] <= 0 or video_info['duration'] <= 0:
+                    validation_result['valid'] = False
+                    validation_result['errors'].append('비디오 길이/프레임레이트를 확인할 수 없음')
+                elif video_info['variable_frame_rate']:
+                    validation_result['warnings'].append('가변 프레임레이트 영상입니다 (시간 기준으로 분석)')
+            
             # 경고사항
             if file_info['size_mb'] > 1024:  # 1GB 이상
                 validation_result['warnings'].append('큰 파일은 분석에 시간이 오래 걸릴 수 있습니다')
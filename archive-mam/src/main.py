@@ -1,16 +1,23 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List, Dict, Any, Optional
 import os
-import shutil
 import json
+import uuid
 from pathlib import Path
 
 from . import database, schemas
-from .database import Base, engine, get_db, Video, Hand, VideoStatus
-from .tasks import analyze_video_task, generate_clip_task
+from .database import create_db_tables, get_async_db, SessionLocal, Video, Hand, VideoStatus
+from .stats import get_cached_statistics, stats_cache
+from .upload_service import (
+    UploadError, UploadSessionManager, filename_in_use, finalize_upload, find_video_by_hash,
+    iter_upload_file, stream_to_disk
+)
+from .tasks import analyze_video_task, generate_clip_task, export_video_clips_task
+from .clip_service import ClipService, file_identity, validate_format
 from .celery_app import celery_app
 
 app = FastAPI(title="Poker MAM API", version="1.0.0")
@@ -21,10 +28,38 @@ CLIPS_DIR = Path("clips")
 UPLOAD_DIR.mkdir(exist_ok=True)
 CLIPS_DIR.mkdir(exist_ok=True)
 
+upload_sessions = UploadSessionManager(UPLOAD_DIR / ".sessions")
+clip_service = ClipService(CLIPS_DIR)
+
 # Create database tables on startup
 @app.on_event("startup")
 def startup_event():
-    Base.metadata.create_all(bind=engine)
+    create_db_tables()
+
+async def _register_upload(db: AsyncSession, part_path: Path, filename: str, content_hash: str, file_size: int):
+    """Register a received file, queueing analysis only for new content
+
+    A taken filename never fails here: finalize_upload stores the file under a
+    hash-tagged name instead, since the client has already sent all of it.
+    """
+    # finalize_upload only renames within UPLOAD_DIR, so it runs on the session's connection
+    db_video, created = await db.run_sync(
+        finalize_upload, part_path, UPLOAD_DIR, filename, content_hash, file_size
+    )
+
+    if not created:
+        return db_video
+
+    stats_cache.invalidate()
+
+    # Start async analysis task (publishing to the broker blocks, so use the threadpool)
+    task = await run_in_threadpool(analyze_video_task.delay, db_video.file_path, db_video.id)
+    
+    # Update video with task ID
+    db_video.task_id = task.id
+    await db.commit()
+    
+    return db_video
 
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -34,63 +69,113 @@ async def read_root():
 @app.post("/videos/upload", response_model=schemas.Video, tags=["Videos"])
 async def upload_video(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload a video file for analysis"""
-    # Check if video already exists
-    existing = db.query(Video).filter(Video.filename == file.filename).first()
+    """Upload a video file for analysis
+
+    The file is streamed to disk while its SHA-256 is computed. If the same
+    content was uploaded before, the existing video is returned and no new
+    analysis is started.
+    """
+    filename = Path(file.filename).name
+    part_path = UPLOAD_DIR / f".{uuid.uuid4().hex}.part"
+    try:
+        content_hash, file_size = await stream_to_disk(iter_upload_file(file), part_path)
+    except Exception:
+        await run_in_threadpool(part_path.unlink, missing_ok=True)
+        raise
+
+    return await _register_upload(db, part_path, filename, content_hash, file_size)
+
+# Resumable upload endpoints (for multi-GB files)
+@app.post("/uploads/", response_model=schemas.UploadSessionStatus, tags=["Uploads"])
+async def create_upload_session(request: schemas.UploadSessionCreate, db: AsyncSession = Depends(get_async_db)):
+    """Start a resumable upload
+
+    If the client already knows the content hash and it matches an existing
+    video, no session is created and existing_video_id is returned instead.
+    A file name that is already taken is rejected here, before any bytes are sent.
+    """
+    existing = await db.run_sync(find_video_by_hash, request.content_hash)
     if existing:
-        raise HTTPException(status_code=400, detail="Video already exists")
-    
-    # Save uploaded file
-    file_path = UPLOAD_DIR / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Create video record
-    db_video = Video(
-        filename=file.filename,
-        file_path=str(file_path),
-        status=VideoStatus.PENDING
-    )
-    db.add(db_video)
-    db.commit()
-    db.refresh(db_video)
-    
-    # Start async analysis task
-    task = analyze_video_task.delay(str(file_path), db_video.id)
-    
-    # Update video with task ID
-    db_video.task_id = task.id
-    db.commit()
-    
-    return db_video
+        return schemas.UploadSessionStatus(
+            filename=existing.filename,
+            total_size=existing.file_size or request.total_size,
+            received_bytes=existing.file_size or request.total_size,
+            existing_video_id=existing.id
+        )
+
+    filename = Path(request.filename).name
+    if await db.run_sync(filename_in_use, UPLOAD_DIR, filename):
+        raise HTTPException(status_code=409, detail="Video already exists")
+
+    try:
+        return await run_in_threadpool(upload_sessions.create, filename, request.total_size)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.get("/uploads/{upload_id}", response_model=schemas.UploadSessionStatus, tags=["Uploads"])
+def get_upload_session(upload_id: str):
+    """Get the number of bytes received so far (the offset to resume from)"""
+    try:
+        return upload_sessions.status(upload_id)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.put("/uploads/{upload_id}", response_model=schemas.UploadSessionStatus, tags=["Uploads"])
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    """Append the raw request body to the upload at the given byte offset"""
+    try:
+        return await upload_sessions.append(upload_id, offset, request.stream())
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.post("/uploads/{upload_id}/complete", response_model=schemas.Video, tags=["Uploads"])
+async def complete_upload(upload_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Finish a resumable upload and queue it for analysis"""
+    try:
+        session, content_hash = await upload_sessions.complete(upload_id)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    try:
+        return await _register_upload(
+            db, upload_sessions.part_path(upload_id), session["filename"],
+            content_hash, session["total_size"]
+        )
+    finally:
+        await run_in_threadpool(upload_sessions.discard, upload_id)
 
 @app.get("/videos/", response_model=List[schemas.Video], tags=["Videos"])
-def get_videos(
+async def get_videos(
     skip: int = 0,
     limit: int = 100,
     status: Optional[VideoStatus] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of videos"""
-    query = db.query(Video)
+    query = select(Video)
     if status:
-        query = query.filter(Video.status == status)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(Video.status == status)
+    return (await db.scalars(query.offset(skip).limit(limit))).all()
 
 @app.get("/videos/{video_id}", response_model=schemas.Video, tags=["Videos"])
-def get_video(video_id: int, db: Session = Depends(get_db)):
+async def get_video(video_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get video details"""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     return video
 
+def _task_status(task_id: str) -> Dict[str, Any]:
+    # Reading the result backend blocks, so callers run this in the threadpool
+    task = celery_app.AsyncResult(task_id)
+    return {"state": task.state, "info": task.info}
+
 @app.get("/videos/{video_id}/status", tags=["Videos"])
-def get_video_status(video_id: int, db: Session = Depends(get_db)):
+async def get_video_status(video_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get video processing status"""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
@@ -98,65 +183,66 @@ def get_video_status(video_id: int, db: Session = Depends(get_db)):
     
     if video.task_id and video.status == VideoStatus.PROCESSING:
         # Get Celery task status
-        task = celery_app.AsyncResult(video.task_id)
-        result["task_state"] = task.state
-        result["task_info"] = task.info
+        task = await run_in_threadpool(_task_status, video.task_id)
+        result["task_state"] = task["state"]
+        result["task_info"] = task["info"]
     
     return result
 
 # Hand endpoints
 @app.post("/hands/", response_model=schemas.Hand, tags=["Hands"])
-def create_hand(hand: schemas.HandCreate, db: Session = Depends(get_db)):
+async def create_hand(hand: schemas.HandCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new hand record"""
     db_hand = Hand(**hand.dict())
     db.add(db_hand)
-    db.commit()
-    db.refresh(db_hand)
+    await db.commit()
+    await db.refresh(db_hand)
+    stats_cache.invalidate()
     return db_hand
 
 @app.get("/hands/", response_model=List[schemas.Hand], tags=["Hands"])
-def get_hands(
+async def get_hands(
     skip: int = 0,
     limit: int = 100,
     video_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of hands"""
-    query = db.query(Hand)
+    query = select(Hand)
     if video_id:
-        query = query.filter(Hand.video_id == video_id)
-    return query.offset(skip).limit(limit).all()
+        query = query.where(Hand.video_id == video_id)
+    return (await db.scalars(query.offset(skip).limit(limit))).all()
 
 @app.get("/hands/{hand_id}", response_model=schemas.Hand, tags=["Hands"])
-def get_hand(hand_id: int, db: Session = Depends(get_db)):
+async def get_hand(hand_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get hand details"""
-    hand = db.query(Hand).filter(Hand.id == hand_id).first()
+    hand = await db.get(Hand, hand_id)
     if not hand:
         raise HTTPException(status_code=404, detail="Hand not found")
     return hand
 
 @app.post("/hands/search", response_model=List[schemas.Hand], tags=["Hands"])
-def search_hands(
+async def search_hands(
     filters: schemas.HandSearchFilter,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search hands with filters"""
-    query = db.query(Hand)
+    query = select(Hand)
     
     # Filter by video filename
     if filters.video_filename:
-        query = query.filter(Hand.video_filename.contains(filters.video_filename))
+        query = query.where(Hand.video_filename.contains(filters.video_filename))
     
     # Filter by player name
     if filters.player_name:
-        query = query.filter(
+        query = query.where(
             Hand.participating_players.contains(f'"{filters.player_name}"')
         )
     
     # Filter by pot size
-    hands = query.offset(skip).limit(limit).all()
+    hands = (await db.scalars(query.offset(skip).limit(limit))).all()
     
     # Post-process for pot size filtering (since it's stored as JSON)
     if filters.min_pot_size is not None or filters.max_pot_size is not None:
@@ -179,48 +265,109 @@ def search_hands(
     return hands
 
 # Clip endpoints
+def _clip_range(hand: Hand):
+    # Default 60s if no end time
+    return hand.start_time_s, hand.end_time_s or hand.start_time_s + 60
+
+def _clip_format(fmt: Optional[str]) -> str:
+    # The format ends up in the cached clip's file name, so only known containers are accepted
+    try:
+        return validate_format(fmt or "mp4")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _video_source(video: Video):
+    if not os.path.exists(video.file_path):
+        raise HTTPException(status_code=404, detail="Video file not found")
+    return video.content_hash or file_identity(video.file_path)
+
 @app.post("/clips/generate", tags=["Clips"])
 async def generate_clip(
     clip_request: schemas.ClipRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate a video clip for a specific hand"""
+    fmt = _clip_format(clip_request.format)
+    
     # Get hand details
-    hand = db.query(Hand).filter(Hand.id == clip_request.hand_id).first()
+    hand = await db.get(Hand, clip_request.hand_id)
     if not hand:
         raise HTTPException(status_code=404, detail="Hand not found")
     
     # Get video details
-    video = db.query(Video).filter(Video.id == hand.video_id).first()
+    video = await db.get(Video, hand.video_id) if hand.video_id is not None else None
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    # Define output path
-    output_filename = f"hand_{hand.id}_clip.{clip_request.format}"
-    output_path = CLIPS_DIR / output_filename
+    # stat() and cache lookups hit the (possibly network) media volume, so keep them off the event loop
+    video_hash = await run_in_threadpool(_video_source, video)
+    start, end = _clip_range(hand)
+    
+    # Clips are content-addressed, so an identical request is served from the cache
+    cached = await run_in_threadpool(
+        clip_service.lookup, video_hash, start, end, fmt, clip_request.accurate
+    )
+    if cached:
+        return {
+            "task_id": None,
+            "hand_id": hand.id,
+            "output_filename": cached.name,
+            "cached": True
+        }
+    
+    output_path = clip_service.cache_path(video_hash, start, end, fmt, clip_request.accurate)
     
     # Start clip generation task
-    task = generate_clip_task.delay(
-        video.file_path,
-        hand.start_time_s,
-        hand.end_time_s or hand.start_time_s + 60,  # Default 60s if no end time
-        str(output_path)
+    task = await run_in_threadpool(
+        generate_clip_task.delay, video.file_path, start, end, fmt,
+        video_hash, clip_request.accurate
     )
     
     return {
         "task_id": task.id,
         "hand_id": hand.id,
-        "output_filename": output_filename
+        "output_filename": output_path.name,
+        "cached": False
+    }
+
+@app.post("/videos/{video_id}/clips", tags=["Clips"])
+async def export_video_clips(video_id: int, format: str = "mp4", db: AsyncSession = Depends(get_async_db)):
+    """Export clips for every hand of a video in one ffmpeg pass"""
+    format = _clip_format(format)
+    video = await db.get(Video, video_id)
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    hands = (await db.scalars(
+        select(Hand).where(Hand.video_id == video_id).order_by(Hand.start_time_s)
+    )).all()
+    if not hands:
+        raise HTTPException(status_code=404, detail="No hands found for video")
+    
+    video_hash = await run_in_threadpool(_video_source, video)
+    ranges = [_clip_range(hand) for hand in hands]
+    
+    task = await run_in_threadpool(export_video_clips_task.delay, video.file_path, ranges, format, video_hash)
+    
+    return {
+        "task_id": task.id,
+        "clips": [
+            {
+                "hand_id": hand.id,
+                "output_filename": clip_service.cache_path(video_hash, start, end, format).name
+            }
+            for hand, (start, end) in zip(hands, ranges)
+        ]
     }
 
 @app.get("/clips/{filename}", tags=["Clips"])
 async def download_clip(filename: str):
     """Download a generated clip"""
-    file_path = CLIPS_DIR / filename
-    if not file_path.exists():
+    file_path = CLIPS_DIR / Path(filename).name
+    if not await run_in_threadpool(file_path.exists):
         raise HTTPException(status_code=404, detail="Clip not found")
     
+    await run_in_threadpool(clip_service.touch, file_path)
     return FileResponse(
         path=file_path,
         media_type="video/mp4",
@@ -228,30 +375,18 @@ async def download_clip(filename: str):
     )
 
 @app.get("/clips/status/{task_id}", tags=["Clips"])
-def get_clip_status(task_id: str):
+async def get_clip_status(task_id: str):
     """Get clip generation task status"""
-    task = celery_app.AsyncResult(task_id)
-    return {
-        "task_id": task_id,
-        "state": task.state,
-        "info": task.info
-    }
+    return {"task_id": task_id, **await run_in_threadpool(_task_status, task_id)}
+
+def _statistics():
+    # The TTL cache holds a thread lock while computing, so aggregate on a
+    # worker thread with a sync session rather than on the event loop
+    with SessionLocal() as db:
+        return get_cached_statistics(db)
 
 # Statistics endpoint
 @app.get("/stats", tags=["Statistics"])
-def get_statistics(db: Session = Depends(get_db)):
-    """Get system statistics"""
-    total_videos = db.query(Video).count()
-    total_hands = db.query(Hand).count()
-    videos_by_status = {}
-    
-    for status in VideoStatus:
-        count = db.query(Video).filter(Video.status == status).count()
-        videos_by_status[status.value] = count
-    
-    return {
-        "total_videos": total_videos,
-        "total_hands": total_hands,
-        "videos_by_status": videos_by_status,
-        "average_hands_per_video": total_hands / total_videos if total_videos > 0 else 0
-    }
\ No newline at end of file
+async def get_statistics():
+    """Get system statistics (aggregated in SQL, cached for a few seconds)"""
+    return await run_in_threadpool(_statistics)
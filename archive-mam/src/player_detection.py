@@ -12,6 +12,13 @@ from pathlib import Path
 import logging
 from collections import defaultdict
 
+try:
+    from .video_index import IndexedCapture
+    from .instrumentation import Instrumentation
+except ImportError:
+    from video_index import IndexedCapture
+    from instrumentation import Instrumentation
+
 @dataclass
 class PlayerSeat:
     """플레이어 좌석 정보"""
@@ -47,10 +54,15 @@ class HandParticipation:
 class PlayerDetector:
     """플레이어 감지기"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None):
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
         
+        # 단계별 계측 (analyze_multiple_hands 실행마다 초기화)
+        self.instrumentation = instrumentation or Instrumentation()
+        self.last_run_stats: Optional[Dict] = None
+        
         # 기본 좌석 배치 (9인 테이블 기준)
         self.seat_positions = [
             PlayerSeat(1, 320, 50, 80, 60, "Seat 1", "상단 중앙"),
@@ -222,29 +234,34 @@ class PlayerDetector:
     
     def analyze_frame(self, frame: np.ndarray, timestamp: float) -> List[CardDetection]:
         """단일 프레임에서 모든 좌석의 카드 감지"""
+        inst = self.instrumentation
         detections = []
-        processed = self.preprocess_frame(frame)
-        
-        for seat in self.seat_positions:
-            try:
-                # 각 좌석별 ROI 추출
-                roi_dict = {}
-                for key, img in processed.items():
-                    roi_dict[key] = self.extract_seat_roi(img, seat)
-                
-                # 카드 감지
-                detection = self.detect_cards_in_roi(roi_dict, seat)
-                detection.timestamp = timestamp
-                
-                detections.append(detection)
-                
-                if detection.has_cards and detection.confidence > 50:
-                    self.logger.debug(f"Seat {seat.seat_id}: 카드 감지 (신뢰도: {detection.confidence:.1f}%)")
-                
-            except Exception as e:
-                self.logger.error(f"Seat {seat.seat_id} 분석 실패: {e}")
-                continue
-        
+        with inst.stage('players.preprocess'):
+            processed = self.preprocess_frame(frame)
+        
+        with inst.stage('players.seats'):
+            for seat in self.seat_positions:
+                try:
+                    # 각 좌석별 ROI 추출
+                    roi_dict = {}
+                    for key, img in processed.items():
+                        roi_dict[key] = self.extract_seat_roi(img, seat)
+                    
+                    # 카드 감지
+                    detection = self.detect_cards_in_roi(roi_dict, seat)
+                    detection.timestamp = timestamp
+                    
+                    detections.append(detection)
+                    
+                    if detection.has_cards and detection.confidence > 50:
+                        self.logger.debug(f"Seat {seat.seat_id}: 카드 감지 (신뢰도: {detection.confidence:.1f}%)")
+                    
+                except Exception as e:
+                    self.logger.error(f"Seat {seat.seat_id} 분석 실패: {e}")
+                    continue
+        
+        inst.count('players.frames')
+        inst.count('players.seats_with_cards', sum(1 for d in detections if d.has_cards))
         return detections
     
     def analyze_hand_segment(self, video_path: str, start_time: float, 
@@ -252,14 +269,8 @@ class PlayerDetector:
         """핸드 구간에서 참여 플레이어 분석"""
         self.logger.info(f"핸드 {hand_id} 분석 시작: {start_time:.1f}s - {end_time:.1f}s")
         
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
-        
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        
-        # 시작 시간으로 이동
-        cap.set(cv2.CAP_PROP_POS_MSEC, start_time * 1000)
+        # 키프레임 인덱스 기반 읽기 (같은 GOP 안에서는 seek 생략)
+        cap = IndexedCapture(video_path)
         
         all_detections = []
         frame_count = 0
@@ -269,8 +280,8 @@ class PlayerDetector:
             current_time = start_time
             while current_time < end_time:
                 # 특정 시간으로 이동
-                cap.set(cv2.CAP_PROP_POS_MSEC, current_time * 1000)
-                ret, frame = cap.read()
+                with self.instrumentation.stage('decode'):
+                    ret, frame = cap.read_at(current_time)
                 
                 if not ret:
                     break
@@ -339,6 +350,7 @@ class PlayerDetector:
     def analyze_multiple_hands(self, video_path: str, 
                              hand_segments: List[Dict]) -> List[HandParticipation]:
         """여러 핸드 구간 분석"""
+        self.instrumentation.reset()
         results = []
         
         for i, segment in enumerate(hand_segments):
@@ -354,10 +366,12 @@ class PlayerDetector:
                 self.logger.error(f"핸드 {i+1} 분석 실패: {e}")
                 continue
         
+        self.last_run_stats = self.instrumentation.snapshot()
         return results
     
-    def save_results(self, results: List[HandParticipation], output_path: str):
-        """결과를 JSON 파일로 저장"""
+    def save_results(self, results: List[HandParticipation], output_path: str,
+                     run_stats: Optional[Dict] = None):
+        """결과를 JSON 파일로 저장 (run_stats: 단계별 계측 요약)"""
         export_data = {
             'analysis_type': 'player_detection',
             'timestamp': cv2.getTickCount(),
@@ -365,6 +379,8 @@ class PlayerDetector:
             'seat_positions': [asdict(seat) for seat in self.seat_positions],
             'hands': [asdict(result) for result in results]
         }
+        if run_stats is not None:
+            export_data['instrumentation'] = run_stats
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(export_data, f, indent=2, ensure_ascii=False)
@@ -467,7 +483,7 @@ def main():
         
         # 결과 저장
         if args.output:
-            detector.save_results(results, args.output)
+            detector.save_results(results, args.output, run_stats=detector.instrumentation.snapshot())
         
         # 결과 요약 출력
         summary = detector.get_participation_summary(results)
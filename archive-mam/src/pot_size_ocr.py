@@ -9,10 +9,44 @@ import pytesseract
 import re
 from typing import List, Dict, Tuple, Optional
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
 import logging
 
+try:
+    from .scene_segmenter import SkipList, get_skip_list
+    from .temporal_cache import TemporalCache, AdaptiveSampler
+    from .result_store import save_columnar, read_rows
+    from .video_probe import capture_properties
+    from .instrumentation import Instrumentation
+    from .signal_cache import SignalCache
+    from .pot_timeline import PotTimeline, DEFAULT_MIN_CONFIDENCE
+except ImportError:
+    from scene_segmenter import SkipList, get_skip_list
+    from temporal_cache import TemporalCache, AdaptiveSampler
+    from result_store import save_columnar, read_rows
+    from video_probe import capture_properties
+    from instrumentation import Instrumentation
+    from signal_cache import SignalCache
+    from pot_timeline import PotTimeline, DEFAULT_MIN_CONFIDENCE
+
+# ROI 전처리/OCR 방식이 바뀌면 올려서 신호 캐시 무효화 (텍스트 파싱은 캐시 후 단계)
+SIGNAL_EXTRACTOR = 'pot_ocr'
+SIGNAL_VERSION = 1
+
+# 컬럼 결과 파일 스키마 (팟을 한 번도 못 읽어 pot_value가 모두 None이어도 숫자 컬럼 유지)
+READING_SCHEMA = {
+    'timestamp': 'float',
+    'raw_text': 'str',
+    'cleaned_text': 'str',
+    'pot_value': 'float',
+    'confidence': 'float',
+    'roi_coords.0': 'int',
+    'roi_coords.1': 'int',
+    'roi_coords.2': 'int',
+    'roi_coords.3': 'int'
+}
+
 # Tesseract 실행 파일 경로 설정 (Windows 기본 경로)
 # pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
@@ -39,10 +73,19 @@ class ROIRegion:
 class PotSizeOCR:
     """팟 사이즈 OCR 분석기"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 signal_cache: Optional[SignalCache] = None):
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
         
+        # 단계별 계측 (analyze_video 실행마다 초기화)
+        self.instrumentation = instrumentation or Instrumentation()
+        self.last_run_stats: Optional[Dict] = None
+        
+        # 샘플별 OCR 원문 캐시 (있으면 파싱/타임라인 로직만 바꾼 재분석은 디코딩/OCR 생략)
+        self.signal_cache = signal_cache
+        
         # 기본 ROI 영역들 (일반적인 포커 UI 위치)
         self.roi_regions = [
             ROIRegion("center_pot", 300, 200, 240, 60, "화면 중앙 팟 사이즈"),
@@ -142,7 +185,9 @@ class PotSizeOCR:
                 roi_image = cv2.resize(roi_image, (new_w, new_h), interpolation=cv2.INTER_CUBIC)
             
             # OCR 수행
-            data = pytesseract.image_to_data(roi_image, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
+            with self.instrumentation.stage('ocr.tesseract'):
+                data = pytesseract.image_to_data(roi_image, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
+            self.instrumentation.count('ocr.calls')
             
             # 텍스트 추출 및 신뢰도 계산
             text_parts = []
@@ -233,34 +278,129 @@ class PotSizeOCR:
         
         return readings
     
+    def _signal_params(self, frame_skip: int, skip_list: Optional[SkipList], adaptive: bool,
+                       cache_epsilon: float) -> Dict:
+        """신호 캐시 키에 들어가는 추출 설정"""
+        return {
+            'frame_skip': frame_skip,
+            'adaptive': adaptive,
+            'cache_epsilon': cache_epsilon if adaptive else None,
+            'skipped_intervals': skip_list.to_list() if skip_list is not None else [],
+            'roi_regions': [asdict(roi) for roi in self.roi_regions],
+            'tesseract_config': self.tesseract_config
+        }
+    
+    def _readings_from_signals(self, rows: List[Dict]) -> List[PotSizeReading]:
+        """캐시된 OCR 원문을 현재 파싱 규칙으로 다시 해석"""
+        readings = []
+        for row in rows:
+            coords = row['roi_coords']
+            cleaned_text, pot_value = self.clean_and_parse_pot_text(row['raw_text'])
+            readings.append(PotSizeReading(
+                timestamp=row['timestamp'],
+                raw_text=row['raw_text'],
+                cleaned_text=cleaned_text,
+                pot_value=pot_value,
+                confidence=row['confidence'],
+                roi_coords=tuple(coords[str(i)] for i in range(len(coords)))
+            ))
+        return readings
+    
+    def roi_signature(self, frame: np.ndarray) -> np.ndarray:
+        """팟 ROI만 축소해 이어 붙인 서명 (화면 전체 서명으로는 숫자 변화가 묻힘)"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        parts = []
+        for roi in self.roi_regions:
+            roi_image = self.extract_roi(gray, roi)
+            if roi_image.size:
+                parts.append(cv2.resize(roi_image, (64, 16), interpolation=cv2.INTER_AREA))
+        return np.vstack(parts) if parts else np.zeros((1, 1), dtype=np.uint8)
+    
     def analyze_video(self, video_path: str, output_path: Optional[str] = None, 
-                     frame_skip: int = 30) -> List[PotSizeReading]:
-        """비디오 전체 분석"""
+                     frame_skip: int = 30, skip_list: Optional[SkipList] = None,
+                     adaptive: bool = False, cache_epsilon: float = 1.5) -> List[PotSizeReading]:
+        """
+        비디오 전체 분석 (skip_list 구간은 건너뜀)
+        
+        adaptive=True면 팟 ROI가 직전 OCR 프레임과 거의 같을 때 OCR 결과를 재사용하고,
+        팟이 안정적인 동안 샘플링 간격을 늘림.
+        signal_cache가 있으면 OCR 원문을 저장해 두고, 같은 설정의 다음 실행에서는 파싱만 다시 수행
+        """
         self.logger.info(f"비디오 분석 시작: {video_path}")
+        inst = self.instrumentation
+        inst.reset()
+        
+        signal_params = None
+        if self.signal_cache is not None:
+            signal_params = self._signal_params(frame_skip, skip_list, adaptive, cache_epsilon)
+            cached = self.signal_cache.load(video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, signal_params)
+            if cached is not None:
+                inst.count('signal_cache_hits')
+                all_readings = self._readings_from_signals(cached[0])
+                self.last_run_stats = inst.snapshot()
+                if output_path:
+                    self.save_results(all_readings, output_path, run_stats=self.last_run_stats)
+                return all_readings
         
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps, total_frames = capture_properties(video_path, cap)
         duration = total_frames / fps
         
         self.logger.info(f"비디오 정보: {duration:.1f}초, {fps:.1f}fps, {total_frames}프레임")
         
         all_readings = []
         frame_count = 0
+        cache = TemporalCache(epsilon=cache_epsilon, signature_fn=self.roi_signature) if adaptive else None
+        sampler = AdaptiveSampler(base_interval=frame_skip / fps) if adaptive else None
+        next_sample = 0
+        reused_count = 0
         
         try:
             while True:
-                ret, frame = cap.read()
-                if not ret:
+                # 정적/테이블 외 구간은 OCR 없이 건너뜀
+                if skip_list is not None:
+                    resume = skip_list.resume_frame(frame_count, fps)
+                    if resume is not None:
+                        with inst.stage('seek'):
+                            cap.set(cv2.CAP_PROP_POS_FRAMES, resume)
+                        inst.count('frames_skipped', resume - frame_count)
+                        frame_count = resume
+                        continue
+                
+                if sampler is not None:
+                    is_sample = frame_count >= next_sample
+                else:
+                    is_sample = frame_count % frame_skip == 0
+                
+                # 분석하지 않는 프레임은 grab만 (retrieve 비용 생략)
+                with inst.stage('decode.grab'):
+                    grabbed = cap.grab()
+                if not grabbed:
                     break
                 
                 # 지정된 간격으로만 분석
-                if frame_count % frame_skip == 0:
+                if is_sample:
+                    with inst.stage('decode.retrieve'):
+                        ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+                    inst.count('frames_sampled')
                     timestamp = frame_count / fps
-                    readings = self.analyze_frame(frame, timestamp)
+                    if cache is not None:
+                        readings, reused = cache.get_or_compute(
+                            frame, lambda f: self.analyze_frame(f, timestamp)
+                        )
+                        if reused:
+                            readings = [replace(r, timestamp=timestamp) for r in readings]
+                            reused_count += 1
+                            inst.count('frames_reused')
+                        sampler.update(stable=reused)
+                        next_sample = frame_count + sampler.frames(fps)
+                    else:
+                        readings = self.analyze_frame(frame, timestamp)
                     all_readings.extend(readings)
                     
                     # 진행률 표시
@@ -274,73 +414,83 @@ class PotSizeOCR:
             cap.release()
         
         self.logger.info(f"분석 완료: 총 {len(all_readings)}개 읽기 결과")
+        if cache is not None:
+            self.logger.info(f"OCR 결과 재사용: {reused_count}회 (적중률 {cache.hit_rate:.1%})")
+        
+        if self.signal_cache is not None:
+            self.signal_cache.store(video_path, SIGNAL_EXTRACTOR, SIGNAL_VERSION, signal_params, [
+                {'timestamp': r.timestamp, 'raw_text': r.raw_text, 'confidence': r.confidence,
+                 'roi_coords': r.roi_coords}
+                for r in all_readings
+            ])
+        
+        self.last_run_stats = inst.snapshot()
         
         # 결과 저장
         if output_path:
-            self.save_results(all_readings, output_path)
+            self.save_results(all_readings, output_path, run_stats=self.last_run_stats)
         
         return all_readings
     
-    def save_results(self, readings: List[PotSizeReading], output_path: str):
-        """결과를 JSON 파일로 저장"""
+    def save_results(self, readings: List[PotSizeReading], output_path: str,
+                     run_stats: Optional[Dict] = None):
+        """결과 저장 (.npz면 컬럼 파일, 그 외에는 JSON / run_stats: 단계별 계측 요약)"""
+        if output_path.endswith('.npz'):
+            summary = {
+                'analysis_type': 'pot_size_ocr',
+                'total_readings': len(readings),
+                'valid_readings': sum(1 for r in readings if r.pot_value is not None)
+            }
+            if run_stats is not None:
+                summary['instrumentation'] = run_stats
+            save_columnar(output_path, [asdict(reading) for reading in readings], summary,
+                          schema=READING_SCHEMA)
+            self.logger.info(f"결과 저장 완료: {output_path}")
+            return
+        
         results = {
             'analysis_type': 'pot_size_ocr',
             'timestamp': cv2.getTickCount(),
             'total_readings': len(readings),
             'readings': [asdict(reading) for reading in readings]
         }
+        if run_stats is not None:
+            results['instrumentation'] = run_stats
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         
         self.logger.info(f"결과 저장 완료: {output_path}")
     
+    def load_results(self, path: str, start: Optional[float] = None,
+                     end: Optional[float] = None) -> List[PotSizeReading]:
+        """컬럼 결과 파일에서 시간 구간의 읽기 결과만 로드"""
+        readings = []
+        for row in read_rows(path, start, end):
+            coords = row['roi_coords']
+            row['roi_coords'] = tuple(coords[str(i)] for i in range(len(coords)))
+            readings.append(PotSizeReading(**row))
+        return readings
+    
     def get_pot_timeline(self, readings: List[PotSizeReading], 
-                        min_confidence: float = 50.0) -> List[Dict]:
+                        min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> List[Dict]:
         """팟 사이즈 타임라인 생성"""
-        timeline = []
-        
-        for reading in readings:
-            if reading.pot_value and reading.confidence >= min_confidence:
-                timeline.append({
-                    'timestamp': reading.timestamp,
-                    'pot_size': reading.pot_value,
-                    'confidence': reading.confidence,
-                    'formatted_time': f"{int(reading.timestamp // 60):02d}:{int(reading.timestamp % 60):02d}"
-                })
-        
-        # 시간순 정렬
-        timeline.sort(key=lambda x: x['timestamp'])
-        
-        return timeline
+        return PotTimeline.from_readings(readings, min_confidence).entries()
     
     def detect_pot_changes(self, readings: List[PotSizeReading], 
                           threshold_percent: float = 10.0) -> List[Dict]:
-        """팟 사이즈 변화 감지"""
-        timeline = self.get_pot_timeline(readings)
-        changes = []
-        
-        if len(timeline) < 2:
-            return changes
+        """
+        팟 사이즈 변화 감지
         
-        prev_pot = timeline[0]['pot_size']
-        
-        for entry in timeline[1:]:
-            current_pot = entry['pot_size']
-            change_percent = abs(current_pot - prev_pot) / prev_pot * 100
-            
-            if change_percent >= threshold_percent:
-                changes.append({
-                    'timestamp': entry['timestamp'],
-                    'formatted_time': entry['formatted_time'],
-                    'previous_pot': prev_pot,
-                    'current_pot': current_pot,
-                    'change_amount': current_pot - prev_pot,
-                    'change_percent': change_percent
-                })
-                prev_pot = current_pot
-        
-        return changes
+        같은 시각의 ROI 중복과 자릿수 오인식을 걸러내고 신뢰도 가중 평활화한 값에서
+        직전 읽기 대비 threshold_percent 이상 바뀐 지점을 찾음
+        """
+        return PotTimeline.from_readings(readings).clean().changes(threshold_percent)
+    
+    def hand_pot_ranges(self, readings: List[PotSizeReading], hands: List[Tuple[float, float]],
+                        min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> List[Dict]:
+        """핸드 (시작, 끝) 목록별 최대/최소 팟 (영상 전체 읽기에서 한 번에 집계)"""
+        return PotTimeline.from_readings(readings, min_confidence).clean().hand_ranges(hands)
 
 
 def main():
@@ -349,10 +499,14 @@ def main():
     
     parser = argparse.ArgumentParser(description='팟 사이즈 OCR 분석기')
     parser.add_argument('video_path', help='분석할 비디오 파일 경로')
-    parser.add_argument('--output', '-o', help='결과 저장 경로 (JSON)')
+    parser.add_argument('--output', '-o', help='결과 저장 경로 (.npz 컬럼 파일 또는 .json)')
     parser.add_argument('--frame-skip', '-s', type=int, default=30, 
                        help='프레임 스킵 간격 (기본: 30)')
     parser.add_argument('--config', '-c', help='설정 파일 경로')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='팟 영역이 바뀌지 않으면 OCR 결과를 재사용하고 샘플링 간격 조절')
+    parser.add_argument('--skip-scenes', action='store_true',
+                       help='정적 구간을 먼저 찾아 OCR에서 제외')
     parser.add_argument('--debug', '-d', action='store_true', help='디버그 모드')
     
     args = parser.parse_args()
@@ -365,8 +519,12 @@ def main():
         analyzer = PotSizeOCR(config_path=args.config)
         
         # 비디오 분석
-        output_path = args.output or f"{Path(args.video_path).stem}_pot_analysis.json"
-        readings = analyzer.analyze_video(args.video_path, output_path, args.frame_skip)
+        output_path = args.output or f"{Path(args.video_path).stem}_pot_analysis.npz"
+        skip_list = None
+        if args.skip_scenes:
+            skip_list = get_skip_list(args.video_path)
+        readings = analyzer.analyze_video(args.video_path, output_path, args.frame_skip, skip_list,
+                                          adaptive=args.adaptive)
         
         # 결과 요약
         timeline = analyzer.get_pot_timeline(readings)
@@ -0,0 +1,225 @@
+"""
+팟 사이즈 타임라인 엔진
+OCR 읽기 결과를 numpy 배열(시간, 값, 신뢰도, ROI)로 한 번 옮겨 두고, 필터링/중복 제거/
+이상치 제거/신뢰도 가중 평활화/변화 지점/핸드별 최대·최소 팟을 배열 연산으로 계산
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from .result_store import read_range
+except ImportError:
+    from result_store import read_range
+
+# 기본 최소 OCR 신뢰도 (get_pot_timeline 기본값과 동일)
+DEFAULT_MIN_CONFIDENCE = 50.0
+
+# 평활화에 쓰는 이웃 창 크기 (읽기 개수, 홀수). 3이면 한 번만 튄 값은 이웃 값으로
+# 대체되고 두 번 이상 이어진 값(실제 팟 변화)은 유지
+SMOOTHING_WINDOW = 3
+
+# 앞뒤 이웃과 모두 이 배율 넘게 차이 나면 오인식으로 제거
+# (자릿수가 하나 더/덜 읽히면 약 10배 차이)
+OUTLIER_RATIO = 5.0
+
+
+def format_time(timestamp: float) -> str:
+    """초 → MM:SS"""
+    return f"{int(timestamp // 60):02d}:{int(timestamp % 60):02d}"
+
+
+def _weighted_median(values: np.ndarray, weights: np.ndarray, window: int) -> np.ndarray:
+    """
+    읽기마다 앞뒤 window//2개 이웃과의 신뢰도 가중 중앙값
+
+    양 끝은 가중치 0으로 채워 실제 이웃만 사용. 누적 가중치가 정확히 절반에서 갈리면
+    (양 끝의 두 값 등) 아래/위 값 중 자기 값에 가까운 쪽을 택해 어느 방향으로도 치우치지 않음.
+    중앙값이라 팟이 계단식으로 바뀌는 지점은 뭉개지지 않음
+    """
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    half = window // 2
+    padded_values = np.pad(values, half, constant_values=np.inf)
+    padded_weights = np.pad(np.maximum(weights, 1e-6), half, constant_values=0.0)
+
+    windows = sliding_window_view(padded_values, window)
+    window_weights = sliding_window_view(padded_weights, window)
+    order = np.argsort(windows, axis=1, kind='stable')
+    sorted_values = np.take_along_axis(windows, order, axis=1)
+    cumulative = np.cumsum(np.take_along_axis(window_weights, order, axis=1), axis=1)
+    half_weight = cumulative[:, -1] / 2
+    rows = np.arange(n)
+    lower = np.argmax(cumulative >= half_weight[:, None], axis=1)
+    upper = np.minimum(lower + 1, window - 1)
+    lower_values = sorted_values[rows, lower]
+    upper_values = sorted_values[rows, upper]
+    tie = np.isclose(cumulative[rows, lower], half_weight)
+    use_upper = tie & (np.abs(upper_values - values) < np.abs(lower_values - values))
+    return np.where(use_upper, upper_values, lower_values)
+
+
+class PotTimeline:
+    """시간순으로 정렬된 팟 읽기 배열"""
+
+    def __init__(self, times: Sequence[float], values: Sequence[float],
+                 confidences: Sequence[float], rois: Optional[np.ndarray] = None):
+        times = np.asarray(times, dtype=np.float64)
+        order = np.argsort(times, kind='stable')
+        self.times = times[order]
+        self.values = np.asarray(values, dtype=np.float64)[order]
+        self.confidences = np.asarray(confidences, dtype=np.float64)[order]
+        if rois is None:
+            rois = np.zeros((len(times), 4), dtype=np.int32)
+        self.rois = np.asarray(rois, dtype=np.int32).reshape(-1, 4)[order]
+
+    @classmethod
+    def from_readings(cls, readings: Sequence, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> 'PotTimeline':
+        """PotSizeReading 목록 → 유효한 읽기(값 있음, 신뢰도 min_confidence 이상)만 담은 타임라인"""
+        n = len(readings)
+        times = np.fromiter((r.timestamp for r in readings), np.float64, n)
+        values = np.fromiter((np.nan if r.pot_value is None else r.pot_value for r in readings), np.float64, n)
+        confidences = np.fromiter((r.confidence for r in readings), np.float64, n)
+        rois = np.array([r.roi_coords for r in readings], dtype=np.int32).reshape(n, 4)
+        return cls(times, values, confidences, rois).filter(min_confidence)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray],
+                     min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> 'PotTimeline':
+        """컬럼 결과(read_range 결과) → 타임라인 (행 객체를 만들지 않음)"""
+        times = columns['timestamp']
+        roi_keys = [f'roi_coords.{i}' for i in range(4)]
+        rois = np.column_stack([columns[key] for key in roi_keys]) if all(k in columns for k in roi_keys) else None
+        return cls(times, columns['pot_value'], columns['confidence'], rois).filter(min_confidence)
+
+    @classmethod
+    def load(cls, path: str, start: Optional[float] = None, end: Optional[float] = None,
+             min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> 'PotTimeline':
+        """PotSizeOCR.save_results가 만든 .npz에서 시간 구간만 로드"""
+        columns = read_range(path, start, end, ['timestamp', 'pot_value', 'confidence', 'roi_coords'])
+        return cls.from_columns(columns, min_confidence)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _take(self, index: np.ndarray) -> 'PotTimeline':
+        return PotTimeline(self.times[index], self.values[index], self.confidences[index], self.rois[index])
+
+    def filter(self, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> 'PotTimeline':
+        """값이 없거나 0 이하, 신뢰도가 낮은 읽기 제거"""
+        with np.errstate(invalid='ignore'):
+            mask = (self.values > 0) & (self.confidences >= min_confidence)
+        return self._take(mask)
+
+    def dedupe(self) -> 'PotTimeline':
+        """같은 시각의 읽기(ROI별 결과)는 신뢰도가 가장 높은 것만 남김"""
+        if len(self) < 2:
+            return self
+        order = np.lexsort((-self.confidences, self.times))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = np.diff(self.times[order]) != 0
+        return self._take(np.sort(order[first]))
+
+    def smoothed(self, window: int = SMOOTHING_WINDOW) -> np.ndarray:
+        """신뢰도 가중 이동 중앙값"""
+        return _weighted_median(self.values, self.confidences, window)
+
+    def outlier_mask(self, ratio: float = OUTLIER_RATIO) -> np.ndarray:
+        """
+        앞뒤 이웃 읽기 모두와 ratio배 넘게 차이 나는 단독 읽기 (자릿수 오인식 등)
+
+        두 번 이상 이어진 값은 큰 올인처럼 실제 팟 변화일 수 있으므로 유지. 양 끝 읽기는
+        유일한 이웃이 그 다음 읽기와 일치할 때만 제거 (읽기가 둘뿐이면 어느 쪽이 맞는지 모름)
+        """
+        n = len(self)
+        if n < 3:
+            return np.zeros(n, dtype=bool)
+        scale = self.values[1:] / self.values[:-1]
+        jump = (scale > ratio) | (scale < 1 / ratio)  # jump[i]: 읽기 i와 i+1 사이
+        off_previous = np.concatenate([[not jump[1]], jump])
+        off_next = np.concatenate([jump, [not jump[-2]]])
+        return off_previous & off_next
+
+    def clean(self, ratio: float = OUTLIER_RATIO, window: int = SMOOTHING_WINDOW) -> 'PotTimeline':
+        """중복 제거 → 이상치 제거 → 평활화한 타임라인"""
+        timeline = self.dedupe()
+        timeline = timeline._take(~timeline.outlier_mask(ratio))
+        timeline.values = timeline.smoothed(window)
+        return timeline
+
+    def change_points(self, threshold_percent: float = 10.0) -> np.ndarray:
+        """직전 읽기 대비 threshold_percent 이상 바뀐 읽기 인덱스"""
+        if len(self) < 2:
+            return np.array([], dtype=np.int64)
+        previous = self.values[:-1]
+        change_percent = np.abs(self.values[1:] - previous) / previous * 100
+        return np.flatnonzero(change_percent >= threshold_percent) + 1
+
+    def changes(self, threshold_percent: float = 10.0) -> List[Dict]:
+        """변화 지점 목록 (detect_pot_changes 결과 형식)"""
+        index = self.change_points(threshold_percent)
+        previous = self.values[index - 1]
+        current = self.values[index]
+        amount = current - previous
+        percent = np.abs(amount) / previous * 100
+        return [
+            {
+                'timestamp': t,
+                'formatted_time': format_time(t),
+                'previous_pot': p,
+                'current_pot': c,
+                'change_amount': a,
+                'change_percent': pc
+            }
+            for t, p, c, a, pc in zip(self.times[index].tolist(), previous.tolist(), current.tolist(),
+                                      amount.tolist(), percent.tolist())
+        ]
+
+    def entries(self) -> List[Dict]:
+        """타임라인 항목 목록 (get_pot_timeline 결과 형식)"""
+        return [
+            {'timestamp': t, 'pot_size': v, 'confidence': c, 'formatted_time': format_time(t)}
+            for t, v, c in zip(self.times.tolist(), self.values.tolist(), self.confidences.tolist())
+        ]
+
+    def segment_stats(self, starts: Iterable[float], ends: Iterable[float]) -> Dict[str, np.ndarray]:
+        """
+        구간 [start, end]마다 읽기 수와 최대/최소 팟 (읽기가 없으면 NaN)
+
+        구간은 겹치거나 비어 있어도 됨. 정렬된 시간 배열에서 searchsorted로 경계를 찾고
+        reduceat 한 번으로 모든 핸드를 집계
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        lo = np.searchsorted(self.times, starts, side='left')
+        hi = np.searchsorted(self.times, ends, side='right')
+        count = np.maximum(hi - lo, 0)
+        if len(starts) == 0:
+            empty = np.array([], dtype=np.float64)
+            return {'count': count, 'max': empty, 'min': empty}
+
+        # 끝에 NaN을 붙여 hi == len(times)도 유효한 인덱스로 (fmax/fmin은 NaN 무시)
+        padded = np.append(self.values, np.nan)
+        bounds = np.column_stack([lo, np.maximum(hi, lo)]).ravel()
+        maxima = np.fmax.reduceat(padded, bounds)[::2]
+        minima = np.fmin.reduceat(padded, bounds)[::2]
+        empty = count == 0
+        maxima[empty] = np.nan
+        minima[empty] = np.nan
+        return {'count': count, 'max': maxima, 'min': minima}
+
+    def hand_ranges(self, hands: Sequence[Tuple[float, float]]) -> List[Dict]:
+        """핸드 (시작, 끝) 목록 → 핸드별 {'readings', 'max_pot', 'min_pot'} (읽기가 없으면 None)"""
+        bounds = np.asarray(hands, dtype=np.float64).reshape(-1, 2)
+        stats = self.segment_stats(bounds[:, 0], bounds[:, 1])
+        return [
+            {
+                'readings': count,
+                'max_pot': None if count == 0 else high,
+                'min_pot': None if count == 0 else low
+            }
+            for count, high, low in zip(stats['count'].tolist(), stats['max'].tolist(), stats['min'].tolist())
+        ]
@@ -0,0 +1,152 @@
+"""
+분석 작업 진행 상황 저장소
+SQLite에 작업 상태를 저장해 여러 프로세스(gunicorn 워커 등)가 공유하고,
+서버 재시작 후에도 상태를 유지. 버전 번호로 변경을 감지해 SSE로 전달
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 이 상태가 되면 더 이상 변경이 없음
+TERMINAL_STATUSES = ('completed', 'error', 'cancelled')
+
+
+class ProgressStore:
+    """SQLite 기반 작업 진행 상황 저장소"""
+
+    def __init__(self, db_path: str = 'analysis_progress.db', poll_interval: float = 0.5):
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        # 같은 프로세스 안의 갱신은 폴링 없이 바로 깨움
+        self._changed = threading.Condition()
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        self._connect().execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                task_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        ''')
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def create(self, task_id: str, **fields) -> Dict[str, Any]:
+        """새 작업 등록"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO jobs (task_id, data, version, updated_at) VALUES (?, ?, 1, ?)',
+            (task_id, json.dumps(fields, ensure_ascii=False), time.time())
+        )
+        self._notify()
+        return fields
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (없으면 None)"""
+        entry = self.get_versioned(task_id)
+        return entry[1] if entry else None
+
+    def get_versioned(self, task_id: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        row = self._connect().execute(
+            'SELECT version, data FROM jobs WHERE task_id = ?', (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get_versioned(task_id) is not None
+
+    def update(self, task_id: str, merge: Optional[Dict[str, Dict]] = None, **fields) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 갱신 (다른 프로세스와 경쟁하지 않도록 한 트랜잭션에서 읽고 씀)
+
+        merge: {'video_info': {...}} 처럼 기존 딕셔너리 필드에 합칠 값
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT data FROM jobs WHERE task_id = ?', (task_id,)).fetchone()
+            if row is None:
+                conn.execute('ROLLBACK')
+                logger.warning(f"알 수 없는 작업 갱신 무시: {task_id}")
+                return None
+
+            data = json.loads(row[0])
+            data.update(fields)
+            for key, values in (merge or {}).items():
+                nested = data.get(key) or {}
+                nested.update(values)
+                data[key] = nested
+
+            conn.execute(
+                'UPDATE jobs SET data = ?, version = version + 1, updated_at = ? WHERE task_id = ?',
+                (json.dumps(data, ensure_ascii=False), time.time(), task_id)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._notify()
+        return data
+
+    def wait_for_change(self, task_id: str, since_version: int,
+                        timeout: float = 15.0) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """since_version 이후의 변경을 기다림 (타임아웃 시 None)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.get_versioned(task_id)
+            if entry is None or entry[0] > since_version:
+                return entry
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            # 다른 프로세스의 갱신은 poll_interval마다 확인
+            with self._changed:
+                self._changed.wait(min(self.poll_interval, remaining))
+
+    def stream(self, task_id: str, since_version: int = 0, heartbeat: float = 15.0) -> Iterator[str]:
+        """Server-Sent Events 메시지 생성기 (작업 종료 시 끝남, Last-Event-ID로 이어받기)"""
+        version = since_version
+        while True:
+            entry = self.wait_for_change(task_id, version, timeout=heartbeat)
+            if entry is None:
+                if task_id not in self:
+                    return
+                # 프록시가 연결을 끊지 않도록 주석 라인 전송
+                yield ': keep-alive\n\n'
+                continue
+
+            version, data = entry
+            yield f"id: {version}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+            if data.get('status') in TERMINAL_STATUSES:
+                return
+
+    def cleanup(self, max_age_seconds: float = 7 * 24 * 3600) -> int:
+        """오래된 작업 기록 삭제"""
+        cursor = self._connect().execute(
+            'DELETE FROM jobs WHERE updated_at < ?', (time.time() - max_age_seconds,)
+        )
+        return cursor.rowcount
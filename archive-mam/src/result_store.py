@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+"""
+프레임 단위 분석 결과의 컬럼 저장소
+행(dict) 목록을 컬럼별 numpy 배열로 바꿔 압축 .npz에 청크 단위로 저장하고,
+요약(summary)과 청크별 시간 범위는 같은 파일 안의 JSON 헤더(summary.json)에 둠.
+요약만 읽거나 시간 구간에 겹치는 청크만 풀어서 읽을 수 있음
+"""
+import json
+import logging
+import math
+import os
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'columnar_results'
+FORMAT_VERSION = 1
+SUMMARY_MEMBER = 'summary.json'
+CHUNK_ROWS = 4096
+
+
+def _flatten(row: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """중첩 dict를 'a.b' 형태의 키로 펼침 (리스트/튜플은 a.0, a.1)"""
+    flat = {}
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + '.'))
+        elif isinstance(value, (list, tuple)):
+            flat.update(_flatten({str(i): v for i, v in enumerate(value)}, name + '.'))
+        else:
+            flat[name] = value
+    return flat
+
+
+# 컬럼 논리 타입 (헤더의 'types'에 기록, 읽을 때 None/정수 복원에 사용)
+COLUMN_TYPES = ('bool', 'int', 'float', 'str')
+
+
+def _infer_type(values: List[Any]) -> str:
+    """값 목록의 논리 타입 (모두 None이면 숫자 컬럼으로 봄 - 예: 한 번도 읽히지 않은 팟 값)"""
+    present = [v for v in values if v is not None]
+    if not present:
+        return 'float'
+    sample = present[0]
+    if isinstance(sample, (bool, np.bool_)):
+        return 'bool'
+    if all(isinstance(v, (int, np.integer)) and not isinstance(v, (bool, np.bool_)) for v in present):
+        return 'int'
+    if all(isinstance(v, (int, float, np.integer, np.floating)) for v in present):
+        return 'float'
+    return 'str'
+
+
+def _to_column(values: List[Any], column_type: Optional[str] = None) -> np.ndarray:
+    """
+    값 목록을 논리 타입에 맞는 numpy 배열로
+
+    숫자 None은 NaN (None이 섞인 정수 컬럼은 float64로 저장하고 읽을 때 정수로 복원),
+    문자열 None은 빈 문자열
+    """
+    column_type = column_type or _infer_type(values)
+    if column_type == 'bool':
+        return np.array([bool(v) for v in values], dtype=bool)
+    if column_type == 'int' and all(v is not None for v in values):
+        return np.array(values, dtype=np.int64)
+    if column_type in ('int', 'float'):
+        return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+    return np.array(['' if v is None else str(v) for v in values])
+
+
+def rows_to_columns(rows: Sequence[Dict[str, Any]],
+                    schema: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    """
+    행 목록 → (컬럼 dict, 컬럼별 논리 타입) (행마다 없는 키는 None 취급)
+
+    schema: 컬럼명 → 논리 타입 ('bool', 'int', 'float', 'str'), 없는 컬럼은 값으로 추론
+    """
+    schema = schema or {}
+    flat_rows = [_flatten(row) for row in rows]
+    names: List[str] = []
+    seen = set()
+    for row in flat_rows:
+        for name in row:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+
+    columns, types = {}, {}
+    for name in names:
+        values = [row.get(name) for row in flat_rows]
+        types[name] = schema.get(name) or _infer_type(values)
+        if types[name] not in COLUMN_TYPES:
+            raise ValueError(f"알 수 없는 컬럼 타입: {name}={types[name]}")
+        columns[name] = _to_column(values, types[name])
+    return columns, types
+
+
+def _to_python(value, column_type: Optional[str] = None):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if column_type == 'int' and isinstance(value, float):
+        return int(value)
+    return value
+
+
+def columns_to_rows(columns: Dict[str, np.ndarray],
+                    types: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """컬럼 dict → 행 목록 ('a.b' 키는 다시 중첩 dict로, types가 있으면 정수 컬럼 복원)"""
+    if not columns:
+        return []
+    types = types or {}
+    length = len(next(iter(columns.values())))
+    rows = []
+    for i in range(length):
+        row: Dict[str, Any] = {}
+        for name, column in columns.items():
+            target = row
+            parts = name.split('.')
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = _to_python(column[i], types.get(name))
+        rows.append(row)
+    return rows
+
+
+def save_columnar(path: str, rows: Sequence[Dict[str, Any]], summary: Optional[Dict] = None,
+                  time_key: str = 'timestamp', chunk_rows: int = CHUNK_ROWS,
+                  schema: Optional[Dict[str, str]] = None) -> str:
+    """
+    행 목록을 컬럼 파일로 저장
+
+    행은 time_key 기준으로 정렬해 저장하며, 청크마다 [시작 시간, 끝 시간, 행 수]를 헤더에 기록.
+    schema(컬럼명 → 논리 타입)를 주면 값이 모두 None인 컬럼도 정해진 타입으로 저장
+    """
+    rows = sorted(rows, key=lambda r: r.get(time_key, 0.0))
+    columns, types = rows_to_columns(rows, schema)
+    total = len(rows)
+
+    arrays = {}
+    chunks = []
+    for chunk_index, offset in enumerate(range(0, total, chunk_rows)):
+        end = min(offset + chunk_rows, total)
+        for name, column in columns.items():
+            arrays[f"{name}@{chunk_index}"] = column[offset:end]
+        times = columns.get(time_key)
+        if times is not None and len(times[offset:end]):
+            chunks.append([float(times[offset]), float(times[end - 1]), end - offset])
+        else:
+            chunks.append([None, None, end - offset])
+
+    header = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'time_key': time_key,
+        'row_count': total,
+        'columns': {name: str(column.dtype) for name, column in columns.items()},
+        'types': types,
+        'chunks': chunks,
+        'summary': summary or {}
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # 임시 파일에 쓴 뒤 교체해 읽는 쪽이 반쯤 쓴 파일을 보지 않게 함
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=directory)
+    os.close(fd)
+    try:
+        np.savez_compressed(tmp_path, **arrays)
+        with zipfile.ZipFile(tmp_path, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(SUMMARY_MEMBER, json.dumps(header, ensure_ascii=False))
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    logger.info(f"컬럼 결과 저장: {path} ({total}행, {len(columns)}컬럼, {len(chunks)}청크)")
+    return path
+
+
+def load_header(path: str) -> Dict:
+    """헤더(JSON)만 읽음 - 프레임 데이터는 풀지 않음"""
+    with zipfile.ZipFile(path) as zf:
+        header = json.loads(zf.read(SUMMARY_MEMBER))
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"컬럼 결과 파일이 아닙니다: {path}")
+    return header
+
+
+def load_summary(path: str) -> Dict:
+    """저장 시 넘긴 요약 + 행/컬럼 정보"""
+    header = load_header(path)
+    return dict(header['summary'], row_count=header['row_count'], columns=list(header['columns']))
+
+
+def read_range(path: str, start: Optional[float] = None, end: Optional[float] = None,
+               columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    시간 구간 [start, end]의 행만 컬럼 dict로 읽음
+
+    columns를 주면 해당 컬럼(또는 'features'처럼 접두어)과 시간 컬럼만 읽음.
+    구간과 겹치지 않는 청크는 압축을 풀지 않음
+    """
+    header = load_header(path)
+    time_key = header['time_key']
+    names = list(header['columns'])
+    if columns is not None:
+        wanted = list(columns) + [time_key]
+        names = [n for n in names if any(n == w or n.startswith(w + '.') for w in wanted)]
+
+    selected = []
+    for index, (chunk_start, chunk_end, _) in enumerate(header['chunks']):
+        if chunk_start is not None:
+            if start is not None and chunk_end < start:
+                continue
+            if end is not None and chunk_start > end:
+                continue
+        selected.append(index)
+
+    result: Dict[str, List[np.ndarray]] = {name: [] for name in names}
+    with np.load(path, allow_pickle=False) as data:
+        for index in selected:
+            chunk = {name: data[f"{name}@{index}"] for name in names}
+            mask = None
+            if time_key in chunk:
+                times = chunk[time_key]
+                mask = np.ones(len(times), dtype=bool)
+                if start is not None:
+                    mask &= times >= start
+                if end is not None:
+                    mask &= times <= end
+            for name in names:
+                result[name].append(chunk[name] if mask is None else chunk[name][mask])
+
+    merged = {}
+    for name in names:
+        parts = result[name]
+        if parts:
+            merged[name] = np.concatenate(parts)
+        else:
+            merged[name] = np.array([], dtype=header['columns'][name])
+    return merged
+
+
+def read_rows(path: str, start: Optional[float] = None, end: Optional[float] = None,
+              columns: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """read_range 결과를 JSON 직렬화 가능한 행 목록으로"""
+    types = load_header(path).get('types')  # 타입 기록 이전 파일은 dtype 그대로
+    return columns_to_rows(read_range(path, start, end, columns), types)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+"""
+장면 분할 사전 패스
+저해상도 썸네일의 프레임 간 차이로 정적 구간(리더보드, 휴식 화면)을 찾고, 선택적으로
+테이블(펠트) 색 비율로 테이블이 보이지 않는 구간(해설, 광고)까지 찾아 스킵 리스트를 만듦.
+무거운 감지기는 스킵 리스트 구간을 건너뛰고 핸드가 있을 수 있는 구간만 분석함
+"""
+import bisect
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+try:
+    from .ffmpeg_frame_reader import FFmpegFrameReader, ffmpeg_available
+except ImportError:
+    from ffmpeg_frame_reader import FFmpegFrameReader, ffmpeg_available
+
+logger = logging.getLogger(__name__)
+
+SCENES_SUFFIX = '.scenes.json'
+SCENES_VERSION = 2
+
+# 썸네일 크기 (16:9)
+THUMB_SIZE = (64, 36)
+
+# 펠트 색 판정: 이 채도/명도 이상인 픽셀의 색상(OpenCV 0~179)만 사용
+TABLE_MIN_SATURATION = 40
+TABLE_MIN_VALUE = 40
+HUE_BINS = 180
+
+
+@dataclass
+class SkipInterval:
+    """분석을 건너뛸 구간"""
+    start: float
+    end: float
+    reason: str  # 'static' 또는 'off_table'
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class SkipList:
+    """시간순으로 정렬된 스킵 구간 목록"""
+
+    def __init__(self, intervals: Optional[List[SkipInterval]] = None):
+        self.intervals = sorted(intervals or [], key=lambda i: i.start)
+        self._starts = [i.start for i in self.intervals]
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def find(self, t: float) -> Optional[SkipInterval]:
+        """t를 포함하는 스킵 구간 (없으면 None)"""
+        i = bisect.bisect_right(self._starts, t) - 1
+        if i >= 0 and t < self.intervals[i].end:
+            return self.intervals[i]
+        return None
+
+    def contains(self, t: float) -> bool:
+        return self.find(t) is not None
+
+    def resume_frame(self, frame_number: int, fps: float) -> Optional[int]:
+        """프레임이 스킵 구간 안이면 분석을 재개할 프레임 번호, 아니면 None"""
+        if not fps:
+            return None
+        interval = self.find(frame_number / fps)
+        if interval is None:
+            return None
+        return max(frame_number + 1, int(np.ceil(interval.end * fps)))
+
+    @property
+    def total_skipped(self) -> float:
+        return sum(i.duration for i in self.intervals)
+
+    def to_list(self) -> List[Dict]:
+        return [asdict(i) for i in self.intervals]
+
+    @classmethod
+    def from_list(cls, data: List[Dict]) -> 'SkipList':
+        return cls([SkipInterval(**item) for item in data])
+
+
+def frame_signature(frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    프레임 서명: (회색조 썸네일, 채도 있는 픽셀의 색상 히스토그램)
+
+    AdvancedUIDetector._calculate_frame_hash와 같이 작은 썸네일을 쓰지만,
+    MD5는 완전히 같은 프레임만 잡아내므로 여기서는 썸네일 자체를 비교함.
+    색상 히스토그램은 펠트 색 보정/테이블 비율 계산용 (썸네일 대신 180개 빈만 보관)
+    """
+    if frame.shape[1] != THUMB_SIZE[0] or frame.shape[0] != THUMB_SIZE[1]:
+        frame = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    colored = (hsv[..., 1] >= TABLE_MIN_SATURATION) & (hsv[..., 2] >= TABLE_MIN_VALUE)
+    hue_hist = np.bincount(hsv[..., 0][colored], minlength=HUE_BINS)[:HUE_BINS]
+    return gray, hue_hist.astype(np.int32)
+
+
+def _hue_window(hue: int, tolerance: int) -> np.ndarray:
+    """hue ± tolerance 색상 빈 (빨강처럼 0/179 경계를 넘는 색도 처리)"""
+    return np.arange(hue - tolerance, hue + tolerance + 1) % HUE_BINS
+
+
+def dominant_table_hue(hue_hists: np.ndarray, tolerance: int, min_ratio: float) -> Optional[int]:
+    """
+    영상 전체 샘플에서 가장 많이 보이는 채도 있는 색상 (펠트 색 보정)
+
+    hue ± tolerance 창에 든 픽셀이 전체 샘플 픽셀의 min_ratio 미만이면
+    지배적인 펠트 색이 없다고 보고 None
+    """
+    if len(hue_hists) == 0:
+        return None
+    total = np.sum(hue_hists, axis=0)
+    # 원형 창 합: 모든 중심 색상에 대해 ±tolerance 합
+    window_sums = sum(np.roll(total, shift) for shift in range(-tolerance, tolerance + 1))
+    hue = int(np.argmax(window_sums))
+    pixels = len(hue_hists) * THUMB_SIZE[0] * THUMB_SIZE[1]
+    if window_sums[hue] < min_ratio * pixels:
+        return None
+    return hue
+
+
+def signature_delta(a: np.ndarray, b: np.ndarray) -> float:
+    """두 썸네일의 평균 절대 차이 (0~255)"""
+    return float(np.mean(cv2.absdiff(a, b)))
+
+
+class SceneSegmenter:
+    """
+    저비용 장면 분할기
+
+    - sample_interval초마다 썸네일 하나만 추출 (ffmpeg가 있으면 디코더에서 축소)
+    - 이전 샘플과의 차이가 static_threshold 미만이면 정적 화면으로 보고
+    - table_color를 주면 테이블 색 비율이 min_table_ratio 미만인 샘플도 테이블 외 화면으로 봄
+      (None: 끔, 'auto': 영상에서 가장 많이 보이는 색을 펠트 색으로 보정, 정수: OpenCV 색상 0~179)
+    - 이런 샘플이 min_skip_duration 이상 이어진 구간만 양 끝 margin을 남기고 스킵
+
+    펠트 색은 방송마다 달라서(녹색/파랑/빨강) 테이블 외 판정은 기본으로 끔.
+    색을 잘못 잡으면 영상 전체가 스킵되어 핸드가 0개가 되기 때문
+    """
+
+    def __init__(self, sample_interval: float = 1.0, static_threshold: float = 2.0,
+                 min_table_ratio: float = 0.05, min_skip_duration: float = 10.0,
+                 margin: float = 2.0, table_color: Union[None, str, int] = None,
+                 hue_tolerance: int = 12):
+        if table_color is not None and table_color != 'auto' and not isinstance(table_color, int):
+            raise ValueError(f"table_color는 None, 'auto', 또는 색상 값(0~179)이어야 합니다: {table_color!r}")
+        self.sample_interval = sample_interval
+        self.static_threshold = static_threshold
+        self.min_table_ratio = min_table_ratio
+        self.min_skip_duration = min_skip_duration
+        self.margin = margin
+        self.table_color = table_color
+        self.hue_tolerance = hue_tolerance
+        # 마지막 분할에서 사용한 펠트 색상 (보정 결과 확인용)
+        self.table_hue: Optional[int] = None
+
+    def params(self) -> Dict:
+        """사이드카 캐시 검증용 파라미터"""
+        return {
+            'sample_interval': self.sample_interval,
+            'static_threshold': self.static_threshold,
+            'min_table_ratio': self.min_table_ratio,
+            'min_skip_duration': self.min_skip_duration,
+            'margin': self.margin,
+            'table_color': self.table_color,
+            'hue_tolerance': self.hue_tolerance
+        }
+
+    def _sample_frames(self, video_path: str):
+        """(시간, 썸네일 프레임) 샘플 생성"""
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        step = max(1, int(round(fps * self.sample_interval)))
+
+        if ffmpeg_available():
+            cap.release()
+            reader = FFmpegFrameReader(video_path, width=THUMB_SIZE[0], height=THUMB_SIZE[1],
+                                       sample_every=step, fps=fps)
+            for _, timestamp, frame in reader:
+                yield timestamp, frame
+            return
+
+        # ffmpeg가 없으면 grab으로 건너뛰고 샘플 프레임만 retrieve
+        frame_number = 0
+        try:
+            while cap.grab():
+                if frame_number % step == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        yield frame_number / fps, frame
+                frame_number += 1
+        finally:
+            cap.release()
+
+    def _table_hue(self, hue_hists: np.ndarray) -> Optional[int]:
+        if self.table_color is None:
+            return None
+        if self.table_color == 'auto':
+            hue = dominant_table_hue(hue_hists, self.hue_tolerance, self.min_table_ratio)
+            if hue is None:
+                logger.info("지배적인 펠트 색을 찾지 못해 테이블 외 판정 생략")
+            return hue
+        return self.table_color % HUE_BINS
+
+    def segment_samples(self, samples) -> SkipList:
+        """(시간, 프레임) 샘플 시퀀스에서 스킵 리스트 계산"""
+        timestamps: List[float] = []
+        static: List[bool] = []
+        hue_hists = []
+        previous = None
+        for timestamp, frame in samples:
+            gray, hue_hist = frame_signature(frame)
+            timestamps.append(timestamp)
+            static.append(previous is not None and signature_delta(gray, previous) < self.static_threshold)
+            hue_hists.append(hue_hist)
+            previous = gray
+
+        # 펠트 색은 전체 샘플을 본 뒤 정함 (영상이 해설 화면으로 시작해도 보정이 흔들리지 않음)
+        hue_hists = np.array(hue_hists, dtype=np.int32).reshape(-1, HUE_BINS)
+        self.table_hue = self._table_hue(hue_hists)
+        off_table = np.zeros(len(timestamps), dtype=bool)
+        if self.table_hue is not None:
+            table_pixels = hue_hists[:, _hue_window(self.table_hue, self.hue_tolerance)].sum(axis=1)
+            off_table = table_pixels < self.min_table_ratio * THUMB_SIZE[0] * THUMB_SIZE[1]
+
+        flags: List[Tuple[float, Optional[str]]] = [
+            (timestamp, 'off_table' if off else ('static' if still else None))
+            for timestamp, off, still in zip(timestamps, off_table.tolist(), static)
+        ]
+
+        intervals = []
+        run_start = None
+        run_reasons = []
+        for i, (timestamp, reason) in enumerate(flags + [(None, None)]):
+            if reason is not None:
+                if run_start is None:
+                    run_start = timestamp
+                run_reasons.append(reason)
+                continue
+            if run_start is not None:
+                run_end = flags[i - 1][0] + self.sample_interval
+                start, end = run_start + self.margin, run_end - self.margin
+                if run_end - run_start >= self.min_skip_duration and end > start:
+                    # 구간 대부분의 원인을 대표 사유로 기록
+                    dominant = max(set(run_reasons), key=run_reasons.count)
+                    intervals.append(SkipInterval(start, end, dominant))
+                run_start = None
+                run_reasons = []
+
+        return SkipList(intervals)
+
+    def scan(self, video_path: str) -> SkipList:
+        """영상 전체를 훑어 스킵 리스트 생성"""
+        skip_list = self.segment_samples(self._sample_frames(video_path))
+        logger.info(f"장면 분할 완료: {video_path} ({len(skip_list)}개 구간, "
+                    f"{skip_list.total_skipped:.1f}초 스킵)")
+        return skip_list
+
+
+def scenes_path(video_path: str) -> str:
+    """스킵 리스트 사이드카 경로"""
+    return video_path + SCENES_SUFFIX
+
+
+def get_skip_list(video_path: str, segmenter: Optional[SceneSegmenter] = None) -> SkipList:
+    """사이드카에서 스킵 리스트를 읽거나 새로 계산해 저장 (영상/파라미터가 바뀌면 재계산)"""
+    segmenter = segmenter or SceneSegmenter()
+    stat = os.stat(video_path)
+    path = scenes_path(video_path)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if (data.get('version') == SCENES_VERSION and data.get('file_size') == stat.st_size
+                and abs(data.get('mtime', 0) - stat.st_mtime) <= 1e-3
+                and data.get('params') == segmenter.params()):
+            return SkipList.from_list(data['intervals'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    skip_list = segmenter.scan(video_path)
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SCENES_VERSION,
+                'file_size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'params': segmenter.params(),
+                'intervals': skip_list.to_list()
+            }, f)
+    except OSError as e:
+        logger.warning(f"스킵 리스트 저장 실패 ({video_path}): {e}")
+    return skip_list
@@ -26,10 +26,24 @@ class Video(VideoBase):
     status: VideoStatus
     task_id: Optional[str] = None
     error_message: Optional[str] = None
+    content_hash: Optional[str] = None
+    file_size: Optional[int] = None
     
     class Config:
         orm_mode = True
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    total_size: int
+    content_hash: Optional[str] = None  # lets the server skip uploads it already has
+
+class UploadSessionStatus(BaseModel):
+    upload_id: Optional[str] = None
+    filename: str
+    total_size: int
+    received_bytes: int = 0
+    existing_video_id: Optional[int] = None
+
 class HandBase(BaseModel):
     video_filename: str
     start_time_s: float
@@ -57,3 +71,4 @@ class HandSearchFilter(BaseModel):
 class ClipRequest(BaseModel):
     hand_id: int
     format: Optional[str] = "mp4"
+    accurate: bool = False  # frame-accurate start (re-encodes the first GOP only)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+영상별 중간 신호(time-series) 캐시
+디코딩/특징 추출로 얻은 샘플 단위 신호(모션 면적, 카드 수, UI 확률, 팟 OCR 원문 등)를
+(영상 내용 해시, 추출기 이름/버전, 추출 파라미터) 키로 컬럼 파일(.npz)에 저장.
+임계값이나 그룹화 로직만 바꾼 재분석은 영상을 다시 디코딩하지 않고 캐시된 신호로 바로 계산함.
+
+추출 방식(샘플링, 필터, 모델 등)을 바꾸면 해당 추출기의 버전을 올려 이전 신호를 무효화
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .result_store import save_columnar, load_summary, read_rows
+except ImportError:
+    from result_store import save_columnar, load_summary, read_rows
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """캐시 디렉토리 (SIGNAL_CACHE_DIR 환경변수는 캐시를 만들 때 읽음)"""
+    return os.environ.get(
+        'SIGNAL_CACHE_DIR',
+        os.path.join(os.path.expanduser('~'), '.cache', 'poker-trend', 'signals')
+    )
+
+
+def params_digest(params: Dict[str, Any]) -> str:
+    """추출 파라미터의 안정적인 해시 (키 순서 무관)"""
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:12]
+
+
+class SignalCache:
+    """
+    영상 내용 해시 기준 신호 캐시
+
+    내용 해시는 (경로, 크기, 수정시간)으로 index.db에 기억해 같은 파일을 다시 해시하지 않음
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        cache_dir = cache_dir or default_cache_dir()
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, 'index.db')
+        conn = sqlite3.connect(self.index_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS video_hashes (
+                    video_path TEXT PRIMARY KEY,
+                    file_size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def video_hash(self, video_path: str) -> str:
+        """영상 파일 SHA-256 (변경되지 않은 파일은 기억해 둔 값)"""
+        video_path = os.path.abspath(video_path)
+        stat = os.stat(video_path)
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            row = conn.execute(
+                'SELECT file_size, mtime, content_hash FROM video_hashes WHERE video_path = ?', (video_path,)
+            ).fetchone()
+            if row and row[0] == stat.st_size and abs(row[1] - stat.st_mtime) <= 1e-3:
+                return row[2]
+
+            hasher = hashlib.sha256()
+            with open(video_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+            content_hash = hasher.hexdigest()
+            conn.execute(
+                'INSERT OR REPLACE INTO video_hashes (video_path, file_size, mtime, content_hash) VALUES (?, ?, ?, ?)',
+                (video_path, stat.st_size, stat.st_mtime, content_hash)
+            )
+            conn.commit()
+            return content_hash
+        finally:
+            conn.close()
+
+    def path_for(self, video_path: str, extractor: str, version: int, params: Dict[str, Any]) -> str:
+        content_hash = self.video_hash(video_path)
+        name = f"{content_hash[:16]}_{extractor}_v{version}_{params_digest(params)}.npz"
+        return os.path.join(self.cache_dir, name)
+
+    def load(self, video_path: str, extractor: str, version: int,
+             params: Dict[str, Any]) -> Optional[Tuple[List[Dict], Dict]]:
+        """캐시된 (신호 행 목록, 요약) 또는 None"""
+        try:
+            path = self.path_for(video_path, extractor, version, params)
+            if not os.path.exists(path):
+                return None
+            summary = load_summary(path)
+            rows = read_rows(path)
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            logger.warning(f"신호 캐시 읽기 실패, 다시 추출: {e}")
+            return None
+        logger.info(f"캐시된 신호 사용: {extractor} v{version} ({len(rows)}개 샘플)")
+        return rows, summary.get('extra', {})
+
+    def store(self, video_path: str, extractor: str, version: int, params: Dict[str, Any],
+              rows: Sequence[Dict], extra: Optional[Dict] = None) -> Optional[str]:
+        """신호 저장 (실패해도 분석은 계속)"""
+        try:
+            path = self.path_for(video_path, extractor, version, params)
+            save_columnar(path, list(rows), {
+                'extractor': extractor,
+                'version': version,
+                'params': params,
+                'video_path': os.path.abspath(video_path),
+                'created_at': time.time(),
+                'extra': extra or {}
+            })
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning(f"신호 캐시 저장 실패: {e}")
+            return None
+        return path
+
+    def invalidate(self, video_path: str, extractor: Optional[str] = None) -> int:
+        """영상(선택적으로 추출기 하나)의 캐시 파일 삭제, 삭제한 수 반환"""
+        prefix = f"{self.video_hash(video_path)[:16]}_"
+        if extractor is not None:
+            prefix += f"{extractor}_v"
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(prefix) and name.endswith('.npz'):
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+
+_default_cache: Optional[SignalCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_signal_cache() -> Optional[SignalCache]:
+    """프로세스 공용 캐시 (경로는 SIGNAL_CACHE_DIR 환경변수로 변경, 열 수 없으면 None → 캐시 없이 분석)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = SignalCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"신호 캐시를 열 수 없어 캐시 없이 분석: {e}")
+                return None
+        return _default_cache
+
+
+def reset_signal_cache():
+    """공용 캐시를 버림 (다음 get_signal_cache가 SIGNAL_CACHE_DIR을 다시 읽음, 테스트용)"""
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = None
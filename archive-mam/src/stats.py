@@ -0,0 +1,145 @@
+"""
+Aggregate statistics for the /stats endpoint.
+
+All aggregates are computed in SQL and the result is held in a short TTL
+cache so dashboards can poll the endpoint cheaply.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from .database import Video, Hand, VideoStatus
+
+# Pot size histogram bucket edges (the last bucket is open-ended)
+POT_BUCKET_EDGES = [0, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000]
+
+# Keep this shorter than the dashboard polling interval
+DEFAULT_STATS_TTL = 5.0
+
+
+class TTLCache:
+    """Thread-safe cache holding a single value for a fixed time"""
+
+    def __init__(self, ttl: float = DEFAULT_STATS_TTL):
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, recomputing it once it has expired"""
+        with self._lock:
+            now = time.monotonic()
+            if self._value is not None and now < self._expires_at:
+                return self._value
+
+            self._value = compute()
+            self._expires_at = now + self.ttl
+            return self._value
+
+    def invalidate(self):
+        """Drop the cached value (called after uploads and hand inserts)"""
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
+
+
+stats_cache = TTLCache()
+
+
+def _pot_bucket_label(index: int) -> str:
+    """Human readable label for a histogram bucket"""
+    lower = POT_BUCKET_EDGES[index]
+    if index + 1 < len(POT_BUCKET_EDGES):
+        return f"{lower}-{POT_BUCKET_EDGES[index + 1]}"
+    return f"{lower}+"
+
+
+def _pot_bucket_case_sql() -> str:
+    """CASE expression mapping max_pot to its bucket index"""
+    clauses = []
+    for index in range(len(POT_BUCKET_EDGES) - 1, 0, -1):
+        clauses.append(f"WHEN max_pot >= {POT_BUCKET_EDGES[index]} THEN {index}")
+    return "CASE " + " ".join(clauses) + " ELSE 0 END"
+
+
+# Largest pot per hand, taken from the pot_size_history JSON array
+_HAND_MAX_POT_SQL = """
+    SELECT (
+        SELECT MAX(CAST(json_extract(entry.value, '$.pot') AS REAL))
+        FROM json_each(hands.pot_size_history) AS entry
+    ) AS max_pot
+    FROM hands
+"""
+
+
+def _query_pot_histogram(db: Session) -> List[Dict[str, Any]]:
+    """Histogram of the largest pot per hand"""
+    query = text(f"""
+        SELECT {_pot_bucket_case_sql()} AS bucket, COUNT(*) AS hand_count
+        FROM ({_HAND_MAX_POT_SQL}) AS pots
+        WHERE max_pot IS NOT NULL
+        GROUP BY bucket
+    """)
+    counts = {row.bucket: row.hand_count for row in db.execute(query)}
+
+    return [
+        {
+            'range': _pot_bucket_label(index),
+            'min': POT_BUCKET_EDGES[index],
+            'max': POT_BUCKET_EDGES[index + 1] if index + 1 < len(POT_BUCKET_EDGES) else None,
+            'count': counts.get(index, 0)
+        }
+        for index in range(len(POT_BUCKET_EDGES))
+    ]
+
+
+def compute_statistics(db: Session) -> Dict[str, Any]:
+    """Compute system statistics with grouped aggregate queries"""
+    # Video counts per status in a single GROUP BY
+    videos_by_status = {status.value: 0 for status in VideoStatus}
+    for status, count in db.query(Video.status, func.count(Video.id)).group_by(Video.status):
+        if status is not None:
+            videos_by_status[VideoStatus(status).value] = count
+    total_videos = sum(videos_by_status.values())
+
+    # Hand count and duration aggregates
+    hand_duration = Hand.end_time_s - Hand.start_time_s
+    total_hands, avg_duration, min_duration, max_duration = db.query(
+        func.count(Hand.id),
+        func.avg(hand_duration),
+        func.min(hand_duration),
+        func.max(hand_duration)
+    ).one()
+
+    # Hands per hour: the last hand boundary of each video approximates its analyzed length
+    footage_per_video = db.query(
+        func.max(func.coalesce(Hand.end_time_s, Hand.start_time_s)).label('footage_s')
+    ).group_by(Hand.video_filename).subquery()
+    total_footage_s = db.query(func.sum(footage_per_video.c.footage_s)).scalar() or 0.0
+
+    hands_per_hour = total_hands / (total_footage_s / 3600) if total_footage_s > 0 else 0
+
+    return {
+        "total_videos": total_videos,
+        "total_hands": total_hands,
+        "videos_by_status": videos_by_status,
+        "average_hands_per_video": total_hands / total_videos if total_videos > 0 else 0,
+        "hands_per_hour": round(hands_per_hour, 2),
+        "hand_duration": {
+            "average_s": round(avg_duration, 2) if avg_duration is not None else None,
+            "min_s": min_duration,
+            "max_s": max_duration
+        },
+        "analyzed_footage_hours": round(total_footage_s / 3600, 2),
+        "pot_size_distribution": _query_pot_histogram(db)
+    }
+
+
+def get_cached_statistics(db: Session, cache: Optional[TTLCache] = None) -> Dict[str, Any]:
+    """Return statistics through the TTL cache"""
+    cache = cache or stats_cache
+    return cache.get_or_compute(lambda: compute_statistics(db))
@@ -7,22 +7,145 @@ import cv2
 import yt_dlp
 import requests
 import logging
-from urllib.parse import urlparse
-from typing import Optional, Dict, Any
+import re
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlparse, parse_qs
+from typing import Optional, Dict, Any, Callable, Hashable
 import time
 
 logger = logging.getLogger(__name__)
 
+# 서명된 스트림 URL 만료 직전에는 재사용하지 않음 (분석 도중 만료 방지)
+EXPIRY_MARGIN_SECONDS = 10 * 60
+# expire 파라미터가 없는 URL의 기본 유효 시간
+DEFAULT_RESOLUTION_TTL = 60 * 60
+
+_YOUTUBE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+
+def extract_youtube_id(url: str) -> Optional[str]:
+    """YouTube URL에서 영상 ID 추출 (watch, youtu.be, shorts, live, embed 형식)"""
+    parsed = urlparse(url)
+    candidate = None
+    
+    if parsed.netloc.endswith('youtu.be'):
+        candidate = parsed.path.lstrip('/').split('/')[0]
+    elif 'youtube.com' in parsed.netloc:
+        query_id = parse_qs(parsed.query).get('v')
+        if query_id:
+            candidate = query_id[0]
+        else:
+            parts = [p for p in parsed.path.split('/') if p]
+            if len(parts) >= 2 and parts[0] in ('shorts', 'live', 'embed', 'v'):
+                candidate = parts[1]
+    
+    if candidate and _YOUTUBE_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+
+def stream_url_expiry(stream_url: str) -> Optional[float]:
+    """서명된 스트림 URL의 만료 시각 (googlevideo의 expire 파라미터, 없으면 None)"""
+    parsed = urlparse(stream_url)
+    expire = parse_qs(parsed.query).get('expire')
+    if not expire:
+        # HLS 매니페스트는 /expire/<timestamp>/ 형태로 경로에 포함
+        match = re.search(r'/expire/(\d+)', parsed.path)
+        expire = [match.group(1)] if match else None
+    try:
+        return float(expire[0]) if expire else None
+    except ValueError:
+        return None
+
+
+class StreamResolutionCache:
+    """
+    스트림 URL 해석 결과 캐시
+    
+    - 서명된 URL의 만료 시각까지만 재사용
+    - 같은 키를 동시에 해석하면 한 번만 수행하고 나머지는 결과를 기다림
+    - URL이 만료된 뒤에도 포맷 메타데이터(fps, 해상도, 길이)는 남겨 둠
+    """
+    
+    def __init__(self, default_ttl: float = DEFAULT_RESOLUTION_TTL,
+                 expiry_margin: float = EXPIRY_MARGIN_SECONDS):
+        self.default_ttl = default_ttl
+        self.expiry_margin = expiry_margin
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _valid_until(self, info: Dict[str, Any]) -> float:
+        expiry = stream_url_expiry(info.get('stream_url', ''))
+        if expiry is None:
+            return time.time() + self.default_ttl
+        return expiry - self.expiry_margin
+    
+    def get_or_resolve(self, key: Hashable, resolver: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """캐시된 결과를 반환하거나 resolver로 해석 (동시 요청은 한 번만 해석)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['valid_until'] > time.time():
+                self.hits += 1
+                return dict(entry['info'])
+            
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+        
+        if not owner:
+            return dict(future.result())
+        
+        try:
+            info = resolver()
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._entries[key] = {'info': info, 'valid_until': self._valid_until(info)}
+            self._in_flight.pop(key, None)
+        future.set_result(info)
+        return dict(info)
+    
+    def get_metadata(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """만료 여부와 관계없이 마지막으로 해석한 메타데이터 (stream_url 제외)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return {k: v for k, v in entry['info'].items() if k != 'stream_url'}
+    
+    def invalidate(self, key: Hashable):
+        """URL만 무효화 (메타데이터는 유지)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry['valid_until'] = 0
+
+
+# 요청마다 핸들러를 새로 만들어도 캐시는 프로세스 전체에서 공유
+_resolution_cache = StreamResolutionCache()
+
 class StreamingVideoHandler:
     """스트리밍 비디오 처리 클래스"""
     
-    def __init__(self):
+    def __init__(self, resolution_cache: Optional[StreamResolutionCache] = None):
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'format': 'best[height<=720]',  # 720p 이하로 제한
             'noplaylist': True,
         }
+        self.resolution_cache = resolution_cache or _resolution_cache
     
     def get_stream_url(self, input_url: str) -> Dict[str, Any]:
         """
@@ -50,8 +173,28 @@ class StreamingVideoHandler:
         parsed = urlparse(url)
         return any(domain in parsed.netloc for domain in youtube_domains)
     
+    def _resolution_key(self, youtube_url: str):
+        """캐시 키: (영상 ID, 포맷 선택자)"""
+        return (extract_youtube_id(youtube_url) or youtube_url, self.ydl_opts['format'])
+    
     def _get_youtube_stream_url(self, youtube_url: str) -> Dict[str, Any]:
-        """YouTube URL에서 스트리밍 URL 추출"""
+        """YouTube URL에서 스트리밍 URL 추출 (만료 전까지 캐시된 결과 재사용)"""
+        key = self._resolution_key(youtube_url)
+        info = self.resolution_cache.get_or_resolve(
+            key, lambda: self._resolve_youtube_stream_url(youtube_url)
+        )
+        info['cache_key'] = key
+        return info
+    
+    def get_cached_metadata(self, input_url: str) -> Optional[Dict[str, Any]]:
+        """네트워크 요청 없이 이전에 해석한 메타데이터 조회 (없으면 None)"""
+        if not self.is_youtube_url(input_url):
+            return None
+        return self.resolution_cache.get_metadata(self._resolution_key(input_url))
+    
+    def _resolve_youtube_stream_url(self, youtube_url: str) -> Dict[str, Any]:
+        """yt-dlp로 YouTube 스트리밍 URL 해석"""
+        logger.info(f"YouTube 스트림 해석: {youtube_url}")
         with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
             try:
                 info = ydl.extract_info(youtube_url, download=False)
@@ -86,6 +229,7 @@ class StreamingVideoHandler:
                     'width': info.get('width', 1280),
                     'height': info.get('height', 720),
                     'fps': info.get('fps', 30),
+                    'is_live': bool(info.get('is_live')),
                     'source_type': 'youtube'
                 }
                 
@@ -141,6 +285,9 @@ class StreamingVideoHandler:
                 cap = cv2.VideoCapture(stream_url)
                 
                 if not cap.isOpened():
+                    # 캐시된 URL이 예상보다 일찍 만료되었을 수 있으므로 다음 요청은 다시 해석
+                    if stream_info.get('cache_key') is not None:
+                        self.resolution_cache.invalidate(stream_info['cache_key'])
                     raise Exception("비디오 스트림을 열 수 없습니다")
             
             # 기본 설정
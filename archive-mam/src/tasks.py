@@ -2,6 +2,8 @@ from celery import Task
 from .celery_app import celery_app
 from .integrate_analysis import analyze_video as analyze_video_sync
 from .database import SessionLocal, Hand
+from .clip_service import ClipService
+from .video_index import get_index
 from sqlalchemy.orm import Session
 import os
 import json
@@ -9,6 +11,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Clips are stored in a content-addressed cache served by the /clips routes
+clip_service = ClipService("clips")
+
 class CallbackTask(Task):
     def on_success(self, retval, task_id, args, kwargs):
         """Success handler"""
@@ -31,6 +36,9 @@ def analyze_video_task(self, video_path: str, video_id: int):
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video file not found: {video_path}")
         
+        # Build the keyframe index sidecar once; seekers and clip generation reuse it
+        get_index(video_path)
+        
         # Analyze video
         logger.info(f"Starting analysis for video: {video_path}")
         
@@ -90,35 +98,42 @@ def analyze_video_task(self, video_path: str, video_id: int):
         raise
 
 @celery_app.task
-def generate_clip_task(video_path: str, start_time: float, end_time: float, output_path: str):
+def generate_clip_task(video_path: str, start_time: float, end_time: float,
+                       output_format: str = 'mp4', video_hash: str = None, accurate: bool = False):
     """
-    Generate a video clip from the original video
+    Generate a video clip from the original video (served from the clip cache when possible)
     """
-    import subprocess
-    
     try:
-        # Use ffmpeg to extract the clip
-        cmd = [
-            'ffmpeg',
-            '-i', video_path,
-            '-ss', str(start_time),
-            '-to', str(end_time),
-            '-c', 'copy',
-            '-avoid_negative_ts', '1',
-            output_path,
-            '-y'
-        ]
+        clip_path = clip_service.get_clip(
+            video_path, start_time, end_time, output_format,
+            video_hash=video_hash, accurate=accurate
+        )
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        return {
+            'status': 'success',
+            'output_path': str(clip_path)
+        }
         
-        if result.returncode != 0:
-            raise Exception(f"FFmpeg error: {result.stderr}")
+    except Exception as e:
+        logger.error(f"Error generating clip: {str(e)}")
+        raise
+
+@celery_app.task
+def export_video_clips_task(video_path: str, ranges: list, output_format: str = 'mp4',
+                            video_hash: str = None):
+    """
+    Export clips for all hands of a video in a single ffmpeg pass
+    """
+    try:
+        clip_paths = clip_service.export_all(
+            video_path, [tuple(r) for r in ranges], output_format, video_hash=video_hash
+        )
         
         return {
             'status': 'success',
-            'output_path': output_path
+            'output_paths': [str(p) for p in clip_paths]
         }
         
     except Exception as e:
-        logger.error(f"Error generating clip: {str(e)}")
-        raise
\ No newline at end of file
+        logger.error(f"Error exporting clips: {str(e)}")
+        raise
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+시간 일관성 기반 프레임 분류 캐시
+연속된 샘플 프레임은 대부분 거의 같으므로, 축소 서명이 직전에 분류한 프레임과
+epsilon 이내면 이전 결과를 재사용함. 샘플링 간격은 안정 구간에서 늘리고
+변화(전환)가 생기면 다시 줄임
+"""
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from .scene_segmenter import signature_delta
+except ImportError:
+    from scene_segmenter import signature_delta
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SIZE = (32, 18)
+
+
+def thumbnail_signature(frame: np.ndarray, size: Tuple[int, int] = SIGNATURE_SIZE) -> np.ndarray:
+    """회색조 축소 썸네일 서명"""
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+class TemporalCache:
+    """
+    직전 분류 결과 재사용 캐시
+
+    - signature_fn으로 프레임 서명을 만들고, 마지막으로 실제 분류한 프레임의 서명과 비교
+    - 비교 기준은 마지막 '분류' 프레임이므로 천천히 변하는 장면도 누적 차이가
+      epsilon을 넘으면 다시 분류됨
+    """
+
+    def __init__(self, epsilon: float = 2.0,
+                 signature_fn: Callable[[np.ndarray], np.ndarray] = thumbnail_signature):
+        self.epsilon = epsilon
+        self.signature_fn = signature_fn
+        self._signature: Optional[np.ndarray] = None
+        self._result: Any = None
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self):
+        self._signature = None
+        self._result = None
+
+    def lookup(self, frame: np.ndarray) -> Tuple[bool, Any, np.ndarray]:
+        """(재사용 가능 여부, 이전 결과, 현재 서명)"""
+        signature = self.signature_fn(frame)
+        if (self._signature is not None and signature.shape == self._signature.shape
+                and signature_delta(signature, self._signature) <= self.epsilon):
+            self.hits += 1
+            return True, self._result, signature
+        self.misses += 1
+        return False, None, signature
+
+    def store(self, signature: np.ndarray, result: Any):
+        self._signature = signature
+        self._result = result
+
+    def get_or_compute(self, frame: np.ndarray, compute: Callable[[np.ndarray], Any]) -> Tuple[Any, bool]:
+        """(결과, 재사용 여부) - 재사용한 결과는 호출자가 타임스탬프 등을 갱신해야 함"""
+        hit, result, signature = self.lookup(frame)
+        if hit:
+            return result, True
+        result = compute(frame)
+        self.store(signature, result)
+        return result, False
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AdaptiveSampler:
+    """
+    적응형 샘플링 간격 (초 단위)
+
+    결과가 재사용되면(안정) grow배씩 늘려 max_interval까지, 새로 분류해야 하면(전환)
+    min_interval로 바로 줄여 전환 지점 주변을 촘촘히 샘플링.
+    전환 시점 오차는 최대 max_interval이므로 너무 크게 잡지 않음
+    """
+
+    def __init__(self, base_interval: float = 1.0, min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None, grow: float = 1.5):
+        self.base_interval = base_interval
+        self.min_interval = min_interval if min_interval is not None else base_interval / 4
+        self.max_interval = max_interval if max_interval is not None else base_interval * 4
+        self.grow = grow
+        self.interval = base_interval
+
+    def update(self, stable: bool) -> float:
+        """이번 샘플이 안정(캐시 재사용)이었는지 반영하고 다음 간격 반환"""
+        if stable:
+            self.interval = min(self.max_interval, self.interval * self.grow)
+        else:
+            self.interval = self.min_interval
+        return self.interval
+
+    def frames(self, fps: float) -> int:
+        """현재 간격을 프레임 수로 (최소 1)"""
+        return max(1, int(round(self.interval * fps)))
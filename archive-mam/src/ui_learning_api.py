@@ -10,6 +10,7 @@ from werkzeug.utils import secure_filename
 import cv2
 import numpy as np
 from .advanced_ui_detector import AdvancedUIDetector
+from .result_store import load_summary, read_rows
 import base64
 from io import BytesIO
 from PIL import Image
@@ -22,8 +23,10 @@ detector = AdvancedUIDetector()
 
 # 설정
 UPLOAD_FOLDER = 'ui_learning_uploads'
+RESULTS_FOLDER = 'ui_learning_results'
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -183,9 +186,14 @@ def analyze_video():
             # 파일 정리
             os.remove(filepath)
             
+            # 프레임별 결과는 컬럼 파일로 저장하고 응답에는 요약만 포함
+            result_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            detector.save_results(results, _result_path(result_id))
+            
             return jsonify({
                 'success': True,
-                'results': results
+                'result_id': result_id,
+                'results': load_summary(_result_path(result_id))
             })
         
         return jsonify({'error': 'Invalid file type'}), 400
@@ -193,6 +201,38 @@ def analyze_video():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _result_path(result_id):
+    return os.path.join(RESULTS_FOLDER, f"{secure_filename(result_id)}.npz")
+
+@ui_learning_bp.route('/api/ui-learning/results/<result_id>', methods=['GET'])
+def get_result_summary(result_id):
+    """저장된 비디오 분석 요약 (프레임 데이터는 읽지 않음)"""
+    path = _result_path(result_id)
+    if not os.path.exists(path):
+        return jsonify({'error': 'Result not found'}), 404
+    return jsonify(load_summary(path))
+
+@ui_learning_bp.route('/api/ui-learning/results/<result_id>/frames', methods=['GET'])
+def get_result_frames(result_id):
+    """시간 구간의 프레임별 결과 (start/end 초, columns=쉼표 구분 컬럼)"""
+    path = _result_path(result_id)
+    if not os.path.exists(path):
+        return jsonify({'error': 'Result not found'}), 404
+    
+    start = request.args.get('start', type=float)
+    end = request.args.get('end', type=float)
+    columns = request.args.get('columns')
+    columns = [c for c in columns.split(',') if c] if columns else None
+    
+    frames = read_rows(path, start, end, columns)
+    return jsonify({
+        'result_id': result_id,
+        'start': start,
+        'end': end,
+        'count': len(frames),
+        'frames': frames
+    })
+
 @ui_learning_bp.route('/api/ui-learning/stats', methods=['GET'])
 def get_stats():
     """현재 학습 데이터 통계"""
@@ -252,6 +252,38 @@ class UIPatternManager:
         conn.close()
         return patterns
     
+    def load_feature_samples(self, video_name: Optional[str] = None) -> List[FeatureSample]:
+        """저장된 레이블 샘플 로드 (video_name 지정 시 해당 영상만, 영상/시간 순)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        query = '''
+            SELECT sample_id, video_name, timestamp, features, is_ui, ui_type, confidence, created_at
+            FROM feature_samples
+        '''
+        params = ()
+        if video_name is not None:
+            query += ' WHERE video_name = ?'
+            params = (video_name,)
+        cursor.execute(query + ' ORDER BY video_name, timestamp', params)
+
+        samples = [
+            FeatureSample(
+                sample_id=row[0],
+                video_name=row[1],
+                timestamp=row[2],
+                features=json.loads(row[3]),
+                is_ui=bool(row[4]),
+                ui_type=row[5],
+                confidence=row[6],
+                created_at=row[7]
+            )
+            for row in cursor.fetchall()
+        ]
+
+        conn.close()
+        return samples
+
     def match_pattern(self, features: Dict[str, float], 
                      threshold: float = 0.8) -> Optional[UIPattern]:
         """현재 특징과 가장 유사한 패턴 찾기"""
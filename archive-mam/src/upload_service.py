@@ -0,0 +1,224 @@
+"""
+Streaming video uploads.
+
+Uploads are written to disk in fixed size chunks while their SHA-256 is
+computed, so a re-upload of the same footage under a different name can be
+resolved to the existing video (and its analysis) instead of being queued
+again. Large files can also be sent through resumable upload sessions.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from .database import Video, VideoStatus
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class UploadError(Exception):
+    """Upload could not be accepted"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE) -> "hashlib._Hash":
+    """Hash an existing file (used to resume a partial upload)"""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+async def stream_to_disk(chunks: AsyncIterator[bytes], dest: Path,
+                         hasher=None, append: bool = False) -> Tuple[str, int]:
+    """Write chunks to dest while hashing them; returns (sha256 hex, bytes written)"""
+    hasher = hasher or hashlib.sha256()
+    written = 0
+    with open(dest, "ab" if append else "wb") as out:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            await run_in_threadpool(out.write, chunk)
+            # Hash only what reached the file, so a failed write can't skew a resumed digest
+            hasher.update(chunk)
+            written += len(chunk)
+    return hasher.hexdigest(), written
+
+
+async def iter_upload_file(upload, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Read a FastAPI UploadFile in chunks"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def find_video_by_hash(db: Session, content_hash: Optional[str]) -> Optional[Video]:
+    if not content_hash:
+        return None
+    return db.query(Video).filter(Video.content_hash == content_hash).first()
+
+
+def filename_in_use(db: Session, upload_dir: Path, filename: str) -> bool:
+    """Whether a video (or a stray file) already uses this name in the upload directory"""
+    if db.query(Video.id).filter(Video.filename == filename).first() is not None:
+        return True
+    return (upload_dir / filename).exists()
+
+
+def _available_filename(db: Session, upload_dir: Path, filename: str, content_hash: str) -> str:
+    """filename, or a variant tagged with the content hash when the name is taken"""
+    if not filename_in_use(db, upload_dir, filename):
+        return filename
+    stem, suffix = Path(filename).stem, Path(filename).suffix
+    candidate = f"{stem}-{content_hash[:8]}{suffix}"
+    counter = 1
+    while filename_in_use(db, upload_dir, candidate):
+        counter += 1
+        candidate = f"{stem}-{content_hash[:8]}-{counter}{suffix}"
+    return candidate
+
+
+def finalize_upload(db: Session, part_path: Path, upload_dir: Path, filename: str,
+                    content_hash: str, file_size: int) -> Tuple[Video, bool]:
+    """
+    Move a fully received upload into place and register it.
+
+    Returns (video, created). When the content already exists the partial
+    file is discarded and the existing video is returned with created=False.
+    New content whose name is already taken is kept under a name tagged with
+    its hash rather than thrown away after the whole file was received.
+    """
+    existing = find_video_by_hash(db, content_hash)
+    if existing:
+        part_path.unlink(missing_ok=True)
+        logger.info(f"Upload {filename} matches existing video {existing.id} ({content_hash[:12]})")
+        return existing, False
+
+    stored_name = _available_filename(db, upload_dir, filename, content_hash)
+    if stored_name != filename:
+        logger.info(f"Upload name {filename} is taken, storing as {stored_name}")
+
+    file_path = upload_dir / stored_name
+    os.replace(part_path, file_path)
+
+    video = Video(
+        filename=stored_name,
+        file_path=str(file_path),
+        status=VideoStatus.PENDING,
+        content_hash=content_hash,
+        file_size=file_size
+    )
+    db.add(video)
+    db.commit()
+    db.refresh(video)
+    return video, True
+
+
+class UploadSessionManager:
+    """
+    Resumable upload sessions.
+
+    Each session is a <id>.json metadata file and a <id>.part data file in
+    the session directory. The size of the .part file is the authoritative
+    received offset, so sessions survive server restarts; the running hash
+    is kept in memory and rebuilt from the partial file when it is missing.
+    """
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self._hashers: Dict[str, Tuple[object, int]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.json"
+
+    def part_path(self, upload_id: str) -> Path:
+        return self.session_dir / f"{upload_id}.part"
+
+    def create(self, filename: str, total_size: int) -> Dict:
+        if total_size < 0:
+            raise UploadError("total_size must not be negative")
+
+        upload_id = uuid.uuid4().hex
+        session = {"upload_id": upload_id, "filename": filename, "total_size": total_size}
+        with open(self._meta_path(upload_id), "w", encoding="utf-8") as f:
+            json.dump(session, f)
+        self.part_path(upload_id).touch()
+        self._hashers[upload_id] = (hashlib.sha256(), 0)
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> Dict:
+        meta_path = self._meta_path(upload_id)
+        # upload_id is used as a file name, so only accept what create() generates
+        if not upload_id.isalnum() or not meta_path.exists():
+            raise UploadError("Upload session not found", status_code=404)
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            session = json.load(f)
+        session["received_bytes"] = self.part_path(upload_id).stat().st_size
+        return session
+
+    def _hasher_for(self, upload_id: str, offset: int):
+        hasher, hashed = self._hashers.get(upload_id, (None, -1))
+        if hasher is None or hashed != offset:
+            logger.info(f"Rebuilding hash state for upload {upload_id} at offset {offset}")
+            hasher = hash_file(self.part_path(upload_id))
+        return hasher
+
+    async def append(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> Dict:
+        """Append a chunk stream at offset; the offset must match the bytes already received"""
+        lock = self._locks.setdefault(upload_id, asyncio.Lock())
+        async with lock:
+            session = self.status(upload_id)
+            received = session["received_bytes"]
+            if offset != received:
+                raise UploadError(f"Offset mismatch: expected {received}", status_code=409)
+
+            hasher = await run_in_threadpool(self._hasher_for, upload_id, received)
+            _, written = await stream_to_disk(chunks, self.part_path(upload_id), hasher, append=True)
+            received += written
+
+            if received > session["total_size"]:
+                # Drop the overflowing chunk so the client can retry from the previous offset
+                os.truncate(self.part_path(upload_id), offset)
+                self._hashers.pop(upload_id, None)
+                raise UploadError("Upload exceeds declared total_size")
+
+            self._hashers[upload_id] = (hasher, received)
+            session["received_bytes"] = received
+            return session
+
+    async def complete(self, upload_id: str) -> Tuple[Dict, str]:
+        """Check that the upload is complete and return (session, sha256 hex)"""
+        session = self.status(upload_id)
+        if session["received_bytes"] != session["total_size"]:
+            raise UploadError(
+                f"Upload incomplete: {session['received_bytes']}/{session['total_size']} bytes",
+                status_code=409
+            )
+
+        hasher = await run_in_threadpool(self._hasher_for, upload_id, session["received_bytes"])
+        return session, hasher.hexdigest()
+
+    def discard(self, upload_id: str):
+        """Remove session metadata (the .part file is moved or deleted by finalize_upload)"""
+        self._meta_path(upload_id).unlink(missing_ok=True)
+        self.part_path(upload_id).unlink(missing_ok=True)
+        self._hashers.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
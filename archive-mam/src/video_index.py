@@ -0,0 +1,336 @@
+"""
+비디오 키프레임 인덱스
+영상마다 한 번 ffprobe로 키프레임 위치(시간/프레임 번호/바이트 오프셋)와
+fps, 프레임 수, 길이를 조사해 사이드카 JSON(<video>.index.json)으로 저장
+"""
+
+import cv2
+import json
+import bisect
+import logging
+import os
+import subprocess
+import threading
+import numpy as np
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.index.json'
+
+# 키프레임 정보가 없을 때 seek 대신 순차 grab으로 이동할 최대 프레임 수
+MAX_GRAB_FRAMES = 90
+
+# 메모리에 둘 인덱스 수 (오래 쓰지 않은 것부터 버림, 버린 인덱스는 사이드카에서 다시 읽음)
+INDEX_MEMO_SIZE = 256
+
+
+@dataclass
+class VideoIndex:
+    """영상 메타데이터와 키프레임 위치"""
+    video_path: str
+    file_size: int
+    mtime: float
+    fps: float
+    frame_count: int
+    duration: float
+    width: int
+    height: int
+    keyframe_times: List[float] = field(default_factory=list)
+    keyframe_frames: List[int] = field(default_factory=list)
+    keyframe_offsets: List[int] = field(default_factory=list)
+    version: int = INDEX_VERSION
+
+    @property
+    def has_keyframes(self) -> bool:
+        return len(self.keyframe_times) > 0
+
+    def frame_at(self, t: float) -> int:
+        """시간(초)에 해당하는 프레임 번호"""
+        frame = int(round(t * self.fps))
+        if self.frame_count > 0:
+            frame = min(frame, self.frame_count - 1)
+        return max(frame, 0)
+
+    def keyframe_before(self, t: float) -> Optional[Tuple[float, int, int]]:
+        """t 이전(포함) 가장 가까운 키프레임 (시간, 프레임 번호, 바이트 오프셋)"""
+        i = bisect.bisect_right(self.keyframe_times, t + 1e-6)
+        if i == 0:
+            return None
+        return self.keyframe_times[i - 1], self.keyframe_frames[i - 1], self.keyframe_offsets[i - 1]
+
+    def keyframe_after(self, t: float) -> Optional[Tuple[float, int, int]]:
+        """t 이후 첫 키프레임"""
+        i = bisect.bisect_right(self.keyframe_times, t + 1e-6)
+        if i >= len(self.keyframe_times):
+            return None
+        return self.keyframe_times[i], self.keyframe_frames[i], self.keyframe_offsets[i]
+
+    def keyframe_frame_before(self, frame: int) -> int:
+        """프레임 번호 이전(포함) 키프레임의 프레임 번호"""
+        i = bisect.bisect_right(self.keyframe_frames, frame)
+        return self.keyframe_frames[i - 1] if i > 0 else 0
+
+
+def sidecar_path(video_path: str) -> str:
+    return video_path + INDEX_SUFFIX
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """'30000/1001' 형식의 프레임 레이트 파싱"""
+    if not rate or rate in ('0/0', 'N/A'):
+        return 0.0
+    if '/' in rate:
+        num, den = rate.split('/', 1)
+        return float(num) / float(den) if float(den) else 0.0
+    return float(rate)
+
+
+def _probe_with_ffprobe(video_path: str, runner: Callable) -> Optional[Dict]:
+    """ffprobe로 스트림 정보(크기, 프레임 레이트, 프레임 수, 길이) 조회"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,r_frame_rate,avg_frame_rate,nb_frames,duration'
+                         ':format=duration',
+        '-of', 'json',
+        video_path
+    ]
+    try:
+        result = runner(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        logger.warning(f"ffprobe 실패, OpenCV 메타데이터로 대체: {result.stderr.strip()}")
+        return None
+    return json.loads(result.stdout or '{}')
+
+
+def _scan_packets(video_path: str, popen: Callable) -> Optional[Tuple[array, List[Tuple[float, int]]]]:
+    """
+    비디오 패킷을 한 줄씩 읽어 (모든 패킷의 pts, 키프레임 (pts, 바이트 위치) 목록) 반환
+
+    몇 시간짜리 60fps 영상은 패킷이 수십만 개이므로 ffprobe 출력을 통째로 받지 않고,
+    패킷마다 pts(float 하나)만 남김
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,pos,flags',
+        '-of', 'csv',
+        video_path
+    ]
+    try:
+        process = popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except FileNotFoundError:
+        return None
+
+    pts = array('d')
+    keyframes = []
+    try:
+        for line in process.stdout:
+            # packet,<pts_time>,<pos>,<flags> (side_data 등 다른 줄은 무시)
+            fields = line.rstrip('\n').split(',')
+            if len(fields) < 4 or fields[0] != 'packet' or fields[1] in ('', 'N/A'):
+                continue
+            t = float(fields[1])
+            pts.append(t)
+            if 'K' in fields[3]:
+                keyframes.append((t, int(fields[2]) if fields[2] not in ('', 'N/A') else -1))
+    finally:
+        process.stdout.close()
+
+    if process.wait() != 0:
+        logger.warning(f"ffprobe 패킷 조회 실패, 키프레임 정보 없이 인덱스 생성: {video_path}")
+        return None
+    return pts, keyframes
+
+
+def _index_from_probe(video_path: str, stat: os.stat_result, probe: Dict,
+                      packets: Optional[Tuple[array, List[Tuple[float, int]]]] = None) -> VideoIndex:
+    stream = (probe.get('streams') or [{}])[0]
+    pts, keyframes = packets or (array('d'), [])
+
+    # 패킷은 디코딩 순서이므로 pts 순으로 정렬한 위치가 표시 프레임 번호
+    keyframes.sort()
+    sorted_pts = np.sort(np.frombuffer(pts, dtype=np.float64)) if pts else np.empty(0)
+    keyframe_times = [t for t, _ in keyframes]
+    keyframe_frames = np.searchsorted(sorted_pts, keyframe_times, side='left').tolist()
+    keyframe_offsets = [pos for _, pos in keyframes]
+
+    fps = _parse_rate(stream.get('avg_frame_rate')) or _parse_rate(stream.get('r_frame_rate'))
+    nb_frames = stream.get('nb_frames')
+    frame_count = int(nb_frames) if nb_frames not in (None, 'N/A') else len(pts)
+
+    duration = stream.get('duration') or probe.get('format', {}).get('duration')
+    if duration in (None, 'N/A'):
+        duration = frame_count / fps if fps > 0 else 0.0
+
+    return VideoIndex(
+        video_path=video_path,
+        file_size=stat.st_size,
+        mtime=stat.st_mtime,
+        fps=fps,
+        frame_count=frame_count,
+        duration=float(duration),
+        width=int(stream.get('width') or 0),
+        height=int(stream.get('height') or 0),
+        keyframe_times=keyframe_times,
+        keyframe_frames=keyframe_frames,
+        keyframe_offsets=keyframe_offsets
+    )
+
+
+def _index_from_capture(video_path: str, stat: os.stat_result) -> VideoIndex:
+    """ffprobe가 없을 때 OpenCV 메타데이터만으로 인덱스 생성 (키프레임 정보 없음)"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+
+    return VideoIndex(
+        video_path=video_path,
+        file_size=stat.st_size,
+        mtime=stat.st_mtime,
+        fps=fps,
+        frame_count=frame_count,
+        duration=frame_count / fps if fps > 0 else 0.0,
+        width=width,
+        height=height
+    )
+
+
+def build_index(video_path: str, runner: Callable = subprocess.run, save: bool = True,
+                popen: Callable = subprocess.Popen) -> VideoIndex:
+    """영상 인덱스 생성 및 사이드카 저장"""
+    stat = os.stat(video_path)
+    probe = _probe_with_ffprobe(video_path, runner)
+    if probe is not None:
+        index = _index_from_probe(video_path, stat, probe, _scan_packets(video_path, popen))
+    else:
+        index = _index_from_capture(video_path, stat)
+
+    if save:
+        try:
+            with open(sidecar_path(video_path), 'w', encoding='utf-8') as f:
+                json.dump(asdict(index), f)
+        except OSError as e:
+            logger.warning(f"인덱스 저장 실패 ({video_path}): {e}")
+
+    logger.info(f"인덱스 생성: {video_path} ({len(index.keyframe_times)}개 키프레임, "
+                f"{index.duration:.1f}초, {index.fps:.2f}fps)")
+    return index
+
+
+def load_index(video_path: str) -> Optional[VideoIndex]:
+    """사이드카 인덱스 로드 (영상 크기/수정시간이 바뀌었으면 None)"""
+    path = sidecar_path(video_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        stat = os.stat(video_path)
+    except (OSError, ValueError):
+        return None
+
+    if (data.get('version') != INDEX_VERSION or data.get('file_size') != stat.st_size
+            or abs(data.get('mtime', 0) - stat.st_mtime) > 1e-3):
+        return None
+
+    data['video_path'] = video_path
+    return VideoIndex(**data)
+
+
+# 경로 → 인덱스, 최근 사용 순
+_index_memo: "OrderedDict[str, VideoIndex]" = OrderedDict()
+_index_memo_lock = threading.Lock()
+
+
+def get_index(video_path: str, runner: Callable = subprocess.run,
+              popen: Callable = subprocess.Popen) -> VideoIndex:
+    """메모리 → 사이드카 → 새로 생성 순으로 인덱스 조회"""
+    with _index_memo_lock:
+        index = _index_memo.get(video_path)
+    if index is not None:
+        try:
+            stat = os.stat(video_path)
+            if stat.st_size == index.file_size and abs(stat.st_mtime - index.mtime) <= 1e-3:
+                with _index_memo_lock:
+                    if video_path in _index_memo:
+                        _index_memo.move_to_end(video_path)
+                return index
+        except OSError:
+            pass
+
+    index = load_index(video_path) or build_index(video_path, runner, popen=popen)
+    with _index_memo_lock:
+        _index_memo[video_path] = index
+        _index_memo.move_to_end(video_path)
+        while len(_index_memo) > INDEX_MEMO_SIZE:
+            _index_memo.popitem(last=False)
+    return index
+
+
+class IndexedCapture:
+    """
+    인덱스를 이용한 시간 기반 프레임 읽기
+
+    목표 프레임이 현재 위치와 같은 GOP 안에 있으면 seek 없이 grab으로 전진하고,
+    다른 GOP에 있을 때만 seek해서 키프레임 재탐색과 중복 디코딩을 피함
+    """
+
+    def __init__(self, video_path: str, index: Optional[VideoIndex] = None):
+        self.index = index or get_index(video_path)
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
+        self.position = 0  # 다음에 읽을 프레임 번호
+        self.seeks = 0
+
+    @property
+    def fps(self) -> float:
+        return self.index.fps
+
+    def _needs_seek(self, target: int) -> bool:
+        if target < self.position:
+            return True
+        if self.index.has_keyframes:
+            return self.index.keyframe_frame_before(target) > self.position
+        return target - self.position > MAX_GRAB_FRAMES
+
+    def read_frame(self, frame_number: int):
+        """프레임 번호로 읽기 (ret, frame)"""
+        if self._needs_seek(frame_number):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            self.seeks += 1
+        else:
+            while self.position < frame_number:
+                if not self.cap.grab():
+                    return False, None
+                self.position += 1
+
+        ret, frame = self.cap.read()
+        self.position = frame_number + 1
+        return ret, frame
+
+    def read_at(self, t: float):
+        """시간(초)으로 읽기 (ret, frame)"""
+        return self.read_frame(self.index.frame_at(t))
+
+    def release(self):
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
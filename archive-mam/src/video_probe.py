@@ -0,0 +1,298 @@
+"""
+비디오 메타데이터 조사(probe) 캐시
+영상마다 (경로, 크기, 수정시간) 기준으로 한 번만 컨테이너 메타데이터를 읽어
+길이, fps, 프레임 수, 코덱, 키프레임 간격, 해상도를 SQLite에 저장.
+탐색기 UI와 각 감지기가 같은 캐시를 읽으므로 수 GB 영상을 매번 다시 열지 않음.
+
+CAP_PROP_FRAME_COUNT는 가변 프레임레이트(VFR) 영상에서 자주 틀리므로
+ffprobe가 있으면 컨테이너 길이와 평균 프레임레이트를 우선 사용함
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+
+import cv2
+
+try:
+    from .video_index import _parse_rate
+except ImportError:
+    from video_index import _parse_rate
+
+logger = logging.getLogger(__name__)
+
+PROBE_VERSION = 1
+
+# 키프레임 간격 추정에 쓰는 앞부분 길이 (초) - 전체 패킷을 읽지 않기 위함
+KEYFRAME_SAMPLE_SECONDS = 60
+
+
+def default_db_path() -> str:
+    """캐시 DB 경로 (VIDEO_PROBE_DB 환경변수는 캐시를 만들 때 읽음)"""
+    return os.environ.get(
+        'VIDEO_PROBE_DB',
+        os.path.join(os.path.expanduser('~'), '.cache', 'poker-trend', 'video_probe.db')
+    )
+
+
+@dataclass
+class VideoProbe:
+    """영상 컨테이너 메타데이터"""
+    video_path: str
+    file_size: int
+    mtime: float
+    duration: float
+    fps: float
+    frame_count: int
+    width: int
+    height: int
+    codec: str
+    keyframe_interval: Optional[float] = None  # 초 (알 수 없으면 None)
+    variable_frame_rate: bool = False
+    source: str = 'ffprobe'  # 'ffprobe' 또는 'opencv'
+    version: int = PROBE_VERSION
+
+    @property
+    def resolution(self) -> str:
+        return f"{self.width}x{self.height}"
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['resolution'] = self.resolution
+        return data
+
+
+def _probe_with_ffprobe(video_path: str, runner: Callable) -> Optional[Dict]:
+    """ffprobe로 스트림/컨테이너 정보와 앞부분 패킷의 키프레임 플래그 조회"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-read_intervals', f'%+{KEYFRAME_SAMPLE_SECONDS}',
+        '-show_entries', 'stream=codec_name,width,height,r_frame_rate,avg_frame_rate,nb_frames,duration'
+                         ':format=duration:packet=pts_time,flags',
+        '-of', 'json',
+        video_path
+    ]
+    try:
+        result = runner(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        logger.warning(f"ffprobe 실패, OpenCV 메타데이터로 대체: {result.stderr.strip()}")
+        return None
+    return json.loads(result.stdout or '{}')
+
+
+def _keyframe_interval(packets) -> Optional[float]:
+    """키프레임 사이 평균 간격 (초)"""
+    times = sorted(
+        float(p['pts_time']) for p in packets
+        if p.get('pts_time') not in (None, 'N/A') and 'K' in p.get('flags', '')
+    )
+    if len(times) < 2:
+        return None
+    return (times[-1] - times[0]) / (len(times) - 1)
+
+
+def _probe_from_ffprobe(video_path: str, stat: os.stat_result, probe: Dict) -> VideoProbe:
+    stream = (probe.get('streams') or [{}])[0]
+    avg_fps = _parse_rate(stream.get('avg_frame_rate'))
+    r_fps = _parse_rate(stream.get('r_frame_rate'))
+    fps = avg_fps or r_fps
+
+    duration = stream.get('duration')
+    if duration in (None, 'N/A'):
+        duration = probe.get('format', {}).get('duration')
+    duration = float(duration) if duration not in (None, 'N/A') else 0.0
+
+    # 컨테이너에 기록된 프레임 수가 가장 정확, 없으면 길이 × 평균 fps
+    nb_frames = stream.get('nb_frames')
+    if nb_frames not in (None, 'N/A') and int(nb_frames) > 0:
+        frame_count = int(nb_frames)
+    else:
+        frame_count = int(round(duration * fps))
+    if duration <= 0 and fps > 0:
+        duration = frame_count / fps
+
+    return VideoProbe(
+        video_path=video_path,
+        file_size=stat.st_size,
+        mtime=stat.st_mtime,
+        duration=duration,
+        fps=fps,
+        frame_count=frame_count,
+        width=int(stream.get('width') or 0),
+        height=int(stream.get('height') or 0),
+        codec=stream.get('codec_name') or '',
+        keyframe_interval=_keyframe_interval(probe.get('packets', [])),
+        variable_frame_rate=bool(avg_fps and r_fps and abs(avg_fps - r_fps) > 0.01),
+        source='ffprobe'
+    )
+
+
+def _probe_from_capture(video_path: str, stat: os.stat_result) -> VideoProbe:
+    """ffprobe가 없을 때 OpenCV 헤더 정보로 대체 (키프레임 간격은 알 수 없음)"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"비디오 파일을 열 수 없습니다: {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    finally:
+        cap.release()
+
+    codec = ''.join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ').lower()
+    return VideoProbe(
+        video_path=video_path,
+        file_size=stat.st_size,
+        mtime=stat.st_mtime,
+        duration=frame_count / fps if fps > 0 else 0.0,
+        fps=fps,
+        frame_count=max(frame_count, 0),
+        width=width,
+        height=height,
+        codec=codec,
+        source='opencv'
+    )
+
+
+def probe_video(video_path: str, runner: Callable = subprocess.run) -> VideoProbe:
+    """캐시 없이 영상 메타데이터 조사"""
+    stat = os.stat(video_path)
+    probe = _probe_with_ffprobe(video_path, runner)
+    if probe is not None:
+        return _probe_from_ffprobe(video_path, stat, probe)
+    return _probe_from_capture(video_path, stat)
+
+
+class ProbeCache:
+    """SQLite 기반 메타데이터 캐시 (프로세스/스레드 간 공유)"""
+
+    def __init__(self, db_path: Optional[str] = None, runner: Callable = subprocess.run):
+        db_path = db_path or default_db_path()
+        self.db_path = db_path
+        self.runner = runner
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_database(self):
+        self._connect().execute('''
+            CREATE TABLE IF NOT EXISTS probes (
+                video_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                data TEXT NOT NULL,
+                probed_at REAL NOT NULL
+            )
+        ''')
+
+    def lookup(self, video_path: str, stat: Optional[os.stat_result] = None) -> Optional[VideoProbe]:
+        """캐시 조회 (크기/수정시간이 바뀌었으면 None)"""
+        video_path = os.path.abspath(video_path)
+        stat = stat or os.stat(video_path)
+        row = self._connect().execute(
+            'SELECT file_size, mtime, data FROM probes WHERE video_path = ?', (video_path,)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or abs(row[1] - stat.st_mtime) > 1e-3:
+            return None
+        data = json.loads(row[2])
+        if data.get('version') != PROBE_VERSION:
+            return None
+        return VideoProbe(**data)
+
+    def store(self, probe: VideoProbe):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO probes (video_path, file_size, mtime, data, probed_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (probe.video_path, probe.file_size, probe.mtime, json.dumps(asdict(probe)), time.time())
+        )
+
+    def get(self, video_path: str) -> VideoProbe:
+        """캐시 → 새로 조사 순으로 메타데이터 반환"""
+        video_path = os.path.abspath(video_path)
+        stat = os.stat(video_path)
+        try:
+            cached = self.lookup(video_path, stat)
+        except sqlite3.Error as e:
+            logger.warning(f"메타데이터 캐시 조회 실패: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        probe = probe_video(video_path, self.runner)
+        try:
+            self.store(probe)
+        except sqlite3.Error as e:
+            logger.warning(f"메타데이터 캐시 저장 실패: {e}")
+        logger.info(f"메타데이터 조사: {video_path} ({probe.duration:.1f}초, {probe.fps:.2f}fps, "
+                    f"{probe.resolution}, {probe.codec or '?'}, {probe.source})")
+        return probe
+
+    def invalidate(self, video_path: str):
+        self._connect().execute('DELETE FROM probes WHERE video_path = ?', (os.path.abspath(video_path),))
+
+
+_default_cache: Optional[ProbeCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_probe_cache() -> ProbeCache:
+    """프로세스 공용 캐시 (DB 경로는 VIDEO_PROBE_DB 환경변수로 변경)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ProbeCache()
+        return _default_cache
+
+
+def reset_probe_cache():
+    """공용 캐시를 버림 (다음 get_probe_cache가 VIDEO_PROBE_DB를 다시 읽음, 테스트용)"""
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = None
+
+
+def get_probe(video_path: str) -> VideoProbe:
+    """공용 캐시로 메타데이터 조회 (캐시 DB를 쓸 수 없으면 직접 조사)"""
+    try:
+        cache = get_probe_cache()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"메타데이터 캐시를 열 수 없어 직접 조사: {e}")
+        return probe_video(video_path)
+    return cache.get(video_path)
+
+
+def capture_properties(video_path: str, cap: cv2.VideoCapture):
+    """
+    감지기용 (fps, 총 프레임 수)
+
+    로컬 파일은 캐시된 메타데이터를, 조사할 수 없는 경우(스트림 URL 등)는
+    열려 있는 VideoCapture 값을 사용
+    """
+    try:
+        probe = get_probe(video_path)
+        if probe.fps > 0 and probe.frame_count > 0:
+            return probe.fps, probe.frame_count
+    except (OSError, ValueError) as e:
+        logger.debug(f"메타데이터 조사 불가, VideoCapture 값 사용: {e}")
+    return cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+공통 테스트 설정
+프로세스 공용 캐시(신호 캐시, 메타데이터 조사 캐시)가 개발자의 ~/.cache 대신
+테스트마다 임시 디렉토리를 쓰도록 함
+"""
+import sys
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import signal_cache, video_probe
+
+
+def _reset_shared_caches():
+    # src 패키지로 읽은 모듈과 src를 경로에 넣고 바로 읽은 모듈 둘 다 재설정
+    for module in (signal_cache, sys.modules.get('signal_cache')):
+        if module is not None:
+            module.reset_signal_cache()
+    for module in (video_probe, sys.modules.get('video_probe')):
+        if module is not None:
+            module.reset_probe_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    monkeypatch.setenv('SIGNAL_CACHE_DIR', str(tmp_path / "cache" / "signals"))
+    monkeypatch.setenv('VIDEO_PROBE_DB', str(tmp_path / "cache" / "video_probe.db"))
+    _reset_shared_caches()
+    yield
+    _reset_shared_caches()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+비동기 DB 세션 / SQLite WAL 설정 테스트
+"""
+import sys
+import asyncio
+import hashlib
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, event, select, text
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("aiosqlite")
+
+from src import database
+from src.database import Base, Video
+from src.upload_service import finalize_upload, find_video_by_hash
+
+
+@pytest.fixture
+def async_db(tmp_path, monkeypatch):
+    """작업 디렉토리의 sql_app.db를 쓰는 새 비동기 엔진"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_AsyncSessionLocal", None)
+
+    async def session():
+        engine = database.get_async_engine()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return database.get_async_db()
+
+    yield session
+    if database._async_engine is not None:
+        asyncio.run(database._async_engine.dispose())
+
+
+def test_sync_engine_pragmas(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'a.db'}")
+    event.listen(engine, "connect", database._set_sqlite_pragma)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == database.BUSY_TIMEOUT_MS
+    engine.dispose()
+
+
+def test_async_session_roundtrip(async_db):
+    async def run():
+        sessions = await async_db()
+        db = await sessions.__anext__()
+        try:
+            assert (await db.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            db.add(Video(filename="a.mp4", file_path="uploads/a.mp4", content_hash="ab" * 32))
+            await db.commit()
+            videos = (await db.scalars(select(Video))).all()
+            # expire_on_commit=False라 커밋 후에도 속성 접근에 추가 I/O 없음
+            return [(video.id, video.filename) for video in videos]
+        finally:
+            await sessions.aclose()
+
+    assert asyncio.run(run()) == [(1, "a.mp4")]
+
+
+def test_reads_do_not_wait_for_open_write(async_db, tmp_path):
+    """업로드 트랜잭션이 열려 있어도 목록 조회는 커밋된 스냅샷을 바로 읽음"""
+    async def run():
+        sessions = await async_db()
+        db = await sessions.__anext__()
+        writer = create_engine(f"sqlite:///{tmp_path / 'sql_app.db'}").connect()
+        try:
+            db.add(Video(filename="a.mp4", file_path="uploads/a.mp4"))
+            await db.commit()
+
+            writer.exec_driver_sql("BEGIN IMMEDIATE")
+            writer.exec_driver_sql(
+                "INSERT INTO videos (filename, file_path, status) VALUES ('b.mp4', 'uploads/b.mp4', 'PENDING')"
+            )
+            # 쓰기 트랜잭션이 열린 상태에서 새 읽기 세션
+            async with database._AsyncSessionLocal() as reader:
+                names = (await reader.scalars(select(Video.filename))).all()
+            writer.rollback()
+            return names
+        finally:
+            writer.close()
+            await sessions.aclose()
+
+    assert asyncio.run(run()) == ["a.mp4"]
+
+
+def test_finalize_upload_through_async_session(async_db, tmp_path):
+    """API가 쓰는 run_sync 경로로 업로드 등록/중복 판정"""
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+
+    def part(data, name):
+        path = upload_dir / f".{name}.part"
+        path.write_bytes(data)
+        return path, hashlib.sha256(data).hexdigest(), len(data)
+
+    async def run():
+        sessions = await async_db()
+        db = await sessions.__anext__()
+        try:
+            path, digest, size = part(b"footage", "a")
+            first, created = await db.run_sync(finalize_upload, path, upload_dir, "a.mp4", digest, size)
+            assert created and (upload_dir / "a.mp4").exists()
+
+            path, digest, size = part(b"footage", "b")
+            second, created = await db.run_sync(finalize_upload, path, upload_dir, "b.mp4", digest, size)
+            assert not created and second.id == first.id
+            assert not path.exists()
+
+            found = await db.run_sync(find_video_by_hash, digest)
+            assert found.filename == "a.mp4"
+
+            path, digest, size = part(b"other", "c")
+            renamed, created = await db.run_sync(finalize_upload, path, upload_dir, "a.mp4", digest, size)
+            assert created and renamed.filename == f"a-{digest[:8]}.mp4"
+        finally:
+            await sessions.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+폴더 일괄 분석 테스트 (LPT 순서, 해시 기반 건너뛰기, 재시작)
+"""
+import json
+import shutil
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import signal_cache
+from src.batch_ingest import BatchIngestor, VideoJob, discover_videos, file_sha256, lpt_order, MANIFEST_NAME
+
+
+def _write_video(path, seconds, size=(64, 48), fps=10):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(int(seconds * fps)):
+        writer.write(np.full((size[1], size[0], 3), (i * 5) % 256, dtype=np.uint8))
+    writer.release()
+
+
+def test_lpt_order_uses_duration_and_resolution():
+    jobs = [
+        VideoJob('a.mp4', 'a', 0, duration=600, width=1280, height=720),
+        VideoJob('b.mp4', 'b', 0, duration=400, width=1920, height=1080),
+        VideoJob('c.mp4', 'c', 0, duration=100, width=3840, height=2160),
+    ]
+    assert [job.path for job in lpt_order(jobs)] == ['b.mp4', 'c.mp4', 'a.mp4']
+
+
+def test_discover_skips_hidden_and_other_files(tmp_path):
+    (tmp_path / "day1").mkdir()
+    (tmp_path / ".trash").mkdir()
+    for name in ("day1/table.MP4", ".trash/old.mp4", "notes.txt", ".hidden.mp4", "final.mkv"):
+        (tmp_path / name).write_bytes(b"x")
+    found = [Path(p).relative_to(tmp_path).as_posix() for p in discover_videos(str(tmp_path))]
+    assert found == ["day1/table.MP4", "final.mkv"]
+    assert discover_videos(str(tmp_path), recursive=False) == [str(tmp_path / "final.mkv")]
+
+
+def test_batch_run_skips_duplicates_and_resumes(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    _write_video(archive / "short.avi", 2)
+    _write_video(archive / "long.avi", 4)
+    shutil.copy(archive / "long.avi", archive / "long_copy.avi")
+    (archive / "broken.mp4").write_bytes(b"not a video")
+
+    output = tmp_path / "out"
+    summary = BatchIngestor(output_dir=str(output), workers=2).run(str(archive))
+
+    assert summary['discovered'] == 4
+    assert summary['scheduled'] == 2
+    assert summary['completed'] == 2
+
+    manifest = json.loads((output / MANIFEST_NAME).read_text(encoding='utf-8'))
+    statuses = sorted(entry['status'] for entry in manifest['videos'].values())
+    assert statuses == ['done', 'done', 'failed']
+    done = [e for e in manifest['videos'].values() if e['status'] == 'done']
+    assert all(Path(e['result_file']).exists() and e['realtime_factor'] > 0 for e in done)
+    assert len(manifest['hash_cache']) == 4
+
+    # 다시 실행하면 새로 추가된 영상만 분석
+    _write_video(archive / "new.avi", 1)
+    again = BatchIngestor(output_dir=str(output), workers=2).run(str(archive))
+    assert again['scheduled'] == 1
+    assert again['completed'] == 1
+
+
+def test_plan_hash_is_reused_by_signal_cache(tmp_path, monkeypatch):
+    # 계획 단계에서 계산한 해시를 워커의 신호 캐시가 그대로 사용 (파일을 두 번 읽지 않음)
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    _write_video(archive / "table.avi", 1)
+    video = str(archive / "table.avi")
+
+    jobs = BatchIngestor(output_dir=str(tmp_path / "out")).plan([video])
+    assert jobs[0].content_hash == file_sha256(video)
+
+    def no_rehash():
+        raise AssertionError("파일을 다시 해시함")
+
+    monkeypatch.setattr(signal_cache.hashlib, 'sha256', no_rehash)
+    assert signal_cache.get_signal_cache().video_hash(video) == jobs[0].content_hash
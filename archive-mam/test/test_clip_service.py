@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+클립 서비스 테스트 (키프레임 스냅, 캐시, LRU 정리, 일괄 추출)
+ffmpeg 실행은 명령을 기록하고 출력 파일만 만드는 러너로 대체
+"""
+import sys
+import io
+import os
+import json
+import time
+import subprocess
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.clip_service import ClipService, keyframe_at_or_before, keyframe_after
+
+KEYFRAMES = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+
+class FakeProcess:
+    """stdout으로 주어진 줄을 내보내는 가짜 프로세스"""
+
+    def __init__(self, lines, returncode=0):
+        self.stdout = io.StringIO(''.join(lines))
+        self.returncode = returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class RecordingRunner:
+    """ffprobe/ffmpeg 호출을 기록하는 러너"""
+
+    def __init__(self, clip_size=100):
+        self.calls = []
+        self.clip_size = clip_size
+
+    def __call__(self, cmd, capture_output=True, text=True):
+        self.calls.append(cmd)
+        if cmd[0] == 'ffprobe':
+            probe = {"streams": [{"avg_frame_rate": "1/1", "width": 640, "height": 360}]}
+            return subprocess.CompletedProcess(cmd, 0, json.dumps(probe), "")
+
+        # 출력 파일 = '-i' 이후 '.'으로 시작하는 임시 경로들
+        for arg in cmd:
+            if os.path.basename(arg).startswith('.') or arg.endswith(('head.mp4', 'tail.mp4')):
+                with open(arg, 'wb') as f:
+                    f.write(b'\0' * self.clip_size)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    def popen(self, cmd, **kwargs):
+        """ffprobe 패킷 조회 (CSV 줄 단위 출력)"""
+        self.calls.append(cmd)
+        lines = []
+        for t in KEYFRAMES:
+            lines.append(f"packet,{t:.6f},{int(t * 1000)},K__\n")
+            lines.append(f"packet,{t + 1:.6f},N/A,___\n")
+        return FakeProcess(lines)
+
+    def ffmpeg_calls(self):
+        return [c for c in self.calls if c[0] == 'ffmpeg']
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"video")
+    return str(path)
+
+
+def test_keyframe_lookup():
+    assert keyframe_at_or_before(KEYFRAMES, 5.3) == 4.0
+    assert keyframe_at_or_before(KEYFRAMES, 6.0) == 6.0
+    assert keyframe_after(KEYFRAMES, 5.3) == 6.0
+    assert keyframe_after(KEYFRAMES, 10.0) is None
+
+
+class TestClipService:
+
+    def test_input_side_seek_snapped_to_keyframe(self, tmp_path, video):
+        runner = RecordingRunner()
+        service = ClipService(tmp_path / "clips", runner=runner, popen=runner.popen)
+        clip = service.get_clip(video, 5.3, 9.0, video_hash="abc")
+
+        cmd = runner.ffmpeg_calls()[0]
+        assert cmd.index('-ss') < cmd.index('-i')
+        assert cmd[cmd.index('-ss') + 1] == "4.000"
+        assert cmd[cmd.index('-t') + 1] == "5.000"
+        assert clip.exists()
+
+    def test_cache_hit_skips_ffmpeg(self, tmp_path, video):
+        runner = RecordingRunner()
+        service = ClipService(tmp_path / "clips", runner=runner, popen=runner.popen)
+        first = service.get_clip(video, 5.3, 9.0, video_hash="abc")
+        second = service.get_clip(video, 5.3, 9.0, video_hash="abc")
+
+        assert first == second
+        assert len(runner.ffmpeg_calls()) == 1
+
+    def test_accurate_mode_encodes_head_gop_only(self, tmp_path, video):
+        runner = RecordingRunner()
+        service = ClipService(tmp_path / "clips", runner=runner, popen=runner.popen)
+        service.get_clip(video, 5.3, 9.0, video_hash="abc", accurate=True)
+
+        head, tail, concat = runner.ffmpeg_calls()
+        assert 'libx264' in head and head[head.index('-t') + 1] == "0.700"
+        assert 'copy' in tail and tail[tail.index('-ss') + 1] == "6.000"
+        assert 'concat' in concat
+
+    def test_lru_eviction(self, tmp_path, video):
+        runner = RecordingRunner(clip_size=100)
+        service = ClipService(tmp_path / "clips", max_cache_bytes=250, runner=runner, popen=runner.popen)
+
+        a = service.get_clip(video, 0, 2, video_hash="abc")
+        b = service.get_clip(video, 2, 4, video_hash="abc")
+        old = time.time() - 100
+        os.utime(a, (old, old))
+        os.utime(b, (old + 10, old + 10))
+        service.lookup("abc", 0, 2)  # a를 최근 사용으로 갱신
+
+        c = service.get_clip(video, 4, 6, video_hash="abc")
+        assert a.exists() and c.exists()
+        assert not b.exists()
+
+    def test_export_all_single_invocation(self, tmp_path, video):
+        runner = RecordingRunner()
+        service = ClipService(tmp_path / "clips", runner=runner, popen=runner.popen)
+        service.get_clip(video, 2.5, 3.5, video_hash="abc")
+
+        paths = service.export_all(video, [(2.5, 3.5), (4.2, 5.0), (8.5, 9.5)], video_hash="abc")
+
+        calls = runner.ffmpeg_calls()
+        assert len(calls) == 2  # 캐시된 첫 클립은 제외하고 한 번에 추출
+        batch = calls[1]
+        assert batch[batch.index('-ss') + 1] == "4.000"
+        assert batch.count('-map') == 2
+        assert all(p.exists() for p in paths)
+
+
+def test_format_cannot_escape_cache_dir(tmp_path, video):
+    runner = RecordingRunner()
+    service = ClipService(tmp_path / "clips", runner=runner, popen=runner.popen)
+    assert service.cache_path("h", 0, 5, "mkv").suffix == ".mkv"
+
+    # webm cannot hold the H.264/AAC streams clips are copied or encoded as
+    for fmt in ("x/../../../tmp/y", "../mp4", "avi", "webm", ""):
+        with pytest.raises(ValueError):
+            service.cache_path("h", 0, 5, fmt)
+        with pytest.raises(ValueError):
+            service.lookup("h", 0, 5, fmt)
+    assert runner.ffmpeg_calls() == []
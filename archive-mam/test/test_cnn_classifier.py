@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+경량 CNN 분류 백엔드 테스트 (UIPatternManager 샘플 학습, 배치/스레드 추론, 감지기 연동)
+"""
+import sys
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트와 src를 sys.path에 추가 (하이브리드 분류기는 src 내부 모듈을 직접 import)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from src.cnn_classifier import CNNConfig, CNNTrainer, TinyCNNBackend, load_backend
+from src.ui_pattern_manager import UIPatternManager
+from src.advanced_ui_detector import AdvancedUIDetector
+from src.hybrid_gfx_classifier import HybridGFXClassifier
+
+
+def _frame(rng, overlay, size=(320, 180)):
+    """테이블 화면 (overlay=True면 하단 통계 그래픽)"""
+    width, height = size
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:] = (30, 110 + rng.integers(-20, 20), 40)
+    for _ in range(4):
+        x, y = int(rng.integers(20, width - 40)), int(rng.integers(20, height // 2))
+        cv2.rectangle(frame, (x, y), (x + 12, y + 18), (255, 255, 255), -1)
+    if overlay:
+        top = int(height * 0.65)
+        frame[top:] = (40, 20, 10)
+        for row in range(top + 8, height - 8, 16):
+            for col in range(10, width - 40, int(rng.integers(40, 60))):
+                cv2.putText(frame, str(rng.integers(100, 9999)), (col, row + 8),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1)
+    noise = rng.integers(-10, 10, frame.shape)
+    return np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = UIPatternManager(str(tmp_path / "ui_data"))
+    rng = np.random.default_rng(1)
+    for i in range(40):
+        is_ui = i % 2 == 0
+        sample_id = manager.save_feature_sample("table.mp4", float(i), {}, is_ui)
+        cv2.imwrite(str(tmp_path / "ui_data" / "screenshots" / f"{sample_id}.jpg"), _frame(rng, is_ui))
+    return manager
+
+
+@pytest.fixture
+def backend(manager):
+    backend, metrics = CNNTrainer(manager).train()
+    assert metrics['total_samples'] == 40
+    assert metrics['ui_samples'] == 20
+    return backend
+
+
+def test_trained_backend_separates_overlays(backend):
+    rng = np.random.default_rng(7)
+    frames = [_frame(rng, i % 2 == 0) for i in range(20)]
+    probabilities = backend.predict_proba(frames)
+    predictions = probabilities > backend.config.threshold
+    assert (predictions == np.array([i % 2 == 0 for i in range(20)])).mean() >= 0.9
+
+
+def test_batched_and_threaded_inference_match(backend):
+    rng = np.random.default_rng(3)
+    frames = [_frame(rng, i % 3 == 0) for i in range(10)]
+    single = np.concatenate([backend.predict_proba([f]) for f in frames])
+
+    backend.config.batch_size = 3
+    backend.config.threads = 2
+    assert np.allclose(backend.predict_proba(frames), single, atol=1e-5)
+    # 미리 축소한 입력도 같은 결과
+    assert np.allclose(backend.predict_proba([backend.prepare(f) for f in frames]), single, atol=1e-5)
+
+
+def test_save_and_load(backend, tmp_path):
+    path = backend.save(str(tmp_path / "models" / "ui_cnn.npz"))
+    loaded = load_backend(path, threads=4, batch_size=8)
+    assert loaded.config.threads == 4
+    assert loaded.config.batch_size == 8
+
+    frames = [_frame(np.random.default_rng(5), True)]
+    assert np.allclose(loaded.predict_proba(frames), backend.predict_proba(frames))
+
+
+def test_trainer_reads_frames_from_video(tmp_path):
+    manager = UIPatternManager(str(tmp_path / "ui_data"))
+    video = tmp_path / "table.avi"
+    rng = np.random.default_rng(2)
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*'MJPG'), 10, (320, 180))
+    for i in range(40):
+        writer.write(_frame(rng, (i // 10) % 2 == 1))
+    writer.release()
+    for i in range(0, 40, 2):
+        manager.save_feature_sample("table.avi", i / 10 + 0.05, {}, (i // 10) % 2 == 1)
+    manager.save_feature_sample("missing.avi", 0.0, {}, True)
+
+    trainer = CNNTrainer(manager, video_resolver=lambda name: str(tmp_path / name) if name == "table.avi" else None)
+    inputs, labels = trainer.collect()
+    assert len(inputs) == 20
+    assert sum(labels) == 10
+    assert inputs[0].shape == (36, 64, 3)
+
+
+def test_untrained_and_single_class():
+    with pytest.raises(ValueError):
+        TinyCNNBackend().predict_proba([np.zeros((36, 64, 3), dtype=np.uint8)])
+    with pytest.raises(ValueError):
+        TinyCNNBackend().fit([np.zeros((36, 64, 3), dtype=np.uint8)] * 3, [True] * 3)
+
+
+def test_ui_detector_batched_video_analysis(backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "broadcast.avi"
+    rng = np.random.default_rng(4)
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*'MJPG'), 10, (320, 180))
+    for second in range(12):
+        for _ in range(10):
+            writer.write(_frame(rng, 4 <= second < 8))
+    writer.release()
+
+    backend.config.batch_size = 5
+    batched = AdvancedUIDetector(backend=backend).analyze_video(str(video))
+    backend.config.batch_size = 1
+    single = AdvancedUIDetector(backend=backend).analyze_video(str(video))
+
+    assert batched['analyzed_frames'] == 12
+    assert [r['is_ui'] for r in batched['frame_results']] == [r['is_ui'] for r in single['frame_results']]
+    assert batched['ui_segments'] == single['ui_segments']
+    segment = batched['ui_segments'][0]
+    assert segment['start'] == pytest.approx(4.0) and segment['end'] == pytest.approx(8.0)
+
+
+def test_hybrid_classifier_cnn_batch(backend):
+    classifier = HybridGFXClassifier(cnn_backend=backend)
+    rng = np.random.default_rng(6)
+    results = classifier.classify_frames([_frame(rng, True), _frame(rng, False)])
+    assert [r.method for r in results] == ['cnn', 'cnn']
+    assert results[0].is_gfx and not results[1].is_gfx
+    stats = classifier.get_path_stats()
+    assert stats['paths'] == {'cnn': 2}
+    assert stats['ocr_frames'] == 0
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+감지기 벤치마크 테스트 (합성 영상 재현성, 경계 점수, 보고서 비교)
+"""
+import json
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.detector_benchmark import (
+    BenchmarkConfig, DetectorBenchmark, prepare_video, truth_boundaries,
+    score_boundaries, compare_reports, save_report
+)
+
+SMALL = dict(duration=90, fps=5, resolutions=[(160, 90)], hand_duration=(15, 25), gap_duration=(5, 10))
+
+
+def test_score_boundaries_matches_within_tolerance():
+    truth = [(10.0, 50.0), (70.0, 120.0)]
+    detected = [(12.0, 49.0), (90.0, 121.0), (200.0, 230.0)]
+    score = score_boundaries(detected, truth, tolerance=5.0)
+
+    # 10↔12, 50↔49, 120↔121 일치 / 70↔90은 허용 오차 밖
+    assert score['matched_boundaries'] == 3
+    assert score['precision'] == 3 / 6
+    assert score['recall'] == 3 / 4
+    assert abs(score['mean_boundary_error'] - 4 / 3) < 1e-9
+
+
+def test_score_boundaries_one_to_one():
+    """감지 경계 하나가 정답 경계 두 개와 동시에 매칭되지 않음"""
+    score = score_boundaries([(10.0, 20.0)], [(9.0, 19.0), (11.0, 21.0)], tolerance=5.0)
+    assert score['matched_boundaries'] == 2
+    assert score['recall'] == 0.5
+
+
+def test_prepare_video_is_reproducible(tmp_path):
+    config = BenchmarkConfig(**SMALL)
+    first = prepare_video(config, 160, 90, str(tmp_path / "a"))
+    second = prepare_video(config, 160, 90, str(tmp_path / "b"))
+    other_seed = prepare_video(config, 160, 90, str(tmp_path / "c"), seed=7)
+
+    assert truth_boundaries(first) == truth_boundaries(second)
+    assert truth_boundaries(first) != truth_boundaries(other_seed)
+    assert len(truth_boundaries(first)) > 0
+
+    # 같은 설정이면 다시 생성하지 않음
+    mtime = Path(first).stat().st_mtime_ns
+    prepare_video(config, 160, 90, str(tmp_path / "a"))
+    assert Path(first).stat().st_mtime_ns == mtime
+
+
+def test_benchmark_report_and_compare(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = BenchmarkConfig(**SMALL)
+    report = DetectorBenchmark(config, str(tmp_path / "work"), detectors=['fast'], isolate=False).run()
+
+    assert report['videos'][0]['truth_hands'] > 0
+    result = report['results'][0]
+    assert result['detector'] == 'fast'
+    assert result['frames_per_second'] > 0
+    assert result['realtime_factor'] > 0
+    assert 0.0 <= result['precision'] <= 1.0
+    assert 0.0 <= result['recall'] <= 1.0
+
+    path = tmp_path / "report.json"
+    save_report(report, str(path))
+    assert json.loads(path.read_text(encoding='utf-8'))['config']['resolutions'] == ['160x90']
+
+    faster = json.loads(json.dumps(report))
+    faster['results'][0]['frames_per_second'] = result['frames_per_second'] * 2
+    rows = compare_reports(report, faster)
+    assert rows[0]['frames_per_second']['change'] > 0
+    assert rows[0]['recall']['change'] == 0
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+ffmpeg 파이프 프레임 리더 테스트 (명령 구성, 버퍼 재사용, 타임스탬프)
+"""
+import io
+import sys
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ffmpeg_frame_reader import FFmpegFrameReader
+from src.video_index import VideoIndex
+
+WIDTH, HEIGHT = 8, 4
+
+
+class ChunkedStream(io.RawIOBase):
+    """파이프처럼 요청보다 적은 바이트를 돌려주는 스트림"""
+
+    def __init__(self, data, chunk=7):
+        self.data = data
+        self.pos = 0
+        self.chunk = chunk
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self.chunk, len(self.data) - self.pos)
+        buffer[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+class FakePopen:
+    """프레임 바이트를 stdout으로 내보내는 가짜 ffmpeg 프로세스"""
+
+    def __init__(self, frames, partial_tail=0):
+        data = b''.join(bytes([value]) * (WIDTH * HEIGHT * 3) for value in frames)
+        self.data = data + b'\x00' * partial_tail
+        self.commands = []
+        self.terminated = False
+
+    def __call__(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        self.stdout = ChunkedStream(self.data)
+        return self
+
+    def poll(self):
+        return None
+
+    def terminate(self):
+        self.terminated = True
+
+    def wait(self, timeout=None):
+        return 0
+
+
+def _index(keyframes):
+    return VideoIndex(
+        video_path='v.mp4', file_size=0, mtime=0, fps=30.0, frame_count=300,
+        duration=10.0, width=1920, height=1080,
+        keyframe_times=[f / 30.0 for f in keyframes], keyframe_frames=list(keyframes),
+        keyframe_offsets=[0] * len(keyframes)
+    )
+
+
+def test_sampled_mode_command_and_positions():
+    popen = FakePopen(frames=[1, 2, 3], partial_tail=5)
+    reader = FFmpegFrameReader('stream.m3u8', width=WIDTH, height=HEIGHT,
+                               sample_every=60, fps=30.0, popen=popen)
+
+    results = [(idx, t, frame.copy()) for idx, t, frame in reader]
+
+    cmd = popen.commands[0]
+    assert '-skip_frame' not in cmd
+    assert cmd[cmd.index('-vf') + 1] == f"select='not(mod(n\\,60))',scale={WIDTH}:{HEIGHT}"
+    assert cmd[cmd.index('-pix_fmt') + 1] == 'bgr24'
+    # 불완전한 마지막 프레임은 버림
+    assert [(idx, t) for idx, t, _ in results] == [(0, 0.0), (60, 2.0), (120, 4.0)]
+    assert results[1][2].shape == (HEIGHT, WIDTH, 3)
+    assert int(results[1][2][0, 0, 0]) == 2
+    assert popen.terminated
+
+
+def test_frames_share_reused_buffer():
+    reader = FFmpegFrameReader('stream.m3u8', width=WIDTH, height=HEIGHT, fps=30.0,
+                               popen=FakePopen(frames=[1, 2]))
+    frames = [frame for _, _, frame in reader]
+    assert frames[0] is frames[1]
+
+
+def test_keyframes_only_uses_index_timestamps():
+    popen = FakePopen(frames=[10, 20, 30])
+    reader = FFmpegFrameReader('v.mp4', width=WIDTH, height=HEIGHT, keyframes_only=True,
+                               index=_index([0, 75, 150]), popen=popen)
+
+    positions = [(idx, round(t, 3)) for idx, t, _ in reader]
+
+    cmd = popen.commands[0]
+    assert cmd.index('-skip_frame') < cmd.index('-i')
+    assert 'select' not in cmd[cmd.index('-vf') + 1]
+    assert reader.expected_frames == 3
+    assert positions == [(0, 0.0), (75, 2.5), (150, 5.0)]
+
+
+def test_keyframes_only_falls_back_without_index():
+    reader = FFmpegFrameReader('https://example.com/live.m3u8', width=WIDTH, height=HEIGHT,
+                               sample_every=30, keyframes_only=True, popen=FakePopen([]))
+    assert not reader.keyframes_only
+    assert '-skip_frame' not in reader.command()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+시각화 렌더 파이프라인 / ffmpeg 파이프 인코더 테스트
+"""
+import sys
+import random
+import threading
+import time
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ffmpeg_frame_reader import FFmpegFrameWriter
+from src.hand_detection_visualizer import (
+    FrameAnnotation, HandDetectionVisualizer, RenderPipeline, scaled_size
+)
+
+
+class FakeStdin:
+    def __init__(self):
+        self.data = bytearray()
+        self.closed = False
+
+    def write(self, data):
+        self.data += bytes(data)
+
+    def close(self):
+        self.closed = True
+
+
+class FakePopen:
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.commands = []
+
+    def __call__(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        self.stdin = FakeStdin()
+        self.stderr = None
+        return self
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+class ListWriter:
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def write(self, frame):
+        self.frames.append(frame)
+
+    def close(self):
+        self.closed = True
+
+
+def _annotation(i, boundary=None):
+    return FrameAnnotation(frame_idx=i, timestamp=i / 10, boundary=boundary)
+
+
+def _stamp(frame, annotation, scale):
+    """프레임 번호를 픽셀 값으로 남기는 렌더 함수 (순서 확인용)"""
+    time.sleep(random.uniform(0, 0.003))
+    out = frame.copy()
+    out[0, 0, 0] = annotation.frame_idx % 256
+    return out
+
+
+def test_ffmpeg_writer_pipes_raw_frames():
+    popen = FakePopen()
+    writer = FFmpegFrameWriter("out.mp4", 8, 4, 29.97, popen=popen)
+    cmd = popen.commands[0]
+    assert cmd[cmd.index('-f') + 1] == 'rawvideo'
+    assert cmd[cmd.index('-s') + 1] == '8x4'
+    assert cmd[cmd.index('-i') + 1] == 'pipe:0'
+    assert cmd[-1] == "out.mp4"
+
+    writer.write(np.full((4, 8, 3), 7, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        writer.write(np.zeros((4, 9, 3), dtype=np.uint8))
+    writer.close()
+    assert bytes(popen.stdin.data) == bytes([7]) * 96
+    assert popen.stdin.closed and writer.frames_written == 1
+
+
+def test_ffmpeg_writer_reports_failure():
+    writer = FFmpegFrameWriter("out.mp4", 8, 4, 30, popen=FakePopen(returncode=1))
+    with pytest.raises(RuntimeError):
+        writer.close()
+
+
+def test_pipeline_keeps_frame_order():
+    writer = ListWriter()
+    pipeline = RenderPipeline(_stamp, writer=writer, workers=4)
+    for i in range(60):
+        pipeline.submit(np.zeros((4, 4, 3), dtype=np.uint8), _annotation(i))
+    pipeline.close()
+
+    assert [int(f[0, 0, 0]) for f in writer.frames] == list(range(60))
+    assert writer.closed and pipeline.rendered_frames == 60
+
+
+def test_pipeline_bounds_pending_frames():
+    release = threading.Event()
+    submitted = []
+
+    def blocked(frame, annotation, scale):
+        release.wait(5)
+        return frame
+
+    pipeline = RenderPipeline(blocked, writer=ListWriter(), workers=1, max_pending=2)
+
+    def produce():
+        for i in range(10):
+            pipeline.submit(np.zeros((2, 2, 3), dtype=np.uint8), _annotation(i))
+            submitted.append(i)
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.2)
+    # 렌더링이 막혀 있으면 감지 쪽 submit도 대기 (프레임이 무한히 쌓이지 않음)
+    assert len(submitted) <= 4
+    release.set()
+    producer.join(5)
+    pipeline.close()
+    assert submitted == list(range(10))
+
+
+def test_boundary_window_and_scale():
+    writer = ListWriter()
+    pipeline = RenderPipeline(_stamp, writer=writer, scale=0.5, boundary_window=0.5, fps=10)
+    for i in range(40):
+        pipeline.submit(np.zeros((40, 64, 3), dtype=np.uint8), _annotation(i, 'start' if i == 20 else None))
+    pipeline.close()
+
+    # 경계 앞뒤 5프레임(0.5초)만 렌더링, 축소 해상도
+    assert [int(f[0, 0, 0]) for f in writer.frames] == list(range(15, 26))
+    assert writer.frames[0].shape == (20, 32, 3)
+    assert pipeline.skipped_frames == 40 - 11
+
+
+def test_scaled_size_is_even():
+    assert scaled_size(1920, 1080, 0.5) == (960, 540)
+    assert scaled_size(641, 361, 0.5) == (320, 180)
+    assert scaled_size(641, 361, 1.0) == (641, 361)
+
+
+def test_visualize_video_writes_scaled_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "table.avi"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*'MJPG'), 10, (320, 240))
+    for i in range(30):
+        frame = np.full((240, 320, 3), (30, 90, 30), dtype=np.uint8)
+        cv2.rectangle(frame, (100 + i * 2, 100), (140 + i * 2, 160), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+    visualizer = HandDetectionVisualizer(show_debug=False, render_scale=0.5, render_workers=2)
+    output = tmp_path / "qa.mp4"
+    result = visualizer.visualize_video(str(video), str(output))
+
+    assert result['frames'] == 30
+    assert result['rendered_frames'] == 30
+    cap = cv2.VideoCapture(str(output))
+    assert int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == 320  # (160 원본 + 160 디버그)
+    assert int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == 120
+    cap.release()
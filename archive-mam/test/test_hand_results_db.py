@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+분석 결과 핸드 저장소 테스트
+"""
+import sys
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hand_results_db import HandResultsDB, classify_duration, DURATION_BUCKET_SECONDS
+
+CATEGORIES = {
+    'very_short': {'min': 0, 'max': 45, 'name': '매우 짧은 핸드', 'color': '#ff4444'},
+    'short': {'min': 45, 'max': 90, 'name': '짧은 핸드', 'color': '#ff8800'},
+    'medium': {'min': 90, 'max': 180, 'name': '보통 핸드', 'color': '#ffcc00'},
+    'long': {'min': 180, 'max': 300, 'name': '긴 핸드', 'color': '#88cc00'},
+    'very_long': {'min': 300, 'max': float('inf'), 'name': '매우 긴 핸드', 'color': '#0088cc'}
+}
+
+
+def _result(durations):
+    hands, t = [], 0.0
+    for i, duration in enumerate(durations, 1):
+        hands.append({'hand_id': i, 'start_time': t, 'end_time': t + duration,
+                      'duration': duration, 'overall_confidence': 80})
+        t += duration + 5
+    return {'video_path': 'v.mp4', 'analysis_time': '2024-01-01T00:00:00',
+            'hands_data': hands, 'categories': CATEGORIES, 'instrumentation': None}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return HandResultsDB(str(tmp_path / "results.db"))
+
+
+def test_classify_duration():
+    assert classify_duration(0, CATEGORIES) == 'very_short'
+    assert classify_duration(45, CATEGORIES) == 'short'
+    assert classify_duration(1000, CATEGORIES) == 'very_long'
+    assert classify_duration(-1, CATEGORIES) is None
+
+
+def test_aggregates_match_python_classification(db):
+    durations = [30, 60, 60, 120, 200, 400, 10]
+    db.materialize("t1", _result(durations))
+
+    results = db.full_results("t1")
+    assert results['statistics'] == {'very_short': 2, 'short': 2, 'medium': 1, 'long': 1, 'very_long': 1}
+    assert [h['hand_id'] for h in results['classified_hands']['short']] == [2, 3]
+    assert [h['duration'] for h in results['hands_data']] == durations
+    assert results['categories']['very_long']['max'] == float('inf')
+
+    summary = results['summary']
+    assert summary['total_hands'] == 7
+    assert summary['total_duration'] == sum(durations)
+    assert summary['average_duration'] == round(sum(durations) / 7, 1)
+    assert summary['longest_hand']['id'] == 6
+    assert summary['shortest_hand'] == {'id': 7, 'duration': 10, 'start_time': 900.0}
+    assert summary['distribution'] == results['statistics']
+
+
+def test_duration_histogram(db):
+    db.materialize("t1", _result([5, 20, 25, 50]))
+    histogram = db.duration_histogram("t1")
+    assert [b['start'] for b in histogram] == [0, 15, 30, 45]
+    assert [b['count'] for b in histogram] == [1, 2, 0, 1]
+    assert histogram[0]['end'] == DURATION_BUCKET_SECONDS
+
+
+def test_pagination_and_category_filter(db):
+    db.materialize("t1", _result([30] * 5 + [60] * 3))
+
+    result = db.page("t1", page=2, per_page=3)
+    assert [h['hand_id'] for h in result['hands']] == [4, 5, 6]
+    assert result['pagination'] == {'page': 2, 'per_page': 3, 'total': 8, 'pages': 3, 'category': None}
+    assert result['statistics']['very_short'] == 5
+
+    hands, total = db.hands("t1", page=1, per_page=10, category='short')
+    assert total == 3
+    assert [h['hand_id'] for h in hands] == [6, 7, 8]
+    assert db.hands("t1", page=5, per_page=10) == ([], 8)
+
+
+def test_empty_result(db):
+    db.materialize("t1", _result([]))
+    result = db.page("t1")
+    assert result['summary']['total_hands'] == 0
+    assert result['summary']['longest_hand'] is None
+    assert result['duration_histogram'] == []
+    assert result['pagination']['pages'] == 0
+    assert db.page("missing") is None
+
+
+def test_etag_changes_with_version_and_variant(db):
+    assert db.etag("t1") is None
+    db.materialize("t1", _result([30, 60]))
+    first = db.etag("t1", 'api', 1, 100, None)
+    assert first == db.etag("t1", 'api', 1, 100, None)
+    assert first != db.etag("t1", 'api', 2, 100, None)
+
+    # 다시 저장하면 핸드가 교체되고 버전(ETag)이 바뀜
+    db.materialize("t1", _result([30]))
+    assert db.version("t1") == 2
+    assert db.etag("t1", 'api', 1, 100, None) != first
+    assert db.hands("t1")[1] == 1
+
+
+def test_shared_between_instances(db, tmp_path):
+    db.materialize("t1", _result([30, 60]))
+    other = HandResultsDB(str(tmp_path / "results.db"))
+    assert "t1" in other
+    assert other.page("t1")['pagination']['total'] == 2
+    other.delete("t1")
+    assert "t1" not in db
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+하이브리드 GFX 분류기의 OCR 게이팅 테스트
+"""
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트와 src를 sys.path에 추가 (분류기는 src 내부 모듈을 직접 import)
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from src.hybrid_gfx_classifier import HybridGFXClassifier
+
+
+class FakeTextAnalyzer:
+    """OCR 호출 횟수를 세는 텍스트 분석기"""
+
+    def __init__(self, text_score):
+        self.text_score = text_score
+        self.calls = 0
+        self.gfx_profile = None
+
+    def classify_frame_by_text(self, frame, visual_score):
+        self.calls += 1
+        return {
+            'text_score': self.text_score,
+            'text_features_count': 0,
+            'poker_analysis': {'poker_score': 0.0},
+            'density_features': {}
+        }
+
+
+def _classifier(visual_score, text_score, gate_ocr=True):
+    classifier = HybridGFXClassifier(gate_ocr=gate_ocr)
+    classifier.text_analyzer = FakeTextAnalyzer(text_score)
+    classifier._calculate_visual_score = lambda features: visual_score
+    return classifier
+
+
+FRAME = np.zeros((90, 160, 3), dtype=np.uint8)
+
+
+def test_default_band_is_lossless():
+    low, high = HybridGFXClassifier().ocr_band()
+    # 가중치 0.7, 임계값 0.65: 텍스트 점수 범위(0~1)로 결과가 바뀔 수 있는 구간
+    assert low == pytest.approx(0.5)
+    assert high == pytest.approx(0.65 / 0.7)
+
+
+@pytest.mark.parametrize("visual_score", [0.1, 0.45, 0.95, 1.0])
+@pytest.mark.parametrize("text_score", [0.0, 1.0])
+def test_gated_decision_matches_hybrid_outside_band(visual_score, text_score):
+    gated = _classifier(visual_score, text_score).classify_frame(FRAME)
+    full = _classifier(visual_score, text_score, gate_ocr=False).classify_frame(FRAME)
+
+    assert gated.method == 'visual_gated'
+    assert gated.is_gfx == full.is_gfx
+
+
+def test_ocr_runs_inside_band_and_stats():
+    classifier = _classifier(0.7, 1.0)
+    result = classifier.classify_frame(FRAME)
+    assert result.method == 'hybrid'
+    assert classifier.text_analyzer.calls == 1
+
+    classifier._calculate_visual_score = lambda features: 0.1
+    classifier.classify_frame(FRAME)
+    classifier.classify_frame(FRAME)
+    assert classifier.text_analyzer.calls == 1
+
+    stats = classifier.get_path_stats()
+    assert stats['paths'] == {'hybrid': 1, 'visual_gated': 2}
+    assert stats['ocr_rate'] == pytest.approx(1 / 3)
+    assert stats['ocr_skipped'] == 2
+
+
+def test_configured_band_and_per_call_override():
+    classifier = _classifier(0.3, 1.0, gate_ocr=False)
+    classifier.thresholds.update({'ocr_band_low': 0.2, 'ocr_band_high': 0.4})
+    assert classifier.ocr_band() == (0.2, 0.4)
+    assert classifier.classify_frame(FRAME, gate_ocr=True).method == 'hybrid'
+    classifier._calculate_visual_score = lambda features: 0.45
+    assert classifier.classify_frame(FRAME, gate_ocr=True).method == 'visual_gated'
+    assert classifier.classify_frame(FRAME).method == 'hybrid'
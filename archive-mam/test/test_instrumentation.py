@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+파이프라인 계측 테스트 (단계 타이머, 카운터, 감지기 연동)
+"""
+import json
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.instrumentation import Instrumentation
+from src.hand_boundary_detector import HandBoundaryDetector
+from src.player_detection import PlayerDetector
+from src.pot_size_ocr import PotSizeOCR
+
+
+def test_stage_and_counter_snapshot():
+    inst = Instrumentation(enabled=True)
+    for _ in range(3):
+        with inst.stage('decode'):
+            pass
+    inst.count('frames', 3)
+    inst.count('frames')
+
+    snapshot = inst.snapshot()
+    assert snapshot['stages']['decode']['calls'] == 3
+    assert snapshot['stages']['decode']['total_ms'] >= 0
+    assert snapshot['counters'] == {'frames': 4}
+    json.dumps(snapshot)
+
+    inst.reset()
+    assert inst.snapshot()['stages'] == {}
+
+
+def test_stage_records_time_on_exception():
+    inst = Instrumentation(enabled=True)
+    try:
+        with inst.stage('ocr'):
+            raise RuntimeError("실패")
+    except RuntimeError:
+        pass
+    assert inst.snapshot()['stages']['ocr']['calls'] == 1
+
+
+def test_disabled_collects_nothing(monkeypatch):
+    inst = Instrumentation(enabled=False)
+    with inst.stage('decode'):
+        pass
+    inst.count('frames')
+    assert inst.snapshot()['stages'] == {}
+    assert inst.snapshot()['counters'] == {}
+
+    # 환경변수로 기본값 끄기
+    monkeypatch.setenv('PIPELINE_INSTRUMENTATION', '0')
+    assert Instrumentation().enabled is False
+
+
+def _write_video(path, count=20, size=(160, 120)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, size)
+    for i in range(count):
+        frame = np.full((size[1], size[0], 3), (0, 100, 0), dtype=np.uint8)
+        cv2.rectangle(frame, (10 + i * 3, 40), (40 + i * 3, 80), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def test_hand_boundary_detector_breakdown(tmp_path):
+    video = tmp_path / "v.avi"
+    _write_video(video, count=40)
+    detector = HandBoundaryDetector(Instrumentation(enabled=True))
+    progress = []
+    detector.analyze_video(str(video), str(tmp_path / "out.json"), progress_callback=progress.append)
+
+    stats = detector.last_run_stats
+    for stage in ('decode', 'process_frame', 'motion.mog2', 'motion.contours', 'motion.optical_flow', 'save'):
+        assert stage in stats['stages'], stage
+    assert stats['counters']['frames'] == 40
+    # 진행 상황에도 중간 요약 포함
+    assert 'instrumentation' in progress[0]
+    # 결과 JSON 형식(핸드 목록)은 그대로
+    assert isinstance(json.loads((tmp_path / "out.json").read_text()), list)
+
+
+def test_hand_boundary_detector_disabled(tmp_path):
+    video = tmp_path / "v.avi"
+    _write_video(video, count=40)
+    detector = HandBoundaryDetector(Instrumentation(enabled=False))
+    progress = []
+    detector.analyze_video(str(video), str(tmp_path / "out.json"), progress_callback=progress.append)
+
+    assert detector.last_run_stats['stages'] == {}
+    assert 'instrumentation' not in progress[0]
+
+
+def test_object_and_player_detectors_share_instrumentation():
+    inst = Instrumentation(enabled=True)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    detector = HandBoundaryDetector(inst)
+    detector.object_detector.detect_cards(frame)
+    detector.object_detector.detect_chips(frame)
+
+    players = PlayerDetector(instrumentation=inst)
+    players.analyze_frame(frame, 0.0)
+
+    stages = inst.snapshot()['stages']
+    assert {'objects.cards', 'objects.chips', 'players.preprocess', 'players.seats'} <= set(stages)
+    assert inst.snapshot()['counters']['players.frames'] == 1
+
+
+def test_pot_ocr_results_include_breakdown(tmp_path, monkeypatch):
+    analyzer = PotSizeOCR(instrumentation=Instrumentation(enabled=True))
+    monkeypatch.setattr('src.pot_size_ocr.pytesseract.image_to_data',
+                        lambda *a, **k: {'text': ['1,200'], 'conf': ['90']})
+    assert analyzer.perform_ocr(np.zeros((60, 240), dtype=np.uint8)) == ('1,200', 90.0)
+
+    video = tmp_path / "pot.avi"
+    _write_video(video, count=20, size=(640, 480))
+    output = tmp_path / "pot.json"
+    analyzer.analyze_video(str(video), str(output), frame_skip=5)
+
+    saved = json.loads(output.read_text(encoding='utf-8'))
+    assert saved['instrumentation']['counters']['frames_sampled'] == 4
+    assert saved['instrumentation']['stages']['ocr.tesseract']['calls'] > 0
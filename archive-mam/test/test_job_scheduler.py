@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+분석 작업 스케줄러 테스트
+"""
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.job_scheduler import JobScheduler, QueueFullError
+
+
+class BlockingJobs:
+    """테스트에서 끝나는 시점을 제어하는 작업"""
+
+    def __init__(self):
+        self.events = {}
+        self.started = {}
+        self.order = []
+
+    def __call__(self, name, cores):
+        self.started[name] = cores
+        self.order.append(name)
+        self.events.setdefault(name, threading.Event()).wait(5)
+
+    def finish(self, name):
+        self.events.setdefault(name, threading.Event()).set()
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("조건 대기 시간 초과")
+        time.sleep(0.01)
+
+
+def test_slot_budget_and_partial_allocation():
+    jobs = BlockingJobs()
+    scheduler = JobScheduler(total_slots=4)
+
+    assert scheduler.submit("a", jobs, "a", cores=3) == 0
+    # 남은 1슬롯만 할당받아 바로 시작
+    assert scheduler.submit("b", jobs, "b", cores=4) == 0
+    _wait_until(lambda: "b" in jobs.started)
+    assert jobs.started == {"a": 3, "b": 1}
+
+    assert scheduler.submit("c", jobs, "c") == 1
+    assert scheduler.status()["free_slots"] == 0
+
+    jobs.finish("b")
+    _wait_until(lambda: "c" in jobs.started)
+    for name in ("a", "c"):
+        jobs.finish(name)
+    _wait_until(lambda: scheduler.status()["free_slots"] == 4)
+
+
+def test_priority_then_fifo_and_position_callbacks():
+    jobs = BlockingJobs()
+    positions = {}
+    scheduler = JobScheduler(
+        total_slots=1,
+        on_queue_change=lambda job_id, position: positions.__setitem__(job_id, position)
+    )
+
+    scheduler.submit("running", jobs, "running")
+    scheduler.submit("low1", jobs, "low1", priority=5)
+    scheduler.submit("low2", jobs, "low2", priority=5)
+    scheduler.submit("urgent", jobs, "urgent", priority=0)
+
+    assert scheduler.queue_position("urgent") == 1
+    assert scheduler.queue_position("low2") == 3
+    assert positions["low1"] == 2
+
+    for name in ("running", "urgent", "low1", "low2"):
+        _wait_until(lambda: name in jobs.started)
+        jobs.finish(name)
+    assert jobs.order == ["running", "urgent", "low1", "low2"]
+
+
+def test_admission_control():
+    jobs = BlockingJobs()
+    scheduler = JobScheduler(total_slots=1, max_queue=1)
+    scheduler.submit("a", jobs, "a")
+    scheduler.submit("b", jobs, "b")
+    with pytest.raises(QueueFullError):
+        scheduler.submit("c", jobs, "c")
+    jobs.finish("a")
+    jobs.finish("b")
+
+
+def test_failing_job_releases_slots():
+    def failing(cores):
+        raise RuntimeError("boom")
+
+    scheduler = JobScheduler(total_slots=2)
+    scheduler.submit("bad", failing, cores=2)
+    _wait_until(lambda: scheduler.status()["free_slots"] == 2)
+
+
+def test_cancel_queued_job():
+    jobs = BlockingJobs()
+    positions = {}
+    scheduler = JobScheduler(total_slots=1, on_queue_change=lambda job_id, pos: positions.__setitem__(job_id, pos))
+    scheduler.submit("a", jobs, "a")
+    scheduler.submit("b", jobs, "b")
+    scheduler.submit("c", jobs, "c")
+    assert positions == {"b": 1, "c": 2}
+
+    cancelled = scheduler.cancel("b")
+    assert cancelled.job_id == "b" and cancelled.args == ("b",)
+    assert positions["c"] == 1
+    assert scheduler.cancel("a") is None  # 실행 중인 작업은 큐에서 뺄 수 없음
+    assert scheduler.is_running("a")
+    assert scheduler.cancel("missing") is None
+
+    jobs.finish("a")
+    _wait_until(lambda: "c" in jobs.started)
+    jobs.finish("c")
+    _wait_until(lambda: scheduler.status()["free_slots"] == 1)
+    assert "b" not in jobs.started
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+라이브 스트림 분석 테스트 (프레임 버림, 지연 예산, 이벤트 전달)
+"""
+import sys
+import threading
+import time
+import numpy as np
+import pytest
+import cv2
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hand_boundary_detector import HandBoundaryDetector, DetectionEvent
+from src.live_stream_analyzer import LatestFrameReader, LiveStreamAnalyzer
+
+
+class FakeLiveCapture:
+    """실시간 속도로 프레임을 내보내는 캡처"""
+
+    def __init__(self, fps=60, total_frames=90):
+        self.interval = 1 / fps
+        self.total_frames = total_frames
+        self.index = 0
+        self.released = False
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.index >= self.total_frames:
+            return False, None
+        time.sleep(self.interval)
+        self.index += 1
+        return True, np.full((48, 64, 3), self.index % 256, dtype=np.uint8)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self.index * self.interval * 1000
+        return 0
+
+    def release(self):
+        self.released = True
+
+
+class SlowDetector(HandBoundaryDetector):
+    """프레임 처리에 시간이 걸리고 10번째 처리마다 이벤트를 내는 감지기"""
+
+    def __init__(self, processing_time):
+        super().__init__()
+        self.processing_time = processing_time
+        self.processed = []
+
+    def process_frame(self, frame, current_time, frame_number):
+        time.sleep(self.processing_time)
+        self.processed.append(frame_number)
+        if len(self.processed) % 10 == 0:
+            return DetectionEvent('hand_start', frame_number, current_time, 80.0, {}, {'hand_id': 1})
+        return None
+
+
+def test_drops_frames_and_emits_events(tmp_path):
+    detector = SlowDetector(processing_time=0.03)
+    received = []
+    analyzer = LiveStreamAnalyzer(detector, latency_budget=0.5, event_callback=received.append)
+    cap = FakeLiveCapture(fps=60, total_frames=90)
+
+    output = analyzer.run(cap, {'title': 'live'}, output_path=str(tmp_path / "live.json"))
+
+    stats = analyzer.get_stats()
+    assert Path(output).exists()
+    assert cap.released
+    # 처리보다 캡처가 빠르므로 밀린 프레임은 버리고 항상 최신 프레임을 처리
+    assert stats['processed_frames'] < 90
+    assert stats['dropped_frames'] > 0
+    assert detector.processed == sorted(detector.processed)
+    assert stats['max_latency'] < 0.5
+    assert len(received) == analyzer.events.qsize() >= 1
+
+
+def test_interval_grows_when_over_budget():
+    analyzer = LiveStreamAnalyzer(SlowDetector(0), latency_budget=0.1, max_interval=1.0)
+    start = analyzer.stats.sample_interval
+    analyzer._adapt_interval(0.5)
+    assert analyzer.stats.sample_interval > start
+
+    for _ in range(100):
+        analyzer._adapt_interval(0.5)
+    assert analyzer.stats.sample_interval == 1.0
+
+    for _ in range(200):
+        analyzer._adapt_interval(0.01)
+    assert analyzer.stats.sample_interval == analyzer.min_interval
+
+
+class StuckCapture(FakeLiveCapture):
+    """첫 프레임 뒤 read()가 막히는 캡처 (응답 없는 스트림)"""
+
+    def __init__(self):
+        super().__init__(fps=100, total_frames=10 ** 6)
+        self.unblock = threading.Event()
+        self.reading = False
+        self.released_while_reading = False
+
+    def read(self):
+        if self.index >= 1:
+            self.reading = True
+            self.unblock.wait(5)
+            self.reading = False
+            return False, None
+        return super().read()
+
+    def release(self):
+        self.released_while_reading = self.reading
+        super().release()
+
+
+def test_stop_returns_and_release_waits_for_blocked_read(tmp_path, monkeypatch):
+    analyzer = LiveStreamAnalyzer(SlowDetector(0), latency_budget=0.5)
+    cap = StuckCapture()
+    threading.Timer(0.3, analyzer.stop).start()
+
+    reader_close = LatestFrameReader.close
+    monkeypatch.setattr(LatestFrameReader, 'close', lambda self, timeout=5.0: reader_close(self, timeout=0.2))
+    started = time.monotonic()
+    output = analyzer.run(cap, output_path=str(tmp_path / "live.json"))
+
+    # 막힌 read()를 기다리지 않고 결과를 저장하고 반환 (스케줄러 슬롯 반환)
+    assert time.monotonic() - started < 2
+    assert Path(output).exists()
+    assert not cap.released
+
+    # read()가 돌아온 뒤 읽기 스레드가 해제
+    cap.unblock.set()
+    deadline = time.monotonic() + 2
+    while not cap.released and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cap.released and not cap.released_while_reading
+
+
+def test_unopened_capture_is_released():
+    class ClosedCapture(FakeLiveCapture):
+        def isOpened(self):
+            return False
+
+    cap = ClosedCapture()
+    with pytest.raises(ValueError):
+        LiveStreamAnalyzer().run(cap)
+    assert cap.released
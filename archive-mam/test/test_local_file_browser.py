@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+로컬 파일 브라우저 디렉토리 목록 테스트 (페이지, 비디오 필터, 목록 캐시)
+"""
+import os
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.local_file_browser import LocalFileBrowser
+
+
+def _make_tree(root):
+    (root / "sub").mkdir()
+    (root / ".hidden").write_bytes(b"x")
+    for i in range(5):
+        (root / f"clip{i}.mp4").write_bytes(b"v" * (i + 1))
+    (root / "notes.txt").write_bytes(b"t")
+
+
+def _count_scans(monkeypatch):
+    calls = []
+    original = os.scandir
+
+    def counting(path):
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(os, 'scandir', counting)
+    return calls
+
+
+def test_listing_order_and_counts(tmp_path):
+    _make_tree(tmp_path)
+    result = LocalFileBrowser().list_directory(str(tmp_path))
+
+    names = [item['name'] for item in result['items']]
+    assert names[0] == '..'
+    assert names[1] == 'sub'
+    assert '.hidden' not in names
+    assert result['video_count'] == 5
+    assert result['has_more'] is False
+    assert result['items'][2]['size'] == 1
+
+
+def test_pagination(tmp_path):
+    _make_tree(tmp_path)
+    browser = LocalFileBrowser()
+    first = browser.list_directory(str(tmp_path), offset=0, limit=3)
+    second = browser.list_directory(str(tmp_path), offset=3, limit=3)
+
+    assert [i['name'] for i in first['items']] == ['..', 'sub', 'clip0.mp4', 'clip1.mp4']
+    assert first['has_more'] is True
+    # 상위 디렉토리 항목은 첫 페이지에만
+    assert [i['name'] for i in second['items']] == ['clip2.mp4', 'clip3.mp4', 'clip4.mp4']
+    assert second['has_more'] is True
+    assert browser.list_directory(str(tmp_path), offset=6, limit=3)['has_more'] is False
+
+
+def test_videos_only(tmp_path):
+    _make_tree(tmp_path)
+    result = LocalFileBrowser().list_directory(str(tmp_path), videos_only=True)
+    names = [item['name'] for item in result['items']]
+    assert 'notes.txt' not in names
+    assert 'sub' in names
+    assert result['video_count'] == 5
+
+
+def test_cache_hit_and_invalidation(tmp_path, monkeypatch):
+    _make_tree(tmp_path)
+    browser = LocalFileBrowser()
+    calls = _count_scans(monkeypatch)
+
+    browser.list_directory(str(tmp_path), limit=2)
+    browser.list_directory(str(tmp_path), offset=2, limit=2)
+    assert len(calls) == 1
+
+    # 항목 추가로 디렉토리 수정시간이 바뀌면 다시 스캔
+    (tmp_path / "new.mkv").write_bytes(b"n")
+    os.utime(tmp_path, (1, 1))
+    result = browser.list_directory(str(tmp_path))
+    assert len(calls) == 2
+    assert 'new.mkv' in [item['name'] for item in result['items']]
+
+    # 새로고침은 캐시 무시
+    browser.list_directory(str(tmp_path), use_cache=False)
+    assert len(calls) == 3
+
+
+def test_cached_items_are_not_shared(tmp_path):
+    _make_tree(tmp_path)
+    browser = LocalFileBrowser()
+    browser.list_directory(str(tmp_path))['items'][1]['name'] = 'changed'
+    assert browser.list_directory(str(tmp_path))['items'][1]['name'] == 'sub'
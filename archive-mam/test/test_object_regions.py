@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+모션 영역/고정 ROI 제한 객체 감지 테스트 (좌표 변환, 정적 ROI 캐시, 전체 프레임 대체)
+"""
+import sys
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hand_boundary_detector import ObjectDetector, HandBoundaryDetector, _merge_rects
+from src.instrumentation import Instrumentation
+
+
+def _frame_with_card(x, y):
+    """50x75 흰색 카드 하나가 있는 640x480 프레임"""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.rectangle(frame, (x, y), (x + 49, y + 74), (255, 255, 255), -1)
+    return frame
+
+
+def _detector(**kwargs):
+    detector = ObjectDetector(Instrumentation(enabled=True), region_mode='motion', **kwargs)
+    detector.set_regions((480, 640, 3))
+    return detector
+
+
+def _color_cards(cards):
+    return sorted(c['bbox'] for c in cards if c['type'] == 'color_detected')
+
+
+def test_motion_region_matches_full_frame_coordinates():
+    # 카드는 어떤 고정 ROI에도 걸리지 않는 위치 (팟/플레이어 자리 밖)
+    frame = _frame_with_card(200, 300)
+    full = ObjectDetector().detect_cards(frame)
+    motion = _detector().detect_cards(frame, [{'bbox': (210, 310, 20, 20)}])
+
+    assert _color_cards(full)
+    assert _color_cards(motion) == _color_cards(full)
+
+
+def test_objects_outside_regions_are_ignored():
+    frame = _frame_with_card(200, 300)
+    assert _detector().detect_cards(frame, []) == []
+    # motion_regions가 없으면 전체 프레임 검사
+    assert _color_cards(_detector().detect_cards(frame)) == _color_cards(ObjectDetector().detect_cards(frame))
+
+
+def test_static_roi_results_are_cached():
+    # 플레이어 1 자리 안의 카드
+    frame = _frame_with_card(90, 350)
+    detector = _detector(static_refresh_interval=3)
+    scanned = []
+    original = detector._find_cards
+    detector._find_cards = lambda crop: scanned.append(crop.shape) or original(crop)
+
+    first = detector.detect_cards(frame, [])
+    assert len(scanned) == 7  # 팟 + 플레이어 6자리
+    second = detector.detect_cards(frame, [])
+    assert len(scanned) == 7
+    assert _color_cards(second) == _color_cards(first) == _color_cards(ObjectDetector().detect_cards(frame))
+    assert detector.instrumentation.snapshot()['counters']['objects.cards_cache_hits'] == 7
+
+    # 모션이 닿은 자리만 다시 검사
+    detector.detect_cards(frame, [{'bbox': (100, 360, 10, 10)}])
+    assert len(scanned) == 8
+
+    # 갱신 주기가 지나면 모든 자리를 다시 검사
+    detector.detect_cards(frame, [])
+    assert len(scanned) == 14
+
+
+def test_cached_results_are_not_mutated_by_merge():
+    frame = _frame_with_card(90, 350)
+    detector = _detector()
+    first = detector.detect_cards(frame, [])
+    for card in first:
+        card['confidence'] = -1
+    assert all(card['confidence'] > 0 for card in detector.detect_cards(frame, []))
+
+
+def test_chip_duplicates_across_regions_are_merged():
+    detector = _detector()
+    chips = [
+        {'center': (100, 100), 'radius': 15, 'color': 'red'},
+        {'center': (104, 98), 'radius': 15, 'color': 'red'},
+        {'center': (104, 98), 'radius': 15, 'color': 'blue'},
+    ]
+    assert len(detector._merge_chips(chips)) == 2
+
+
+def test_merge_rects():
+    merged = _merge_rects([(0, 0, 10, 10), (5, 5, 20, 20), (30, 30, 40, 40)])
+    assert sorted(merged) == [(0, 0, 20, 20), (30, 30, 40, 40)]
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        HandBoundaryDetector(object_detection='roi')
+    assert HandBoundaryDetector(object_detection='motion').object_detector.region_mode == 'motion'
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+팟 타임라인 엔진 테스트
+"""
+import sys
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.pot_size_ocr import PotSizeOCR, PotSizeReading
+from src.pot_timeline import PotTimeline
+
+ROI = (300, 200, 240, 60)
+
+
+def _reading(t, value, confidence=80.0, roi=ROI):
+    return PotSizeReading(float(t), str(value), str(value), value, confidence, roi)
+
+
+def test_timeline_matches_legacy_filter_and_order():
+    readings = [_reading(5, 1200.0), _reading(1, None), _reading(3, 800.0, 40.0),
+                _reading(2, 0.0), _reading(0, 500.0, 50.0), _reading(65, 900.0)]
+    timeline = PotSizeOCR().get_pot_timeline(readings)
+
+    assert [e['timestamp'] for e in timeline] == [0.0, 5.0, 65.0]
+    assert [e['pot_size'] for e in timeline] == [500.0, 1200.0, 900.0]
+    assert timeline[2]['formatted_time'] == "01:05"
+
+
+def test_dedupe_keeps_most_confident_roi():
+    readings = [_reading(1, 100.0, 70.0), _reading(1, 110.0, 90.0, (0, 0, 10, 10)), _reading(2, 120.0)]
+    timeline = PotTimeline.from_readings(readings).dedupe()
+
+    assert timeline.times.tolist() == [1.0, 2.0]
+    assert timeline.values.tolist() == [110.0, 120.0]
+    assert timeline.rois[0].tolist() == [0, 0, 10, 10]
+
+
+def test_extra_digit_misread_is_rejected():
+    values = [1000.0] * 6 + [10000.0] + [1000.0] * 3 + [2500.0] * 6
+    readings = [_reading(t, v) for t, v in enumerate(values)]
+
+    timeline = PotTimeline.from_readings(readings)
+    assert np.flatnonzero(timeline.outlier_mask()).tolist() == [6]
+
+    changes = PotSizeOCR().detect_pot_changes(readings)
+    assert [(c['timestamp'], c['previous_pot'], c['current_pot']) for c in changes] == [(10.0, 1000.0, 2500.0)]
+    assert changes[0]['change_percent'] == 150.0
+    assert changes[0]['formatted_time'] == "00:10"
+
+
+def test_step_lasting_two_readings_is_kept():
+    # 큰 올인처럼 5배 넘게 뛴 값이 두 번만 읽혀도 오인식으로 버리지 않음 (끝과 중간)
+    tail = PotTimeline(range(6), [100, 100, 100, 100, 2000, 2000], [90] * 6)
+    assert not tail.outlier_mask().any()
+    assert tail.clean().values.tolist() == [100.0] * 4 + [2000.0] * 2
+    assert [(c['timestamp'], c['current_pot']) for c in tail.clean().changes()] == [(4.0, 2000.0)]
+
+    middle = PotTimeline(range(8), [100, 100, 100, 2000, 2000, 100, 100, 100], [90] * 8)
+    assert not middle.outlier_mask().any()
+    assert [(c['timestamp'], c['current_pot']) for c in middle.clean().changes()] == [(3.0, 2000.0), (5.0, 100.0)]
+
+    readings = [_reading(t, v) for t, v in enumerate([100.0] * 4 + [2000.0] * 2)]
+    assert PotSizeOCR().hand_pot_ranges(readings, [(0, 5)])[0]['max_pot'] == 2000.0
+
+
+def test_weighted_smoothing_follows_confidence():
+    # 낮은 신뢰도의 튀는 값은 가중 중앙값에서 이웃 값으로 대체
+    readings = [_reading(0, 100.0, 90.0), _reading(1, 100.0, 90.0), _reading(2, 130.0, 55.0),
+                _reading(3, 100.0, 90.0), _reading(4, 100.0, 90.0)]
+    timeline = PotTimeline.from_readings(readings)
+    assert timeline.smoothed().tolist() == [100.0] * 5
+    assert timeline.clean().changes(10.0) == []
+
+
+def test_segment_stats_match_per_hand_scan():
+    rng = np.random.default_rng(7)
+    times = np.sort(rng.uniform(0, 1000, 3000))
+    values = rng.uniform(100, 5000, 3000).round()
+    timeline = PotTimeline(times, values, np.full(3000, 80.0))
+
+    starts = rng.uniform(-10, 1000, 400)
+    ends = starts + rng.uniform(0, 30, 400)
+    starts[:3] = [2000, 5, 500]
+    ends[:3] = [2100, 5, 400]  # 범위 밖 / 길이 0 / 역순 구간
+    stats = timeline.segment_stats(starts, ends)
+
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        inside = values[(times >= start) & (times <= end)]
+        assert stats['count'][i] == len(inside)
+        if len(inside):
+            assert stats['max'][i] == inside.max() and stats['min'][i] == inside.min()
+        else:
+            assert np.isnan(stats['max'][i]) and np.isnan(stats['min'][i])
+
+
+def test_hand_pot_ranges_and_columnar_load(tmp_path):
+    analyzer = PotSizeOCR()
+    readings = [_reading(t, 100.0 * (1 + t // 10)) for t in range(30)]
+    ranges = analyzer.hand_pot_ranges(readings, [(0, 9), (10, 19.5), (40, 50)])
+    assert ranges[0] == {'readings': 10, 'max_pot': 100.0, 'min_pot': 100.0}
+    assert ranges[1]['max_pot'] == 200.0
+    assert ranges[2] == {'readings': 0, 'max_pot': None, 'min_pot': None}
+
+    path = str(tmp_path / "pot.npz")
+    analyzer.save_results(readings + [_reading(30, None)], path)
+    loaded = PotTimeline.load(path, start=5, end=14)
+    assert loaded.times.tolist() == [float(t) for t in range(5, 15)]
+    assert loaded.rois[0].tolist() == list(ROI)
+    assert loaded.entries() == PotTimeline.from_readings(readings[5:15]).entries()
+
+
+def test_empty_timeline():
+    timeline = PotTimeline.from_readings([])
+    assert len(timeline.clean()) == 0
+    assert timeline.changes() == []
+    assert timeline.hand_ranges([(0, 10)]) == [{'readings': 0, 'max_pot': None, 'min_pot': None}]
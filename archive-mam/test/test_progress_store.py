@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+작업 진행 상황 저장소 테스트
+"""
+import sys
+import json
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.progress_store import ProgressStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "progress.db")
+
+
+def test_create_update_and_merge(db_path):
+    store = ProgressStore(db_path)
+    store.create("t1", status="starting", progress=0, video_info={"title": "A"})
+    store.update("t1", merge={"video_info": {"fps": 30}}, status="analyzing", progress=10)
+
+    data = store.get("t1")
+    assert data["status"] == "analyzing"
+    assert data["progress"] == 10
+    assert data["video_info"] == {"title": "A", "fps": 30}
+    assert store.get_versioned("t1")[0] == 2
+    assert "t1" in store and "missing" not in store
+    assert store.update("missing", progress=1) is None
+
+
+def test_shared_between_instances(db_path):
+    """다른 프로세스(워커)의 저장소 인스턴스에서도 같은 상태가 보임"""
+    writer = ProgressStore(db_path)
+    reader = ProgressStore(db_path)
+    writer.create("t1", status="starting")
+    writer.update("t1", status="completed")
+    assert reader.get("t1")["status"] == "completed"
+
+
+def test_wait_for_change_wakes_on_update(db_path):
+    store = ProgressStore(db_path, poll_interval=5)
+    store.create("t1", progress=0)
+
+    def later():
+        time.sleep(0.1)
+        store.update("t1", progress=50)
+
+    threading.Thread(target=later).start()
+    start = time.monotonic()
+    version, data = store.wait_for_change("t1", since_version=1, timeout=3)
+    assert data["progress"] == 50
+    assert version == 2
+    assert time.monotonic() - start < 2  # 같은 프로세스는 폴링 간격을 기다리지 않음
+
+    assert store.wait_for_change("t1", since_version=2, timeout=0.05) is None
+
+
+def test_stream_ends_at_terminal_status(db_path):
+    store = ProgressStore(db_path)
+    store.create("t1", status="analyzing", progress=10)
+    store.update("t1", status="completed", progress=100)
+
+    events = list(store.stream("t1", heartbeat=0.1))
+    assert len(events) == 1
+    assert events[0].startswith("id: 2\n")
+    payload = json.loads(events[0].split("data: ", 1)[1])
+    assert payload["status"] == "completed"
+
+
+def test_stream_ends_when_cancelled(db_path):
+    store = ProgressStore(db_path)
+    store.create("t1", status="queued", progress=0)
+    store.update("t1", status="cancelled")
+
+    events = list(store.stream("t1", heartbeat=0.1))
+    assert len(events) == 1
+    assert json.loads(events[0].split("data: ", 1)[1])["status"] == "cancelled"
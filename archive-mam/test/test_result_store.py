@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+컬럼 결과 저장소 테스트 (요약 헤더, 시간 구간 읽기, 라운드트립)
+"""
+import sys
+import zipfile
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.result_store import save_columnar, load_summary, read_range, read_rows
+from src.pot_size_ocr import PotSizeOCR, PotSizeReading
+from src.pot_timeline import PotTimeline
+
+
+def _ui_rows(count):
+    return [
+        {
+            'timestamp': float(i),
+            'frame_hash': f"h{i}",
+            'features': {'brightness': i * 0.5, 'edges': 1.0},
+            'ui_probability': np.float64(i / count),
+            'is_ui': np.bool_(i % 2 == 0),
+            'confidence': 0.0
+        }
+        for i in range(count)
+    ]
+
+
+def test_roundtrip_and_summary(tmp_path):
+    path = str(tmp_path / "ui.npz")
+    rows = _ui_rows(10)
+    save_columnar(path, list(reversed(rows)), {'fps': 30, 'ui_segments': [{'start': 1, 'end': 2}]})
+
+    summary = load_summary(path)
+    assert summary['fps'] == 30
+    assert summary['row_count'] == 10
+    assert 'features.brightness' in summary['columns']
+
+    loaded = read_rows(path)
+    assert [r['timestamp'] for r in loaded] == [float(i) for i in range(10)]
+    assert loaded[3]['features'] == {'brightness': 1.5, 'edges': 1.0}
+    assert loaded[4]['is_ui'] is True
+    assert loaded[4]['frame_hash'] == "h4"
+
+
+def test_range_read_only_touches_overlapping_chunks(tmp_path, monkeypatch):
+    path = str(tmp_path / "ui.npz")
+    save_columnar(path, _ui_rows(100), chunk_rows=10)
+
+    accessed = []
+    original = np.lib.npyio.NpzFile.__getitem__
+
+    def tracking(self, key):
+        accessed.append(key)
+        return original(self, key)
+
+    monkeypatch.setattr(np.lib.npyio.NpzFile, '__getitem__', tracking)
+    columns = read_range(path, start=25, end=34, columns=['ui_probability'])
+
+    assert list(columns) == ['timestamp', 'ui_probability']
+    assert columns['timestamp'].tolist() == [float(t) for t in range(25, 35)]
+    assert len(columns['ui_probability']) == 10
+    assert {key.split('@')[1] for key in accessed} == {'2', '3'}
+
+
+def test_empty_range_and_summary_without_frame_data(tmp_path):
+    path = str(tmp_path / "ui.npz")
+    save_columnar(path, _ui_rows(5), {'note': '요약'})
+
+    assert len(read_range(path, start=100)['timestamp']) == 0
+    with zipfile.ZipFile(path) as zf:
+        assert 'summary.json' in zf.namelist()
+    assert load_summary(path)['note'] == '요약'
+
+
+def test_pot_readings_columnar(tmp_path):
+    path = str(tmp_path / "pot.npz")
+    analyzer = PotSizeOCR()
+    readings = [
+        PotSizeReading(float(t), "1,200", "1200", 1200.0 if t % 2 else None, 80.0, (300, 200, 240, 60))
+        for t in range(6)
+    ]
+    analyzer.save_results(readings, path)
+
+    assert load_summary(path)['valid_readings'] == 3
+    loaded = analyzer.load_results(path, start=2, end=4)
+    assert loaded == readings[2:5]
+
+
+def test_all_none_and_partly_none_columns_roundtrip(tmp_path):
+    path = str(tmp_path / "mixed.npz")
+    rows = [{'timestamp': float(t), 'missing': None, 'count': None if t == 1 else t, 'label': None}
+            for t in range(3)]
+    save_columnar(path, rows, schema={'label': 'str'})
+
+    columns = read_range(path)
+    assert columns['missing'].dtype == np.float64 and np.isnan(columns['missing']).all()
+    loaded = read_rows(path)
+    assert [r['missing'] for r in loaded] == [None, None, None]
+    assert [r['count'] for r in loaded] == [0, None, 2]
+    assert isinstance(loaded[2]['count'], int)
+    assert [r['label'] for r in loaded] == ['', '', '']
+
+
+def test_pot_readings_without_any_pot_value(tmp_path):
+    """팟을 한 번도 못 읽은 결과도 다시 읽어 타임라인을 만들 수 있음"""
+    path = str(tmp_path / "pot.npz")
+    analyzer = PotSizeOCR()
+    readings = [PotSizeReading(float(t), "", "", None, 0.0, (300, 200, 240, 60)) for t in range(3)]
+    analyzer.save_results(readings, path)
+
+    loaded = analyzer.load_results(path)
+    assert loaded == readings
+    assert analyzer.get_pot_timeline(loaded) == []
+    assert len(PotTimeline.load(path)) == 0
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+장면 분할 사전 패스 테스트 (정적/테이블 외 구간 검출, 스킵 리스트 소비)
+"""
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.scene_segmenter import SceneSegmenter, SkipInterval, SkipList, get_skip_list, scenes_path
+from src.hand_boundary_detector import HandBoundaryDetector
+
+GREEN = (0, 120, 0)
+BLUE = (140, 60, 20)
+RED = (30, 20, 150)
+
+
+def _table_frame(seed, felt=GREEN):
+    """테이블(펠트) 위에서 무언가 움직이는 프레임"""
+    frame = np.zeros((36, 64, 3), dtype=np.uint8)
+    frame[:] = felt
+    x = (seed * 7) % 56
+    frame[10:26, x:x + 8] = (255, 255, 255)
+    return frame
+
+
+def _leaderboard_frame():
+    """테이블이 보이지 않는 정적 화면"""
+    frame = np.full((36, 64, 3), 40, dtype=np.uint8)
+    frame[5:10, 5:60] = (200, 200, 200)
+    return frame
+
+
+def _samples(pattern):
+    return [(float(t), frame) for t, frame in enumerate(pattern)]
+
+
+def _broadcast(felt=GREEN):
+    return (
+        [_table_frame(i, felt) for i in range(10)]     # 0~9초: 핸드 진행
+        + [_leaderboard_frame()] * 10                  # 10~19초: 리더보드
+        + [_table_frame(3, felt)] * 10                 # 20~29초: 정지 화면
+        + [_table_frame(i, felt) for i in range(5)]    # 30~34초: 다시 진행
+    )
+
+
+def test_detects_off_table_and_static_runs():
+    segmenter = SceneSegmenter(min_skip_duration=5, margin=1, table_color='auto')
+    pattern = _broadcast()
+
+    skip_list = segmenter.segment_samples(_samples(pattern))
+
+    # 20초의 첫 테이블 프레임은 직전 리더보드와 달라서 정적 구간은 21초부터 시작
+    assert [(i.start, i.end, i.reason) for i in skip_list.intervals] == [
+        (11.0, 19.0, 'off_table'),
+        (22.0, 29.0, 'static'),
+    ]
+
+
+def test_non_green_felt_is_calibrated():
+    """파랑/빨강 펠트도 영상에서 펠트 색을 보정해 테이블 구간은 스킵하지 않음"""
+    for felt in (BLUE, RED):
+        segmenter = SceneSegmenter(min_skip_duration=5, margin=1, table_color='auto')
+        skip_list = segmenter.segment_samples(_samples(_broadcast(felt)))
+        assert [(i.start, i.end, i.reason) for i in skip_list.intervals] == [
+            (11.0, 19.0, 'off_table'),
+            (22.0, 29.0, 'static'),
+        ]
+
+    # 펠트 색이 0/179 경계 근처인 빨강: 보정된 색상 창이 경계를 넘어감
+    assert segmenter.table_hue is not None and (segmenter.table_hue < 12 or segmenter.table_hue > 167)
+
+
+def test_off_table_check_is_opt_in():
+    """기본값은 정적 구간만 스킵 (펠트 색을 가정하지 않음)"""
+    moving_blue_table = [_table_frame(i, BLUE) for i in range(120)]
+    assert len(SceneSegmenter().segment_samples(_samples(moving_blue_table))) == 0
+
+    # 녹색으로 고정하면 파랑 펠트 영상 전체가 테이블 외 화면이 됨 (기본으로 끈 이유)
+    fixed_green = SceneSegmenter(table_color=60)
+    assert fixed_green.segment_samples(_samples(moving_blue_table)).intervals[0].reason == 'off_table'
+
+    skip_list = SceneSegmenter(min_skip_duration=5, margin=1).segment_samples(_samples(_broadcast(BLUE)))
+    assert [i.reason for i in skip_list.intervals] == ['static', 'static']
+
+
+def test_short_runs_are_not_skipped():
+    segmenter = SceneSegmenter(min_skip_duration=5, margin=1)
+    pattern = [_table_frame(i) for i in range(5)] + [_leaderboard_frame()] * 3 + [_table_frame(1)]
+    assert len(segmenter.segment_samples(_samples(pattern))) == 0
+
+
+def test_skip_list_lookup_and_resume():
+    skip_list = SkipList([SkipInterval(20.0, 30.0, 'static'), SkipInterval(5.0, 10.0, 'off_table')])
+    assert skip_list.find(7.0).reason == 'off_table'
+    assert not skip_list.contains(10.0)
+    assert skip_list.resume_frame(600, 30) == 900
+    assert skip_list.resume_frame(599, 30) is None
+    assert skip_list.total_skipped == 15.0
+    assert SkipList.from_list(skip_list.to_list()).intervals == skip_list.intervals
+
+
+def _write_video(path, frames):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 36))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def test_hand_boundary_detector_skips_intervals(tmp_path, monkeypatch):
+    video = tmp_path / "v.avi"
+    _write_video(video, [_table_frame(i) for i in range(60)])
+
+    detector = HandBoundaryDetector()
+    processed = []
+    original = detector.process_frame
+    monkeypatch.setattr(detector, 'process_frame',
+                        lambda frame, t, n: processed.append(n) or original(frame, t, n))
+
+    skip_list = SkipList([SkipInterval(1.0, 4.0, 'static')])
+    detector.analyze_video(str(video), str(tmp_path / "out.json"), skip_list=skip_list)
+
+    assert not any(10 <= n < 40 for n in processed)
+    assert processed[:10] == list(range(10))
+    assert 40 in processed
+
+
+def test_sidecar_cache(tmp_path, monkeypatch):
+    video = tmp_path / "v.avi"
+    _write_video(video, [_table_frame(0)] * 30)
+    monkeypatch.setattr('src.scene_segmenter.ffmpeg_available', lambda: False)
+    segmenter = SceneSegmenter(min_skip_duration=1, margin=0)
+
+    first = get_skip_list(str(video), segmenter)
+    assert Path(scenes_path(str(video))).exists()
+    assert len(first) == 1
+
+    monkeypatch.setattr(segmenter, 'scan', lambda path: (_ for _ in ()).throw(AssertionError("재계산")))
+    assert get_skip_list(str(video), segmenter).intervals == first.intervals
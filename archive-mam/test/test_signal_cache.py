@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+신호 캐시(증분 재분석) 테스트
+"""
+import sys
+import json
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.signal_cache import SignalCache, params_digest
+from src.fast_hand_detector import FastHandDetector, SIGNAL_EXTRACTOR, SIGNAL_VERSION, SIGNAL_CHUNK_SAMPLES
+from src.advanced_ui_detector import AdvancedUIDetector
+from src.pot_size_ocr import PotSizeOCR
+
+
+def _write_video(path, frames, fps=10):
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def _table_video(path, n_frames=240):
+    """카드가 나타났다 사라지는 합성 테이블 영상"""
+    frames = []
+    for i in range(n_frames):
+        frame = np.full((360, 640, 3), (30, 90, 30), dtype=np.uint8)
+        if 60 <= i < 180:
+            for k in range(4):
+                x = 120 + k * 90 + (i % 7)
+                cv2.rectangle(frame, (x, 140), (x + 50, 210), (255, 255, 255), -1)
+        frames.append(frame)
+    _write_video(path, frames)
+
+
+def test_params_digest_is_order_independent():
+    assert params_digest({'a': 1, 'b': [1, 2]}) == params_digest({'b': [1, 2], 'a': 1})
+    assert params_digest({'a': 1}) != params_digest({'a': 2})
+
+
+def test_store_load_and_invalidate(tmp_path):
+    video = tmp_path / "v.bin"
+    video.write_bytes(b"video-bytes")
+    cache = SignalCache(str(tmp_path / "cache"))
+
+    assert cache.load(str(video), 'x', 1, {'p': 1}) is None
+    rows = [{'timestamp': 0.0, 'value': 1.5}, {'timestamp': 1.0, 'value': 2.5}]
+    assert cache.store(str(video), 'x', 1, {'p': 1}, rows, {'end_time': 2.0})
+
+    loaded, extra = cache.load(str(video), 'x', 1, {'p': 1})
+    assert loaded == rows
+    assert extra == {'end_time': 2.0}
+    # 버전/파라미터가 다르면 별도 항목
+    assert cache.load(str(video), 'x', 2, {'p': 1}) is None
+    assert cache.load(str(video), 'x', 1, {'p': 2}) is None
+
+    assert cache.invalidate(str(video), 'x') == 1
+    assert cache.load(str(video), 'x', 1, {'p': 1}) is None
+
+
+def test_content_hash_follows_file_changes(tmp_path):
+    video = tmp_path / "v.bin"
+    video.write_bytes(b"first")
+    cache = SignalCache(str(tmp_path / "cache"))
+    first = cache.video_hash(str(video))
+    assert cache.video_hash(str(video)) == first
+
+    video.write_bytes(b"second-version")
+    assert cache.video_hash(str(video)) != first
+
+    # 같은 내용의 다른 경로는 같은 해시 → 캐시 공유
+    copy = tmp_path / "copy.bin"
+    copy.write_bytes(b"second-version")
+    assert cache.video_hash(str(copy)) == cache.video_hash(str(video))
+
+
+def test_fast_hand_threshold_change_reuses_signals(tmp_path, monkeypatch):
+    video = tmp_path / "table.avi"
+    _table_video(video)
+    cache = SignalCache(str(tmp_path / "cache"))
+
+    def run(detector, name):
+        out = detector.analyze_video(str(video), str(tmp_path / name))
+        return json.loads(Path(out).read_text())
+
+    baseline = run(FastHandDetector(sampling_rate=5, num_workers=1), "base.json")
+
+    detector = FastHandDetector(sampling_rate=5, num_workers=1, signal_cache=cache)
+    assert run(detector, "first.json") == baseline
+    assert detector.last_signals_cached is False
+
+    # 두 번째 실행은 프레임 추출 없이 캐시된 신호로 같은 결과
+    monkeypatch.setattr(detector, '_extract_key_frames',
+                        lambda *a, **k: (_ for _ in ()).throw(AssertionError("decoded")))
+    assert run(detector, "second.json") == baseline
+    assert detector.last_signals_cached is True
+
+    # 임계값만 바꾸면 여전히 캐시 사용, 결과는 캐시 없는 실행과 동일
+    detector.card_threshold = 10
+    changed = run(detector, "changed.json")
+    assert detector.last_signals_cached is True
+    reference = FastHandDetector(sampling_rate=5, num_workers=1)
+    reference.card_threshold = 10
+    assert changed == run(reference, "reference.json")
+
+    # 샘플링을 바꾸면 신호를 다시 추출
+    assert cache.load(str(video), SIGNAL_EXTRACTOR, SIGNAL_VERSION, detector.signal_params(False)) is not None
+    detector.sampling_rate = 10
+    monkeypatch.undo()
+    run(detector, "resampled.json")
+    assert detector.last_signals_cached is False
+
+
+def test_signals_do_not_depend_on_worker_count(tmp_path):
+    """청크 경계가 고정이라 워커 수가 달라도 같은 신호, 같은 캐시 항목"""
+    video = tmp_path / "table.avi"
+    _table_video(video)
+    cache = SignalCache(str(tmp_path / "cache"))
+
+    single = FastHandDetector(sampling_rate=1, num_workers=1, signal_cache=cache)
+    cap = cv2.VideoCapture(str(video))
+    key_frames = single._extract_key_frames(cap, 240, 10.0, None)
+    cap.release()
+    assert len(key_frames) > 2 * SIGNAL_CHUNK_SAMPLES
+
+    parallel = FastHandDetector(sampling_rate=1, num_workers=3, signal_cache=cache)
+    assert single._extract_signals_parallel(key_frames) == parallel._extract_signals_parallel(key_frames)
+    assert single.signal_params(False) == parallel.signal_params(False)
+
+    single.analyze_video(str(video), str(tmp_path / "single.json"))
+    assert single.last_signals_cached is False
+    parallel.num_workers = 2
+    parallel.analyze_video(str(video), str(tmp_path / "parallel.json"))
+    assert parallel.last_signals_cached is True
+
+
+def test_ui_threshold_change_without_decoding(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "ui.avi"
+    frames = [np.full((36, 64, 3), 60, dtype=np.uint8)] * 50 + [np.full((36, 64, 3), 200, dtype=np.uint8)] * 50
+    _write_video(video, frames)
+
+    detector = AdvancedUIDetector(signal_cache=SignalCache(str(tmp_path / "cache")))
+    detector.is_trained = True  # analyze_frame을 학습된 모델처럼 대체
+    probabilities = {}
+
+    def fake_analyze(frame, timestamp):
+        probabilities[timestamp] = 0.7 if timestamp >= 5 else 0.2
+        return {'timestamp': timestamp, 'ui_probability': probabilities[timestamp],
+                'is_ui': probabilities[timestamp] > detector.ui_threshold}
+
+    monkeypatch.setattr(detector, 'analyze_frame', fake_analyze)
+    first = detector.analyze_video(str(video))
+    assert first['ui_segments'][0]['start'] == 5.0
+
+    calls = len(probabilities)
+    monkeypatch.setattr(cv2.VideoCapture, 'grab', lambda self: (_ for _ in ()).throw(AssertionError("decoded")))
+    detector.ui_threshold = 0.1
+    second = detector.analyze_video(str(video))
+    assert len(probabilities) == calls
+    assert second['analyzed_frames'] == first['analyzed_frames']
+    assert second['ui_segments'][0]['start'] == 0.0
+    assert all(r['is_ui'] for r in second['frame_results'])
+
+
+def test_pot_ocr_second_run_skips_ocr(tmp_path, monkeypatch):
+    video = tmp_path / "pot.avi"
+    _write_video(video, [np.full((480, 640, 3), 30, dtype=np.uint8)] * 40)
+
+    analyzer = PotSizeOCR(signal_cache=SignalCache(str(tmp_path / "cache")))
+    calls = []
+    monkeypatch.setattr(analyzer, 'perform_ocr', lambda roi: calls.append(1) or ("POT: $12,500", 88.0))
+
+    first = analyzer.analyze_video(str(video), frame_skip=10)
+    ocr_calls = len(calls)
+    assert ocr_calls == len(first) > 0
+
+    second = analyzer.analyze_video(str(video), frame_skip=10)
+    assert len(calls) == ocr_calls
+    assert analyzer.last_run_stats['counters']['signal_cache_hits'] == 1
+    assert [(r.timestamp, r.pot_value, r.roi_coords) for r in second] == \
+        [(r.timestamp, r.pot_value, r.roi_coords) for r in first]
+
+    # frame_skip이 다르면 다시 OCR
+    analyzer.analyze_video(str(video), frame_skip=20)
+    assert len(calls) > ocr_calls
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+/stats 집계 쿼리 테스트
+"""
+import sys
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import Base, Video, Hand, VideoStatus
+from src.stats import TTLCache, compute_statistics, get_cached_statistics
+
+
+@pytest.fixture
+def db():
+    """인메모리 SQLite 세션"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add_sample_data(db):
+    db.add_all([
+        Video(id=1, filename="a.mp4", file_path="uploads/a.mp4", status=VideoStatus.COMPLETED),
+        Video(id=2, filename="b.mp4", file_path="uploads/b.mp4", status=VideoStatus.PENDING),
+        Video(id=3, filename="c.mp4", file_path="uploads/c.mp4", status=VideoStatus.COMPLETED),
+    ])
+    db.add_all([
+        Hand(video_id=1, video_filename="a.mp4", start_time_s=0, end_time_s=60,
+             pot_size_history=[{"time_s": 10, "pot": 300}, {"time_s": 50, "pot": 1200}]),
+        Hand(video_id=1, video_filename="a.mp4", start_time_s=60, end_time_s=180,
+             pot_size_history=[{"time_s": 70, "pot": 40000}]),
+        Hand(video_id=3, video_filename="c.mp4", start_time_s=0, end_time_s=180,
+             pot_size_history=[]),
+    ])
+    db.commit()
+
+
+class TestStatistics:
+    """통계 집계 테스트"""
+
+    def test_empty_database(self, db):
+        stats = compute_statistics(db)
+        assert stats["total_videos"] == 0
+        assert stats["total_hands"] == 0
+        assert stats["average_hands_per_video"] == 0
+        assert stats["hands_per_hour"] == 0
+        assert set(stats["videos_by_status"]) == {s.value for s in VideoStatus}
+
+    def test_aggregates(self, db):
+        _add_sample_data(db)
+        stats = compute_statistics(db)
+
+        assert stats["total_videos"] == 3
+        assert stats["total_hands"] == 3
+        assert stats["videos_by_status"]["completed"] == 2
+        assert stats["videos_by_status"]["pending"] == 1
+        assert stats["hand_duration"]["average_s"] == 120
+        # a.mp4 180초 + c.mp4 180초 = 6분 동안 3핸드
+        assert stats["hands_per_hour"] == 30
+
+        counts = {b["range"]: b["count"] for b in stats["pot_size_distribution"]}
+        assert counts["1000-2500"] == 1
+        assert counts["25000-50000"] == 1
+        assert sum(counts.values()) == 2  # 팟 기록이 없는 핸드는 제외
+
+    def test_cache_invalidation(self, db):
+        cache = TTLCache(ttl=60)
+        assert get_cached_statistics(db, cache)["total_videos"] == 0
+
+        _add_sample_data(db)
+        assert get_cached_statistics(db, cache)["total_videos"] == 0
+
+        cache.invalidate()
+        assert get_cached_statistics(db, cache)["total_videos"] == 3
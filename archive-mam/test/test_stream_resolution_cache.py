@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+스트림 URL 해석 캐시 테스트 (만료, 동시 해석 중복 제거, 영상 ID 추출)
+"""
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+yt_dlp = pytest.importorskip("yt_dlp")
+
+from src.streaming_video_handler import (
+    StreamResolutionCache, StreamingVideoHandler, extract_youtube_id, stream_url_expiry
+)
+
+
+class CountingResolver:
+    """호출 횟수를 세는 가짜 yt-dlp 해석기"""
+
+    def __init__(self, expire=None, delay=0.0):
+        self.calls = 0
+        self.expire = expire
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        url = "https://rr1.googlevideo.com/videoplayback?itag=22"
+        if self.expire is not None:
+            url += f"&expire={int(self.expire)}"
+        return {'stream_url': url, 'fps': 30, 'width': 1280, 'height': 720, 'duration': 600}
+
+
+def test_extract_youtube_id():
+    vid = "dQw4w9WgXcQ"
+    assert extract_youtube_id(f"https://www.youtube.com/watch?v={vid}&t=10") == vid
+    assert extract_youtube_id(f"https://youtu.be/{vid}?si=abc") == vid
+    assert extract_youtube_id(f"https://www.youtube.com/shorts/{vid}") == vid
+    assert extract_youtube_id(f"https://www.youtube.com/live/{vid}") == vid
+    assert extract_youtube_id(f"https://m.youtube.com/embed/{vid}") == vid
+    assert extract_youtube_id("https://www.youtube.com/channel/abc") is None
+
+
+def test_stream_url_expiry():
+    assert stream_url_expiry("https://x.googlevideo.com/videoplayback?expire=1700000000") == 1700000000
+    assert stream_url_expiry("https://x.googlevideo.com/api/manifest/hls/expire/1700000000/id/1") == 1700000000
+    assert stream_url_expiry("https://example.com/video.mp4") is None
+
+
+def test_cache_hit_and_expiry():
+    cache = StreamResolutionCache(expiry_margin=60)
+    fresh = CountingResolver(expire=time.time() + 3600)
+    first = cache.get_or_resolve("a", fresh)
+    first['stream_url'] = "mutated"
+    assert cache.get_or_resolve("a", fresh)['stream_url'] != "mutated"
+    assert fresh.calls == 1
+    assert cache.hits == 1
+
+    # 만료 여유 시간 안쪽이면 다시 해석
+    stale = CountingResolver(expire=time.time() + 30)
+    cache.get_or_resolve("b", stale)
+    cache.get_or_resolve("b", stale)
+    assert stale.calls == 2
+
+
+def test_invalidate_keeps_metadata():
+    cache = StreamResolutionCache()
+    resolver = CountingResolver()
+    cache.get_or_resolve("a", resolver)
+    cache.invalidate("a")
+
+    metadata = cache.get_metadata("a")
+    assert metadata['fps'] == 30 and 'stream_url' not in metadata
+    cache.get_or_resolve("a", resolver)
+    assert resolver.calls == 2
+
+
+def test_concurrent_resolution_is_deduplicated():
+    cache = StreamResolutionCache()
+    resolver = CountingResolver(delay=0.2)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_resolve("a", resolver)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert resolver.calls == 1
+    assert len(results) == 5
+
+
+def test_failed_resolution_propagates_and_retries():
+    cache = StreamResolutionCache()
+
+    def failing():
+        raise RuntimeError("network")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_resolve("a", failing)
+    assert cache.get_or_resolve("a", CountingResolver())['fps'] == 30
+
+
+def test_handler_keys_by_video_id_and_format():
+    cache = StreamResolutionCache()
+    handler = StreamingVideoHandler(resolution_cache=cache)
+    resolver = CountingResolver()
+    handler._resolve_youtube_stream_url = lambda url: resolver()
+
+    handler.get_stream_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+    info = handler.get_stream_url("https://youtu.be/dQw4w9WgXcQ")
+    assert resolver.calls == 1
+    assert info['cache_key'] == ("dQw4w9WgXcQ", handler.ydl_opts['format'])
+    assert handler.get_cached_metadata("https://youtu.be/dQw4w9WgXcQ")['height'] == 720
+
+    # URL이 무효화돼도 메타데이터는 네트워크 요청 없이 조회, 직접 URL은 캐시하지 않음
+    cache.invalidate(info['cache_key'])
+    assert handler.get_cached_metadata("https://youtu.be/dQw4w9WgXcQ")['duration'] == 600
+    assert handler.get_cached_metadata("https://example.com/video.mp4") is None
+    assert resolver.calls == 1
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+시간 일관성 캐시와 적응형 샘플링 테스트
+"""
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.temporal_cache import TemporalCache, AdaptiveSampler
+from src.advanced_ui_detector import AdvancedUIDetector
+from src.pot_size_ocr import PotSizeOCR, PotSizeReading
+
+
+def _frame(value, size=(64, 36)):
+    return np.full((size[1], size[0], 3), value, dtype=np.uint8)
+
+
+def test_cache_reuses_within_epsilon():
+    cache = TemporalCache(epsilon=2.0)
+    calls = []
+
+    def compute(frame):
+        calls.append(int(frame[0, 0, 0]))
+        return len(calls)
+
+    assert cache.get_or_compute(_frame(100), compute) == (1, False)
+    assert cache.get_or_compute(_frame(101), compute) == (1, True)
+    assert cache.get_or_compute(_frame(150), compute) == (2, False)
+    assert calls == [100, 150]
+    assert cache.hit_rate == 1 / 3
+
+
+def test_cache_compares_against_last_classified_frame():
+    """조금씩 변하는 장면도 누적 차이가 epsilon을 넘으면 다시 분류"""
+    cache = TemporalCache(epsilon=2.0)
+    results = [cache.get_or_compute(_frame(v), lambda f: int(f[0, 0, 0]))[0] for v in (100, 101, 102, 103)]
+    assert results == [100, 100, 100, 103]
+
+
+def test_sampler_grows_and_shrinks():
+    sampler = AdaptiveSampler(base_interval=1.0, max_interval=4.0)
+    assert sampler.update(stable=False) == 0.25
+    for _ in range(10):
+        sampler.update(stable=True)
+    assert sampler.interval == 4.0
+    assert sampler.frames(30) == 120
+    assert sampler.update(stable=False) == 0.25
+
+
+def _write_video(path, frames, fps=10):
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, (w, h))
+    for frame in frames:
+        writer.write(frame)
+    writer.release()
+
+
+def test_ui_detector_adaptive_reuses_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    video = tmp_path / "v.avi"
+    # 20초 정적 화면 후 장면 전환
+    _write_video(video, [_frame(60)] * 200 + [_frame(200)] * 50)
+
+    detector = AdvancedUIDetector()
+    calls = []
+    monkeypatch.setattr(detector, 'analyze_frame',
+                        lambda frame, t: calls.append(t) or {'timestamp': t, 'is_ui': t >= 20})
+
+    baseline = AdvancedUIDetector().analyze_video(str(video))
+    results = detector.analyze_video(str(video), adaptive=True)
+
+    assert len(calls) < baseline['analyzed_frames']
+    assert results['reused_frames'] == results['analyzed_frames'] - len(calls)
+    timestamps = [r['timestamp'] for r in results['frame_results']]
+    assert timestamps == sorted(timestamps)
+    # 전환 직후 프레임은 새로 분석됨
+    assert any(t >= 20 for t in calls)
+    assert results['ui_segments'][0]['start'] >= 20
+
+
+def test_pot_ocr_adaptive_uses_roi_signature(tmp_path, monkeypatch):
+    video = tmp_path / "pot.avi"
+    frames = []
+    for i in range(100):
+        frame = _frame(30, size=(640, 480))
+        # 팟 숫자 영역만 50프레임째에 바뀜
+        if i >= 50:
+            cv2.putText(frame, "12,500", (320, 240), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 3)
+        frames.append(frame)
+    _write_video(video, frames)
+
+    analyzer = PotSizeOCR()
+    calls = []
+
+    def fake_analyze(frame, timestamp):
+        calls.append(timestamp)
+        return [PotSizeReading(timestamp, "", "", None, 0.0, (0, 0, 0, 0))]
+
+    monkeypatch.setattr(analyzer, 'analyze_frame', fake_analyze)
+    readings = analyzer.analyze_video(str(video), frame_skip=5, adaptive=True)
+
+    assert len(calls) < len(readings)
+    # 팟이 바뀐 뒤 최대 간격(기본 간격의 4배) 안에 다시 OCR
+    assert any(5.0 <= t <= 5.0 + 0.5 * 4 for t in calls)
+    assert [r.timestamp for r in readings] == sorted(r.timestamp for r in readings)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+스트리밍 업로드 / 해시 중복 제거 / 이어받기 테스트
+"""
+import sys
+import asyncio
+import hashlib
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.database import Base, Video, add_missing_columns
+from src.upload_service import (
+    UploadError, UploadSessionManager, filename_in_use, finalize_upload, stream_to_disk
+)
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _receive(tmp_path, data, name):
+    part = tmp_path / f"{name}.part"
+    digest, size = asyncio.run(stream_to_disk(_chunks(data[:3], data[3:]), part))
+    return part, digest, size
+
+
+class TestStreamingUpload:
+    """단일 요청 업로드"""
+
+    def test_hash_while_streaming(self, tmp_path):
+        data = b"poker footage" * 1000
+        part, digest, size = _receive(tmp_path, data, "a")
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert size == len(data)
+        assert part.read_bytes() == data
+
+    def test_duplicate_content_returns_existing_video(self, tmp_path, db):
+        data = b"same content"
+        part, digest, size = _receive(tmp_path, data, "a")
+        first, created = finalize_upload(db, part, tmp_path, "a.mp4", digest, size)
+        assert created
+        assert (tmp_path / "a.mp4").exists()
+
+        part, digest, size = _receive(tmp_path, data, "b")
+        second, created = finalize_upload(db, part, tmp_path, "renamed.mp4", digest, size)
+        assert not created
+        assert second.id == first.id
+        assert not part.exists()
+        assert db.query(Video).count() == 1
+
+    def test_same_name_different_content_kept_under_unique_name(self, tmp_path, db):
+        part, digest, size = _receive(tmp_path, b"first", "a")
+        finalize_upload(db, part, tmp_path, "a.mp4", digest, size)
+        assert filename_in_use(db, tmp_path, "a.mp4")
+
+        # 다 받은 파일을 버리지 않고 해시를 붙인 이름으로 보관
+        part, digest, size = _receive(tmp_path, b"second", "b")
+        video, created = finalize_upload(db, part, tmp_path, "a.mp4", digest, size)
+        assert created
+        assert video.filename == f"a-{digest[:8]}.mp4"
+        assert (tmp_path / video.filename).read_bytes() == b"second"
+        assert (tmp_path / "a.mp4").read_bytes() == b"first"
+
+    def test_failed_write_does_not_advance_hash(self, tmp_path, monkeypatch):
+        """쓰기에 실패한 청크는 해시에 반영되지 않음 (이어받기 digest 보호)"""
+        hasher = hashlib.sha256()
+        part = tmp_path / "a.part"
+
+        real_open = open
+
+        class FailingFile:
+            def __init__(self, f):
+                self.f = f
+
+            def write(self, data):
+                if data == b"lost":
+                    raise OSError("disk full")
+                return self.f.write(data)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.f.close()
+
+        monkeypatch.setattr("builtins.open", lambda *a, **k: FailingFile(real_open(*a, **k)))
+        with pytest.raises(OSError):
+            asyncio.run(stream_to_disk(_chunks(b"ok", b"lost"), part, hasher))
+        monkeypatch.undo()
+
+        assert hasher.hexdigest() == hashlib.sha256(part.read_bytes()).hexdigest()
+
+
+class TestResumableUpload:
+    """이어받기 업로드 세션"""
+
+    def test_resume_after_restart(self, tmp_path):
+        data = b"0123456789" * 100
+        manager = UploadSessionManager(tmp_path)
+        upload_id = manager.create("big.mp4", len(data))["upload_id"]
+
+        asyncio.run(manager.append(upload_id, 0, _chunks(data[:400])))
+
+        # 서버 재시작 - 메모리의 해시 상태가 사라져도 부분 파일로 복원
+        manager = UploadSessionManager(tmp_path)
+        assert manager.status(upload_id)["received_bytes"] == 400
+        asyncio.run(manager.append(upload_id, 400, _chunks(data[400:])))
+
+        session, digest = asyncio.run(manager.complete(upload_id))
+        assert session["filename"] == "big.mp4"
+        assert digest == hashlib.sha256(data).hexdigest()
+
+    def test_offset_mismatch(self, tmp_path):
+        manager = UploadSessionManager(tmp_path)
+        upload_id = manager.create("big.mp4", 10)["upload_id"]
+        with pytest.raises(UploadError) as exc:
+            asyncio.run(manager.append(upload_id, 5, _chunks(b"abc")))
+        assert exc.value.status_code == 409
+
+    def test_incomplete_upload_cannot_complete(self, tmp_path):
+        manager = UploadSessionManager(tmp_path)
+        upload_id = manager.create("big.mp4", 10)["upload_id"]
+        asyncio.run(manager.append(upload_id, 0, _chunks(b"abc")))
+        with pytest.raises(UploadError):
+            asyncio.run(manager.complete(upload_id))
+
+    def test_overflow_is_rolled_back(self, tmp_path):
+        manager = UploadSessionManager(tmp_path)
+        upload_id = manager.create("big.mp4", 4)["upload_id"]
+        asyncio.run(manager.append(upload_id, 0, _chunks(b"ab")))
+        with pytest.raises(UploadError):
+            asyncio.run(manager.append(upload_id, 2, _chunks(b"cdef")))
+        assert manager.status(upload_id)["received_bytes"] == 2
+
+
+def test_add_missing_columns():
+    """기존 DB에 content_hash / file_size 컬럼 추가"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE videos (id INTEGER PRIMARY KEY, filename VARCHAR, file_path VARCHAR, "
+            "upload_date DATETIME, status VARCHAR, task_id VARCHAR, error_message VARCHAR)"
+        ))
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("videos")}
+    assert {"content_hash", "file_size"} <= columns
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+비디오 키프레임 인덱스 테스트
+"""
+import sys
+import io
+import json
+import subprocess
+import pytest
+import numpy as np
+import cv2
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src import video_index
+from src.video_index import (
+    IndexedCapture, build_index, get_index, load_index, sidecar_path
+)
+
+
+def _missing_ffprobe(cmd, **kwargs):
+    raise FileNotFoundError(cmd[0])
+
+
+class FakeProcess:
+    """ffprobe 패킷 출력(CSV)을 줄 단위로 내보내는 가짜 프로세스"""
+
+    def __init__(self, lines):
+        self.stdout = io.StringIO(''.join(lines))
+
+    @classmethod
+    def factory(cls, lines, calls=None):
+        def popen(cmd, **kwargs):
+            if calls is not None:
+                calls.append(cmd)
+            return cls(lines)
+        return popen
+
+    def wait(self, timeout=None):
+        return 0
+
+
+@pytest.fixture
+def numbered_video(tmp_path):
+    """프레임 번호를 밝기로 기록한 30fps, 60프레임 영상"""
+    path = str(tmp_path / "numbered.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+    for i in range(60):
+        writer.write(np.full((48, 64, 3), i * 4, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_index_from_ffprobe_packets(numbered_video):
+    # 디코딩 순서(B 프레임)로 나오는 패킷을 pts 순으로 정렬해 프레임 번호 부여
+    probe = {
+        "streams": [{"avg_frame_rate": "30/1", "width": 64, "height": 48, "nb_frames": "6"}],
+        "format": {"duration": "0.200000"}
+    }
+    packets = [
+        "packet,0.000000,48,K_\n",
+        "packet,0.066667,900,__\n",
+        "side_data,Skip Samples\n",
+        "packet,0.033333,1200,__\n",
+        "packet,0.100000,1500,K_\n",
+        "packet,N/A,1800,__\n",
+        "packet,0.166667,2100,__\n",
+        "packet,0.133333,2400,__\n",
+    ]
+    runner = lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, json.dumps(probe), "")
+
+    index = build_index(numbered_video, runner, popen=FakeProcess.factory(packets))
+    assert index.fps == 30
+    assert index.frame_count == 6
+    assert index.duration == pytest.approx(0.2)
+    assert index.keyframe_times == [0.0, 0.1]
+    assert index.keyframe_frames == [0, 3]
+    assert index.keyframe_offsets == [48, 1500]
+    assert index.keyframe_before(0.15) == (0.1, 3, 1500)
+
+
+def test_sidecar_roundtrip_and_invalidation(numbered_video):
+    index = build_index(numbered_video, _missing_ffprobe)
+    assert Path(sidecar_path(numbered_video)).exists()
+    assert index.frame_count == 60
+    assert load_index(numbered_video) == index
+
+    # 영상이 바뀌면 사이드카는 무효
+    with open(numbered_video, 'ab') as f:
+        f.write(b'\0')
+    assert load_index(numbered_video) is None
+
+
+def test_indexed_capture_reads_requested_frames(numbered_video):
+    index = build_index(numbered_video, _missing_ffprobe, save=False)
+    with IndexedCapture(numbered_video, index) as cap:
+        for t in (0.5, 0.6, 1.5, 0.1):
+            ret, frame = cap.read_at(t)
+            assert ret
+            assert abs(int(frame.mean()) - int(round(t * 30)) * 4) <= 3
+
+        # 가까운 전진은 grab, 뒤로 가는 경우만 seek
+        assert cap.seeks == 1
+
+
+def test_index_memo_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_index, '_index_memo', video_index.OrderedDict())
+    monkeypatch.setattr(video_index, 'INDEX_MEMO_SIZE', 2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"v{i}.mp4"
+        path.write_bytes(b"x" * (i + 1))
+        paths.append(str(path))
+
+    probe = {"streams": [{"avg_frame_rate": "30/1", "width": 64, "height": 48}]}
+    runner = lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, json.dumps(probe), "")
+    calls = []
+    popen = FakeProcess.factory(["packet,0.000000,0,K_\n"], calls)
+
+    get_index(paths[0], runner, popen)
+    get_index(paths[1], runner, popen)
+    get_index(paths[0], runner, popen)  # 최근 사용으로 갱신
+    get_index(paths[2], runner, popen)
+    assert list(video_index._index_memo) == [paths[0], paths[2]]
+    # 메모에서 버린 인덱스는 사이드카에서 다시 읽음 (ffprobe를 다시 실행하지 않음)
+    assert get_index(paths[1], runner, popen).keyframe_times == [0.0]
+    assert len(calls) == 3
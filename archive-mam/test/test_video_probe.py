@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+비디오 메타데이터 조사 캐시 테스트 (ffprobe 파싱, SQLite 캐시, 파일 브라우저 연동)
+"""
+import json
+import sys
+import subprocess
+import cv2
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.video_probe import ProbeCache, probe_video, capture_properties
+from src import video_probe
+from src.local_file_browser import LocalFileBrowser
+
+
+def _write_video(path, count=30, fps=10, size=(64, 48)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    for i in range(count):
+        writer.write(np.full((size[1], size[0], 3), i * 5, dtype=np.uint8))
+    writer.release()
+
+
+def _ffprobe_runner(output, calls=None):
+    def runner(cmd, **kwargs):
+        if calls is not None:
+            calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(output), stderr='')
+    return runner
+
+
+def _missing_ffprobe(cmd, **kwargs):
+    raise FileNotFoundError(cmd[0])
+
+
+VFR_PROBE = {
+    'streams': [{
+        'codec_name': 'h264', 'width': 1920, 'height': 1080,
+        'r_frame_rate': '60/1', 'avg_frame_rate': '30000/1001', 'duration': '7200.5'
+    }],
+    'format': {'duration': '7200.6'},
+    'packets': [{'pts_time': str(t), 'flags': 'K_' if t % 2 == 0 else '__'} for t in range(0, 11)]
+}
+
+
+def test_ffprobe_parsing_uses_container_duration(tmp_path):
+    video = tmp_path / "vfr.mp4"
+    video.write_bytes(b"x")
+    probe = probe_video(str(video), runner=_ffprobe_runner(VFR_PROBE))
+
+    assert probe.codec == 'h264'
+    assert probe.duration == 7200.5
+    assert abs(probe.fps - 29.97) < 0.01
+    # nb_frames가 없으면 길이 × 평균 fps
+    assert probe.frame_count == round(7200.5 * 30000 / 1001)
+    assert probe.keyframe_interval == 2.0
+    assert probe.variable_frame_rate is True
+    assert probe.to_dict()['resolution'] == '1920x1080'
+
+
+def test_opencv_fallback(tmp_path):
+    video = tmp_path / "v.avi"
+    _write_video(video)
+    probe = probe_video(str(video), runner=_missing_ffprobe)
+
+    assert probe.source == 'opencv'
+    assert probe.frame_count == 30
+    assert probe.duration == 3.0
+    assert probe.codec == 'mjpg'
+    assert probe.keyframe_interval is None
+
+
+def test_cache_probes_once_per_file_version(tmp_path):
+    video = tmp_path / "v.mp4"
+    video.write_bytes(b"x")
+    calls = []
+    cache = ProbeCache(str(tmp_path / "probe.db"), runner=_ffprobe_runner(VFR_PROBE, calls))
+
+    first = cache.get(str(video))
+    # 다른 인스턴스(다른 프로세스 상당)도 같은 DB를 읽음
+    other = ProbeCache(str(tmp_path / "probe.db"), runner=_ffprobe_runner(VFR_PROBE, calls))
+    assert other.get(str(video)) == first
+    assert len(calls) == 1
+
+    # 파일이 바뀌면 다시 조사
+    video.write_bytes(b"changed")
+    cache.get(str(video))
+    assert len(calls) == 2
+
+
+def test_capture_properties_falls_back_for_streams(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_probe, '_default_cache', ProbeCache(str(tmp_path / "probe.db"),
+                                                                  runner=_missing_ffprobe))
+    video = tmp_path / "v.avi"
+    _write_video(video, count=20)
+    cap = cv2.VideoCapture(str(video))
+    try:
+        assert capture_properties(str(video), cap) == (10.0, 20)
+        assert capture_properties("https://example.com/live.m3u8", cap) == (cap.get(cv2.CAP_PROP_FPS), 20)
+    finally:
+        cap.release()
+
+
+def test_validate_video_file_reports_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_probe, '_default_cache', ProbeCache(str(tmp_path / "probe.db"),
+                                                                  runner=_missing_ffprobe))
+    video = tmp_path / "v.avi"
+    _write_video(video)
+    broken = tmp_path / "broken.mp4"
+    broken.write_bytes(b"not a video")
+
+    browser = LocalFileBrowser()
+    result = browser.validate_video_file(str(video))
+    assert result['valid'] is True
+    assert result['file_info']['video_info']['frame_count'] == 30
+
+    result = browser.validate_video_file(str(broken))
+    assert result['valid'] is False
+    assert any('비디오를 열 수 없음' in e for e in result['errors'])
+
+
+def test_default_cache_reads_env_when_created(tmp_path, monkeypatch):
+    video_probe.reset_probe_cache()
+    monkeypatch.setenv('VIDEO_PROBE_DB', str(tmp_path / "first" / "probe.db"))
+    assert video_probe.get_probe_cache().db_path == str(tmp_path / "first" / "probe.db")
+
+    # 재설정 후에는 바뀐 환경변수로 새 캐시
+    monkeypatch.setenv('VIDEO_PROBE_DB', str(tmp_path / "second" / "probe.db"))
+    assert video_probe.get_probe_cache().db_path == str(tmp_path / "first" / "probe.db")
+    video_probe.reset_probe_cache()
+    assert video_probe.get_probe_cache().db_path == str(tmp_path / "second" / "probe.db")
+    video_probe.reset_probe_cache()